@@ -0,0 +1,86 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from multiprocessing import Pool, Process, Event
+from smtm import Database
+
+
+def make_dummy_data(market, start, count):
+    start_dt = datetime.fromisoformat(start)
+    data = []
+    for idx in range(count):
+        date_time = start_dt + timedelta(minutes=idx)
+        data.append(
+            {
+                "market": market,
+                "date_time": date_time.strftime("%Y-%m-%d %H:%M:%S"),
+                "opening_price": 1000.0 + idx,
+                "high_price": 1100.0 + idx,
+                "low_price": 900.0 + idx,
+                "closing_price": 1050.0 + idx,
+                "acc_price": 5000.0,
+                "acc_volume": 5.0,
+            }
+        )
+    return data
+
+
+def read_candles(args):
+    db_file, read_only, pragmas, duration = args
+    db = Database(db_file, read_only=read_only, pragmas=pragmas, shared=True)
+    count = 0
+    end_time = time.time() + duration
+    while time.time() < end_time:
+        columns = db.query_columns("2020-03-01 00:00:00", "2020-03-02 00:00:00", "KRW-BTC")
+        if len(columns["ts"]) != 1440:
+            raise UserWarning(f"invalid data count: {len(columns['ts'])}")
+        count += 1
+    return count
+
+
+def write_candles(db_file, pragmas, stop_event):
+    db = Database(db_file, pragmas=pragmas)
+    day = 2
+    while not stop_event.is_set():
+        db.update(make_dummy_data("KRW-ETH", f"2020-03-{day:02d} 00:00:00", 1440))
+        day = day % 27 + 2
+
+
+class DatabaseIntegrationTests(unittest.TestCase):
+    READER = 4
+    DURATION = 3
+
+    def _run_benchmark(self, db_file, read_only, pragmas):
+        stop_event = Event()
+        writer = Process(target=write_candles, args=(db_file, pragmas, stop_event))
+        writer.start()
+        with Pool(processes=self.READER) as pool:
+            result = pool.map(
+                read_candles, [(db_file, read_only, pragmas, self.DURATION)] * self.READER
+            )
+        stop_event.set()
+        writer.join()
+        return sum(result) / self.DURATION
+
+    def test_ITG_concurrent_reader_throughput_with_writer(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            rollback_db = os.path.join(tmpdir, "rollback.db")
+            rollback_pragmas = {"journal_mode": "DELETE", "synchronous": "FULL", "mmap_size": 0}
+            db = Database(rollback_db, pragmas=rollback_pragmas)
+            db.update(make_dummy_data("KRW-BTC", "2020-03-01 00:00:00", 1440))
+            db.conn.close()
+
+            wal_db = os.path.join(tmpdir, "wal.db")
+            db = Database(wal_db)
+            db.update(make_dummy_data("KRW-BTC", "2020-03-01 00:00:00", 1440))
+            db.conn.close()
+
+            rollback_qps = self._run_benchmark(rollback_db, False, rollback_pragmas)
+            wal_qps = self._run_benchmark(wal_db, True, None)
+
+        print(f"\n{self.READER} readers with a writer, 1440 candles per query")
+        print(f"rollback journal: {rollback_qps:10.1f} query/sec")
+        print(f"WAL, read only  : {wal_qps:10.1f} query/sec")
+        self.assertGreater(wal_qps, 0)
@@ -2,12 +2,20 @@
 Description for Package
 """
 from .date_converter import DateConverter
+from .candle_frame import CandleFrame
 from .operator import Operator
 from .log_manager import LogManager
+from .record_table import RecordTable
+from .trading_table import TradingTable
+from .analyzer_checkpoint import AnalyzerCheckpoint
+from .trade_journal import TradeJournal
+from .graph_renderer import GraphRenderer
 from .analyzer import Analyzer
 from .simulation_trader import SimulationTrader
 from .simulation_data_provider import SimulationDataProvider
+from .simulation_context import SimulationContext
 from .simulation_operator import SimulationOperator
+from .indicators import RollingWindow
 from .strategy_bnh import StrategyBuyAndHold
 from .strategy_sma_0 import StrategySma0
 from .strategy_rsi import StrategyRsi
@@ -21,8 +29,13 @@ from .bithumb_data_provider import BithumbDataProvider
 from .controller import Controller
 from .jpt_controller import JptController
 from .telegram_controller import TelegramController
+from .rate_limiter import RateLimiter
 from .data_repository import DataRepository
 from .database import Database
+from .candle_archive import CandleArchive
+from .parameter_sampler import ParameterSampler
+from .result_journal import ResultJournal
+from .mass_coordinator import MassCoordinator
 from .mass_simulator import MassSimulator
 
 __all__ = [
@@ -6,23 +6,40 @@ mode:
     3: telegram chatbot controller
     4: mass simulation with config file
     5: make config file for mass simulation
+    6: prefetch trading data to database
 
 Example)
 python -m smtm --mode 0
 python -m smtm --mode 1
 python -m smtm --mode 1 --budget 500 --from_dash_to 201220.170000-201221 --term 1 --strategy 0 --currency BTC
+python -m smtm --mode 1 --budget 500 --from_dash_to 201220.170000-201221 --strategy 0 --currency BTC --sync
 python -m smtm --mode 2 --budget 50000 --term 60 --strategy 0 --currency ETH
+python -m smtm --mode 2 --budget 50000 --term 60 --strategy 0 --currency ETH --journal
 python -m smtm --mode 3
 python -m smtm --mode 4 --config /data/sma0_simulation.json
+python -m smtm --mode 4 --config /data/sma0_simulation.json --sync
+python -m smtm --mode 4 --config /data/sma0_simulation.json --resume
+SMTM_MASS_AUTHKEY=secret python -m smtm --mode 4 --config /data/sma0_simulation.json --serve 192.168.0.10:50000
+SMTM_MASS_AUTHKEY=secret python -m smtm --mode 4 --join 192.168.0.10:50000 --process 8
 python -m smtm --mode 5 --budget 50000 --title SMA_2H_week --strategy 1 --currency ETH --from_dash_to 210804.000000-210811.000000 --offset 120 --file generated_config.json
+python -m smtm --mode 6 --currency BTC,ETH --from_dash_to 210101.000000-220101.000000
 """
 import argparse
 from argparse import RawTextHelpFormatter
 import sys
-from . import Simulator, Controller, TelegramController, MassSimulator, LogManager
+from . import (
+    Simulator,
+    Controller,
+    TelegramController,
+    MassSimulator,
+    MassCoordinator,
+    LogManager,
+    DataRepository,
+    DateConverter,
+)
 
 if __name__ == "__main__":
-    DEFAULT_MODE = 6
+    DEFAULT_MODE = -1
     parser = argparse.ArgumentParser(
         description="""자동 거래 시스템 smtm
 
@@ -33,14 +50,22 @@ mode:
     3: telegram chatbot controller
     4: mass simulation with config file
     5: make config file for mass simulation
+    6: prefetch trading data to database
 
 Example)
 python -m smtm --mode 0
 python -m smtm --mode 1 --budget 50000 --from_dash_to 201220.170000-201221 --term 0.1 --strategy 0 --currency BTC
+python -m smtm --mode 1 --budget 50000 --from_dash_to 201220.170000-201221 --strategy 0 --currency BTC --sync
 python -m smtm --mode 2 --budget 50000 --term 60 --strategy 0 --currency ETH
+python -m smtm --mode 2 --budget 50000 --term 60 --strategy 0 --currency ETH --journal
 python -m smtm --mode 3
 python -m smtm --mode 4 --config /data/sma0_simulation.json
+python -m smtm --mode 4 --config /data/sma0_simulation.json --sync
+python -m smtm --mode 4 --config /data/sma0_simulation.json --resume
+SMTM_MASS_AUTHKEY=secret python -m smtm --mode 4 --config /data/sma0_simulation.json --serve 192.168.0.10:50000
+SMTM_MASS_AUTHKEY=secret python -m smtm --mode 4 --join 192.168.0.10:50000 --process 8
 python -m smtm --mode 5 --budget 50000 --title SMA_6H_week --strategy 1 --currency ETH --from_dash_to 210804.000000-210811.000000 --offset 360 --file generated_config.json
+python -m smtm --mode 6 --currency BTC,ETH --from_dash_to 210101.000000-220101.000000
 """,
         formatter_class=RawTextHelpFormatter,
     )
@@ -48,11 +73,13 @@ python -m smtm --mode 5 --budget 50000 --title SMA_6H_week --strategy 1 --curren
     parser.add_argument("--term", help="trading tick interval (seconds)", type=float, default="60")
     parser.add_argument("--strategy", help="strategy 0: buy and hold, 1: sma0, 2: rsi", default="0")
     parser.add_argument("--trader", help="trader 0: Upbit, 1: Bithumb", default="0")
-    parser.add_argument("--currency", help="trading currency e.g.BTC", default="BTC")
+    parser.add_argument(
+        "--currency", help="trading currency e.g.BTC, BTC,ETH for prefetch", default="BTC"
+    )
     parser.add_argument("--config", help="mass simulation config file", default="")
     parser.add_argument(
         "--process",
-        help="process number for mass simulation. default -1 use cpu number",
+        help="process number for mass simulation, thread number for prefetch. default -1",
         type=int,
         default=-1,
     )
@@ -60,6 +87,43 @@ python -m smtm --mode 5 --budget 50000 --title SMA_6H_week --strategy 1 --curren
     parser.add_argument("--file", help="generated config file name", default=None)
     parser.add_argument("--offset", help="mass simulation period offset", type=int, default=120)
     parser.add_argument("--log", help="log file name", default=None)
+    parser.add_argument(
+        "--sync",
+        help="run simulation in the current thread without worker thread and timer",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--resume",
+        help="resume mass simulation, skip periods recorded in the result journal",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--serve",
+        help="serve mass simulation jobs to joined workers at host:port\n"
+        "default: 127.0.0.1:50000, only local workers can join\n"
+        "jobs and results are pickled, a peer with the secret key can run code on this host\n"
+        "use only with trusted workers on a trusted network",
+        nargs="?",
+        const=MassCoordinator.DEFAULT_ADDRESS,
+        default=None,
+    )
+    parser.add_argument(
+        "--join",
+        help="join mass simulation served at host:port with --process workers\n"
+        "jobs are pickled, the coordinator can run code on this host, join only trusted hosts",
+        default=None,
+    )
+    parser.add_argument(
+        "--authkey",
+        help="secret key shared by --serve and --join, SMTM_MASS_AUTHKEY is used if not set\n"
+        "serve and join are refused without a secret key",
+        default=None,
+    )
+    parser.add_argument(
+        "--journal",
+        help="write all trading records to the journal table of smtm.db in real trading mode",
+        action="store_true",
+    )
     parser.add_argument(
         "--mode",
         help="0: interactive simulator, 1: single simulation, 2: real trading",
@@ -75,6 +139,10 @@ python -m smtm --mode 5 --budget 50000 --title SMA_6H_week --strategy 1 --curren
     if args.log is not None:
         LogManager.change_log_file(args.log)
 
+    if args.mode == DEFAULT_MODE:
+        parser.print_help()
+        sys.exit(0)
+
     if args.mode < 2:
         simulator = Simulator(
             budget=args.budget,
@@ -82,12 +150,9 @@ python -m smtm --mode 5 --budget 50000 --title SMA_6H_week --strategy 1 --curren
             strategy=args.strategy,
             currency=args.currency,
             from_dash_to=args.from_dash_to,
+            sync=args.sync,
         )
 
-    if args.mode == DEFAULT_MODE:
-        parser.print_help()
-        sys.exit(0)
-
     if args.mode == 0:
         simulator.main()
     elif args.mode == 1:
@@ -99,18 +164,30 @@ python -m smtm --mode 5 --budget 50000 --title SMA_6H_week --strategy 1 --curren
             strategy=args.strategy,
             currency=args.currency,
             is_bithumb=args.trader == "1",
+            journal=args.journal,
         )
         controller.main()
     elif args.mode == 3:
-        tcb = TelegramController()
+        tcb = TelegramController(journal=args.journal)
         tcb.main()
     elif args.mode == 4:
+        if args.join is not None:
+            MassSimulator().join(args.join, args.process, authkey=args.authkey)
+            sys.exit(0)
+
         if args.config == "":
             parser.print_help()
             sys.exit(0)
 
         mass = MassSimulator()
-        mass.run(args.config, args.process)
+        mass.run(
+            args.config,
+            args.process,
+            sync=args.sync,
+            resume=args.resume,
+            serve=args.serve,
+            authkey=args.authkey,
+        )
     elif args.mode == 5:
         result = MassSimulator.make_config_json(
             title=args.title,
@@ -122,3 +199,14 @@ python -m smtm --mode 5 --budget 50000 --title SMA_6H_week --strategy 1 --curren
             filepath=args.file,
         )
         print(f"{result} is generated")
+    elif args.mode == 6:
+        period = DateConverter.to_end_min(args.from_dash_to)
+        repo = DataRepository()
+        markets = [f"KRW-{currency}" for currency in args.currency.split(",")]
+        result = repo.prefetch(
+            period[0][0],
+            period[0][1],
+            markets,
+            max_workers=args.process if args.process > 0 else None,
+        )
+        print(f"prefetch is completed {result}")
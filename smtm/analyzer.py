@@ -1,16 +1,22 @@
 """거래 요청, 결과 정보를 저장하고 투자 결과를 분석하는 Analayzer 클래스"""
 
-import copy
 import os
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
 from datetime import datetime
-from datetime import timedelta
+from operator import itemgetter
 import ast
 import matplotlib
 import pandas as pd
-import mplfinance as mpf
 import psutil
 import numpy as np
 from .log_manager import LogManager
+from .indicators import Rsi
+from .graph_renderer import GraphRenderer
+from .record_table import RecordTable
+from .analyzer_checkpoint import AnalyzerCheckpoint
+from .trading_table import TradingTable
 
 matplotlib.use("Agg")
 
@@ -24,6 +30,9 @@ class Analyzer:
     asset_info_list: 특정 시점에 기록된 자산 데이터 목록
     score_list: 특정 시점에 기록된 수익률 데이터 목록
     get_asset_info_func: 자산 정보 업데이트를 요청하기 위한 콜백 함수
+    get_strategy_info_func: DEBUG 정보에 기록할 전략의 보관 상태 정보를 요청하기 위한 콜백 함수
+    journal: 모든 기록을 저장할 TradeJournal, 설정하면 목록별로 최근 기록만 메모리에 유지하고
+        지나간 구간의 수익률 보고서와 전체 거래 기록 테이블은 journal에서 읽는다
     """
 
     ISO_DATEFORMAT = "%Y-%m-%dT%H:%M:%S"
@@ -32,16 +41,71 @@ class Analyzer:
     GRAPH_MAX_COUNT = 1440
     DEBUG_MODE = True
     RSI = None  # set (low, high, count) tuple to draw e.g. (30, 70, 14)
-
-    def __init__(self, sma_info=(10, 40, 60)):
-        self.request_list = []
-        self.result_list = []
-        self.info_list = []
-        self.asset_info_list = []
-        self.score_list = []
-        self.spot_list = []
+    # "csv", "jsonl", "parquet"이면 거래 기록 테이블을 보고서와 같은 이름의 별도 파일로 저장
+    REPORT_FORMAT = "txt"
+    # journal을 사용할 때 메모리에 유지할 목록별 최근 기록 수, 두 배가 되면 지난 기록을 지운다
+    JOURNAL_KEEP_COUNT = 10080
+    # 목록 이름: (컬럼으로 저장할 항목, kind, float 컬럼으로 저장할 항목)
+    RECORD_SCHEMA = {
+        "info_list": (
+            (
+                "market",
+                "date_time",
+                "opening_price",
+                "high_price",
+                "low_price",
+                "closing_price",
+                "acc_price",
+                "acc_volume",
+            ),
+            0,
+            (
+                "opening_price",
+                "high_price",
+                "low_price",
+                "closing_price",
+                "acc_price",
+                "acc_volume",
+            ),
+        ),
+        "request_list": (("id", "type", "price", "amount", "date_time"), 1, ("price", "amount")),
+        "result_list": (
+            ("request", "type", "price", "amount", "msg", "balance", "state", "date_time"),
+            2,
+            ("price", "amount"),
+        ),
+        "asset_info_list": (("balance", "asset", "quote", "date_time"), None, ("balance",)),
+        "score_list": (
+            ("balance", "cumulative_return", "price_change_ratio", "asset", "date_time"),
+            3,
+            ("balance",),
+        ),
+        "spot_list": (("date_time", "value"), None, ()),
+    }
+    DUMP_LISTS = (
+        "request_list",
+        "result_list",
+        "info_list",
+        "asset_info_list",
+        "score_list",
+        "spot_list",
+    )
+
+    def __init__(self, sma_info=(10, 40, 60), journal=None):
+        self.request_list = self.make_record_table("request_list")
+        self.result_list = self.make_record_table("result_list")
+        self.info_list = self.make_record_table("info_list")
+        self.asset_info_list = self.make_record_table("asset_info_list")
+        self.score_list = self.make_record_table("score_list")
+        self.spot_list = self.make_record_table("spot_list")
         self.start_asset_info = None
+        self.checkpoints = {}
+        self.journal = journal
+        self.journal_seq = dict.fromkeys(self.DUMP_LISTS, 0)
+        self.journal_base = dict.fromkeys(self.DUMP_LISTS, 0)
+        self.journal_head = {}
         self.get_asset_info_func = None
+        self.get_strategy_info_func = None
         self.logger = LogManager.get_logger(__class__.__name__)
         self.is_simulation = False
         self.sma_info = sma_info
@@ -49,12 +113,21 @@ class Analyzer:
         if os.path.isdir("output") is False:
             os.mkdir("output")
 
-    def initialize(self, get_asset_info_func):
+    def initialize(self, get_asset_info_func, get_strategy_info_func=None):
         """콜백 함수를 입력받아 초기화한다
 
         get_asset_info_func: 거래 데이터를 요청하는 함수로 func(arg1) arg1은 정보 타입
+        get_strategy_info_func: 전략의 보관 상태 정보를 요청하는 함수로 func()
+            Returns: {이름: {"count", "maxlen", "dropped", "size"}}
         """
         self.get_asset_info_func = get_asset_info_func
+        self.get_strategy_info_func = get_strategy_info_func
+
+    @classmethod
+    def make_record_table(cls, name):
+        """RECORD_SCHEMA에 정의된 형식으로 레코드를 저장할 RecordTable을 생성한다"""
+        fields, kind, float_fields = cls.RECORD_SCHEMA[name]
+        return RecordTable(fields, kind=kind, float_fields=float_fields)
 
     def add_drawing_spot(self, date_time, value):
         """그래프에 그려질 점의 위치를 입력받아서 저장한다
@@ -62,7 +135,7 @@ class Analyzer:
         date_time: 그래프의 시간축 정보로 info_list의 date_time과 같은 형식
         value: 그래프의 y축에 해당하는 정보로 price 정보와 비슷한 수준의 값을 갖는 것이 좋다
         """
-        self.spot_list.append({"date_time": date_time, "value": value})
+        self.__append_record("spot_list", {"date_time": date_time, "value": value})
 
     def put_trading_info(self, info):
         """거래 정보를 저장한다
@@ -73,9 +146,7 @@ class Analyzer:
             2: 매매 결과
             3: 수익률 정보
         """
-        new = copy.deepcopy(info)
-        new["kind"] = 0
-        self.info_list.append(new)
+        self.__append_record("info_list", info, 0)
         self.make_periodic_record()
 
     def put_requests(self, requests):
@@ -96,17 +167,15 @@ class Analyzer:
             3: 수익률 정보
         """
         for request in requests:
-            new = copy.deepcopy(request)
             if request["type"] == "cancel":
-                new["price"] = 0
-                new["amount"] = 0
+                price = 0
+                amount = 0
             else:
-                if float(request["price"]) <= 0 or float(request["amount"]) <= 0:
+                price = float(request["price"])
+                amount = float(request["amount"])
+                if price <= 0 or amount <= 0:
                     continue
-                new["price"] = float(new["price"])
-                new["amount"] = float(new["amount"])
-            new["kind"] = 1
-            self.request_list.append(new)
+            self.__append_record("request_list", request, 1, price=price, amount=amount)
 
     def put_result(self, result):
         """거래 결과 정보를 저장한다
@@ -136,11 +205,10 @@ class Analyzer:
             self.logger.warning(f"Invalid result: {err}")
             return
 
-        new = copy.deepcopy(result)
-        new["price"] = float(new["price"])
-        new["amount"] = float(new["amount"])
-        new["kind"] = 2
-        self.result_list.append(new)
+        values = {"price": float(result["price"]), "amount": float(result["amount"])}
+        if isinstance(result.get("request"), dict):
+            values["request"] = dict(result["request"])
+        self.__append_record("result_list", result, 2, **values)
         self.update_asset_info()
 
     def update_asset_info(self):
@@ -158,19 +226,26 @@ class Analyzer:
             return
 
         asset_info = self.get_asset_info_func()
-        new = copy.deepcopy(asset_info)
+        # 자산 항목의 값은 교체될 뿐 변경되지 않으므로 딕셔너리만 복사한다
+        new = dict(asset_info)
         new["balance"] = float(new["balance"])
+        for name in ("asset", "quote"):
+            if isinstance(new.get(name), dict):
+                new[name] = dict(new[name])
         if self.start_asset_info is None and len(self.asset_info_list) == 0:
             self.start_asset_info = new
-        self.asset_info_list.append(new)
+        self.__append_record("asset_info_list", new)
         self.make_score_record(new)
 
     def make_start_point(self):
         """시작시점 거래정보를 기록한다"""
         self.start_asset_info = None
-        self.request_list = []
-        self.result_list = []
-        self.asset_info_list = []
+        self.request_list = self.make_record_table("request_list")
+        self.result_list = self.make_record_table("result_list")
+        self.asset_info_list = self.make_record_table("asset_info_list")
+        for name in ("request_list", "result_list", "asset_info_list"):
+            self.journal_base[name] = self.journal_seq[name]
+            self.journal_head.pop(name, None)
         self.update_asset_info()
 
     def update_start_point(self, info):
@@ -181,16 +256,95 @@ class Analyzer:
         """최소 간격을 유지하며 수익율을 기록한다
         RECORD_INTERVAL: 수익률 기록 간의 최소 시간(초)
         """
-        now = datetime.now()
         if self.is_simulation:
-            now = datetime.strptime(self.info_list[-1]["date_time"], self.ISO_DATEFORMAT)
+            now = self.__get_timestamp(self.info_list, -1)
+        else:
+            now = (datetime.now() - RecordTable.EPOCH).total_seconds()
 
-        last = datetime.strptime(self.asset_info_list[-1]["date_time"], self.ISO_DATEFORMAT)
-        delta = now - last
+        last = self.__get_timestamp(self.asset_info_list, -1)
 
-        if delta.total_seconds() > self.RECORD_INTERVAL:
+        if now - last > self.RECORD_INTERVAL:
             self.update_asset_info()
 
+    def __append_record(self, name, record, kind=None, **values):
+        record_list = getattr(self, name)
+        if isinstance(record_list, RecordTable):
+            record_list.append(record, **values)
+        elif kind is None and len(values) == 0:
+            record_list.append(record)
+        else:
+            new = dict(record, **values)
+            new["kind"] = kind
+            record_list.append(new)
+
+        if self.journal is not None:
+            self.__put_journal(name, record_list)
+
+    def __put_journal(self, name, record_list):
+        """기록을 journal에 저장하고 목록이 JOURNAL_KEEP_COUNT의 두 배가 되면 최근 기록만 남긴다
+
+        지우는 기록 중 전체 기간의 보고서에 필요한 첫 기록과 수익률 범위는 journal_head에 남긴다
+        """
+        self.journal.put(name, self.journal_seq[name], record_list[-1])
+        self.journal_seq[name] += 1
+        if not isinstance(record_list, RecordTable):
+            return
+        if len(record_list) < self.JOURNAL_KEEP_COUNT * 2:
+            return
+
+        count = len(record_list) - self.JOURNAL_KEEP_COUNT
+        if name == "score_list":
+            return_list = self._get_values(record_list, "cumulative_return")[:count]
+            low, high = self.journal_head.get(name, (min(return_list), max(return_list)))
+            self.journal_head[name] = (min(low, min(return_list)), max(high, max(return_list)))
+        elif name not in self.journal_head:
+            self.journal_head[name] = record_list[0]
+        record_list.drop(count)
+
+    def __get_trimmed_count(self, name):
+        """journal에만 남아있는 목록 앞부분의 기록 수"""
+        if self.journal is None:
+            return 0
+        trimmed = self.journal_seq[name] - self.journal_base[name] - len(getattr(self, name))
+        return max(trimmed, 0)
+
+    def __load_journal(self, name, **kwargs):
+        """journal에 저장된 현재 목록의 기록을 RecordTable로 읽는다
+
+        kwargs: TradeJournal.get_records 조회 조건, start_seq, end_seq는 현재 목록 내 위치
+        """
+        base = self.journal_base[name]
+        kwargs["start_seq"] = base + kwargs.get("start_seq", 0)
+        if kwargs.get("end_seq") is not None:
+            kwargs["end_seq"] += base
+
+        record_list = self.make_record_table(name)
+        for record in self.journal.get_records(name, **kwargs):
+            record_list.append(record)
+        return record_list
+
+    def __get_timestamp(self, record_list, index):
+        if isinstance(record_list, RecordTable):
+            timestamp = record_list.get_timestamp(index)
+            if timestamp is not None:
+                return timestamp
+
+        return self.__parse_timestamp(record_list[index]["date_time"])
+
+    def __get_timestamps(self, record_list):
+        """레코드 목록의 date_time을 초 단위 정수 목록으로 반환한다
+
+        RecordTable은 추가할 때 변환해 둔 값을 그대로 사용하고 그 외의 목록만 변환한다
+        """
+        if isinstance(record_list, RecordTable) and type(record_list.timestamps) is array:
+            return record_list.timestamps
+
+        return [self.__parse_timestamp(record["date_time"]) for record in record_list]
+
+    def __parse_timestamp(self, date_time):
+        parsed = datetime.strptime(date_time, self.ISO_DATEFORMAT)
+        return (parsed - RecordTable.EPOCH) // RecordTable.ONE_SECOND
+
     def make_score_record(self, new_info):
         """수익률 기록을 생성한다
 
@@ -246,7 +400,8 @@ class Analyzer:
                 f"cumulative_return {start_total} -> {current_total}, {cumulative_return}%"
             )
 
-            self.score_list.append(
+            self.__append_record(
+                "score_list",
                 {
                     "balance": float(new_info["balance"]),
                     "cumulative_return": cumulative_return,
@@ -254,12 +409,19 @@ class Analyzer:
                     "asset": new_asset_list,
                     "date_time": new_info["date_time"],
                     "kind": 3,
-                }
+                },
             )
         except (IndexError, AttributeError) as msg:
             self.logger.error(f"making score record fail {msg}")
 
-    def get_return_report(self, graph_filename=None, index_info=None):
+    def get_return_report(
+        self,
+        graph_filename=None,
+        index_info=None,
+        graph_renderer=None,
+        callback=None,
+        graph_key=None,
+    ):
         """현시점 기준 간단한 수익률 보고서를 제공한다
 
         index_info: 수익률 구간 정보
@@ -267,6 +429,10 @@ class Analyzer:
                 interval: 구간의 길이로 turn의 갯수 예) 180: interval이 60인 경우 180분
                 index: 구간의 인덱스 예) -1: 최근 180분, 0: 첫 180분
             )
+        graph_renderer: 그래프를 요청한 스레드 밖에서 그릴 GraphRenderer, None이면 바로 그린다
+        callback: 그래프 파일까지 생성된 후 보고서를 전달받을 콜백 함수
+            graph_renderer를 사용하면 렌더링 스레드에서 호출되며 그래프 생성에 실패하면 graph는 None
+        graph_key: graph_renderer가 대기 중인 요청을 합칠 때 사용할 그래프 대상 정보
         Returns:
             (
                 start_budget: 시작 자산
@@ -296,13 +462,60 @@ class Analyzer:
             result_list = interval_data[3]
             spot_list = interval_data[4]
 
-        return self.__get_return_report(
+        is_async = graph_renderer is not None and graph_filename is not None
+        summary = self.__get_return_report(
             asset_info_list,
             score_list,
             info_list,
             result_list,
-            graph_filename=graph_filename,
+            graph_filename=None if is_async else graph_filename,
             spot_list=spot_list,
+            head=self.journal_head if index_info is None else None,
+        )
+
+        if is_async and summary is not None:
+            # 그래프는 렌더링 프로세스에서 그리고, 파일이 생성되면 callback으로 보고서를 전달
+            summary = summary[:4] + (graph_filename,) + summary[5:]
+            snapshot = self.__make_graph_snapshot(info_list, result_list, score_list, spot_list)
+
+            def on_rendered(graph):
+                if callback is not None:
+                    callback(summary[:4] + (graph,) + summary[5:])
+
+            graph_renderer.render(snapshot, graph_filename, on_rendered, key=graph_key)
+        elif callback is not None:
+            callback(summary)
+        return summary
+
+    def get_metrics(self):
+        """파일 생성 없이 시뮬레이션 결과 비교에 필요한 지표만 계산한다
+
+        Returns:
+            (
+                cumulative_return: 시스템 시작 시점부터 누적 수익률
+                return_low: 기간내 최저 수익률
+                return_high: 기간내 최고 수익률
+                trade_count: 체결된 거래 횟수
+                max_drawdown: 기간내 최고 자산 대비 최대 하락률, 0 또는 음수
+            )
+            수익률 기록이 없어 계산할 수 없으면 모든 값이 None인 튜플
+        """
+        try:
+            return_list = np.array(self._get_values(self.score_list, "cumulative_return"))
+            last_return = float(return_list[-1])
+        except IndexError:
+            self.logger.error("get metrics FAIL")
+            return (None, None, None, None, None)
+
+        # 누적 수익률로 시작 자산을 100으로 한 자산 변화를 만들어 최고점 대비 하락률을 계산
+        value = return_list + 100
+        drawdown = (value / np.maximum.accumulate(value) - 1) * 100
+        return (
+            last_return,
+            float(return_list.min()),
+            float(return_list.max()),
+            len(self.result_list),
+            round(float(drawdown.min()), 3),
         )
 
     @staticmethod
@@ -315,30 +528,8 @@ class Analyzer:
         if len(prices) <= count:
             return None
 
-        deltas = np.diff(prices)
-        seed = deltas[:count]
-        up_avg = seed[seed >= 0].sum() / count
-        down_avg = -seed[seed < 0].sum() / count
-        r_strength = up_avg / down_avg
-        rsi = np.zeros_like(prices)
-        rsi[: count + 1] = 100.0 - 100.0 / (1.0 + r_strength)
-
-        for i in range(count + 1, len(prices)):
-            delta = deltas[i - 1]  # cause the diff is 1 shorter
-
-            if delta > 0:
-                upval = delta
-                downval = 0.0
-            else:
-                upval = 0.0
-                downval = -delta
-
-            up_avg = (up_avg * (count - 1) + upval) / count
-            down_avg = (down_avg * (count - 1) + downval) / count
-
-            r_strength = up_avg / down_avg
-            rsi[i] = 100.0 - 100.0 / (1.0 + r_strength)
-
+        rsi = Rsi.batch(prices, count=count)
+        rsi[:count] = rsi[count]
         return rsi
 
     def __make_interval_data(self, index_info):
@@ -346,45 +537,70 @@ class Analyzer:
         index = index_info[1]
         start = period * index
         end = start + period if index != -1 else None
-        if abs(start) > len(self.info_list):
+        trimmed = self.__get_trimmed_count("info_list")
+        total = trimmed + len(self.info_list)
+        if abs(start) > total:
             if start < 0:
-                info_list = self.info_list[:period]
+                start, end = None, period
             else:
-                last = period * -1
-                info_list = self.info_list[last:]
+                start, end = period * -1, None
+        start, end, _ = slice(start, end).indices(total)
+        if start < trimmed:
+            # 메모리에서 지운 구간은 journal에서 읽는다
+            info_list = self.__load_journal("info_list", start_seq=start, end_seq=end)
         else:
-            info_list = self.info_list[start:end]
-        start_dt = datetime.strptime(info_list[0]["date_time"], "%Y-%m-%dT%H:%M:%S")
-        end_dt = datetime.strptime(info_list[-1]["date_time"], "%Y-%m-%dT%H:%M:%S")
+            info_list = self.__get_range(self.info_list, start - trimmed, end - trimmed)
+        info_timestamps = self.__get_timestamps(info_list)
+        start_ts = info_timestamps[0]
+        end_ts = info_timestamps[-1]
 
         # w/a for short term query
-        if start_dt == end_dt:
-            end_dt = end_dt + timedelta(minutes=2)
-
-        score_list = []
-        asset_info_list = []
-        result_list = []
-        spot_list = []
-        self.__make_filtered_list(start_dt, end_dt, score_list, self.score_list)
-        self.__make_filtered_list(start_dt, end_dt, asset_info_list, self.asset_info_list)
-        self.__make_filtered_list(start_dt, end_dt, result_list, self.result_list)
-        self.__make_filtered_list(start_dt, end_dt, spot_list, self.spot_list)
+        if start_ts == end_ts:
+            end_ts = end_ts + 120
+
+        score_list = self.__get_interval_list("score_list", start_ts, end_ts)
+        asset_info_list = self.__get_interval_list("asset_info_list", start_ts, end_ts)
+        result_list = self.__get_interval_list("result_list", start_ts, end_ts)
+        spot_list = self.__get_interval_list("spot_list", start_ts, end_ts)
 
         return (asset_info_list, score_list, info_list, result_list, spot_list)
 
+    def __get_interval_list(self, name, start_ts, end_ts):
+        """목록에서 시간 구간의 기록을 찾는다. 구간의 기록이 메모리에서 지워졌으면 journal에서 읽는다"""
+        record_list = getattr(self, name)
+        if self.__get_trimmed_count(name) > 0:
+            first_ts = record_list.timestamps[0] if len(record_list) > 0 else None
+            if not record_list.is_sorted or first_ts is None or first_ts >= start_ts:
+                return self.__load_journal(name, start_ts=start_ts, end_ts=end_ts)
+        return self.__make_filtered_list(start_ts, end_ts, record_list)
+
+    @staticmethod
+    def _get_values(record_list, name):
+        if isinstance(record_list, RecordTable) and name in record_list.field_set:
+            return record_list.get_column(name)
+        return [record[name] for record in record_list]
+
     @staticmethod
     def _get_min_max_return(score_list):
-        return_list = []
-        for score in score_list:
-            return_list.append(score["cumulative_return"])
+        return_list = Analyzer._get_values(score_list, "cumulative_return")
         return (min(return_list), max(return_list))
 
     @staticmethod
-    def __make_filtered_list(start_dt, end_dt, dest, source):
-        for target in source:
-            target_dt = datetime.strptime(target["date_time"], "%Y-%m-%dT%H:%M:%S")
-            if start_dt <= target_dt <= end_dt:
-                dest.append(target)
+    def __get_range(record_list, start, end):
+        if isinstance(record_list, RecordTable):
+            return record_list.get_range(start, end)
+        return record_list[start:end]
+
+    def __make_filtered_list(self, start_ts, end_ts, source):
+        if isinstance(source, RecordTable) and type(source.timestamps) is array:
+            return source.filter_by_time(start_ts, end_ts)
+
+        timestamps = self.__get_timestamps(source)
+        return [
+            target
+            for target, timestamp in zip(source, timestamps)
+            if start_ts <= timestamp <= end_ts
+        ]
 
     def __get_return_report(
         self,
@@ -394,14 +610,26 @@ class Analyzer:
         result_list,
         graph_filename=None,
         spot_list=None,
+        head=None,
     ):
+        """
+        head: 메모리에서 지운 기록 중 보고서에 필요한 journal_head, 목록의 앞부분 대신 사용한다
+        """
         try:
             graph = None
-            start_value = Analyzer.__get_start_property_value(asset_info_list[0])
+            head = head or {}
+            first_info = head.get("info_list", info_list[0])
+            first_asset_info = head.get("asset_info_list", asset_info_list[0])
+            start_value = Analyzer.__get_start_property_value(first_asset_info)
             last_value = Analyzer.__get_last_property_value(asset_info_list[-1])
             last_return = score_list[-1]["cumulative_return"]
             change_ratio = score_list[-1]["price_change_ratio"]
             min_max = self._get_min_max_return(score_list)
+            if "score_list" in head:
+                min_max = (
+                    min(min_max[0], head["score_list"][0]),
+                    max(min_max[1], head["score_list"][1]),
+                )
             if graph_filename is not None:
                 graph = self.__draw_graph(
                     info_list,
@@ -411,7 +639,7 @@ class Analyzer:
                     is_fullpath=True,
                     spot_list=spot_list,
                 )
-            period = info_list[0]["date_time"] + " - " + info_list[-1]["date_time"]
+            period = first_info["date_time"] + " - " + info_list[-1]["date_time"]
             summary = (
                 start_value,
                 last_value,
@@ -423,7 +651,7 @@ class Analyzer:
                 min_max[1],
                 (
                     self.start_asset_info["date_time"],
-                    info_list[0]["date_time"],
+                    first_info["date_time"],
                     info_list[-1]["date_time"],
                 ),
             )
@@ -461,7 +689,7 @@ class Analyzer:
                     return_low: 기간내 최저 수익률
                     date_info: 시스템 시작 시간, 구간 시작 시간, 구간 종료 시간
                 ),
-                "trading_table" : [
+                "trading_table" : TradingTable [
                     {
                         "date_time": 생성 시간, 정렬 기준 값
                         거래 정보, 매매 요청 및 결과 정보, 수익률 정보 딕셔너리
@@ -476,13 +704,11 @@ class Analyzer:
                 self.logger.error("invalid return report")
                 return None
 
-            list_sum = self.request_list + self.info_list + self.score_list + self.result_list
-            trading_table = sorted(
-                list_sum,
-                key=lambda x: (
-                    datetime.strptime(x["date_time"], self.ISO_DATEFORMAT),
-                    x["kind"],
-                ),
+            trading_table = TradingTable(
+                *map(
+                    self.__get_report_list,
+                    ("request_list", "info_list", "score_list", "result_list"),
+                )
             )
             self.__create_report_file(tag, summary, trading_table)
             self.__draw_graph(
@@ -492,9 +718,16 @@ class Analyzer:
         except (IndexError, AttributeError):
             self.logger.error("create report FAIL")
 
+    def __get_report_list(self, name):
+        """보고서에 기록할 목록, 메모리에서 지운 기록이 있으면 journal의 전체 기록을 읽는 뷰"""
+        if self.__get_trimmed_count(name) > 0:
+            return self.journal.get_view(name, start_seq=self.journal_base[name])
+        return getattr(self, name)
+
     def __create_report_file(self, filepath, summary, trading_table):
         """
         보고서를 정해진 형식에 맞게 파일로 출력한다
+        REPORT_FORMAT이 txt가 아니면 TRADING TABLE은 REPORT_FORMAT 확장자의 별도 파일로 출력한다
 
         ### TRADING TABLE =================================
         date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume
@@ -517,26 +750,8 @@ class Analyzer:
         """
         final_path = self.OUTPUT_FOLDER + filepath + ".txt"
         with open(final_path, "w") as report_file:
-            if len(trading_table) > 0:
-                report_file.write("### TRADING TABLE =================================\n")
-
-            for item in trading_table:
-                if item["kind"] == 0:
-                    report_file.write(
-                        f"{item['date_time']}, {item['opening_price']}, {item['high_price']}, {item['low_price']}, {item['closing_price']}, {item['acc_price']}, {item['acc_volume']}\n"
-                    )
-                elif item["kind"] == 1:
-                    report_file.write(
-                        f"{item['date_time']}, [->] {item['id']}, {item['type']}, {item['price']}, {item['amount']}\n"
-                    )
-                elif item["kind"] == 2:
-                    report_file.write(
-                        f"{item['date_time']}, [<-] {item['request']['id']}, {item['type']}, {item['price']}, {item['amount']}, {item['msg']}\n"
-                    )
-                elif item["kind"] == 3:
-                    report_file.write(
-                        f"{item['date_time']}, [#] {item['balance']}, {item['cumulative_return']}, {item['price_change_ratio']}, {item['asset']}\n"
-                    )
+            if self.REPORT_FORMAT == "txt":
+                trading_table.write(report_file)
 
             report_file.write("### SUMMARY =======================================\n")
             report_file.write(f"Property                 {summary[0]:10} -> {summary[1]:10}\n")
@@ -555,18 +770,31 @@ class Analyzer:
                 report_file.write(f"info_list: {len(self.info_list)}\n")
                 report_file.write(f"asset_info_list: {len(self.asset_info_list)}\n")
                 report_file.write(f"score_list: {len(self.score_list)}\n")
+                if self.journal is not None:
+                    report_file.write(f"journal: {self.journal.session}\n")
+                if self.get_strategy_info_func is not None:
+                    for name, info in self.get_strategy_info_func().items():
+                        report_file.write(
+                            f"strategy {name}: {info['count']} / {info['maxlen']}, "
+                            f"dropped: {info['dropped']}, size: {info['size'] / 2 ** 10:.1f} KB\n"
+                        )
+
+        if self.REPORT_FORMAT != "txt":
+            trading_table.write(
+                f"{self.OUTPUT_FOLDER}{filepath}.{self.REPORT_FORMAT}", self.REPORT_FORMAT
+            )
 
     @staticmethod
     def _get_rss_memory():
         process = psutil.Process()
-        return process.memory_info().rss / 2 ** 20  # Bytes to MB
+        return process.memory_info().rss / 2**20  # Bytes to MB
 
-    def __get_spot_info(self, spot_list, start_pos, ref_time):
+    @staticmethod
+    def __get_spot_info(spot_list, start_pos, ref_time):
         spot_pos = start_pos
         spot_info = None
         while spot_pos < len(spot_list):
-            spot = spot_list[spot_pos]
-            spot_time = datetime.strptime(spot["date_time"], self.ISO_DATEFORMAT)
+            spot_time, spot = spot_list[spot_pos]
             if ref_time < spot_time:
                 break
             spot_info = spot["value"]
@@ -574,6 +802,15 @@ class Analyzer:
         return spot_info, spot_pos
 
     def __create_plot_data(self, info_list, result_list, score_list, spot_list=None):
+        if all(
+            isinstance(record_list, RecordTable) and record_list.is_sorted
+            for record_list in (info_list, result_list, score_list)
+        ) and (
+            spot_list is None
+            or (isinstance(spot_list, RecordTable) and type(spot_list.timestamps) is array)
+        ):
+            return self.__create_window_plot_data(info_list, result_list, score_list, spot_list)
+
         result_pos = 0
         score_pos = 0
         spot_pos = 0
@@ -582,20 +819,20 @@ class Analyzer:
         plot_data = []
         spots = None
         if spot_list is not None:
-            spots = sorted(
-                spot_list,
-                key=lambda x: (datetime.strptime(x["date_time"], self.ISO_DATEFORMAT),),
-            )
+            spots = sorted(zip(self.__get_timestamps(spot_list), spot_list), key=itemgetter(0))
+        result_times = self.__get_timestamps(result_list)
+        score_times = self.__get_timestamps(score_list)
+        result_list = list(result_list)
+        score_list = list(score_list)
 
         # 그래프를 그리기 위해 매매, 수익률 정보를 트레이딩 정보와 합쳐서 하나의 테이블로 생성
-        for info in info_list:
+        for info, info_time in zip(info_list, self.__get_timestamps(info_list)):
             new = info.copy()
-            info_time = datetime.strptime(info["date_time"], self.ISO_DATEFORMAT)
 
             # 매매 정보를 생성해서 추가. 없는 경우 추가 안함. 기간내 매매별 하나씩만 추가됨
             while result_pos < len(result_list):
                 result = result_list[result_pos]
-                result_time = datetime.strptime(result["date_time"], self.ISO_DATEFORMAT)
+                result_time = result_times[result_pos]
                 if info_time < result_time:
                     break
 
@@ -615,7 +852,7 @@ class Analyzer:
             # 수익률 정보를 추가. 정보가 없는 경우 최근 정보로 채움
             while score_pos < len(score_list):
                 score = score_list[score_pos]
-                score_time = datetime.strptime(score["date_time"], self.ISO_DATEFORMAT)
+                score_time = score_times[score_pos]
 
                 # keep last one only
                 if info_time >= score_time:
@@ -635,11 +872,96 @@ class Analyzer:
                         new["avr_price"] = last_avr_price
                     break
             plot_data.append(new)
-        return pd.DataFrame(plot_data)[-self.GRAPH_MAX_COUNT :]
 
-    def __draw_graph(
-        self, info_list, result_list, score_list, filename, is_fullpath=False, spot_list=None
-    ):
+        total = pd.DataFrame(plot_data)[-self.GRAPH_MAX_COUNT :]
+        # 그래프 구간에 값이 없는 항목은 그리지 않는다
+        empty_columns = [
+            name
+            for name in ("buy", "sell", "spot", "return", "avr_price")
+            if name in total.columns and total[name].isna().all()
+        ]
+        return total.drop(columns=empty_columns)
+
+    def __create_window_plot_data(self, info_list, result_list, score_list, spot_list=None):
+        """그래프에 그려질 마지막 GRAPH_MAX_COUNT개의 거래 정보에 대해서만 그래프 데이터를 만든다
+
+        시간 순서로 저장된 RecordTable은 각 매매, 수익률, spot 정보가 합쳐질 거래 정보의 위치를
+        이진 탐색으로 찾을 수 있으므로 전체 기록을 순회한 결과와 같은 데이터를 구간 크기에
+        비례하는 시간에 만든다. 구간에 값이 없는 항목은 컬럼을 만들지 않는다.
+        """
+        info_times = info_list.timestamps
+        end = len(info_list)
+        start = max(end - self.GRAPH_MAX_COUNT, 0)
+        plot_data = info_list[start:end]
+        if end == 0:
+            return pd.DataFrame(plot_data)
+
+        def get_window(times):
+            # 구간 이전의 거래 정보에 합쳐진 레코드와 아직 합쳐지지 않은 레코드를 제외한 범위
+            low = bisect_right(times, info_times[start - 1]) if start > 0 else 0
+            return low, bisect_right(times, info_times[end - 1])
+
+        def get_row(timestamp):
+            return bisect_left(info_times, timestamp, start, end) - start
+
+        result_times = result_list.timestamps
+        low, high = get_window(result_times)
+        for pos in range(low, high):
+            result = result_list[pos]
+            if result["type"] in ("buy", "sell"):
+                plot_data[get_row(result_times[pos])][result["type"]] = result["price"]
+
+        if spot_list is not None:
+            spots = list(zip(spot_list.timestamps, spot_list.get_column("value")))
+            if not spot_list.is_sorted:
+                spots.sort(key=itemgetter(0))
+            spot_times = [spot[0] for spot in spots]
+            low, high = get_window(spot_times)
+            spot_map = {}
+            for spot_time, value in spots[low:high]:
+                spot_map[get_row(spot_time)] = value
+            for row, value in spot_map.items():
+                if value is not None:
+                    plot_data[row]["spot"] = value
+
+        score_times = score_list.timestamps
+        low, high = get_window(score_times)
+        last_acc_return = 0
+        last_avr_price = None
+        if low > 0:
+            last_score = score_list[low - 1]
+            last_acc_return = last_score["cumulative_return"]
+            last_avr_price = self.__get_avr_price(last_score)
+
+        score_pos = low
+        for row, new in enumerate(plot_data):
+            while score_pos < high and get_row(score_times[score_pos]) == row:
+                score = score_list[score_pos]
+                new["return"] = last_acc_return = score["cumulative_return"]
+                last_avr_price = self.__get_avr_price(score)
+                if last_avr_price is not None:
+                    new["avr_price"] = last_avr_price
+                score_pos += 1
+
+            # 이후에 합쳐질 수익률 정보가 남아 있으면 최근 정보로 채움
+            if score_pos < len(score_list):
+                new["return"] = last_acc_return
+                if last_avr_price is not None:
+                    new["avr_price"] = last_avr_price
+        return pd.DataFrame(plot_data)
+
+    @staticmethod
+    def __get_avr_price(score):
+        if (
+            len(score["asset"]) > 0
+            and score["asset"][0][1] > 0  # 평균 가격
+            and score["asset"][0][3] > 0  # 현재 수량
+        ):
+            return score["asset"][0][1]
+        return None
+
+    def __make_graph_snapshot(self, info_list, result_list, score_list, spot_list=None):
+        """GraphRenderer.draw에 전달할 그래프 데이터를 만든다"""
         total = self.__create_plot_data(info_list, result_list, score_list, spot_list=spot_list)
         total = total.rename(
             columns={
@@ -653,52 +975,25 @@ class Analyzer:
         )
         total = total.set_index("Date")
         total.index = pd.to_datetime(total.index)
-        apds = []
 
+        rsi_info = None
         if self.RSI is not None:
             rsi = self.make_rsi(total["Close"], count=self.RSI[2])
             if rsi is not None:
-                rsi_low = np.full(len(rsi), self.RSI[0])
-                rsi_high = np.full(len(rsi), self.RSI[1])
-                apds.append(
-                    mpf.make_addplot(rsi, panel=2, color="lime", ylim=(10, 90), secondary_y=False)
-                )
-                apds.append(
-                    mpf.make_addplot(rsi_low, panel=2, color="red", width=0.5, secondary_y=False)
-                )
-                apds.append(
-                    mpf.make_addplot(rsi_high, panel=2, color="red", width=0.5, secondary_y=False)
-                )
+                rsi_info = (rsi, self.RSI[0], self.RSI[1])
 
-        if "buy" in total.columns:
-            apds.append(mpf.make_addplot(total["buy"], type="scatter", markersize=100, marker="^"))
-        if "sell" in total.columns:
-            apds.append(mpf.make_addplot(total["sell"], type="scatter", markersize=100, marker="v"))
-        if "avr_price" in total.columns:
-            apds.append(mpf.make_addplot(total["avr_price"]))
-        if "return" in total.columns:
-            apds.append(mpf.make_addplot((total["return"]), panel=1, color="g", secondary_y=True))
-        if "spot" in total.columns:
-            apds.append(
-                mpf.make_addplot(
-                    (total["spot"]), type="scatter", markersize=50, marker=".", color="g"
-                )
-            )
+        return {"plot_data": total, "rsi": rsi_info, "sma_info": self.sma_info}
+
+    def __draw_graph(
+        self, info_list, result_list, score_list, filename, is_fullpath=False, spot_list=None
+    ):
+        snapshot = self.__make_graph_snapshot(info_list, result_list, score_list, spot_list)
 
         destination = self.OUTPUT_FOLDER + filename + ".jpg"
         if is_fullpath:
             destination = filename
 
-        mpf.plot(
-            total,
-            type="candle",
-            volume=True,
-            addplot=apds,
-            mav=self.sma_info,
-            style="starsandstripes",
-            savefig=dict(fname=destination, dpi=300, pad_inches=0.25),
-            figscale=1.25,
-        )
+        GraphRenderer.draw(snapshot, destination)
         self.logger.info(f'"{destination}" graph file created!')
         return destination
 
@@ -734,17 +1029,37 @@ class Analyzer:
             return target_list
 
     def dump(self, filename="dump"):
-        """주요 데이터를 파일로 저장한다"""
-        self._write_to_file(filename + ".1", self.request_list)
-        self._write_to_file(filename + ".2", self.result_list)
-        self._write_to_file(filename + ".3", self.info_list)
-        self._write_to_file(filename + ".4", self.asset_info_list)
-        self._write_to_file(filename + ".5", self.score_list)
+        """주요 데이터를 filename.db 체크포인트 파일에 저장한다
+
+        같은 파일에 다시 저장하면 마지막 저장 이후 추가된 기록만 추가로 저장한다
+        """
+        self.__get_checkpoint(filename).save(
+            {name: getattr(self, name) for name in self.DUMP_LISTS},
+            state={"start_asset_info": self.start_asset_info},
+        )
 
     def load_dump(self, filename="dump"):
-        """주요 데이터를 파일로부터 읽어온다"""
-        self.request_list = self._load_list_from_file(filename + ".1")
-        self.result_list = self._load_list_from_file(filename + ".2")
-        self.info_list = self._load_list_from_file(filename + ".3")
-        self.asset_info_list = self._load_list_from_file(filename + ".4")
-        self.score_list = self._load_list_from_file(filename + ".5")
+        """주요 데이터를 파일로부터 읽어온다
+
+        filename.db 체크포인트 파일이 없으면 이전 버전의 텍스트 파일 filename.1 ~ 5를 읽는다
+        """
+        checkpoint = self.__get_checkpoint(filename)
+        if os.path.exists(checkpoint.file_path) is False:
+            self.request_list = self._load_list_from_file(filename + ".1")
+            self.result_list = self._load_list_from_file(filename + ".2")
+            self.info_list = self._load_list_from_file(filename + ".3")
+            self.asset_info_list = self._load_list_from_file(filename + ".4")
+            self.score_list = self._load_list_from_file(filename + ".5")
+            return
+
+        record_lists, state = checkpoint.load()
+        for name, record_list in record_lists.items():
+            if name in self.DUMP_LISTS:
+                setattr(self, name, record_list)
+        if state is not None:
+            self.start_asset_info = state.get("start_asset_info")
+
+    def __get_checkpoint(self, filename):
+        if filename not in self.checkpoints:
+            self.checkpoints[filename] = AnalyzerCheckpoint(filename + ".db")
+        return self.checkpoints[filename]
@@ -0,0 +1,262 @@
+"""Analyzer의 기록 목록을 SQLite 파일에 저장하고 불러오는 AnalyzerCheckpoint 클래스"""
+import json
+import os
+import sqlite3
+import sys
+from array import array
+from contextlib import closing
+from .log_manager import LogManager
+from .record_table import _MISSING, RecordTable
+
+
+class AnalyzerCheckpoint:
+    """
+    Analyzer의 기록 목록을 SQLite 파일에 컬럼 청크로 저장하고 불러오는 클래스
+
+    save는 목록별로 마지막 저장 이후 추가된 레코드만 하나의 청크로 추가하므로 주기적으로 저장해도
+    전체 기록을 다시 쓰지 않는다. 한 번의 저장은 하나의 트랜잭션이라 중간에 중단되어도 이전 저장
+    상태가 유지된다. 목록이 다른 객체로 교체되었거나, RecordTable의 앞부분이 지워져 generation이
+    바뀌었거나, 파일의 기록과 맞지 않으면 그 목록은 처음부터 다시 저장한다.
+
+    저장 형식은 VERSION으로 구분하며, meta 테이블의 버전이 다른 파일은 불러오지 않는다.
+    chunk 테이블: 목록 이름, 시작 위치, 레코드 수와 함께
+        RecordTable이면 fields, kind, is_sorted와 extra_list를, 그 외 목록이면 레코드 리스트를
+        records에 JSON으로 저장한다. 그 외 목록의 fields는 NULL
+    chunk_column 테이블: RecordTable의 컬럼을 fields 순서 pos로, timestamps는 pos -1로 저장한다.
+        array 컬럼은 typecode와 little-endian 바이트로, 리스트 컬럼은 typecode 없이 JSON으로 저장한다
+    meta 테이블: version과 JSON으로 저장한 state
+    JSON에서 튜플은 {"__tuple__": [...]}, 값이 없는 항목은 {"__missing__": 1}로 저장한다.
+
+    file_path: 저장할 SQLite 파일 경로
+    """
+
+    VERSION = 2
+    # 변환 없이 그대로 JSON으로 저장하는 값의 타입
+    SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+    def __init__(self, file_path):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.file_path = file_path
+        self.saved = {}
+
+    def save(self, record_lists, state=None):
+        """목록들을 저장한다
+
+        record_lists: {목록 이름: 레코드 목록}
+        state: 함께 저장할 JSON으로 변환 가능한 정보, 저장할 때마다 교체한다
+        """
+        directory = os.path.dirname(self.file_path)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(sqlite3.connect(self.file_path)) as conn:
+            with conn:
+                self._prepare(conn)
+                for name, record_list in record_lists.items():
+                    start = self._get_saved_count(conn, name, record_list)
+                    end = len(record_list)
+                    if end > start:
+                        self._insert_chunk(conn, name, record_list, start, end)
+                    self.saved[name] = (record_list, end, self._get_generation(record_list))
+                conn.execute(
+                    "REPLACE INTO meta(key, value) VALUES ('state', ?)", (self._to_json(state),)
+                )
+
+    def load(self):
+        """저장된 목록들을 불러온다
+
+        Returns: ({목록 이름: 레코드 목록}, state)
+        """
+        if not os.path.exists(self.file_path):
+            raise UserWarning(f"checkpoint file is not exist: {self.file_path}")
+
+        with closing(sqlite3.connect(f"file:{self.file_path}?mode=ro", uri=True)) as conn:
+            version = self._get_version(conn)
+            if version != self.VERSION:
+                raise UserWarning(f"unsupported checkpoint version: {version}")
+
+            record_lists = {}
+            for row in conn.execute(
+                "SELECT name, start, count, fields, kind, is_sorted, records "
+                "FROM chunk ORDER BY name, start"
+            ).fetchall():
+                name = row[0]
+                chunk = self._load_chunk(conn, *row)
+                if name in record_lists:
+                    record_lists[name].extend(chunk)
+                else:
+                    record_lists[name] = chunk
+
+            row = conn.execute("SELECT value FROM meta WHERE key = 'state'").fetchone()
+            state = self._from_json(row[0]) if row is not None else None
+
+        self.saved = {
+            name: (record_list, len(record_list), self._get_generation(record_list))
+            for name, record_list in record_lists.items()
+        }
+        return record_lists, state
+
+    def _prepare(self, conn):
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB)")
+        version = self._get_version(conn)
+        if version is not None and version != self.VERSION:
+            self.logger.warning(f"checkpoint version {version} is replaced: {self.file_path}")
+            conn.execute("DROP TABLE IF EXISTS chunk")
+            conn.execute("DROP TABLE IF EXISTS chunk_column")
+            self.saved = {}
+
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunk "
+            "(name TEXT, start INTEGER, count INTEGER, fields TEXT, kind INTEGER, "
+            "is_sorted INTEGER, records TEXT, PRIMARY KEY (name, start))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunk_column "
+            "(name TEXT, start INTEGER, pos INTEGER, typecode TEXT, data BLOB, "
+            "PRIMARY KEY (name, start, pos))"
+        )
+        if version != self.VERSION:
+            conn.execute("REPLACE INTO meta(key, value) VALUES ('version', ?)", (self.VERSION,))
+
+    @staticmethod
+    def _get_version(conn):
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row is not None else None
+
+    def _get_saved_count(self, conn, name, record_list):
+        """파일에 이미 저장된 레코드 수를 반환한다. 이어서 저장할 수 없으면 기록을 지우고 0"""
+        saved_list, count, generation = self.saved.get(name, (None, 0, 0))
+        stored = conn.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM chunk WHERE name = ?", (name,)
+        ).fetchone()[0]
+        if (
+            saved_list is record_list
+            and generation == self._get_generation(record_list)
+            and count == stored
+            and len(record_list) >= count
+        ):
+            return count
+
+        if stored > 0:
+            conn.execute("DELETE FROM chunk WHERE name = ?", (name,))
+            conn.execute("DELETE FROM chunk_column WHERE name = ?", (name,))
+        return 0
+
+    @staticmethod
+    def _get_generation(record_list):
+        return getattr(record_list, "generation", 0)
+
+    def _insert_chunk(self, conn, name, record_list, start, end):
+        if not isinstance(record_list, RecordTable):
+            conn.execute(
+                "INSERT INTO chunk(name, start, count, records) VALUES (?, ?, ?, ?)",
+                (name, start, end - start, self._to_json(list(record_list[start:end]))),
+            )
+            return
+
+        table = record_list.get_range(start, end)
+        conn.execute(
+            "INSERT INTO chunk(name, start, count, fields, kind, is_sorted, records) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                name,
+                start,
+                end - start,
+                json.dumps(table.fields),
+                table.kind,
+                table.is_sorted,
+                self._to_json(table.extra_list),
+            ),
+        )
+        columns = [(-1, table.timestamps)] + list(enumerate(table.columns))
+        conn.executemany(
+            "INSERT INTO chunk_column(name, start, pos, typecode, data) VALUES (?, ?, ?, ?, ?)",
+            [(name, start, pos) + self._dump_column(column) for pos, column in columns],
+        )
+
+    def _load_chunk(self, conn, name, start, count, fields, kind, is_sorted, records):
+        if fields is None:
+            return self._from_json(records)
+
+        fields = json.loads(fields)
+        table = RecordTable(fields, kind=kind)
+        columns = {
+            pos: self._load_column(typecode, data)
+            for pos, typecode, data in conn.execute(
+                "SELECT pos, typecode, data FROM chunk_column WHERE name = ? AND start = ?",
+                (name, start),
+            )
+        }
+        table.timestamps = columns.pop(-1, None)
+        table.columns = [columns.pop(pos, None) for pos in range(len(fields))]
+        table.extra_list = self._from_json(records)
+        table.is_sorted = bool(is_sorted)
+
+        if (
+            table.timestamps is None
+            or len(table.timestamps) != count
+            or len(table.extra_list) != count
+            or any(column is None or len(column) != count for column in table.columns)
+        ):
+            raise UserWarning(f"invalid checkpoint chunk: {name} {start}")
+        return table
+
+    @classmethod
+    def _dump_column(cls, column):
+        """컬럼을 (typecode, data)로 변환한다. 리스트 컬럼의 typecode는 None"""
+        if type(column) is not array:
+            return (None, cls._to_json(column).encode("utf-8"))
+
+        if sys.byteorder != "little":
+            column = array(column.typecode, column)
+            column.byteswap()
+        return (column.typecode, column.tobytes())
+
+    @classmethod
+    def _load_column(cls, typecode, data):
+        if typecode is None:
+            return cls._from_json(data)
+
+        column = array(typecode)
+        column.frombytes(data)
+        if sys.byteorder != "little":
+            column.byteswap()
+        return column
+
+    @classmethod
+    def _to_json(cls, value):
+        return json.dumps(cls._encode(value), ensure_ascii=False, default=cls._to_builtin)
+
+    @classmethod
+    def _from_json(cls, data):
+        return json.loads(data, object_hook=cls._decode)
+
+    @classmethod
+    def _encode(cls, value):
+        if value is _MISSING:
+            return {"__missing__": 1}
+        if isinstance(value, dict):
+            return {key: cls._encode(item) for key, item in value.items()}
+        if isinstance(value, (tuple, list)):
+            scalar_types = cls.SCALAR_TYPES
+            items = [item if type(item) in scalar_types else cls._encode(item) for item in value]
+            return {"__tuple__": items} if isinstance(value, tuple) else items
+        return value
+
+    @staticmethod
+    def _decode(item):
+        if len(item) == 1 and "__tuple__" in item:
+            return tuple(item["__tuple__"])
+        if len(item) == 1 and "__missing__" in item:
+            return _MISSING
+        return item
+
+    @staticmethod
+    def _to_builtin(value):
+        """numpy 값처럼 JSON으로 바로 변환할 수 없는 값을 파이썬 값으로 변환한다"""
+        if hasattr(value, "item"):
+            return value.item()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,202 @@
+"""거래 데이터를 월 단위 컬럼 파일로 저장하는 CandleArchive 클래스"""
+import os
+import numpy as np
+from .log_manager import LogManager
+
+
+class CandleArchive:
+    """
+    거래 데이터를 거래 시장, 캔들 기간, 월 단위로 나누어 컬럼별 .npy 파일로 저장하는 클래스
+
+    Database와 같은 인터페이스를 제공하므로 DataRepository의 저장소로 사용할 수 있다.
+    월 단위 파일은 그 달의 모든 캔들 자리를 미리 갖고 있어서 기준 시간으로 위치를 바로 계산하며,
+    memory-map으로 열어서 한 달 이내의 조회는 파일을 복사 없이 배열로 반환한다.
+    Database에 저장된 데이터는 archive.update(database.query(start, end, market))로 옮길 수 있다.
+
+    파일 구조: archive_dir/market/period/YYYY-MM/column.npy
+    valid: 데이터가 저장된 자리는 1, 비어있는 자리는 0인 컬럼
+    """
+
+    COLUMN_NAMES = (
+        "ts",
+        "opening_price",
+        "high_price",
+        "low_price",
+        "closing_price",
+        "acc_price",
+        "acc_volume",
+    )
+    DTYPES = {
+        "ts": np.int64,
+        "opening_price": np.float64,
+        "high_price": np.float64,
+        "low_price": np.float64,
+        "closing_price": np.float64,
+        "acc_price": np.float64,
+        "acc_volume": np.float64,
+        "recovered": np.int8,
+        "valid": np.uint8,
+    }
+
+    def __init__(self, archive_dir="smtm_archive", read_only=False):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.archive_dir = archive_dir
+        self.read_only = read_only
+        self.files = {}
+
+    @staticmethod
+    def _to_ts(date_time):
+        return int(np.datetime64(date_time.replace(" ", "T"), "s").astype(np.int64))
+
+    @staticmethod
+    def _to_date_time(ts):
+        return str(np.datetime64(int(ts), "s")).replace("T", " ")
+
+    @staticmethod
+    def _get_month_list(start_ts, end_ts):
+        """[start_ts, end_ts) 구간이 걸친 월의 (YYYY-MM, 월 시작, 다음 월 시작) 리스트"""
+        month_list = []
+        month = np.datetime64(start_ts, "s").astype("datetime64[M]")
+        month_start = int(month.astype("datetime64[s]").astype(np.int64))
+        while month_start < end_ts:
+            next_start = int((month + 1).astype("datetime64[s]").astype(np.int64))
+            month_list.append((str(month), month_start, next_start))
+            month += 1
+            month_start = next_start
+        return month_list
+
+    def _get_slices(self, start, end, period):
+        """기간을 월 단위로 나누어 (월 정보, 시작 위치, 종료 위치) 리스트로 반환"""
+        start_ts = self._to_ts(start)
+        end_ts = self._to_ts(end)
+        slices = []
+        for month in self._get_month_list(start_ts, end_ts):
+            begin = -(-(max(start_ts, month[1]) - month[1]) // period)
+            last = -(-(min(end_ts, month[2]) - month[1]) // period)
+            if begin < last:
+                slices.append((month, begin, last))
+        return slices
+
+    def _get_column(self, market, period, month, name, create=False):
+        key = (market, period, month[0], name)
+        if key in self.files:
+            return self.files[key]
+
+        path = os.path.join(self.archive_dir, market, str(period), month[0], f"{name}.npy")
+        if os.path.exists(path):
+            column = np.load(path, mmap_mode="r" if self.read_only else "r+")
+        elif create:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            size = (month[2] - month[1]) // period
+            column = np.lib.format.open_memmap(
+                path, mode="w+", dtype=self.DTYPES[name], shape=(size,)
+            )
+        else:
+            return None
+
+        self.files[key] = column
+        return column
+
+    def _read_columns(self, start, end, market, period, names):
+        parts = {name: [] for name in names}
+        for month, begin, last in self._get_slices(start, end, period):
+            valid = self._get_column(market, period, month, "valid")
+            if valid is None:
+                continue
+
+            mask = valid[begin:last].astype(bool)
+            is_full = bool(mask.all())
+            for name in names:
+                column = self._get_column(market, period, month, name)[begin:last]
+                parts[name].append(column if is_full else column[mask])
+
+        columns = {}
+        for name in names:
+            if len(parts[name]) == 0:
+                columns[name] = np.empty(0, dtype=self.DTYPES[name])
+            elif len(parts[name]) == 1:
+                columns[name] = parts[name][0].view(np.ndarray)
+            else:
+                columns[name] = np.concatenate(parts[name])
+            columns[name].flags.writeable = False
+        return columns
+
+    def query(self, start, end, market, period=60):
+        """데이터 조회, Database.query와 같은 딕셔너리 리스트로 반환"""
+        columns = self._read_columns(start, end, market, period, self.COLUMN_NAMES + ("recovered",))
+        data = []
+        for idx, ts in enumerate(columns["ts"]):
+            item = {
+                "period": period,
+                "recovered": int(columns["recovered"][idx]),
+                "market": market,
+                "date_time": self._to_date_time(ts),
+            }
+            for name in self.COLUMN_NAMES[1:]:
+                item[name] = float(columns[name][idx])
+            data.append(item)
+        return data
+
+    def query_columns(self, start, end, market, period=60):
+        """데이터 조회, 한 달 이내의 구간은 memory-map 파일의 읽기 전용 뷰를 그대로 반환
+
+        Returns: COLUMN_NAMES를 키로 갖는 딕셔너리, ts는 int64 나머지는 float64 배열
+        """
+        return self._read_columns(start, end, market, period, self.COLUMN_NAMES)
+
+    def get_missing_ranges(self, start, end, market, period=60):
+        """기간내 데이터가 저장되지 않은 구간 목록 조회
+
+        Returns: [(구간 시작, 구간 종료)], 모든 데이터가 저장되어 있으면 빈 리스트
+        """
+        mask_list = []
+        ts_list = []
+        for month, begin, last in self._get_slices(start, end, period):
+            valid = self._get_column(market, period, month, "valid")
+            if valid is None:
+                mask_list.append(np.zeros(last - begin, dtype=np.int8))
+            else:
+                mask_list.append(valid[begin:last].astype(np.int8))
+            ts_list.append(month[1] + np.arange(begin, last, dtype=np.int64) * period)
+
+        if len(mask_list) == 0:
+            return []
+
+        slot_ts = np.concatenate(ts_list)
+        diff = np.diff(np.concatenate(([1], np.concatenate(mask_list), [1])))
+        missing_list = []
+        for begin, last in zip(np.flatnonzero(diff == -1), np.flatnonzero(diff == 1)):
+            range_start = start if begin == 0 else self._to_date_time(slot_ts[begin])
+            range_end = end if last == len(slot_ts) else self._to_date_time(slot_ts[last])
+            missing_list.append((range_start, range_end))
+        return missing_list
+
+    def update(self, data, period=60):
+        """데이터 추가 또는 업데이트, 월 단위 파일이 없으면 빈 자리를 가진 파일을 새로 생성"""
+        if self.read_only:
+            raise UserWarning("can't update read only archive")
+
+        group = {}
+        for item in data:
+            ts = self._to_ts(item["date_time"])
+            month = self._get_month_list(ts, ts + 1)[0]
+            group.setdefault((item["market"], month), []).append((ts, item))
+
+        for (market, month), item_list in group.items():
+            index = np.array([(ts - month[1]) // period for ts, _ in item_list], dtype=np.int64)
+            self._get_column(market, period, month, "ts", create=True)[index] = [
+                ts for ts, _ in item_list
+            ]
+            self._get_column(market, period, month, "recovered", create=True)[index] = [
+                item.get("recovered", 0) for _, item in item_list
+            ]
+            for name in self.COLUMN_NAMES[1:]:
+                self._get_column(market, period, month, name, create=True)[index] = [
+                    item[name] for _, item in item_list
+                ]
+            valid = self._get_column(market, period, month, "valid", create=True)
+            valid[index] = 1
+            for name in self.DTYPES:
+                self.files[(market, period, month[0], name)].flush()
+
+        self.logger.info(f"Updated: {len(data)}")
@@ -0,0 +1,135 @@
+"""거래 데이터를 컬럼 단위의 NumPy 배열로 저장하는 CandleFrame 클래스"""
+from collections.abc import Mapping
+import numpy as np
+
+
+class CandleFrame:
+    """
+    1분봉 등의 OHLCV 거래 데이터를 컬럼별 NumPy 배열로 저장하는 클래스
+
+    거래 데이터마다 딕셔너리를 만들지 않고 컬럼 배열만 보관하며, 생성된 배열은 읽기 전용이다.
+    인덱스로 접근하면 get_info()의 거래 정보 딕셔너리와 같은 키를 제공하는 CandleRow를 반환한다.
+
+    market: 거래 시장 종류 e.g. KRW-BTC
+    timestamp: 정보의 기준 시간, 시간대 변환 없이 기준 시간을 그대로 epoch 초로 변환한 int64 배열
+    columns: PRICE_COLUMNS 이름을 키로 갖는 float64 배열 딕셔너리
+    """
+
+    PRICE_COLUMNS = (
+        "opening_price",
+        "high_price",
+        "low_price",
+        "closing_price",
+        "acc_price",
+        "acc_volume",
+    )
+
+    def __init__(self, market, timestamp, columns):
+        self.market = market
+        self.timestamp = self._to_readonly_array(timestamp, np.int64)
+        self.columns = {}
+        for name in self.PRICE_COLUMNS:
+            self.columns[name] = self._to_readonly_array(columns[name], np.float64)
+
+    @staticmethod
+    def _to_readonly_array(values, dtype):
+        array = np.asarray(values, dtype=dtype).view()
+        array.flags.writeable = False
+        return array
+
+    @classmethod
+    def from_records(cls, records, market=None):
+        """거래 정보 딕셔너리 리스트로부터 CandleFrame을 생성한다
+
+        date_time은 'YYYY-MM-DDTHH:MM:SS', 'YYYY-MM-DD HH:MM:SS' 형식 모두 가능
+        """
+        if market is None and len(records) > 0:
+            market = records[0]["market"]
+
+        timestamp = cls.to_timestamp([record["date_time"] for record in records])
+        columns = {}
+        for name in cls.PRICE_COLUMNS:
+            columns[name] = np.fromiter(
+                (record[name] for record in records), dtype=np.float64, count=len(records)
+            )
+        return cls(market, timestamp, columns)
+
+    @staticmethod
+    def to_timestamp(date_time):
+        """날짜 시간 문자열 또는 문자열 리스트를 epoch 초로 변환한다"""
+        if isinstance(date_time, str):
+            return int(np.datetime64(date_time, "s").astype(np.int64))
+        return np.array(date_time, dtype="datetime64[s]").astype(np.int64)
+
+    @staticmethod
+    def to_date_time_string(timestamp):
+        """epoch 초를 %Y-%m-%dT%H:%M:%S 형태의 문자열로 변환한다"""
+        return str(np.datetime64(int(timestamp), "s"))
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            columns = {name: column[index] for name, column in self.columns.items()}
+            return CandleFrame(self.market, self.timestamp[index], columns)
+
+        length = len(self.timestamp)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("candle index out of range")
+        return CandleRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.timestamp)):
+            yield CandleRow(self, index)
+
+    def slice_time(self, start, end):
+        """기준 시간이 start 이상 end 미만인 구간을 복사 없이 잘라서 반환한다
+
+        start, end: epoch 초
+        """
+        begin = int(np.searchsorted(self.timestamp, start, side="left"))
+        last = int(np.searchsorted(self.timestamp, end, side="left"))
+        return self[begin:last]
+
+    def get_date_time(self, index):
+        """index 위치 거래 정보의 기준 시간을 %Y-%m-%dT%H:%M:%S 형태의 문자열로 반환한다"""
+        return self.to_date_time_string(self.timestamp[index])
+
+    def to_records(self):
+        """거래 정보 딕셔너리 리스트로 변환해서 반환한다"""
+        return [dict(row) for row in self]
+
+
+class CandleRow(Mapping):
+    """CandleFrame의 한 행을 거래 정보 딕셔너리처럼 읽을 수 있게 해주는 가벼운 뷰
+
+    값은 접근할 때 컬럼 배열에서 읽어오며, 수정이 필요한 경우 dict(row)로 복사해서 사용한다.
+    """
+
+    __slots__ = ("frame", "index")
+    KEYS = ("market", "date_time") + CandleFrame.PRICE_COLUMNS
+
+    def __init__(self, frame, index):
+        self.frame = frame
+        self.index = index
+
+    def __getitem__(self, key):
+        if key == "market":
+            return self.frame.market
+        if key == "date_time":
+            return self.frame.get_date_time(self.index)
+        if key not in self.frame.columns:
+            raise KeyError(key)
+        return float(self.frame.columns[key][self.index])
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"CandleRow({dict(self)})"
@@ -12,6 +12,7 @@ from . import (
     StrategySma0,
     StrategyRsi,
     Operator,
+    TradeJournal,
 )
 
 
@@ -27,6 +28,7 @@ class Controller:
         budget=50000,
         currency="BTC",
         is_bithumb=False,
+        journal=False,
     ):
         self.logger = LogManager.get_logger("Controller")
         self.terminating = False
@@ -39,6 +41,7 @@ class Controller:
         self.is_bithumb = is_bithumb
         self.strategy = None
         self.currency = currency
+        self.journal = TradeJournal() if journal else None
         LogManager.set_stream_level(30)
 
         strategy_num = int(strategy)
@@ -95,7 +98,7 @@ class Controller:
             data_provider,
             self.strategy,
             trader,
-            Analyzer(),
+            Analyzer(journal=self.journal),
             budget=self.budget,
         )
 
@@ -177,6 +180,8 @@ class Controller:
         """프로그램 중지"""
         if self.operator is not None:
             self.operator.stop()
+        if self.journal is not None:
+            self.journal.stop()
 
     def terminate(self, signum=None, frame=None):
         """프로그램 종료"""
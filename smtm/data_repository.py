@@ -3,45 +3,182 @@
 """
 import copy
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import requests
 from .log_manager import LogManager
 from .date_converter import DateConverter
 from .database import Database
+from .candle_archive import CandleArchive
+from .candle_frame import CandleFrame
+from .rate_limiter import RateLimiter
 
 
 class DataRepository:
-    """데이터를 서버 또는 데이터베이스에서 가져와서 반환해주는 클래스"""
+    """데이터를 서버 또는 데이터베이스에서 가져와서 반환해주는 클래스
 
-    def __init__(self, db_file=None):
+    URL: 업비트 분봉 조회 API 주소
+    MAX_FETCH_COUNT: 1회 조회시 가져올 수 있는 최대 데이터 개수
+    REQUEST_PER_SEC: 업비트 시세 조회 API의 초당 최대 요청 수
+    PREFETCH_WORKER: prefetch에서 동시에 요청하는 스레드 개수
+    PREFETCH_BATCH_SIZE: prefetch에서 한 번의 트랜잭션으로 저장하는 데이터 개수
+    THROTTLE_RETRY_COUNT: 429 응답을 받았을 때 다시 요청하는 최대 횟수
+    THROTTLE_BACKOFF: 429 응답 후 첫 재시도까지 기다리는 시간(초), 재시도마다 두 배로 늘어난다
+    BACKENDS: 사용 가능한 저장소, sqlite: Database, archive: CandleArchive
+    """
+
+    URL = "https://api.upbit.com/v1/candles/minutes/1"
+    MAX_FETCH_COUNT = 200
+    REQUEST_PER_SEC = 10
+    PREFETCH_WORKER = 4
+    PREFETCH_BATCH_SIZE = 10000
+    THROTTLE_RETRY_COUNT = 5
+    THROTTLE_BACKOFF = 0.5
+    BACKENDS = ("sqlite", "archive")
+
+    def __init__(
+        self,
+        db_file=None,
+        read_only=False,
+        pragmas=None,
+        shared=False,
+        backend="sqlite",
+        archive_dir="smtm_archive",
+    ):
+        """
+        read_only, pragmas, shared: Database 연결 설정, 읽기 전용인 경우 서버에서 가져오지 않는다
+        backend: 저장소 종류, sqlite인 경우 db_file, archive인 경우 archive_dir에 저장한다
+        """
         self.logger = LogManager.get_logger(__class__.__name__)
-        db = db_file if db_file is not None else "smtm.db"
-        self.database = Database(db)
+        if backend not in self.BACKENDS:
+            raise UserWarning(f"not supported backend: {backend}")
+
+        if backend == "archive":
+            self.database = CandleArchive(archive_dir, read_only=read_only)
+        else:
+            db = db_file if db_file is not None else "smtm.db"
+            self.database = Database(db, read_only=read_only, pragmas=pragmas, shared=shared)
+        self.read_only = read_only
         self.verify_mode = False
+        self.rate_limiter = RateLimiter(self.REQUEST_PER_SEC)
 
     def get_data(self, start, end, market="KRW-BTC"):
         """거래 데이터를 제공
         데이터베이스에서 데이터 조회해서 결과를 반환하거나
-        데이터베이스에 데이터가 없을 경우 서버에서 데이터를 가져와서 반환
-        서버에서 가져온 데이터는 데이터베이스에 업데이트
+        데이터베이스에 없는 구간이 있을 경우 해당 구간만 서버에서 가져와서 업데이트 후 반환
+        """
+        data = self._get_records(start, end, market)
+        self._convert_to_upbit_datetime_string(data)
+        return data
+
+    def get_frame(self, start, end, market="KRW-BTC"):
+        """거래 데이터를 컬럼 단위의 CandleFrame으로 제공
+
+        get_data와 같은 방식으로 데이터를 가져오지만 거래 정보마다 딕셔너리를 만들지 않고
+        데이터베이스에서 epoch 초 시간과 float64 OHLCV 배열로 바로 조회해서 반환한다
+        """
+        if self.verify_mode:
+            return CandleFrame.from_records(self._get_records(start, end, market), market=market)
+
+        total_count = self._fetch_missing_data(start, end, market)
+        columns = self._query_columns(start, end, market)
+        self._check_count(total_count, len(columns["ts"]))
+        return CandleFrame(market, columns["ts"], columns)
+
+    def prefetch(self, start, end, markets, max_workers=None):
+        """여러 거래 시장의 거래 데이터를 서버에서 병렬로 가져와서 데이터베이스에 저장한다
+
+        데이터베이스에 저장되지 않은 구간만 MAX_FETCH_COUNT 단위로 나누어
+        스레드 풀에서 동시에 조회한다. 조회 횟수는 rate_limiter로 제한되며
+        조회 결과는 PREFETCH_BATCH_SIZE 단위로 모아서 한 번의 트랜잭션으로 저장하므로
+        중간에 중단되더라도 다시 실행하면 저장되지 않은 구간부터 이어서 가져온다.
+
+        start: 기간 시작, %Y-%m-%dT%H:%M:%S 형태의 datetime 문자열
+        end: 기간 종료, %Y-%m-%dT%H:%M:%S 형태의 datetime 문자열
+        markets: 거래 시장 리스트 e.g. ["KRW-BTC", "KRW-ETH"]
+        max_workers: 동시에 요청하는 스레드 개수, None인 경우 PREFETCH_WORKER
+        Returns: 거래 시장별로 새로 저장된 데이터 개수 딕셔너리
         """
+        if self.read_only:
+            raise UserWarning("can't prefetch to read only database")
+
+        if isinstance(markets, str):
+            markets = [markets]
+
+        if DateConverter.to_end_min(start_iso=start, end_iso=end) is None:
+            raise UserWarning(f"invalid period: {start} - {end}")
+
+        task_list = []
+        for market in markets:
+            for missing in self._get_missing_ranges(start, end, market):
+                for dt in self._split_to_chunks(missing[0], missing[1]):
+                    task_list.append((dt, market))
+
+        self.logger.info(f"prefetch {len(task_list)} chunks: {start} to {end}, {markets}")
+        result = {market: 0 for market in markets}
+        pending = []
+        worker_count = max_workers if max_workers is not None else self.PREFETCH_WORKER
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            futures = [executor.submit(self._fetch_chunk, dt, market) for dt, market in task_list]
+            try:
+                for future in as_completed(futures):
+                    market, data = future.result()
+                    result[market] += len(data)
+                    pending += data
+                    if len(pending) >= self.PREFETCH_BATCH_SIZE:
+                        self._update(pending)
+                        pending = []
+            except UserWarning:
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                if len(pending) > 0:
+                    self._update(pending)
+
+        self.logger.info(f"prefetch is completed: {result}")
+        return result
+
+    def _fetch_chunk(self, dt, market):
+        fetch_data = self._fetch_from_upbit_up_to_200(dt[1], dt[2], market)
+        return market, self._recovery_upbit_data(fetch_data, dt[0], dt[2], market)
+
+    def _split_to_chunks(self, start, end):
+        return DateConverter.to_end_min(
+            start_iso=start, end_iso=end, max_count=self.MAX_FETCH_COUNT
+        )
+
+    def _get_records(self, start, end, market):
+        if self.verify_mode:
+            return self._fetch_from_upbit(start, end, market)
+
+        total_count = self._fetch_missing_data(start, end, market)
+        db_data = self._query(start, end, market)
+        self._check_count(total_count, len(db_data))
+        return db_data
+
+    def _fetch_missing_data(self, start, end, market):
+        """데이터베이스에 없는 구간을 서버에서 가져와서 업데이트 후 기간의 전체 데이터 개수를 반환"""
         self.logger.info(f"get data from repo: {start} to {end}, {market}")
         count_info = DateConverter.to_end_min(start_iso=start, end_iso=end)
-        total_count = count_info[0][2]
-        db_data = self._query(start, end, market)
+        missing_list = self._get_missing_ranges(start, end, market)
+        if len(missing_list) > 0:
+            if self.read_only:
+                raise UserWarning(f"missing data in read only database: {missing_list}")
+            self._fetch_missing_ranges(missing_list, market)
+        return count_info[0][2]
 
-        self.logger.info(f"total vs database: {total_count} vs {len(db_data)}")
-        if len(db_data) > total_count:
+    def _check_count(self, total_count, db_count):
+        self.logger.info(f"total vs database: {total_count} vs {db_count}")
+        if db_count > total_count:
             raise UserWarning("Something wrong in DB")
 
-        if not self.verify_mode and total_count == len(db_data):
-            self.logger.info(f"from database: {total_count}")
-            self._convert_to_upbit_datetime_string(db_data)
-            return db_data
-
-        server_data = self._fetch_from_upbit(start, end, market)
-        self._convert_to_upbit_datetime_string(server_data)
-        return server_data
+    def _fetch_missing_ranges(self, missing_list, market):
+        """데이터베이스에 없는 구간만 서버에서 가져와서 데이터베이스에 업데이트"""
+        for missing in missing_list:
+            self.logger.info(f"fetch missing range from {missing[0]} to {missing[1]}")
+            for dt in self._split_to_chunks(missing[0], missing[1]):
+                self._update(self._fetch_chunk(dt, market)[1])
 
     @staticmethod
     def _convert_to_upbit_datetime_string(data_list):
@@ -86,6 +223,17 @@ class DataRepository:
         end_datetime = end.replace("T", " ")
         return self.database.query(start_datetime, end_datetime, market)
 
+    def _query_columns(self, start, end, market):
+        start_datetime = start.replace("T", " ")
+        end_datetime = end.replace("T", " ")
+        return self.database.query_columns(start_datetime, end_datetime, market)
+
+    def _get_missing_ranges(self, start, end, market):
+        start_datetime = start.replace("T", " ")
+        end_datetime = end.replace("T", " ")
+        missing_list = self.database.get_missing_ranges(start_datetime, end_datetime, market)
+        return [(item[0].replace(" ", "T"), item[1].replace(" ", "T")) for item in missing_list]
+
     def _update(self, data):
         self._convert_to_datetime(data)
         self.database.update(data)
@@ -97,7 +245,9 @@ class DataRepository:
         업비트는 현재 공식적으로 최대 200개까지 조회 가능
         """
         total_data = []
-        dt_list = DateConverter.to_end_min(start_iso=start, end_iso=end, max_count=200)
+        dt_list = DateConverter.to_end_min(
+            start_iso=start, end_iso=end, max_count=self.MAX_FETCH_COUNT
+        )
         for dt in dt_list:
             self.logger.info(f"fetch from {dt[0]} to {dt[1]}, count: {dt[2]}")
             query_data = self._query(dt[0], dt[1], market)
@@ -166,19 +316,27 @@ class DataRepository:
         self.logger.error(f"Broken data {dt}, {market}, {period}")
 
     def _fetch_from_upbit_up_to_200(self, end, count, market):
-        result = None
-        while result is None:
+        """업비트 서버에서 데이터를 조회한다
+
+        429 응답을 받으면 THROTTLE_BACKOFF초부터 두 배씩 늘려가며 기다린 후 다시 요청하고,
+        THROTTLE_RETRY_COUNT번 재시도해도 실패하면 UserWarning을 발생시킨다
+        """
+        for retry in range(self.THROTTLE_RETRY_COUNT + 1):
+            self.rate_limiter.acquire()
             try:
-                result = self._fetch_from_upbit_up_to_200_impl(end, count, market)
+                return self._fetch_from_upbit_up_to_200_impl(end, count, market)
             except UserWarning as msg:
-                if str(msg).find("429 Client Error: Too Many Requests") == 0:
-                    self.logger.warning("Try again for Upbit throttling")
-                    time.sleep(0.5)
-                else:
+                if str(msg).find("429 Client Error: Too Many Requests") != 0:
                     self.logger.warning(msg)
                     raise UserWarning("Fail get data from sever") from msg
 
-        return result
+                if retry == self.THROTTLE_RETRY_COUNT:
+                    raise UserWarning("Fail get data from sever by throttling") from msg
+
+                backoff = self.THROTTLE_BACKOFF * (2**retry)
+                self.logger.warning(f"Try again for Upbit throttling after {backoff} sec")
+                time.sleep(backoff)
+        return None
 
     def _fetch_from_upbit_up_to_200_impl(self, end, count, market):
         """업비트 서버에서 최대 200개까지 데이터 조회해서 반환
@@ -186,12 +344,11 @@ class DataRepository:
         https://docs.upbit.com/reference#%EC%8B%9C%EC%84%B8-%EC%BA%94%EB%93%A4-%EC%A1%B0%ED%9A%8C
         """
 
-        url = "https://api.upbit.com/v1/candles/minutes/1"
         to_datetime = DateConverter.from_kst_to_utc_str(end) + "Z"
         query_string = {"market": market, "to": to_datetime, "count": count}
         self.logger.debug(f"query_string {query_string}")
         try:
-            response = requests.get(url, params=query_string)
+            response = requests.get(self.URL, params=query_string)
             response.raise_for_status()
             data = response.json()
             data.reverse()
@@ -1,33 +1,97 @@
 """거래 데이터의 데이터베이스 역할의 Database 클래스"""
+import os
 import sqlite3
+from datetime import datetime, timedelta, timezone
+import numpy as np
 from .log_manager import LogManager
 
 
 class Database:
-    """과거 거래 데이터의 데이터 베이스 클래스"""
+    """과거 거래 데이터의 데이터 베이스 클래스
 
-    def __init__(self, db_file=None):
+    upbit 테이블에 거래 데이터를 저장하고, coverage 테이블에 데이터가 빠짐없이 저장된
+    연속 구간을 기록해서 전체 데이터를 조회하지 않고도 비어있는 구간을 알 수 있다.
+
+    DEFAULT_PRAGMAS: 연결 후 적용되는 pragma, WAL 저널로 읽기가 쓰기에 막히지 않도록 한다
+    SHARED_CONNECTIONS: 프로세스별로 공유되는 연결, (pid, db_file, read_only)가 키
+    """
+
+    SQL_DATEFORMAT = "%Y-%m-%d %H:%M:%S"
+    DEFAULT_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16384,
+        "mmap_size": 268435456,
+    }
+    SHARED_CONNECTIONS = {}
+    COLUMN_NAMES = (
+        "ts",
+        "opening_price",
+        "high_price",
+        "low_price",
+        "closing_price",
+        "acc_price",
+        "acc_volume",
+    )
+
+    def __init__(self, db_file=None, read_only=False, pragmas=None, shared=False):
+        """
+        read_only: True인 경우 읽기 전용 URI로 연결하며 테이블 생성과 변환을 하지 않는다
+        pragmas: DEFAULT_PRAGMAS를 덮어쓸 pragma 딕셔너리, 값이 None인 pragma는 적용하지 않는다
+        shared: True인 경우 같은 프로세스에서 같은 파일의 연결을 공유한다
+        """
         db = db_file if db_file is not None else "smtm.db"
         self.logger = LogManager.get_logger(__class__.__name__)
-        self.conn = sqlite3.connect(db, check_same_thread=False, timeout=30.0)
+        self.read_only = read_only
+        self.shared = shared
+
+        shared_key = (os.getpid(), db, read_only)
+        if shared and shared_key in self.SHARED_CONNECTIONS:
+            self.conn = self.SHARED_CONNECTIONS[shared_key]
+            self.cursor = self.conn.cursor()
+            return
+
+        if read_only:
+            self.conn = sqlite3.connect(
+                f"file:{db}?mode=ro", uri=True, check_same_thread=False, timeout=30.0
+            )
+        else:
+            self.conn = sqlite3.connect(db, check_same_thread=False, timeout=30.0)
 
         def dict_factory(cursor, row):
-            dictionay = {}
-            for idx, col in enumerate(cursor.description):
-                dictionay[col[0]] = row[idx]
-            return dictionay
+            return dict(zip([col[0] for col in cursor.description], row))
 
         self.conn.row_factory = dict_factory
 
         self.cursor = self.conn.cursor()
-        self.create_table()
+        self.apply_pragmas(pragmas)
+        if not read_only:
+            self.create_table()
+            self.migrate()
+
+        if shared:
+            self.SHARED_CONNECTIONS[shared_key] = self.conn
 
     def __del__(self):
-        self.conn.close()
+        if not self.shared:
+            self.conn.close()
+
+    def apply_pragmas(self, pragmas=None):
+        """DEFAULT_PRAGMAS에 pragmas를 덮어쓴 설정을 적용, 읽기 전용 연결은 journal_mode 제외"""
+        target = dict(self.DEFAULT_PRAGMAS)
+        if pragmas is not None:
+            target.update(pragmas)
+
+        for name, value in target.items():
+            if value is None or (self.read_only and name == "journal_mode"):
+                continue
+            if not name.isidentifier() or not str(value).lstrip("-").isalnum():
+                raise UserWarning(f"invalid pragma: {name} = {value}")
+            self.cursor.execute(f"PRAGMA {name} = {value}")
 
     def create_table(self):
         """테이블 생성
-        id TEXT 고유 식별자 period(S)-date_time e.g. 60S-YYYY-MM-DD HH:MM:SS
+        id TEXT 고유 식별자 period(S)-market-date_time e.g. 60S-KRW-BTC-YYYY-MM-DD HH:MM:SS
         period INT 캔들의 기간(초), 분봉 - 60
         recoverd INT 복구된 데이터인지여부
         market TEXT 거래 시장 종류 BTC
@@ -38,29 +102,238 @@ class Database:
         closing_price FLOAT 마지막 거래 가격
         acc_price FLOAT 단위 시간내 누적 거래 금액
         acc_volume FLOAT 단위 시간내 누적 거래 양
+        ts INT 정보의 기준 시간을 시간대 변환 없이 epoch 초로 변환한 값, (market, period, ts) 인덱스
+
+        coverage 테이블, upbit 테이블에 데이터가 빠짐없이 저장된 [start_time, end_time) 구간
+        market TEXT 거래 시장 종류
+        period INT 캔들의 기간(초)
+        start_time DATETIME 구간 시작, 'YYYY-MM-DD HH:MM:SS' 형식의 sql datetime format
+        end_time DATETIME 구간 종료, 'YYYY-MM-DD HH:MM:SS' 형식의 sql datetime format
+        """
+        self.cursor.execute(
+            """CREATE TABLE IF NOT EXISTS upbit (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT, ts INT)"""
+        )
+        self.cursor.execute(
+            """CREATE TABLE IF NOT EXISTS coverage (market TEXT, period INT, start_time DATETIME, end_time DATETIME, PRIMARY KEY(market, period, start_time))"""
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS coverage_end ON coverage(market, period, end_time)"
+        )
+        self.conn.commit()
+
+    def create_journal_table(self):
+        """거래 기록을 저장하는 journal 테이블 생성
+        session TEXT 기록을 구분하는 세션 이름
+        name TEXT 기록 목록 이름 e.g. request_list
+        seq INT 세션 내 목록별 기록 순번, (session, name, seq) 기본 키
+        ts INT 기록의 date_time을 시간대 변환 없이 epoch 초로 변환한 값, (session, name, ts) 인덱스
+        data TEXT JSON 형식의 기록
         """
         self.cursor.execute(
-            """CREATE TABLE IF NOT EXISTS upbit (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)"""
+            "CREATE TABLE IF NOT EXISTS journal (session TEXT, name TEXT, seq INT, ts INT, data TEXT, PRIMARY KEY(session, name, seq))"
         )
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS journal_ts ON journal(session, name, ts)")
         self.conn.commit()
 
+    def migrate(self):
+        """이전 버전의 데이터베이스를 현재 스키마로 변환, 버전은 user_version에 기록
+
+        0 -> 1: 여러 거래 시장의 데이터가 같은 id로 덮어써지지 않도록 id에 market 추가
+        1 -> 2: 이미 저장된 데이터의 연속 구간으로 coverage 테이블 생성
+        2 -> 3: 정수 시간 ts 컬럼과 (market, period, ts) 인덱스 추가
+        """
+        version = self.cursor.execute("PRAGMA user_version").fetchone()["user_version"]
+        if version == 0:
+            self.logger.info("migrate database to version 1")
+            self.cursor.execute(
+                "UPDATE upbit SET id = period || 'S-' || market || '-' || date_time"
+            )
+            self.cursor.execute("PRAGMA user_version = 1")
+            self.conn.commit()
+            version = 1
+
+        if version == 1:
+            self.logger.info("migrate database to version 2")
+            self.cursor.execute(
+                "INSERT OR REPLACE INTO coverage(market, period, start_time, end_time) SELECT market, period, datetime(MIN(date_time)), datetime(MAX(date_time), '+' || period || ' seconds') FROM (SELECT market, period, date_time, strftime('%s', date_time) - ROW_NUMBER() OVER (PARTITION BY market, period ORDER BY strftime('%s', date_time)) * period AS run FROM upbit) GROUP BY market, period, run"
+            )
+            self.cursor.execute("PRAGMA user_version = 2")
+            self.conn.commit()
+            version = 2
+
+        if version == 2:
+            self.logger.info("migrate database to version 3")
+            column_list = [column["name"] for column in self._get_table_info("upbit")]
+            if "ts" not in column_list:
+                self.cursor.execute("ALTER TABLE upbit ADD COLUMN ts INT")
+            self.cursor.execute("UPDATE upbit SET ts = CAST(strftime('%s', date_time) AS INT)")
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS upbit_market_period_ts ON upbit(market, period, ts)"
+            )
+            self.cursor.execute("PRAGMA user_version = 3")
+            self.conn.commit()
+
+    def _get_table_info(self, table):
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        return self.cursor.fetchall()
+
     def query(self, start, end, market, period=60):
         """데이터 조회"""
 
         self.cursor.execute(
-            "SELECT period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM upbit WHERE market = ? AND period = ? AND date_time >= ? AND date_time < ? ORDER BY datetime(date_time) ASC",
+            "SELECT period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM upbit WHERE market = ? AND period = ? AND ts >= CAST(strftime('%s', ?) AS INT) AND ts < CAST(strftime('%s', ?) AS INT) ORDER BY ts ASC",
+            (market, period, start, end),
+        )
+        return self.cursor.fetchall()
+
+    def query_columns(self, start, end, market, period=60):
+        """데이터 조회, 행마다 딕셔너리를 만들지 않고 컬럼별 NumPy 배열로 반환
+
+        row_factory 없이 튜플로 조회한 결과를 한 번에 배열로 변환한다
+        Returns: COLUMN_NAMES를 키로 갖는 딕셔너리, ts는 int64 나머지는 float64 배열
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            f"SELECT {', '.join(self.COLUMN_NAMES)} FROM upbit WHERE market = ? AND period = ? AND ts >= CAST(strftime('%s', ?) AS INT) AND ts < CAST(strftime('%s', ?) AS INT) ORDER BY ts ASC",
             (market, period, start, end),
         )
+        rows = cursor.fetchall()
+        cursor.close()
+
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), len(self.COLUMN_NAMES))
+        columns = {"ts": table[:, 0].astype(np.int64)}
+        for idx, name in enumerate(self.COLUMN_NAMES[1:], start=1):
+            columns[name] = np.ascontiguousarray(table[:, idx])
+        return columns
+
+    def insert_journal(self, rows):
+        """journal 테이블에 기록 추가
+
+        rows: (session, name, seq, ts, data) 튜플 목록
+        """
+        self.cursor.executemany(
+            "REPLACE INTO journal(session, name, seq, ts, data) VALUES(?, ?, ?, ?, ?)", rows
+        )
+        self.conn.commit()
+
+    def query_journal(
+        self, session, name, start_seq=0, end_seq=None, start_ts=None, end_ts=None, by_time=False
+    ):
+        """journal 조회, 조건에 맞는 기록의 data를 seq 순서로 하나씩 반환
+
+        end_seq: 포함하지 않는 마지막 순번
+        start_ts, end_ts: 포함하는 ts 구간, None이면 제한 없음
+        by_time: True이면 ts, seq 순서로 반환
+        """
+        conditions = ["session = ?", "name = ?", "seq >= ?"]
+        params = [session, name, start_seq]
+        for condition, value in (("seq < ?", end_seq), ("ts >= ?", start_ts), ("ts <= ?", end_ts)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+
+        where = " AND ".join(conditions)
+        order = "ts, seq" if by_time else "seq"
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"SELECT data FROM journal WHERE {where} ORDER BY {order}", params)
+        try:
+            for row in cursor:
+                yield row[0]
+        finally:
+            cursor.close()
+
+    def count_journal(self, session, name, start_seq=0):
+        """journal에 저장된 start_seq 이후의 기록 수 조회"""
+        self.cursor.execute(
+            "SELECT COUNT(*) AS count FROM journal WHERE session = ? AND name = ? AND seq >= ?",
+            (session, name, start_seq),
+        )
+        return self.cursor.fetchone()["count"]
+
+    def get_missing_ranges(self, start, end, market, period=60):
+        """기간내 데이터가 저장되지 않은 구간 목록 조회
+
+        start, end: 'YYYY-MM-DD HH:MM:SS' 형식의 sql datetime format
+        Returns: [(구간 시작, 구간 종료)], 모든 데이터가 저장되어 있으면 빈 리스트
+        """
+        missing_list = []
+        current = start
+        for coverage in self._query_coverage(market, period, start, end):
+            if current >= end:
+                break
+            if coverage["start_time"] > current:
+                missing_list.append((current, min(coverage["start_time"], end)))
+            current = max(current, coverage["end_time"])
+
+        if current < end:
+            missing_list.append((current, end))
+        return missing_list
+
+    def _query_coverage(self, market, period, start, end):
+        """[start, end] 구간과 겹치거나 맞닿은 coverage 구간을 start_time 순으로 조회
+
+        구간들은 서로 겹치지 않으므로 end_time 인덱스로 첫 구간을 찾은 후
+        start_time 인덱스로 범위를 조회한다
+        """
+        self.cursor.execute(
+            "SELECT start_time FROM coverage WHERE market = ? AND period = ? AND end_time >= ? ORDER BY end_time ASC LIMIT 1",
+            (market, period, start),
+        )
+        first = self.cursor.fetchone()
+        if first is None:
+            return []
+
+        self.cursor.execute(
+            "SELECT start_time, end_time FROM coverage WHERE market = ? AND period = ? AND start_time >= ? AND start_time <= ? ORDER BY start_time ASC",
+            (market, period, first["start_time"], end),
+        )
         return self.cursor.fetchall()
 
+    def _update_coverage(self, data, period):
+        """저장된 데이터의 연속 구간을 기존 coverage 구간과 합쳐서 기록"""
+        date_time_map = {}
+        for item in data:
+            dt = datetime.fromisoformat(item["date_time"])
+            date_time_map.setdefault(item["market"], set()).add(dt)
+
+        step = timedelta(seconds=period)
+        for market, dt_set in date_time_map.items():
+            dt_list = sorted(dt_set)
+            run_start = dt_list[0]
+            for prev_dt, dt in zip(dt_list, dt_list[1:]):
+                if dt - prev_dt != step:
+                    self._merge_coverage(market, period, run_start, prev_dt + step)
+                    run_start = dt
+            self._merge_coverage(market, period, run_start, dt_list[-1] + step)
+
+    def _merge_coverage(self, market, period, start_dt, end_dt):
+        start = start_dt.strftime(self.SQL_DATEFORMAT)
+        end = end_dt.strftime(self.SQL_DATEFORMAT)
+        overlapped = self._query_coverage(market, period, start, end)
+        if len(overlapped) > 0:
+            self.cursor.execute(
+                "DELETE FROM coverage WHERE market = ? AND period = ? AND start_time >= ? AND start_time <= ?",
+                (market, period, overlapped[0]["start_time"], overlapped[-1]["start_time"]),
+            )
+            start = min(start, overlapped[0]["start_time"])
+            end = max(end, overlapped[-1]["end_time"])
+
+        self.cursor.execute(
+            "INSERT INTO coverage(market, period, start_time, end_time) VALUES(?, ?, ?, ?)",
+            (market, period, start, end),
+        )
+
     def update(self, data, period=60):
-        """데이터베이스 데이터 추가 또는 업데이트"""
+        """데이터베이스 데이터 추가 또는 업데이트, 저장된 구간은 coverage에 함께 기록"""
         tuple_list = []
         for item in data:
             recovered = item["recovered"] if "recovered" in item else 0
+            date_time = datetime.fromisoformat(item["date_time"]).replace(tzinfo=timezone.utc)
             tuple_list.append(
                 (
-                    f"{period}S-{item['date_time']}",
+                    f"{period}S-{item['market']}-{item['date_time']}",
                     period,
                     recovered,
                     item["market"],
@@ -71,12 +344,15 @@ class Database:
                     item["closing_price"],
                     item["acc_price"],
                     item["acc_volume"],
+                    int(date_time.timestamp()),
                 )
             )
 
         self.logger.info(f"Updated: {len(tuple_list)}")
         self.cursor.executemany(
-            "REPLACE INTO upbit(id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "REPLACE INTO upbit(id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume, ts) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             tuple_list,
         )
+        if len(data) > 0:
+            self._update_coverage(data, period)
         self.conn.commit()
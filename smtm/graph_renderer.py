@@ -0,0 +1,185 @@
+"""수익률 그래프를 별도의 프로세스에서 그리는 GraphRenderer 클래스"""
+import multiprocessing
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from .log_manager import LogManager
+
+
+class GraphRenderer:
+    """
+    수익률 그래프 생성 요청을 받아 렌더링 스레드와 별도의 프로세스에서 그리는 클래스
+
+    render는 그래프를 그릴 데이터의 snapshot을 대기열에 넣고 바로 반환하므로 거래를 진행하는
+    스레드는 그래프를 그리는 동안 기다리지 않는다. 렌더링 스레드가 대기열의 요청을 차례대로
+    렌더링 프로세스에 전달하고, 파일이 생성되면 요청할 때 전달받은 콜백으로 파일 경로를 전달한다.
+    같은 key의 요청이 대기 중이면 최신 snapshot과 파일 경로로 교체하고, 콜백은 모두 최신 파일 경로로
+    함께 호출한다. 파일 이름에 요청 시간이 포함되므로 key는 그래프 태그와 같은 대상 정보를 사용한다.
+    대기열이 가득 차면 가장 오래된 요청을 버리고 그 콜백에는 None을 전달한다.
+
+    max_pending: 대기열에 보관할 수 있는 최대 요청 수
+    use_process: False이면 별도의 프로세스 없이 렌더링 스레드에서 바로 그린다
+    """
+
+    MAX_PENDING = 4
+
+    def __init__(self, max_pending=MAX_PENDING, use_process=True):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.max_pending = max_pending
+        self.use_process = use_process
+        self.pending = OrderedDict()
+        self.dropped = []
+        self.condition = threading.Condition()
+        self.thread = None
+        self.executor = None
+        self.is_stopping = False
+
+    @staticmethod
+    def draw(snapshot, destination):
+        """snapshot으로 그래프를 그려서 destination에 저장하고 파일 경로를 반환한다
+
+        snapshot:
+        {
+            "plot_data": Date 인덱스와 Open, High, Low, Close, Volume 컬럼을 갖는 DataFrame
+                buy, sell, avr_price, return, spot 컬럼은 있는 경우에만 그린다
+            "rsi": (RSI 값 목록, 하단 기준값, 상단 기준값), 그리지 않는 경우 None
+            "sma_info": 이동 평균선 기간 튜플
+        }
+        """
+        # 그래프를 그리지 않는 경우 로드하지 않도록 사용할 때 import
+        import mplfinance as mpf
+
+        total = snapshot["plot_data"]
+        apds = []
+
+        if snapshot["rsi"] is not None:
+            rsi, low, high = snapshot["rsi"]
+            rsi_low = np.full(len(rsi), low)
+            rsi_high = np.full(len(rsi), high)
+            apds.append(
+                mpf.make_addplot(rsi, panel=2, color="lime", ylim=(10, 90), secondary_y=False)
+            )
+            apds.append(
+                mpf.make_addplot(rsi_low, panel=2, color="red", width=0.5, secondary_y=False)
+            )
+            apds.append(
+                mpf.make_addplot(rsi_high, panel=2, color="red", width=0.5, secondary_y=False)
+            )
+
+        if "buy" in total.columns:
+            apds.append(mpf.make_addplot(total["buy"], type="scatter", markersize=100, marker="^"))
+        if "sell" in total.columns:
+            apds.append(mpf.make_addplot(total["sell"], type="scatter", markersize=100, marker="v"))
+        if "avr_price" in total.columns:
+            apds.append(mpf.make_addplot(total["avr_price"]))
+        if "return" in total.columns:
+            apds.append(mpf.make_addplot((total["return"]), panel=1, color="g", secondary_y=True))
+        if "spot" in total.columns:
+            apds.append(
+                mpf.make_addplot(
+                    (total["spot"]), type="scatter", markersize=50, marker=".", color="g"
+                )
+            )
+
+        mpf.plot(
+            total,
+            type="candle",
+            volume=True,
+            addplot=apds,
+            mav=snapshot["sma_info"],
+            style="starsandstripes",
+            savefig=dict(fname=destination, dpi=300, pad_inches=0.25),
+            figscale=1.25,
+        )
+        return destination
+
+    def render(self, snapshot, destination, callback=None, key=None):
+        """그래프 생성을 요청하고 바로 반환한다
+
+        callback: 생성된 파일 경로를 전달받을 콜백 함수, 실패하거나 요청이 버려지면 None 전달
+        key: 대기 중인 요청을 합칠 때 사용할 그래프 대상 정보, None이면 destination
+        """
+        if key is None:
+            key = destination
+
+        with self.condition:
+            if key in self.pending:
+                callbacks = self.pending[key][2]
+            else:
+                callbacks = []
+                if len(self.pending) >= self.max_pending:
+                    _, dropped = self.pending.popitem(last=False)
+                    self.logger.warning(f"graph request is dropped: {dropped[1]}")
+                    self.dropped.extend(dropped[2])
+
+            if callback is not None:
+                callbacks.append(callback)
+            self.pending[key] = (snapshot, destination, callbacks)
+            self.is_stopping = False
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._looper, name="Graph-Renderer", daemon=True
+                )
+                self.thread.start()
+            self.condition.notify()
+
+    def stop(self):
+        """대기 중인 요청을 모두 처리한 후 렌더링 스레드와 프로세스를 종료하도록 한다"""
+        with self.condition:
+            self.is_stopping = True
+            self.condition.notify()
+
+    def _looper(self):
+        while True:
+            request = None
+            with self.condition:
+                while len(self.pending) == 0 and len(self.dropped) == 0 and not self.is_stopping:
+                    self.condition.wait()
+
+                dropped = self.dropped
+                self.dropped = []
+                if len(self.pending) > 0:
+                    request = self.pending.popitem(last=False)
+                elif len(dropped) == 0:
+                    # 종료 직후의 요청은 새 스레드가 처리하므로 프로세스를 넘겨받아 정리한다
+                    executor = self.executor
+                    self.executor = None
+                    self.thread = None
+                    break
+
+            self._notify(dropped, None)
+            if request is not None:
+                snapshot, destination, callbacks = request[1]
+                self._notify(callbacks, self._draw(snapshot, destination))
+
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.logger.debug("graph renderer is terminated")
+
+    def _draw(self, snapshot, destination):
+        try:
+            if self.use_process is False:
+                return self.draw(snapshot, destination)
+
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self.executor.submit(self.draw, snapshot, destination).result()
+        except BrokenProcessPool:
+            self.logger.error("graph render process is terminated")
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        except Exception:
+            self.logger.error(f"graph render fail: {traceback.format_exc()}")
+        return None
+
+    def _notify(self, callbacks, destination):
+        for callback in callbacks:
+            try:
+                callback(destination)
+            except Exception:
+                self.logger.error(f"graph callback fail: {traceback.format_exc()}")
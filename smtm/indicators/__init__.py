@@ -0,0 +1,14 @@
+"""
+전략과 분석에서 공통으로 사용하는 보조 지표
+
+모든 지표는 가격을 하나씩 전달 받아 최신 값을 계산하는 update와
+가격 배열 전체를 NumPy로 한 번에 계산하는 batch를 함께 제공하며 두 결과는 같다.
+"""
+from .rolling_window import RollingWindow
+from .sma import Sma
+from .ema import Ema
+from .rsi import Rsi
+from .rolling_std import RollingStd
+from .bollinger import Bollinger
+
+__all__ = ["RollingWindow", "Sma", "Ema", "Rsi", "RollingStd", "Bollinger"]
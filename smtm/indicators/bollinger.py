@@ -0,0 +1,38 @@
+"""볼린저 밴드 Bollinger Bands를 계산하는 Bollinger 클래스"""
+from .rolling_window import RollingWindow
+from .sma import Sma
+from .rolling_std import RollingStd
+
+
+class Bollinger:
+    """
+    볼린저 밴드 Bollinger Bands
+
+    중심선은 period 개 가격의 이동 평균, 상단과 하단은 중심선에서 k 배의 표준편차만큼 떨어진 선
+
+    period: 이동 평균과 표준편차를 계산할 가격의 개수
+    k: 밴드 폭을 결정하는 표준편차의 배수
+    value: 최신 (중심선, 상단, 하단), 가격이 period 개 모이기 전에는 None
+    """
+
+    def __init__(self, period=20, k=2):
+        self.period = period
+        self.k = k
+        self.window = RollingWindow(period)
+        self.value = None
+
+    def update(self, price):
+        """새로운 가격을 추가하고 최신 (중심선, 상단, 하단)을 반환한다"""
+        self.window.append(price)
+        if self.window.is_full():
+            middle = self.window.mean()
+            width = self.k * self.window.std()
+            self.value = (middle, middle + width, middle - width)
+        return self.value
+
+    @staticmethod
+    def batch(prices, period=20, k=2):
+        """가격 배열의 (중심선, 상단, 하단) 배열을 반환한다. 가격이 period 개 모이기 전은 nan"""
+        middle = Sma.batch(prices, period)
+        width = k * RollingStd.batch(prices, period)
+        return middle, middle + width, middle - width
@@ -0,0 +1,55 @@
+"""지수 이동 평균 Exponential Moving Average를 계산하는 Ema 클래스"""
+import numpy as np
+import pandas as pd
+
+
+class Ema:
+    """
+    지수 이동 평균 Exponential Moving Average
+
+    처음 period 개 가격의 단순 평균을 시작 값으로 사용하고, 이후에는 가중치 weight로 평활한다.
+    value = (이전 value * (weight - 1) + price) / weight
+
+    period: 이동 평균의 기간
+    wilder: True인 경우 weight = period 인 Wilder 평활, RSI 계산에 사용
+            False인 경우 weight = (period + 1) / 2, 평활 계수 2 / (period + 1)
+    value: 최신 이동 평균, 가격이 period 개 모이기 전에는 None
+    """
+
+    def __init__(self, period, wilder=False):
+        self.period = period
+        self.weight = self.get_weight(period, wilder)
+        self.seed_total = 0.0
+        self.count = 0
+        self.value = None
+
+    @staticmethod
+    def get_weight(period, wilder=False):
+        """평활 가중치, 평활 계수 alpha의 역수"""
+        return period if wilder else (period + 1) / 2
+
+    def update(self, price):
+        """새로운 가격을 추가하고 최신 이동 평균을 반환한다"""
+        if self.value is not None:
+            self.value = (self.value * (self.weight - 1) + price) / self.weight
+            return self.value
+
+        self.seed_total += price
+        self.count += 1
+        if self.count == self.period:
+            self.value = self.seed_total / self.period
+        return self.value
+
+    @staticmethod
+    def batch(prices, period, wilder=False):
+        """가격 배열의 지수 이동 평균 배열을 반환한다. 가격이 period 개 모이기 전은 nan"""
+        prices = np.asarray(prices, dtype=np.float64)
+        result = np.full(len(prices), np.nan)
+        if len(prices) < period:
+            return result
+
+        seed = prices[:period].sum() / period
+        smoothed = pd.Series(np.concatenate(([seed], prices[period:])))
+        alpha = 1 / Ema.get_weight(period, wilder)
+        result[period - 1 :] = smoothed.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+        return result
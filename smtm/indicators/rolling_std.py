@@ -0,0 +1,35 @@
+"""이동 표준편차를 계산하는 RollingStd 클래스"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from .rolling_window import RollingWindow
+
+
+class RollingStd:
+    """
+    최근 period 개 가격의 모표준편차, numpy.std와 같은 ddof=0 기준
+
+    period: 표준편차를 계산할 가격의 개수
+    window: 최근 period 개의 가격을 보관하는 RollingWindow
+    value: 최신 표준편차, 가격이 period 개 모이기 전에는 None
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.window = RollingWindow(period)
+        self.value = None
+
+    def update(self, price):
+        """새로운 가격을 추가하고 최신 표준편차를 반환한다"""
+        self.window.append(price)
+        if self.window.is_full():
+            self.value = self.window.std()
+        return self.value
+
+    @staticmethod
+    def batch(prices, period):
+        """가격 배열의 이동 표준편차 배열을 반환한다. 가격이 period 개 모이기 전은 nan"""
+        prices = np.asarray(prices, dtype=np.float64)
+        result = np.full(len(prices), np.nan)
+        if len(prices) >= period:
+            result[period - 1 :] = sliding_window_view(prices, period).std(axis=1)
+        return result
@@ -0,0 +1,99 @@
+"""최근 값들의 합계와 분산을 누적해서 관리하는 링 버퍼 RollingWindow 클래스"""
+import math
+
+
+class RollingWindow:
+    """
+    고정된 개수의 최근 값만 보관하는 링 버퍼
+
+    값을 추가할 때 합계와 제곱합을 누적해서 갱신하므로 평균과 표준편차를 O(1)에 계산할 수 있다.
+    누적 연산의 부동소수점 오차가 쌓이지 않도록 size 번 추가될 때마다 합계를 새로 계산한다.
+    가격처럼 큰 값의 제곱합에서 자릿수가 손실되지 않도록 제곱합은 shift를 뺀 값으로 누적한다.
+
+    size: 보관할 값의 최대 개수
+    total: 보관 중인 값의 합계
+    shift: 제곱합을 계산할 때 기준이 되는 값, 합계를 새로 계산할 때 평균으로 갱신된다
+    square_total: 보관 중인 값에서 shift를 뺀 값의 제곱합
+    shifted_total: 보관 중인 값에서 shift를 뺀 값의 합계
+    """
+
+    def __init__(self, size):
+        if size < 1:
+            raise UserWarning(f"invalid window size: {size}")
+        self.size = size
+        self.buffer = [0.0] * size
+        self.head = 0
+        self.count = 0
+        self.total = 0.0
+        self.shift = None
+        self.square_total = 0.0
+        self.shifted_total = 0.0
+        self.append_count = 0
+
+    def append(self, value):
+        """값을 추가한다. 가득 찬 경우 가장 오래된 값이 제거된다"""
+        value = float(value)
+        if self.shift is None:
+            self.shift = value
+
+        if self.count == self.size:
+            oldest = self.buffer[self.head]
+            self.total -= oldest
+            self.shifted_total -= oldest - self.shift
+            self.square_total -= (oldest - self.shift) ** 2
+        else:
+            self.count += 1
+
+        self.buffer[self.head] = value
+        self.total += value
+        self.shifted_total += value - self.shift
+        self.square_total += (value - self.shift) ** 2
+        self.head = (self.head + 1) % self.size
+
+        self.append_count += 1
+        if self.append_count >= self.size:
+            self._resum()
+
+    def _resum(self):
+        values = self.values()
+        self.total = math.fsum(values)
+        self.shift = self.total / self.count
+        self.shifted_total = math.fsum(value - self.shift for value in values)
+        self.square_total = math.fsum((value - self.shift) ** 2 for value in values)
+        self.append_count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """오래된 값부터 0, 1, 2... 순서로 접근, 음수인 경우 최근 값부터 접근"""
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError("window index out of range")
+        return self.buffer[(self.head - self.count + index) % self.size]
+
+    def is_full(self):
+        """size 개의 값이 모두 채워졌는지 여부"""
+        return self.count == self.size
+
+    def values(self):
+        """보관 중인 값을 오래된 값부터 리스트로 반환한다"""
+        start = self.head - self.count
+        if start >= 0:
+            return self.buffer[start : self.head]
+        return self.buffer[start:] + self.buffer[: self.head]
+
+    def mean(self):
+        """보관 중인 값의 평균, 값이 없으면 None"""
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    def std(self):
+        """보관 중인 값의 모표준편차, numpy.std와 같은 ddof=0 기준, 값이 없으면 None"""
+        if self.count == 0:
+            return None
+        shifted_mean = self.shifted_total / self.count
+        variance = self.square_total / self.count - shifted_mean * shifted_mean
+        return math.sqrt(max(variance, 0.0))
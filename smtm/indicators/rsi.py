@@ -0,0 +1,57 @@
+"""Wilder 방식의 RSI Relative Strength Index를 계산하는 Rsi 클래스"""
+import numpy as np
+from .ema import Ema
+
+
+class Rsi:
+    """
+    RSI Relative Strength Index 상대 강도 지수
+    http://www.investopedia.com/terms/r/rsi.asp
+
+    가격 변화량의 상승분과 하락분을 각각 Wilder 평활한 값으로 계산한다.
+    처음 count 개 변화량의 평균을 시작 값으로 사용하며, 하락분 평균이 0이면 100이다.
+
+    count: RSI 계산 기간
+    up_avg, down_avg: 상승분, 하락분 평활 Ema
+    last_price: 마지막으로 전달 받은 가격
+    value: 최신 RSI, 가격이 count + 1 개 모이기 전에는 None
+    """
+
+    def __init__(self, count=14):
+        self.count = count
+        self.up_avg = Ema(count, wilder=True)
+        self.down_avg = Ema(count, wilder=True)
+        self.last_price = None
+        self.value = None
+
+    @staticmethod
+    def to_rsi(up_avg, down_avg):
+        """상승분, 하락분 평균으로 RSI를 계산한다. 둘 다 0이면 nan"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_strength = np.divide(up_avg, down_avg)
+        return 100.0 - 100.0 / (1.0 + r_strength)
+
+    def update(self, price):
+        """새로운 가격을 추가하고 최신 RSI를 반환한다"""
+        if self.last_price is not None:
+            delta = price - self.last_price
+            up_avg = self.up_avg.update(delta if delta > 0 else 0.0)
+            down_avg = self.down_avg.update(0.0 if delta > 0 else -delta)
+            if up_avg is not None:
+                self.value = float(self.to_rsi(up_avg, down_avg))
+        self.last_price = price
+        return self.value
+
+    @staticmethod
+    def batch(prices, count=14):
+        """가격 배열의 RSI 배열을 반환한다. 가격이 count + 1 개 모이기 전은 nan"""
+        prices = np.asarray(prices, dtype=np.float64)
+        result = np.full(len(prices), np.nan)
+        if len(prices) <= count:
+            return result
+
+        deltas = np.diff(prices)
+        up_avg = Ema.batch(np.maximum(deltas, 0.0), count, wilder=True)
+        down_avg = Ema.batch(np.maximum(-deltas, 0.0), count, wilder=True)
+        result[1:] = Rsi.to_rsi(up_avg, down_avg)
+        return result
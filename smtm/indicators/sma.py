@@ -0,0 +1,53 @@
+"""단순 이동 평균 Simple Moving Average를 계산하는 Sma 클래스"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from .rolling_window import RollingWindow
+
+
+class Sma:
+    """
+    단순 이동 평균 Simple Moving Average
+
+    update로 가격을 하나씩 전달하면 O(1)에 최신 이동 평균을 계산하고,
+    batch는 가격 배열 전체의 이동 평균을 한 번에 계산한다.
+
+    period: 이동 평균을 계산할 가격의 개수
+    window: 최근 period 개의 가격을 보관하는 RollingWindow
+    value: 최신 이동 평균, 가격이 period 개 모이기 전에는 None
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.window = RollingWindow(period)
+        self.value = None
+
+    def update(self, price):
+        """새로운 가격을 추가하고 최신 이동 평균을 반환한다"""
+        self.window.append(price)
+        if self.window.is_full():
+            self.value = self.window.mean()
+        return self.value
+
+    def predict(self, price, count):
+        """price가 count 번 더 이어진다고 가정했을 때의 이동 평균 리스트
+
+        count가 보관된 가격 수보다 크면 윈도우가 모두 예측 가격으로 채워진 이후의 이동 평균은
+        변하지 않는다
+        Returns: 예측 가격을 1개부터 count개까지 포함한 이동 평균 리스트
+        """
+        predicted_list = []
+        total = self.window.total
+        for i in range(count):
+            dropped = self.window[i] if i < len(self.window) else price
+            total += price - dropped
+            predicted_list.append(total / self.period)
+        return predicted_list
+
+    @staticmethod
+    def batch(prices, period):
+        """가격 배열의 이동 평균 배열을 반환한다. 가격이 period 개 모이기 전은 nan"""
+        prices = np.asarray(prices, dtype=np.float64)
+        result = np.full(len(prices), np.nan)
+        if len(prices) >= period:
+            result[period - 1 :] = sliding_window_view(prices, period).mean(axis=1)
+        return result
@@ -0,0 +1,189 @@
+"""여러 호스트의 대량 시뮬레이션 워커에게 작업을 나누어 주는 MassCoordinator 클래스"""
+import os
+import queue
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from .log_manager import LogManager
+
+
+class _CoordinatorClient(BaseManager):
+    pass
+
+
+_CoordinatorClient.register("get_coordinator")
+
+
+class MassCoordinator:
+    """
+    대량 시뮬레이션 작업을 묶음 단위로 워커에게 빌려주고 결과를 모으는 클래스
+
+    serve로 TCP 서버를 시작하면 다른 프로세스나 호스트의 워커가 connect로 연결해서
+    lease로 작업 묶음을 받아가고 complete로 결과를 하나씩 돌려준다.
+    빌려준 묶음은 lease_timeout 초 동안 결과가 오지 않으면 워커가 종료된 것으로 보고
+    완료되지 않은 작업을 다시 대기열 앞에 넣어 다른 워커에게 빌려준다.
+    늦게 도착한 같은 작업의 결과는 무시한다.
+
+    코디네이터와 워커는 pickle로 직렬화된 객체를 주고받으므로 연결된 상대방은 이쪽에서 임의의
+    코드를 실행할 수 있다. 같은 비밀 키를 가진 신뢰할 수 있는 호스트끼리만 연결되도록 비밀 키는
+    인자나 AUTHKEY_ENV 환경 변수로 반드시 직접 지정해야 하며, 기본 주소는 로컬 호스트이다.
+    다른 호스트의 워커를 받으려면 신뢰할 수 있는 네트워크의 주소를 명시적으로 지정한다.
+
+    config: 워커에게 전달할 시뮬레이션 설정
+    task_list: MassSimulator.make_task_list로 만든 작업 리스트, group 단위로 빌려준다
+    period_list: 워커가 데이터베이스를 준비할 때 사용할 전체 기간 목록
+    lease_timeout: 결과 없이 묶음을 빌려줄 수 있는 최대 시간(초)
+    """
+
+    DEFAULT_ADDRESS = "127.0.0.1:50000"
+    AUTHKEY_ENV = "SMTM_MASS_AUTHKEY"
+    LEASE_TIMEOUT = 600
+
+    def __init__(self, config, task_list, period_list=None, lease_timeout=LEASE_TIMEOUT):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.config = config
+        self.period_list = period_list if period_list is not None else []
+        self.lease_timeout = lease_timeout
+        self.lock = threading.Lock()
+        self.group_map = {}
+        for task in task_list:
+            self.group_map.setdefault(task["group"], []).append(task)
+        self.pending = list(self.group_map.keys())
+        self.lease_map = {}
+        self.done = set()
+        self.total = len(task_list)
+        self.result_queue = queue.Queue()
+        self.server = None
+
+    @staticmethod
+    def parse_address(address):
+        """host:port 문자열을 (host, port) 튜플로 변환한다"""
+        host, _, port = address.rpartition(":")
+        if port.isdigit() is False:
+            raise UserWarning(f"invalid address: {address}")
+        return (host, int(port))
+
+    @classmethod
+    def get_authkey(cls, authkey=None):
+        """연결에 사용할 비밀 키를 반환한다
+
+        authkey: 비밀 키 문자열 또는 bytes, None이면 AUTHKEY_ENV 환경 변수를 사용한다
+        비밀 키가 지정되지 않았으면 UserWarning을 발생시킨다
+        """
+        if not authkey:
+            authkey = os.environ.get(cls.AUTHKEY_ENV, "")
+        if not authkey:
+            raise UserWarning(f"secret key is required, set {cls.AUTHKEY_ENV} or --authkey")
+        if isinstance(authkey, str):
+            authkey = authkey.encode("utf-8")
+        return authkey
+
+    @classmethod
+    def connect(cls, address, authkey=None):
+        """serve 중인 MassCoordinator에 연결해서 프록시를 반환한다"""
+        manager = _CoordinatorClient(
+            address=cls.parse_address(address), authkey=cls.get_authkey(authkey)
+        )
+        manager.connect()
+        return manager.get_coordinator()
+
+    def serve(self, address, authkey=None):
+        """TCP 서버를 별도의 스레드에서 시작하고 실제로 연결을 받는 (host, port)를 반환한다"""
+
+        class CoordinatorServer(BaseManager):
+            pass
+
+        CoordinatorServer.register("get_coordinator", callable=lambda: self)
+        manager = CoordinatorServer(
+            address=self.parse_address(address), authkey=self.get_authkey(authkey)
+        )
+        self.server = manager.get_server()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.logger.info(f"coordinator is serving at {self.server.address}")
+        return self.server.address
+
+    def shutdown(self):
+        """TCP 서버를 중지한다
+
+        연결을 받는 스레드는 프로세스가 종료될 때까지 남아서 늦게 연결한 워커에게도
+        모든 작업이 완료되었음을 알려준다
+        """
+        if self.server is None:
+            return
+
+        stop_event = getattr(self.server, "stop_event", None)
+        if stop_event is not None:
+            stop_event.set()
+        self.server = None
+
+    def get_config(self):
+        """워커가 사용할 시뮬레이션 설정을 반환한다"""
+        return self.config
+
+    def get_period_list(self):
+        """전체 시뮬레이션 기간 목록을 반환한다"""
+        return self.period_list
+
+    def lease(self, worker):
+        """완료되지 않은 작업 묶음 하나를 worker에게 빌려준다
+
+        Returns:
+            작업 리스트, 대기 중인 묶음이 없지만 빌려준 묶음이 남아 있으면 빈 리스트
+            모든 작업이 완료되면 None
+        """
+        with self.lock:
+            self._expire_leases()
+            while len(self.pending) > 0:
+                group = self.pending.pop(0)
+                task_list = [task for task in self.group_map[group] if task["idx"] not in self.done]
+                if len(task_list) == 0:
+                    continue
+
+                self.lease_map[group] = {"worker": worker, "deadline": self._get_deadline()}
+                self.logger.info(f"lease group {group} ({len(task_list)}) to {worker}")
+                return task_list
+
+            if len(self.done) == self.total:
+                return None
+            return []
+
+    def complete(self, worker, result):
+        """worker가 완료한 작업의 결과를 받는다
+
+        result: {"idx": 작업 순번, "result": 시뮬레이션 결과, "group": 작업 묶음 순번}
+        Returns: 처음 받은 결과이면 True, 이미 완료된 작업이면 False
+        """
+        with self.lock:
+            if result["idx"] in self.done:
+                self.logger.warning(f"duplicated result #{result['idx']} from {worker}")
+                return False
+
+            self.done.add(result["idx"])
+            lease = self.lease_map.get(result.get("group"))
+            if lease is not None:
+                if all(task["idx"] in self.done for task in self.group_map[result["group"]]):
+                    del self.lease_map[result["group"]]
+                else:
+                    lease["deadline"] = self._get_deadline()
+            self.result_queue.put({"idx": result["idx"], "result": result["result"]})
+            return True
+
+    def get_result(self, timeout=1):
+        """완료된 작업의 결과를 하나 꺼낸다. timeout 초 동안 결과가 없으면 None"""
+        try:
+            return self.result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _get_deadline(self):
+        return time.monotonic() + self.lease_timeout
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        for group, lease in list(self.lease_map.items()):
+            if lease["deadline"] > now:
+                continue
+
+            self.logger.warning(f"lease of group {group} is expired, worker: {lease['worker']}")
+            del self.lease_map[group]
+            self.pending.insert(0, group)
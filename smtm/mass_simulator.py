@@ -2,27 +2,31 @@
 
 SimulationOperator과 설정 파일을 사용해서 대량 시뮬레이션을 수행하는 모듈
 """
-import copy
 import os
 import json
 import time
 import sys
-from multiprocessing import Pool, TimeoutError, current_process
+import socket
+from multiprocessing import Pool, Process, current_process
 from datetime import datetime
 from datetime import timedelta
 import psutil
 import pandas as pd
-import matplotlib.pyplot as plt
 from . import (
     LogManager,
     DateConverter,
     SimulationDataProvider,
+    SimulationContext,
+    DataRepository,
     StrategyBuyAndHold,
     StrategySma0,
     StrategyRsi,
     SimulationOperator,
     SimulationTrader,
     Analyzer,
+    ParameterSampler,
+    ResultJournal,
+    MassCoordinator,
 )
 
 
@@ -34,6 +38,10 @@ class MassSimulator:
     RESULT_FILE_OUTPUT = "output/"
     CONFIG_FILE_OUTPUT = "output/generated_config.json"
     MIN_PRINT_STATE_SEC = 3
+    CHUNK_PER_PROCESS = 4
+    worker_config = None
+    worker_context = None
+    worker_group = None
 
     def __init__(self):
         """
@@ -43,8 +51,14 @@ class MassSimulator:
         self.result = []
         self.start = 0
         self.last_print = 0
+        self.done_count = 0
+        self.resumed_count = 0
         self.config = {}
         self.analyzed_result = None
+        self.parameter_list = None
+        self.best_parameter = None
+        self.job_list = []
+        self.journal = None
         LogManager.change_log_file("mass-simulation.log")
 
         if os.path.isdir("output") is False:
@@ -65,8 +79,11 @@ class MassSimulator:
             json_data = json.load(json_file)
         return json_data
 
-    def print_state(self, is_start=False, is_end=False):
-        """현재 시뮬레이터의 상태를 화면에 표시"""
+    def print_state(self, is_start=False, is_end=False, result=None):
+        """현재 시뮬레이터의 상태를 화면에 표시
+
+        result: 완료된 시뮬레이션 결과 {"idx": 순번, "result": 결과}, 진행 상황과 결과를 표시
+        """
         iso_format = "%Y-%m-%dT%H:%M:%S"
         now = datetime.now()
         now_string = now.strftime(iso_format)
@@ -78,6 +95,11 @@ class MassSimulator:
             print(
                 f"{self.config['period_list'][0]['start']} ~ {self.config['period_list'][-1]['end']} ({len(self.config['period_list'])})"
             )
+            if self.parameter_list is not None:
+                method = self.config["parameter"].get("method", "grid")
+                print(f"Parameter: {method} ({len(self.parameter_list)})")
+            if self.resumed_count > 0:
+                print(f"Resumed: {self.resumed_count} / {len(self.result)}")
             print("========================================================")
             self.start = self.last_print = now
             print(f"{now_string}     +0          simulation start!")
@@ -91,9 +113,24 @@ class MassSimulator:
             print(f"수익률 편차: {self.analyzed_result[1]:8}")
             print(f"수익률 최대: {self.analyzed_result[2]:8}")
             print(f"수익률 최소: {self.analyzed_result[3]:8}")
+            if self.best_parameter is not None:
+                print(f"최고 파라미터: {self.best_parameter[0]}, 평균 수익률: {self.best_parameter[1]}")
             print("========================================================")
             return
 
+        if result is not None:
+            self.last_print = now
+            elapsed = (now - self.start).total_seconds()
+            total = len(self.result)
+            executed = self.done_count - self.resumed_count
+            remain = round(elapsed / executed * (total - self.done_count), 1)
+            return_rate = result["result"][0] if result["result"] is not None else None
+            print(
+                f"{now_string}     +{elapsed:<10} [{self.done_count}/{total}] "
+                f"#{result['idx']} return: {return_rate}, remain: {remain}s"
+            )
+            return
+
         delta = now - self.last_print
         diff = delta.total_seconds()
         if diff > self.MIN_PRINT_STATE_SEC:
@@ -102,11 +139,17 @@ class MassSimulator:
             print(f"{now_string}     +{total_diff.total_seconds():<10} simulation is running")
 
     @staticmethod
-    def run_single(operator):
-        """시뮬레이션 1회 실행"""
-        operator.start()
-        while operator.state == "running":
-            time.sleep(0.1)
+    def run_single(operator, sync=False):
+        """시뮬레이션 1회 실행
+
+        sync: True인 경우 Worker 스레드와 타이머 없이 현재 스레드에서 시뮬레이션 진행
+        """
+        if sync:
+            operator.run_sync()
+        else:
+            operator.start()
+            while operator.state == "running":
+                time.sleep(0.1)
 
         last_report = (None, None, None, None)
 
@@ -119,14 +162,34 @@ class MassSimulator:
         return last_report
 
     @staticmethod
-    def get_initialized_operator(budget, strategy_num, interval, currency, start, end, tag):
-        """시뮬레이션 오퍼레이션 생성 후 주어진 설정 값으로 초기화 하여 반환"""
+    def get_initialized_operator(
+        budget,
+        strategy_num,
+        interval,
+        currency,
+        start,
+        end,
+        tag,
+        context=None,
+        parameter=None,
+        metrics_only=False,
+    ):
+        """시뮬레이션 오퍼레이션 생성 후 주어진 설정 값으로 초기화 하여 반환
+
+        context: 거래 데이터를 제공할 SimulationContext, 없는 경우 새로 생성
+        parameter: 전략의 클래스 상수를 대신할 값 딕셔너리 e.g. {"SHORT": 5, "LONG": 30}
+        metrics_only: True인 경우 시뮬레이션 종료 시 보고서 파일과 그래프를 생성하지 않음
+        """
         dt = DateConverter.to_end_min(start_iso=start, end_iso=end)
         end = dt[0][1]
         count = dt[0][2]
 
+        if context is None:
+            context = SimulationContext(currency=currency)
+        frame = context.load(end=end, count=count)
+
         data_provider = SimulationDataProvider(currency=currency)
-        data_provider.initialize_simulation(end=end, count=count)
+        data_provider.initialize_simulation(end=end, count=count, frame=frame)
 
         strategy_number = int(strategy_num)
         if strategy_number == 0:
@@ -138,15 +201,21 @@ class MassSimulator:
         else:
             raise UserWarning(f"Invalid Strategy! {strategy_number}")
 
+        if parameter is not None:
+            for name, value in parameter.items():
+                if not name.isupper() or not hasattr(strategy, name):
+                    raise UserWarning(f"Invalid Parameter for {strategy.NAME}! {name}")
+                setattr(strategy, name, value)
+
         strategy.is_simulation = True
 
         trader = SimulationTrader(currency=currency)
-        trader.initialize_simulation(end=end, count=count, budget=budget)
+        trader.initialize_simulation(end=end, count=count, budget=budget, frame=frame)
 
         analyzer = Analyzer()
         analyzer.is_simulation = True
 
-        operator = SimulationOperator(periodic_record_enable=False)
+        operator = SimulationOperator(periodic_record_enable=False, report_enable=not metrics_only)
         operator.initialize(
             data_provider,
             strategy,
@@ -158,106 +227,331 @@ class MassSimulator:
         operator.set_interval(interval)
         return operator
 
-    def run(self, config_file, process=-1):
-        """설정 파일의 내용으로 기간을 변경하며 시뮬레이션 진행"""
+    def run(self, config_file, process=-1, sync=False, resume=False, serve=None, authkey=None):
+        """설정 파일의 내용으로 기간을 변경하며 시뮬레이션 진행
+
+        sync: True인 경우 각 시뮬레이션을 Worker 스레드와 타이머 없이 동기식으로 진행
+        resume: True인 경우 결과 기록 파일에 완료된 것으로 기록된 작업은 건너뛰고 이어서 진행
+        serve: host:port 주소, 지정된 경우 직접 시뮬레이션 하지 않고 MassCoordinator로
+            join으로 연결한 워커들에게 작업을 나누어 주고 결과를 모은다
+        authkey: serve에 사용할 비밀 키, None이면 MassCoordinator.AUTHKEY_ENV 환경 변수
+            비밀 키가 없으면 시뮬레이션을 시작하지 않고 UserWarning을 발생시킨다
+
+        완료된 작업의 결과는 output/{title}.journal.jsonl 파일에 바로 기록되므로
+        중단된 시뮬레이션을 resume으로 이어서 진행하거나 기간을 추가해서 확장할 수 있다
+
+        설정 파일의 database 항목으로 데이터베이스 연결을 설정할 수 있다
+            {
+                "db_file": 데이터베이스 파일, 기본값 smtm.db
+                "read_only": True인 경우 데이터를 미리 저장한 후 각 프로세스는 읽기 전용으로 연결
+                "pragmas": Database.DEFAULT_PRAGMAS를 덮어쓸 pragma 딕셔너리
+                "backend": 저장소 종류, sqlite 또는 archive, 기본값 sqlite
+                "archive_dir": archive 저장소의 디렉토리, 기본값 smtm_archive
+            }
+
+        설정 파일의 parameter 항목이 있으면 ParameterSampler로 생성한 전략 파라미터 조합과
+        기간의 모든 조합을 시뮬레이션 하고, 파라미터별 평균 수익률 순위를 파일로 저장한다
+            {
+                "method": grid, random, lhs
+                "space": {"SHORT": [5, 10], "LONG": [40, 60]}
+                "count": random, lhs인 경우 생성할 조합의 수
+                "seed": random, lhs인 경우 난수 시드
+            }
+
+        각 기간의 결과는 Analyzer.get_metrics의 지표 튜플로 전달받으며, 설정 파일의
+        metrics_only 항목이 true이면 기간별 보고서 파일과 그래프를 생성하지 않는다
+        """
+        if serve is not None:
+            authkey = MassCoordinator.get_authkey(authkey)
         self.config = self._load_config(config_file)
+        database = self.config.get("database", {})
+        if database.get("read_only", False) and serve is None:
+            self._prepare_database(database)
+
+        self.parameter_list = ParameterSampler.sample(self.config.get("parameter"))
+        self.job_list = self.make_job_list(self.config["period_list"], self.parameter_list)
+        self.result = [None for x in range(len(self.job_list))]
+
+        self.journal = ResultJournal(
+            f"{self.RESULT_FILE_OUTPUT}{self.config['title']}.journal.jsonl",
+            ResultJournal.make_key(self.config),
+        )
+        if resume:
+            for idx, result in self.journal.load(self.job_list).items():
+                self.result[idx] = result
+        self.done_count = self.resumed_count = len(self.result) - self.result.count(None)
+        job_list = [job for job in self.job_list if self.result[job["idx"]] is None]
+
         process_num = process
         if process_num < 1:
             process_num = os.cpu_count()
 
-        if process_num > len(self.config["period_list"]):
-            process_num = len(self.config["period_list"])
+        if process_num > len(job_list):
+            process_num = max(len(job_list), 1)
 
         # 시뮬레이션 준비
-        config_list = []
-        period_object_list = []
-        for i in range(len(self.config["period_list"])):
-            period_object_list.append({"idx": i, "period": self.config["period_list"][i]})
-        separated_periods = self.make_chunk(period_object_list, process_num)
-        for i in range(process_num):
-            config_list.append(
-                {
-                    "title": self.config["title"],
-                    "budget": self.config["budget"],
-                    "strategy": self.config["strategy"],
-                    "interval": self.config["interval"],
-                    "currency": self.config["currency"],
-                    "partial_idx": i,
-                    "partial_period_list": separated_periods[i],
-                }
-            )
+        chunksize = self.config.get("chunksize", self.get_chunksize(len(job_list), process_num))
+        worker_config = {
+            "title": self.config["title"],
+            "budget": self.config["budget"],
+            "strategy": self.config["strategy"],
+            "interval": self.config["interval"],
+            "currency": self.config["currency"],
+            "sync": sync,
+            "database": database,
+            "metrics_only": self.config.get("metrics_only", False),
+        }
+        task_list = self.make_task_list(job_list, chunksize)
 
         # 시뮬레이션 수행
-        self.result = [None for x in range(len(self.config["period_list"]))]
         self.print_state(is_start=True)
-        self._execute_simulation(config_list, process_num)
+        self.journal.open(resume=resume)
+        try:
+            if len(task_list) > 0 and serve is not None:
+                self._serve_simulation(worker_config, task_list, serve, authkey)
+            elif len(task_list) > 0:
+                self._execute_simulation(worker_config, task_list, process_num, chunksize)
+        finally:
+            self.journal.close()
 
         # 결과 분석
         self.analyze_result(self.result, self.config)
+        if self.parameter_list is not None:
+            self.analyze_parameter_result(self.result, self.config, self.parameter_list)
         self.print_state(is_end=True)
 
-    def _execute_simulation(self, config_list, process_num):
-        is_running = True
-        result_list = []
+    @classmethod
+    def get_chunksize(cls, job_count, process_num):
+        """프로세스마다 CHUNK_PER_PROCESS 번 정도 작업을 나누어 받도록 한 번에 전달할 작업 수를 계산"""
+        return max(1, job_count // (process_num * cls.CHUNK_PER_PROCESS))
+
+    @staticmethod
+    def make_task_list(job_list, chunksize):
+        """작업을 chunksize 개씩 묶어서 같은 묶음의 작업은 같은 group과 group_periods를 갖도록 한다
+
+        Pool은 chunksize 개의 연속된 작업을 한 프로세스에 전달하므로
+        프로세스는 group이 바뀔 때 group_periods를 한 번에 로드해서 묶음 내 작업에 사용한다
+        Returns: [{"idx", "period", "parameter", "group": 묶음 순번, "group_periods": 묶음의 기간 목록}]
+        """
+        task_list = []
+        for start in range(0, len(job_list), chunksize):
+            group = job_list[start : start + chunksize]
+            group_periods = [job["period"] for job in group]
+            for job in group:
+                task = dict(job)
+                task["group"] = start // chunksize
+                task["group_periods"] = group_periods
+                task_list.append(task)
+        return task_list
+
+    @staticmethod
+    def make_job_list(period_list, parameter_list=None):
+        """기간과 파라미터 조합으로 시뮬레이션 작업 리스트를 생성한다
+
+        같은 기간의 작업이 연속되도록 기간 순서로 나열하며, 작업의 idx는 결과 리스트의 위치이다
+        파라미터 조합의 순번은 idx % len(parameter_list)
+        Returns: [{"idx": 순번, "period": 기간, "parameter": 파라미터 조합}]
+            parameter_list가 None이면 parameter 항목 없이 기간별 작업
+        """
+        if parameter_list is None:
+            return [{"idx": idx, "period": period} for idx, period in enumerate(period_list)]
+
+        job_list = []
+        for period in period_list:
+            for parameter in parameter_list:
+                job_list.append({"idx": len(job_list), "period": period, "parameter": parameter})
+        return job_list
+
+    def _prepare_database(self, database):
+        """읽기 전용 연결로 시뮬레이션 하기 전에 전체 기간의 데이터를 데이터베이스에 저장"""
+        repo = DataRepository(
+            database.get("db_file", "smtm.db"),
+            pragmas=database.get("pragmas"),
+            backend=database.get("backend", "sqlite"),
+            archive_dir=database.get("archive_dir", "smtm_archive"),
+        )
+        market = SimulationContext.AVAILABLE_CURRENCY[self.config["currency"]]
+        for start, end in SimulationContext.merge_periods(self.config["period_list"]):
+            repo.prefetch(start, end, [market])
+
+    def _execute_simulation(self, config, task_list, process_num, chunksize=1):
+        """작업을 하나씩 프로세스 풀에 전달하고 완료되는 순서대로 결과를 업데이트
+
+        먼저 끝난 프로세스가 다음 작업을 가져가므로 특정 기간이 오래 걸려도 다른 프로세스는 쉬지 않는다
+        """
         self.memory_usage()
-        with Pool(processes=process_num) as pool:
+        with Pool(
+            processes=process_num,
+            initializer=MassSimulator._initialize_worker,
+            initargs=(config,),
+        ) as pool:
             try:
-                async_result = pool.map_async(
-                    MassSimulator._execute_single_process_simulation, config_list
-                )
-                while is_running:
-                    try:
-                        result_list = async_result.get(timeout=0.5)
-                        is_running = False
-                    except TimeoutError:
-                        self.print_state()
-
-                for result in result_list:
+                for result in pool.imap_unordered(
+                    MassSimulator._execute_simulation_task, task_list, chunksize=chunksize
+                ):
                     self._update_result(result)
+                    self.print_state(result=result)
             except KeyboardInterrupt:
                 print("Terminating......")
                 sys.exit(0)
 
-    def _update_result(self, partial_result):
-        for result in partial_result:
-            idx = result["idx"]
-            self.result[idx] = result["result"]
+    def _serve_simulation(self, config, task_list, address, authkey=None):
+        """MassCoordinator를 시작하고 워커들이 돌려주는 결과를 모든 작업이 완료될 때까지 업데이트
+
+        결과 없이 lease_timeout 초가 지난 작업 묶음은 다른 워커에게 다시 전달된다
+        """
+        coordinator = MassCoordinator(
+            config,
+            task_list,
+            period_list=self.config["period_list"],
+            lease_timeout=self.config.get("lease_timeout", MassCoordinator.LEASE_TIMEOUT),
+        )
+        server_address = coordinator.serve(address, authkey)
+        print(f"waiting for workers at {server_address[0]}:{server_address[1]}")
+        try:
+            remain = len(task_list)
+            while remain > 0:
+                result = coordinator.get_result()
+                if result is None:
+                    continue
+
+                self._update_result(result)
+                self.print_state(result=result)
+                remain -= 1
+        except KeyboardInterrupt:
+            print("Terminating......")
+            sys.exit(0)
+        finally:
+            coordinator.shutdown()
+
+    def join(self, address, process=-1, authkey=None):
+        """host:port 주소의 MassCoordinator에 연결해서 process 개의 워커 프로세스로 작업을 수행
+
+        각 워커는 이 호스트의 데이터베이스를 사용하며, 읽기 전용 설정인 경우 먼저 전체 기간의 데이터를 저장한다
+        authkey: 코디네이터와 같은 비밀 키, None이면 MassCoordinator.AUTHKEY_ENV 환경 변수
+        """
+        authkey = MassCoordinator.get_authkey(authkey)
+        coordinator = MassCoordinator.connect(address, authkey)
+        config = coordinator.get_config()
+        database = config.get("database", {})
+        if database.get("read_only", False):
+            self.config = {
+                "currency": config["currency"],
+                "period_list": coordinator.get_period_list(),
+            }
+            self._prepare_database(database)
+
+        process_num = process
+        if process_num < 1:
+            process_num = os.cpu_count()
+
+        print(f"join {address} with {process_num} process, title: {config['title']}")
+        worker_list = [
+            Process(target=MassSimulator._join_worker, args=(address, authkey))
+            for _ in range(process_num)
+        ]
+        for worker in worker_list:
+            worker.start()
+        try:
+            for worker in worker_list:
+                worker.join()
+        except KeyboardInterrupt:
+            print("Terminating......")
+            sys.exit(0)
+
+    @staticmethod
+    def _join_worker(address, authkey=None):
+        """MassCoordinator에서 작업 묶음을 빌려서 실행하고 결과를 하나씩 돌려주는 워커 프로세스
+
+        코디네이터와의 연결이 끊어지면 남은 작업은 코디네이터가 다른 워커에게 다시 전달하므로 종료한다
+        """
+        name = f"{socket.gethostname()}-{os.getpid()}"
+        try:
+            coordinator = MassCoordinator.connect(address, authkey)
+            MassSimulator._initialize_worker(coordinator.get_config())
+            while True:
+                task_list = coordinator.lease(name)
+                if task_list is None:
+                    break
+
+                if len(task_list) == 0:
+                    time.sleep(1)
+                    continue
+
+                for task in task_list:
+                    result = MassSimulator._execute_simulation_task(task)
+                    result["group"] = task["group"]
+                    coordinator.complete(name, result)
+        except (OSError, EOFError) as err:
+            print(f"[{name}] coordinator is disconnected: {err}")
+
+    def _update_result(self, result):
+        self.result[result["idx"]] = result["result"]
+        self.done_count += 1
+        if self.journal is not None:
+            self.journal.append(self.job_list[result["idx"]], result["result"])
 
     @staticmethod
-    def _execute_single_process_simulation(config):
+    def _initialize_worker(config):
+        """프로세스 풀의 각 프로세스에서 작업 실행 전에 한 번 호출되어 설정과 SimulationContext를 준비"""
         LogManager.set_stream_level(30)
-        LogManager.change_log_file(f"mass-simulation-{config['partial_idx']}.log")
-        period_list = config["partial_period_list"]
-        result_list = []
+        LogManager.change_log_file(f"mass-simulation-{current_process().name}.log")
         MassSimulator.memory_usage()
-        print(f"partial simulation start @{current_process().name}")
-        for period in period_list:
-            tag = f"MASS-{config['title']}-{period['idx']}"
-            operator = MassSimulator.get_initialized_operator(
-                config["budget"],
-                config["strategy"],
-                config["interval"],
-                config["currency"],
-                period["period"]["start"],
-                period["period"]["end"],
-                tag,
-            )
-            try:
-                report = MassSimulator.run_single(operator)
-                result_list.append({"idx": period["idx"], "result": report})
-                print(f"     #{period['idx']} return: {report[2]}")
-            except KeyboardInterrupt:
-                print(f"Terminating......@{current_process().name}")
-                operator.stop()
 
-        return result_list
+        database = config.get("database", {})
+        MassSimulator.worker_config = config
+        MassSimulator.worker_context = SimulationContext(
+            currency=config["currency"],
+            db_file=database.get("db_file", "smtm.db"),
+            read_only=database.get("read_only", False),
+            pragmas=database.get("pragmas"),
+            backend=database.get("backend", "sqlite"),
+            archive_dir=database.get("archive_dir", "smtm_archive"),
+        )
+        MassSimulator.worker_group = None
+
+    @staticmethod
+    def _execute_simulation_task(task):
+        """한 기간의 시뮬레이션을 실행하고 결과를 반환
+
+        같은 묶음의 작업은 처음 한 번만 묶음의 기간 전체를 로드하고 이후에는 잘라서 사용한다
+        Returns: {"idx": 작업 순번, "result": 시뮬레이션 결과}
+        """
+        config = MassSimulator.worker_config
+        context = MassSimulator.worker_context
+        if MassSimulator.worker_group != task["group"]:
+            context.prefetch_periods(task["group_periods"])
+            MassSimulator.worker_group = task["group"]
+
+        operator = MassSimulator.get_initialized_operator(
+            config["budget"],
+            config["strategy"],
+            config["interval"],
+            config["currency"],
+            task["period"]["start"],
+            task["period"]["end"],
+            f"MASS-{config['title']}-{task['idx']}",
+            context=context,
+            parameter=task.get("parameter"),
+            metrics_only=config.get("metrics_only", False),
+        )
+        try:
+            MassSimulator.run_single(operator, sync=config.get("sync", False))
+        except KeyboardInterrupt:
+            print(f"Terminating......@{current_process().name}")
+            operator.stop()
+            raise
+        return {"idx": task["idx"], "result": operator.analyzer.get_metrics()}
 
     @staticmethod
     def _round(num):
         return round(num, 3)
 
     def analyze_result(self, result_list, config):
-        """수익률 비교 결과를 파일로 저장"""
+        """수익률 비교 결과를 파일로 저장
+
+        지표를 계산하지 못한 기간의 결과는 모든 값이 None이며 통계에서 제외한다
+        """
         title = config["title"]
         period_list = config["period_list"]
 
@@ -274,20 +568,29 @@ class MassSimulator:
         final_return_list = []
         min_return_list = []
         max_return_list = []
+        trade_count_list = []
+        drawdown_list = []
         for result in result_list:
-            final_return_list.append(result[2])
-            min_return_list.append(result[6])
-            max_return_list.append(result[7])
+            final_return_list.append(result[0])
+            min_return_list.append(result[1])
+            max_return_list.append(result[2])
+            trade_count_list.append(result[3])
+            drawdown_list.append(result[4])
 
         dataframe = pd.DataFrame(
             {
                 "min_return": min_return_list,
                 "max_return": max_return_list,
                 "final_return": final_return_list,
+                "trade_count": trade_count_list,
+                "max_drawdown": drawdown_list,
             }
         )
         # 최종수익율
         df_final = dataframe.sort_values(by="final_return", ascending=False)
+        final_return = df_final["final_return"].dropna()
+        if final_return.empty:
+            raise UserWarning("No period has metrics")
 
         # 순간 최대 수익율
         df_max = dataframe.sort_values(by="max_return", ascending=False)
@@ -297,8 +600,8 @@ class MassSimulator:
         self.analyzed_result = (
             self._round(dataframe["final_return"].mean()),
             self._round(dataframe["final_return"].std()),
-            self._round(df_final["final_return"].iloc[0]),
-            self._round(df_final["final_return"].iloc[-1]),
+            self._round(final_return.iloc[0]),
+            self._round(final_return.iloc[-1]),
         )
 
         with open(f"{self.RESULT_FILE_OUTPUT}{title}.result", "w", encoding="utf-8") as result_file:
@@ -315,24 +618,24 @@ class MassSimulator:
             result_file.write(f"수익률 평균: {self.analyzed_result[0]:8}\n")
             result_file.write(f"수익률 편차: {self.analyzed_result[1]:8}\n")
             result_file.write(
-                f"수익률 최대: {self.analyzed_result[2]:8}, {df_final['final_return'].index[0]:3}\n"
+                f"수익률 최대: {self.analyzed_result[2]:8}, {final_return.index[0]:3}\n"
             )
             result_file.write(
-                f"수익률 최소: {self.analyzed_result[3]:8}, {df_final['final_return'].index[-1]:3}\n"
+                f"수익률 최소: {self.analyzed_result[3]:8}, {final_return.index[-1]:3}\n"
             )
 
-            if len(final_return_list) > 10:
+            if len(final_return) > 10:
                 result_file.write("수익률 TOP 10 ===============================================\n")
                 for i in range(10):
                     result_file.write(
-                        f"{self._round(df_final['final_return'].iloc[i]):8}, {df_final['final_return'].index[i]:3}\n"
+                        f"{self._round(final_return.iloc[i]):8}, {final_return.index[i]:3}\n"
                     )
 
                 result_file.write("수익률 WORST 10 ===============================================\n")
                 for i in range(10):
                     idx = -1 * (i + 1)
                     result_file.write(
-                        f"{self._round(df_final['final_return'].iloc[idx]):8}, {df_final['final_return'].index[idx]:3}\n"
+                        f"{self._round(final_return.iloc[idx]):8}, {final_return.index[idx]:3}\n"
                     )
 
                 result_file.write("순간 최대 수익률 BEST 10 =====================================\n")
@@ -347,23 +650,62 @@ class MassSimulator:
                         f"{self._round(df_mix['min_return'].iloc[i]):8}, {df_mix['min_return'].index[i]:3}\n"
                     )
 
-            result_file.write("순번, 인덱스, 구간 수익률, 최대 수익률, 최저 수익률 ===\n")
+            result_file.write(
+                "순번, 인덱스, 구간 수익률, 최대 수익률, 최저 수익률, 거래 횟수, 최대 낙폭 ===\n"
+            )
             count = 0
             for index, row in df_final.iterrows():
                 count += 1
+                trade_count = "-" if pd.isna(row["trade_count"]) else int(row["trade_count"])
                 result_file.write(
-                    f"{count:4}, {index:6}, {self._round(row['final_return']):11}, {self._round(row['max_return']):11}, {self._round(row['min_return']):11}\n"
+                    f"{count:4}, {index:6}, {self._round(row['final_return']):11}, {self._round(row['max_return']):11}, {self._round(row['min_return']):11}, {trade_count:>9}, {self._round(row['max_drawdown']):11}\n"
                 )
 
             self.draw_graph(
-                final_return_list,
+                dataframe["final_return"].tolist(),
                 mean=self._round(dataframe["final_return"].mean()),
                 filename=f"{self.RESULT_FILE_OUTPUT}{title}.jpg",
             )
 
+    def analyze_parameter_result(self, result_list, config, parameter_list):
+        """파라미터 조합별 수익률을 평균 수익률 순으로 정렬해서 파일로 저장"""
+        title = config["title"]
+        dataframe = pd.DataFrame(
+            {
+                "parameter": [idx % len(parameter_list) for idx in range(len(result_list))],
+                "final_return": [result[0] for result in result_list],
+            }
+        )
+        ranked = (
+            dataframe.groupby("parameter")["final_return"]
+            .agg(["mean", "std", "max", "min"])
+            .sort_values(by="mean", ascending=False)
+        )
+        self.best_parameter = (
+            parameter_list[ranked.index[0]],
+            self._round(ranked["mean"].iloc[0]),
+        )
+
+        with open(
+            f"{self.RESULT_FILE_OUTPUT}{title}.parameter.result", "w", encoding="utf-8"
+        ) as result_file:
+            result_file.write(f"Title: {title}\n")
+            result_file.write(
+                f"Parameter: {config['parameter'].get('method', 'grid')} ({len(parameter_list)}), "
+                f"Period: {len(config['period_list'])}\n"
+            )
+            result_file.write("순위, 파라미터, 평균 수익률, 수익률 편차, 최대 수익률, 최저 수익률, 값 ===\n")
+            for rank, (index, row) in enumerate(ranked.iterrows(), start=1):
+                result_file.write(
+                    f"{rank:4}, {index:8}, {self._round(row['mean']):11}, {self._round(row['std']):11}, {self._round(row['max']):11}, {self._round(row['min']):11}, {json.dumps(parameter_list[index])}\n"
+                )
+
     @staticmethod
     def draw_graph(return_list, mean=0, filename="mass-simulation-result.jpg"):
         """수익률 막대 그래프를 파일로 저장"""
+        # 워커 프로세스에서는 사용하지 않으므로 사용할 때 import
+        import matplotlib.pyplot as plt
+
         idx = list(range(len(return_list)))
         mean = [mean for i in range(len(return_list))]
         plt.bar(idx, return_list)
@@ -395,6 +737,7 @@ class MassSimulator:
                     "end": 시뮬레이션 기간 종료
                 }
             ],
+            "parameter": 전략 파라미터 탐색 설정, ParameterSampler 참고, 필요한 경우 추가
         }
         """
         iso_format = "%Y-%m-%dT%H:%M:%S"
@@ -425,24 +768,3 @@ class MassSimulator:
         with open(filepath, "w", encoding="utf-8") as dump_file:
             json.dump(config, dump_file)
         return filepath
-
-    @staticmethod
-    def make_chunk(original, num):
-        """전달 받은 리스트를 num개로 분할하여 반환"""
-        if len(original) < num or num == 1:
-            return [copy.deepcopy(original)]
-
-        div = divmod(len(original), num)
-        result = []
-        last = 0
-
-        for i in range(num):
-            if i < div[1]:
-                count = div[0] + 1
-            else:
-                count = div[0]
-
-            result.append(original[last : last + count])
-            last += count
-
-        return result
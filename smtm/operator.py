@@ -5,12 +5,14 @@ import threading
 from datetime import datetime
 from .log_manager import LogManager
 from .worker import Worker
+from .graph_renderer import GraphRenderer
 
 
 class Operator:
     """
     전체 시스템의 운영을 담당하는 클래스
     PERIODIC_RECORD : 주기적으로 수익률 보고서와 그래프를 생성하는 기능
+    ASYNC_GRAPH : 수익률 그래프를 거래 스레드가 아닌 별도의 렌더링 프로세스에서 그리는 기능
 
     Attributes:
         data_provider: 사용될 DataProvider 인스턴스
@@ -25,6 +27,7 @@ class Operator:
     PERIODIC_RECORD = True
     PERIODIC_RECORD_INFO = (360, -1)  # (turn, index) e.g. (360, -1) 최근 6시간
     PERIODIC_RECORD_INTERVAL_SEC = 300 * 60
+    ASYNC_GRAPH = True
 
     def __init__(self, on_exception=None):
         self.logger = LogManager.get_logger(__class__.__name__)
@@ -36,6 +39,7 @@ class Operator:
         self.timer = None
         self.analyzer = None
         self.worker = Worker("Operator-Worker")
+        self.graph_renderer = GraphRenderer() if self.ASYNC_GRAPH else None
         self.state = None
         self.is_trading_activated = False
         self.tag = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -59,13 +63,19 @@ class Operator:
         def add_spot_callback(date_time, value):
             analyzer.add_drawing_spot(date_time, value)
 
+        def get_strategy_info():
+            try:
+                return strategy.get_retention_info()
+            except AttributeError:
+                return {}
+
         self.data_provider = data_provider
         self.strategy = strategy
         self.trader = trader
         self.analyzer = analyzer
         self.state = "ready"
         self.strategy.initialize(budget, add_spot_callback=add_spot_callback)
-        self.analyzer.initialize(trader.get_account_info)
+        self.analyzer.initialize(trader.get_account_info, get_strategy_info)
         self.tag = datetime.now().strftime("%Y%m%d-%H%M%S")
         try:
             self.tag += "-" + self.trader.NAME + "-" + self.strategy.NAME
@@ -185,6 +195,8 @@ class Operator:
 
         self.worker.register_on_terminated(on_terminated)
         self.worker.stop()
+        if self.graph_renderer is not None:
+            self.graph_renderer.stop()
 
         return self.last_report
 
@@ -220,11 +232,13 @@ class Operator:
                 graph_filename = f"{self.OUTPUT_FOLDER}g{round(time.time())}-{now.month:02d}{now.day:02d}T{now.hour:02d}{now.minute:02d}.jpg"
 
             try:
-                index_info = task["index_info"]
-                task["callback"](
-                    self.analyzer.get_return_report(
-                        graph_filename=graph_filename, index_info=index_info
-                    )
+                # 그래프는 렌더링 프로세스에서 그리고 파일이 생성되면 callback이 호출된다
+                self.analyzer.get_return_report(
+                    graph_filename=graph_filename,
+                    index_info=task["index_info"],
+                    graph_renderer=self.graph_renderer,
+                    callback=task["callback"],
+                    graph_key=(graph_tag, task["index_info"]),
                 )
             except TypeError as msg:
                 self.logger.error(f"invalid callback {msg}")
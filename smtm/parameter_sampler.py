@@ -0,0 +1,83 @@
+"""전략 파라미터 탐색 설정으로 파라미터 조합을 생성하는 ParameterSampler 클래스"""
+import itertools
+import random
+
+
+class ParameterSampler:
+    """
+    전략 파라미터 탐색 설정으로 파라미터 조합 리스트를 생성하는 클래스
+
+    config: {
+        "method": 조합 생성 방법, grid, random, lhs 중 하나, 기본값 grid
+        "space": {
+            파라미터 이름: grid인 경우 후보 값 리스트, random과 lhs인 경우 [최솟값, 최댓값]
+        }
+        "count": random, lhs인 경우 생성할 조합의 수, 기본값 10
+        "seed": random, lhs인 경우 난수 시드
+    }
+    random, lhs는 최솟값과 최댓값이 모두 정수이면 정수, 그 외에는 실수 값을 생성한다
+    lhs는 Latin hypercube 방식으로 파라미터마다 구간을 count개로 나누어 한 번씩 사용한다
+    """
+
+    METHODS = ("grid", "random", "lhs")
+    DEFAULT_COUNT = 10
+
+    @classmethod
+    def sample(cls, config):
+        """설정에 따라 파라미터 조합 리스트를 생성한다
+
+        Returns: [{파라미터 이름: 값}], config가 None이면 None
+        """
+        if config is None:
+            return None
+
+        method = config.get("method", "grid")
+        space = config.get("space", {})
+        if method not in cls.METHODS:
+            raise UserWarning(f"not supported sampling method: {method}")
+        if len(space) == 0:
+            raise UserWarning("empty parameter space")
+
+        if method == "grid":
+            return cls.make_grid(space)
+
+        count = config.get("count", cls.DEFAULT_COUNT)
+        rng = random.Random(config.get("seed"))
+        if method == "random":
+            return cls.make_random(space, count, rng)
+        return cls.make_latin_hypercube(space, count, rng)
+
+    @staticmethod
+    def make_grid(space):
+        """후보 값의 모든 조합을 생성한다"""
+        names = list(space.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+    @classmethod
+    def make_random(cls, space, count, rng):
+        """[최솟값, 최댓값] 범위에서 균등 분포로 count개의 조합을 생성한다"""
+        return [
+            {name: cls._scale(value_range, rng.random()) for name, value_range in space.items()}
+            for _ in range(count)
+        ]
+
+    @classmethod
+    def make_latin_hypercube(cls, space, count, rng):
+        """[최솟값, 최댓값] 범위를 count개 구간으로 나누어 구간마다 한 번씩 사용하는 조합을 생성한다"""
+        parameter_list = [{} for _ in range(count)]
+        for name, value_range in space.items():
+            strata = list(range(count))
+            rng.shuffle(strata)
+            for parameter, stratum in zip(parameter_list, strata):
+                parameter[name] = cls._scale(value_range, (stratum + rng.random()) / count)
+        return parameter_list
+
+    @staticmethod
+    def _scale(value_range, ratio):
+        if len(value_range) != 2 or value_range[0] > value_range[1]:
+            raise UserWarning(f"invalid parameter range: {value_range}")
+
+        low, high = value_range
+        if isinstance(low, int) and isinstance(high, int):
+            return min(low + int(ratio * (high - low + 1)), high)
+        return low + ratio * (high - low)
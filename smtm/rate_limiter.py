@@ -0,0 +1,39 @@
+"""요청 횟수를 제한하기 위한 토큰 버킷 방식의 RateLimiter 클래스"""
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    토큰 버킷 방식으로 초당 요청 횟수를 제한하는 클래스
+
+    여러 스레드에서 공유해서 사용할 수 있으며, 토큰이 없는 경우 acquire에서 대기한다.
+
+    rate: 초당 충전되는 토큰의 수
+    capacity: 버킷에 저장 가능한 최대 토큰의 수, 순간적으로 허용되는 최대 요청 수
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise UserWarning(f"invalid rate: {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.last_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 한 개를 사용한다. 토큰이 없으면 충전될 때까지 대기한다"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_time) * self.rate)
+        self.last_time = now
@@ -0,0 +1,232 @@
+"""딕셔너리 레코드를 항목별 컬럼에 나누어 저장하는 RecordTable 클래스"""
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from datetime import datetime
+from datetime import timedelta
+
+
+class _Missing:
+    """값이 없는 항목을 표시하는 객체, pickle 후에도 같은 객체로 복원된다"""
+
+    def __reduce__(self):
+        return "_MISSING"
+
+    def __repr__(self):
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+class RecordTable:
+    """
+    딕셔너리 레코드를 항목별 컬럼에 나누어 저장하고 리스트처럼 읽을 수 있게 하는 클래스
+
+    append는 레코드를 복사하지 않고 각 항목의 값만 컬럼에 추가한다.
+    float_fields 항목은 array("d") 컬럼에 저장하며, float가 아닌 값이 들어오면 원래 값을
+    그대로 돌려줄 수 있도록 그 컬럼만 리스트로 바꾼다.
+    date_time 항목은 추가할 때 한 번만 초 단위 정수로 변환해서 저장하고, 시간 순서로 추가된
+    경우 is_sorted를 유지해서 filter_by_time이 이진 탐색으로 구간을 찾을 수 있게 한다.
+    인덱스로 읽으면 저장한 값으로 딕셔너리를 새로 만들어 반환하고, kind가 있으면 마지막에 추가한다.
+    fields에 없는 항목은 레코드별로 따로 보관한다.
+    drop으로 앞부분을 지울 때마다 generation이 증가하므로 위치를 기억하는 쪽에서 변경을 알 수 있다.
+
+    fields: 컬럼으로 저장할 항목 이름 목록, 읽을 때의 딕셔너리 키 순서
+    kind: 보고서를 위한 데이터 종류, None이면 추가하지 않는다
+    float_fields: float 컬럼으로 저장할 항목 이름 목록
+    """
+
+    EPOCH = datetime(1970, 1, 1)
+    ONE_SECOND = timedelta(seconds=1)
+
+    def __init__(self, fields, kind=None, float_fields=()):
+        self.fields = tuple(fields)
+        self.field_set = frozenset(self.fields)
+        self.kind = kind
+        self.columns = [array("d") if name in float_fields else [] for name in self.fields]
+        self.timestamps = array("q")
+        self.extra_list = []
+        self.is_sorted = True
+        self.generation = 0
+
+    @classmethod
+    def to_timestamp(cls, date_time):
+        """ISO 형식의 시간 문자열을 초 단위 정수로 변환한다. 변환할 수 없으면 None"""
+        try:
+            return (datetime.fromisoformat(date_time) - cls.EPOCH) // cls.ONE_SECOND
+        except (TypeError, ValueError):
+            return None
+
+    def append(self, record, **values):
+        """레코드를 추가한다
+
+        values: 레코드의 값 대신 저장할 항목 값
+        """
+        if len(values) > 0:
+            record = {**record, **values}
+
+        found = 0
+        for pos, name in enumerate(self.fields):
+            value = record.get(name, _MISSING)
+            if value is not _MISSING:
+                found += 1
+            column = self.columns[pos]
+            if type(column) is array and type(value) is not float:
+                column = self.columns[pos] = list(column)
+            column.append(value)
+
+        timestamp = self.to_timestamp(record.get("date_time"))
+        if timestamp is None:
+            self.is_sorted = False
+            if type(self.timestamps) is array:
+                self.timestamps = list(self.timestamps)
+        elif self.is_sorted and len(self.timestamps) > 0 and self.timestamps[-1] > timestamp:
+            self.is_sorted = False
+        self.timestamps.append(timestamp)
+
+        extra = None
+        if found < len(record):
+            extra = {
+                key: value
+                for key, value in record.items()
+                if key not in self.field_set and (self.kind is None or key != "kind")
+            }
+        self.extra_list.append(extra or None)
+
+    def get_timestamp(self, index):
+        """레코드의 date_time을 초 단위 정수로 반환한다. date_time이 없거나 잘못된 경우 None"""
+        return self.timestamps[index]
+
+    def get_column(self, name):
+        """항목의 값 목록을 반환한다. 값이 없는 레코드가 있으면 KeyError"""
+        column = self.columns[self.fields.index(name)]
+        if type(column) is not array and _MISSING in column:
+            raise KeyError(name)
+        return column
+
+    def get_range(self, start=None, end=None):
+        """start부터 end 전까지의 레코드를 갖는 RecordTable을 반환한다
+
+        start, end: 슬라이스와 같은 방식으로 해석하는 인덱스
+        """
+        start, end, _ = slice(start, end).indices(len(self))
+        table = self._make_empty()
+        table.columns = [column[start:end] for column in self.columns]
+        table.timestamps = self.timestamps[start:end]
+        table.extra_list = self.extra_list[start:end]
+        table.is_sorted = self.is_sorted
+        return table
+
+    def filter_by_time(self, start, end):
+        """date_time이 start 이상 end 이하인 레코드를 갖는 RecordTable을 반환한다
+
+        start, end: to_timestamp로 변환한 초 단위 정수 시간
+        """
+        if self.is_sorted:
+            return self.get_range(
+                bisect_left(self.timestamps, start), bisect_right(self.timestamps, end)
+            )
+
+        positions = [
+            pos
+            for pos, timestamp in enumerate(self.timestamps)
+            if timestamp is not None and start <= timestamp <= end
+        ]
+        table = self._make_empty()
+        table.columns = [self._take(column, positions) for column in self.columns]
+        table.timestamps = self._take(self.timestamps, positions)
+        table.extra_list = [self.extra_list[pos] for pos in positions]
+        table.is_sorted = all(
+            table.timestamps[pos - 1] <= table.timestamps[pos]
+            for pos in range(1, len(table.timestamps))
+        )
+        return table
+
+    def extend(self, table):
+        """같은 fields를 갖는 RecordTable의 레코드를 뒤에 추가한다"""
+        if table.fields != self.fields:
+            raise UserWarning(f"fields are different: {table.fields}")
+
+        if len(table) > 0 and len(self) > 0:
+            if table.timestamps[0] is None or self.timestamps[-1] is None:
+                self.is_sorted = False
+            elif self.timestamps[-1] > table.timestamps[0]:
+                self.is_sorted = False
+        self.is_sorted = self.is_sorted and table.is_sorted
+
+        for pos, column in enumerate(table.columns):
+            if type(self.columns[pos]) is array and type(column) is not array:
+                self.columns[pos] = list(self.columns[pos])
+            self.columns[pos].extend(column)
+        if type(self.timestamps) is array and type(table.timestamps) is not array:
+            self.timestamps = list(self.timestamps)
+        self.timestamps.extend(table.timestamps)
+        self.extra_list.extend(table.extra_list)
+
+    def drop(self, count):
+        """앞에서부터 count개의 레코드를 지운다"""
+        for column in self.columns:
+            del column[:count]
+        del self.timestamps[:count]
+        del self.extra_list[:count]
+        self.generation += 1
+
+    def _make_empty(self):
+        table = RecordTable(self.fields, kind=self.kind)
+        table.field_set = self.field_set
+        return table
+
+    @staticmethod
+    def _take(column, positions):
+        values = [column[pos] for pos in positions]
+        if type(column) is array:
+            return array(column.typecode, values)
+        return values
+
+    def _get_record(self, index):
+        extra = self.extra_list[index]
+        record = {}
+        for name, column in zip(self.fields, self.columns):
+            value = column[index]
+            if value is not _MISSING:
+                record[name] = value
+        if extra is not None:
+            record.update(extra)
+        if self.kind is not None:
+            record["kind"] = self.kind
+        return record
+
+    def __len__(self):
+        return len(self.extra_list)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get_record(pos) for pos in range(*index.indices(len(self)))]
+        return self._get_record(index)
+
+    def __iter__(self):
+        for pos in range(len(self)):
+            yield self._get_record(pos)
+
+    def __eq__(self, other):
+        if isinstance(other, RecordTable):
+            other = list(other)
+        if not isinstance(other, list):
+            return NotImplemented
+        return list(self) == other
+
+    __hash__ = None
+
+    def __add__(self, other):
+        if not isinstance(other, (list, RecordTable)):
+            return NotImplemented
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return other + list(self)
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,98 @@
+"""대량 시뮬레이션의 작업별 결과를 파일에 기록하고 다시 불러오는 ResultJournal 클래스"""
+import hashlib
+import json
+import os
+
+
+class ResultJournal:
+    """
+    완료된 시뮬레이션 작업의 결과를 JSON Lines 형식으로 파일 끝에 한 줄씩 기록하는 클래스
+
+    각 줄은 {"key": 설정 해시, "idx": 작업 순번, "period": 기간, "parameter": 파라미터 조합,
+    "result": 시뮬레이션 결과} 이며, 기록할 때마다 flush 하므로 중단되어도 완료된 결과는 남는다.
+    load는 설정 해시가 같고 같은 순번의 작업과 기간, 파라미터가 일치하는 결과만 반환하므로
+    기간 목록 끝에 기간을 추가한 설정으로 이어서 실행하면 기존 결과를 그대로 사용할 수 있다.
+
+    file_path: 결과를 기록할 파일 경로
+    key: 시뮬레이션 설정의 해시, make_key로 생성
+    """
+
+    KEY_ITEMS = ("budget", "strategy", "interval", "currency")
+
+    def __init__(self, file_path, key):
+        self.file_path = file_path
+        self.key = key
+        self.journal_file = None
+
+    @classmethod
+    def make_key(cls, config):
+        """시뮬레이션 결과에 영향을 주는 설정 항목으로 해시를 생성한다"""
+        items = {name: config.get(name) for name in cls.KEY_ITEMS}
+        dumped = json.dumps(items, sort_keys=True, default=str)
+        return hashlib.sha1(dumped.encode("utf-8")).hexdigest()[:16]
+
+    def load(self, job_list):
+        """기록된 결과 중 현재 작업 리스트와 일치하는 결과를 읽는다
+
+        Returns: {작업 순번: 시뮬레이션 결과}, 파일이 없으면 빈 딕셔너리
+        """
+        if not os.path.exists(self.file_path):
+            return {}
+
+        done = {}
+        with open(self.file_path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 중단되어 잘린 줄
+                    continue
+
+                idx = record.get("idx")
+                if record.get("key") != self.key or not isinstance(idx, int):
+                    continue
+                if idx < 0 or idx >= len(job_list):
+                    continue
+
+                job = job_list[idx]
+                if record.get("period") != job["period"]:
+                    continue
+                if record.get("parameter") != job.get("parameter"):
+                    continue
+                done[idx] = tuple(record["result"])
+        return done
+
+    def open(self, resume=False):
+        """기록할 파일을 연다. resume이 False이면 기존 기록을 지우고 새로 시작한다"""
+        self.close()
+        directory = os.path.dirname(self.file_path)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+        is_truncated = False
+        if resume and os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0:
+            with open(self.file_path, "rb") as journal_file:
+                journal_file.seek(-1, os.SEEK_END)
+                is_truncated = journal_file.read(1) != b"\n"
+
+        self.journal_file = open(self.file_path, "a" if resume else "w", encoding="utf-8")
+        if is_truncated:
+            # 잘린 줄 뒤에 이어서 기록되지 않도록 줄을 바꾼다
+            self.journal_file.write("\n")
+
+    def append(self, job, result):
+        """작업의 결과를 한 줄 기록한다"""
+        record = {
+            "key": self.key,
+            "idx": job["idx"],
+            "period": job["period"],
+            "parameter": job.get("parameter"),
+            "result": result,
+        }
+        self.journal_file.write(json.dumps(record, default=str) + "\n")
+        self.journal_file.flush()
+
+    def close(self):
+        """기록 중인 파일을 닫는다"""
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
@@ -0,0 +1,70 @@
+"""최근 항목만 보관하고 오래된 항목은 버리거나 파일로 내보내는 RetentionBuffer 클래스"""
+import json
+import sys
+from collections import deque
+
+
+class RetentionBuffer(deque):
+    """
+    최근 maxlen 개의 항목만 보관하는 deque
+
+    가득 찬 상태에서 항목이 추가되면 가장 오래된 항목이 버려지며,
+    spill_file이 지정된 경우 버려지는 항목을 JSON Lines 형식으로 파일 끝에 기록한다.
+    spill_file은 처음 기록할 때 줄 단위 버퍼링으로 한 번 열어서 버퍼가 해제되거나 close를
+    호출할 때까지 사용하며, pickle 할 때는 열린 파일을 제외한다.
+
+    maxlen: 보관할 최대 항목 수, None이면 제한 없이 보관
+    spill_file: 버려지는 항목을 기록할 파일 경로, None이면 기록하지 않음
+    dropped_count: 지금까지 버려진 항목 수
+    """
+
+    def __init__(self, iterable=(), maxlen=None, spill_file=None):
+        super().__init__(maxlen=maxlen)
+        self.spill_file = spill_file
+        self.spill_handle = None
+        self.dropped_count = 0
+        for item in iterable:
+            self.append(item)
+
+    def append(self, item):
+        """항목을 추가한다. 가득 찬 경우 가장 오래된 항목을 버린다"""
+        if self.maxlen is not None and len(self) == self.maxlen:
+            if self.spill_file is not None:
+                if self.spill_handle is None:
+                    self.spill_handle = open(self.spill_file, "a", buffering=1, encoding="utf-8")
+                self.spill_handle.write(json.dumps(self[0], default=str) + "\n")
+            self.dropped_count += 1
+        super().append(item)
+
+    def close(self):
+        """spill_file을 닫는다. 이후에 버려지는 항목이 있으면 다시 열어서 이어서 기록한다"""
+        if self.spill_handle is not None:
+            self.spill_handle.close()
+            self.spill_handle = None
+
+    def __del__(self):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["spill_handle"] = None
+        return state
+
+    def get_info(self):
+        """보관 상태 정보를 반환한다
+
+        Returns:
+        {
+            "count": 보관 중인 항목 수
+            "maxlen": 보관할 최대 항목 수
+            "dropped": 지금까지 버려진 항목 수
+            "size": 보관 중인 항목이 차지하는 대략적인 메모리 크기, Bytes
+        }
+        """
+        size = sys.getsizeof(self) + sum(sys.getsizeof(item) for item in self)
+        return {
+            "count": len(self),
+            "maxlen": self.maxlen,
+            "dropped": self.dropped_count,
+            "size": size,
+        }
@@ -0,0 +1,119 @@
+"""시뮬레이션 기간의 거래 데이터를 한 번만 로드해서 공유하는 SimulationContext 클래스"""
+
+from datetime import datetime, timedelta
+from .log_manager import LogManager
+from .data_repository import DataRepository
+from .candle_frame import CandleFrame
+
+
+class SimulationContext:
+    """
+    시뮬레이션 기간의 거래 데이터를 한 번만 로드해서
+    SimulationDataProvider와 VirtualMarket이 같은 CandleFrame을 공유하도록 해주는 클래스
+
+    market: 거래 시장 종류 e.g. KRW-BTC
+    repo: 데이터를 가져올 DataRepository, 처음 load 할 때 생성되며 프로세스별로 연결을 공유한다
+    read_only: True인 경우 읽기 전용으로 데이터베이스에 연결, 필요한 데이터가 미리 저장되어 있어야 한다
+    pragmas: 데이터베이스 연결에 적용할 pragma 딕셔너리
+    backend: DataRepository의 저장소 종류, sqlite 또는 archive
+    archive_dir: archive 저장소의 디렉토리
+    frame: 마지막으로 로드한 CandleFrame, 읽기 전용
+    prefetch_ranges: 한 번에 로드할 연속된 구간 목록, [start, end] 리스트
+    cache: prefetch_ranges 중 마지막으로 로드한 구간의 CandleFrame
+    """
+
+    AVAILABLE_CURRENCY = {"BTC": "KRW-BTC", "ETH": "KRW-ETH", "DOGE": "KRW-DOGE", "XRP": "KRW-XRP"}
+    ISO_DATEFORMAT = "%Y-%m-%dT%H:%M:%S"
+
+    def __init__(
+        self,
+        currency="BTC",
+        db_file="smtm.db",
+        read_only=False,
+        pragmas=None,
+        backend="sqlite",
+        archive_dir="smtm_archive",
+    ):
+        if currency not in self.AVAILABLE_CURRENCY:
+            raise UserWarning(f"not supported currency: {currency}")
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.market = self.AVAILABLE_CURRENCY[currency]
+        self.db_file = db_file
+        self.read_only = read_only
+        self.pragmas = pragmas
+        self.backend = backend
+        self.archive_dir = archive_dir
+        self.repo = None
+        self.frame = None
+        self.prefetch_ranges = []
+        self.cache = None
+        self.cache_range = None
+
+    def prefetch_periods(self, period_list):
+        """시뮬레이션 기간 목록을 겹치거나 맞닿은 구간끼리 합쳐서 미리 로드할 구간으로 등록한다
+
+        구간 전체를 한 번에 로드해두고 이후 load 요청은 메모리에서 잘라서 제공한다.
+        실제 로드는 해당 구간의 기간이 처음 요청될 때 수행된다.
+        period_list: [{"start": 시뮬레이션 기간 시작, "end": 시뮬레이션 기간 종료}]
+        """
+        self.prefetch_ranges = self.merge_periods(period_list)
+        self.cache = None
+        self.cache_range = None
+
+    @staticmethod
+    def merge_periods(period_list):
+        """시뮬레이션 기간 목록을 겹치거나 맞닿은 구간끼리 합쳐서 [start, end] 리스트로 반환"""
+        merged = []
+        for start, end in sorted((period["start"], period["end"]) for period in period_list):
+            if len(merged) > 0 and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return merged
+
+    def load(self, end, count):
+        """end 시점까지 count 분의 거래 데이터를 로드해서 CandleFrame으로 반환한다"""
+        end_dt = datetime.strptime(end, self.ISO_DATEFORMAT)
+        start = (end_dt - timedelta(minutes=count)).strftime(self.ISO_DATEFORMAT)
+
+        self.frame = self._get_cached_frame(start, end, count)
+        if self.frame is None:
+            self.frame = self._get_repo().get_frame(start, end, market=self.market)
+
+        self.logger.debug(f"simulation data is loaded {start} - {end}, {len(self.frame)}")
+        return self.frame
+
+    def _get_repo(self):
+        if self.repo is None:
+            self.repo = DataRepository(
+                self.db_file,
+                read_only=self.read_only,
+                pragmas=self.pragmas,
+                shared=True,
+                backend=self.backend,
+                archive_dir=self.archive_dir,
+            )
+        return self.repo
+
+    def _get_cached_frame(self, start, end, count):
+        is_cached = self.cache_range is not None
+        if not is_cached or not self.cache_range[0] <= start < end <= self.cache_range[1]:
+            target = None
+            for prefetch_range in self.prefetch_ranges:
+                if prefetch_range[0] <= start < end <= prefetch_range[1]:
+                    target = prefetch_range
+                    break
+
+            if target is None:
+                return None
+
+            self.logger.info(f"prefetch simulation data {target[0]} - {target[1]}")
+            self.cache = self._get_repo().get_frame(target[0], target[1], market=self.market)
+            self.cache_range = target
+
+        start_ts = CandleFrame.to_timestamp(start)
+        frame = self.cache.slice_time(start_ts, CandleFrame.to_timestamp(end))
+        if len(frame) != count:
+            self.logger.warning(f"invalid cached data {start} - {end}, {len(frame)} vs {count}")
+            return None
+        return frame
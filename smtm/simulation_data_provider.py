@@ -15,20 +15,29 @@ class SimulationDataProvider(DataProvider):
         if currency not in self.AVAILABLE_CURRENCY:
             raise UserWarning(f"not supported currency: {currency}")
         self.logger = LogManager.get_logger(__class__.__name__)
-        self.repo = DataRepository("smtm.db")
+        self.repo = None
         self.data = []
         self.index = 0
 
         self.market = self.AVAILABLE_CURRENCY[currency]
 
-    def initialize_simulation(self, end=None, count=100):
-        """DataRepository를 통해서 데이터를 가져와서 초기화한다"""
+    def initialize_simulation(self, end=None, count=100, frame=None):
+        """DataRepository를 통해서 데이터를 CandleFrame으로 가져와서 초기화한다
+
+        frame: SimulationContext에서 미리 로드한 CandleFrame, 전달된 경우 DataRepository를 사용하지 않는다
+        """
 
         self.index = 0
+        if frame is not None:
+            self.data = frame
+            return
+
+        if self.repo is None:
+            self.repo = DataRepository("smtm.db")
         end_dt = datetime.strptime(end, "%Y-%m-%dT%H:%M:%S")
         start_dt = end_dt - timedelta(minutes=count)
         start = start_dt.strftime("%Y-%m-%dT%H:%M:%S")
-        self.data = self.repo.get_data(start, end, market=self.market)
+        self.data = self.repo.get_frame(start, end, market=self.market)
 
     def get_info(self):
         """순차적으로 거래 정보 전달한다
@@ -51,5 +60,6 @@ class SimulationDataProvider(DataProvider):
             return None
 
         self.index = now + 1
-        self.logger.info(f'[DATA] @ {self.data[now]["date_time"]}')
-        return self.data[now]
+        info = dict(self.data[now])
+        self.logger.info(f'[DATA] @ {info["date_time"]}')
+        return info
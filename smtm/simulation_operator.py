@@ -10,8 +10,9 @@ class SimulationOperator(Operator):
     """각 모듈을 연동해 시뮬레이션을 진행하는 클래스"""
     PERIODIC_RECORD_INFO = (360, -1)  # (turn, index) e.g. (360, -1) 최근 6시간
     PERIODIC_RECORD_INTERVAL_TURN = 300
+    ASYNC_GRAPH = False
 
-    def __init__(self, periodic_record_enable=False):
+    def __init__(self, periodic_record_enable=False, report_enable=True):
         super().__init__()
         self.logger = LogManager.get_logger(__class__.__name__)
         self.turn = 0
@@ -19,16 +20,28 @@ class SimulationOperator(Operator):
         self.current_turn = 0
         self.last_periodic_turn = 0
         self.periodic_record_enable = periodic_record_enable
+        self.report_enable = report_enable
+        self.is_sync = False
 
     def _execute_trading(self, task):
-        """자동 거래를 실행 후 타이머를 실행한다
+        """자동 거래를 실행 후 타이머를 실행한다. 요청이 없어 턴이 중단되면 타이머를 실행하지 않는다
 
         simulation_terminated 상태는 시뮬레이션에만 존재하는 상태로서 시뮬레이션이 끝났으나
         Operator는 중지되지 않은 상태. Operator의 시작과 중지는 외부부터 실행되어야 한다.
         """
         del task
+        if self._execute_turn() is None:
+            return
+        self._start_timer()
+
+    def _execute_turn(self):
+        """한 턴의 거래를 수행한다
+
+        정상적으로 턴이 진행되지 않은 경우 False, 요청이 없어 턴을 중단한 경우 None을 반환한다
+        """
         self.logger.info(f"############# Simulation trading is started : {self.turn + 1}")
         self.is_timer_running = False
+        is_completed = True
         try:
             self.current_turn += 1
             trading_info = self.data_provider.get_info()
@@ -47,7 +60,7 @@ class SimulationOperator(Operator):
                 if result["msg"] == "game-over":
                     trading_info = self.data_provider.get_info()
                     self.analyzer.put_trading_info(trading_info)
-                    self.last_report = self.analyzer.create_report(tag=self.tag)
+                    self.last_report = self._make_last_report()
                     self.state = "simulation_terminated"
                     return
 
@@ -57,7 +70,7 @@ class SimulationOperator(Operator):
             target_request = self.strategy.get_request()
             if target_request is None:
                 self.logger.error("request should be submitted at simulation!")
-                return
+                return None
             self.trader.send_request(target_request, send_request_callback)
             self.analyzer.put_requests(target_request)
 
@@ -66,10 +79,43 @@ class SimulationOperator(Operator):
 
         except AttributeError as err:
             self.logger.error(f"excuting fail: {err}")
+            is_completed = False
 
         self.turn += 1
         self.logger.debug("############# Simulation trading is completed")
-        self._start_timer()
+        return is_completed
+
+    def _make_last_report(self):
+        """시뮬레이션 종료 시점의 보고서를 생성한다
+
+        report_enable이 False인 경우 보고서 파일과 그래프를 생성하지 않고 summary만 계산한다
+        """
+        if self.report_enable:
+            return self.analyzer.create_report(tag=self.tag)
+        return {"summary": self.analyzer.get_return_report()}
+
+    def run_sync(self):
+        """Worker 스레드와 타이머 없이 현재 스레드에서 시뮬레이션을 끝까지 수행한다
+
+        data_provider, strategy, trader, analyzer를 하나의 루프에서 차례대로 호출하므로
+        interval은 사용되지 않는다. 시뮬레이션이 종료되면 analyzer.create_report의 결과를 반환한다.
+        턴이 정상적으로 진행되지 않아 중단된 경우에도 그 시점까지의 보고서를 반환한다.
+        """
+        if self.state != "ready":
+            return None
+
+        self.logger.info("===== Start synchronous simulation =====")
+        self.is_sync = True
+        self.state = "running"
+        self.analyzer.make_start_point()
+        while self.state == "running":
+            if self._execute_turn() is not True:
+                self.logger.error("synchronous simulation is stopped by invalid turn")
+                self.last_report = self._make_last_report()
+                self.state = "simulation_terminated"
+
+        self.logger.info("===== Synchronous simulation is completed =====")
+        return self.last_report
 
     def get_score(self, callback, index_info=None, graph_tag=None):
         """현재 수익률을 인자로 전달받은 콜백함수를 통해 전달한다
@@ -114,9 +160,12 @@ class SimulationOperator(Operator):
             except TypeError as err:
                 self.logger.error(f"invalid callback: {err}")
 
-        self.worker.post_task(
-            {"runnable": get_score_callback, "callback": callback, "index_info": index_info}
-        )
+        task = {"runnable": get_score_callback, "callback": callback, "index_info": index_info}
+        if self.is_sync:
+            get_score_callback(task)
+            return
+
+        self.worker.post_task(task)
 
     def _periodic_internal_get_score(self):
         if self.current_turn - self.last_periodic_turn < self.PERIODIC_RECORD_INTERVAL_TURN:
@@ -25,9 +25,12 @@ class SimulationTrader(Trader):
         self.market = VirtualMarket(market=self.AVAILABLE_CURRENCY[currency])
         self.is_initialized = False
 
-    def initialize_simulation(self, end, count, budget):
-        """시뮬레이션기간, 횟수, 예산을 초기화 한다"""
-        self.market.initialize(end, count, budget)
+    def initialize_simulation(self, end, count, budget, frame=None):
+        """시뮬레이션기간, 횟수, 예산을 초기화 한다
+
+        frame: SimulationContext에서 미리 로드한 CandleFrame
+        """
+        self.market.initialize(end, count, budget, frame=frame)
         self.is_initialized = True
 
     def send_request(self, request_list, callback):
@@ -6,6 +6,7 @@ from . import (
     Analyzer,
     SimulationTrader,
     SimulationDataProvider,
+    SimulationContext,
     StrategyBuyAndHold,
     StrategySma0,
     StrategyRsi,
@@ -41,6 +42,7 @@ class Simulator:
         strategy=0,
         from_dash_to="201220.170000-201220.180000",
         currency="BTC",
+        sync=False,
     ):
         self.logger = LogManager.get_logger("Simulator")
         self.__terminating = False
@@ -52,6 +54,7 @@ class Simulator:
         self.budget = int(budget)
         self.need_init = True
         self.currency = currency
+        self.sync = sync
 
         self.interval = float(self.interval)
 
@@ -155,10 +158,12 @@ class Simulator:
         self.operator = SimulationOperator()
         self._print_configuration(strategy.NAME)
 
+        context = SimulationContext(currency=self.currency)
+        frame = context.load(end=end, count=count)
         data_provider = SimulationDataProvider(currency=self.currency)
-        data_provider.initialize_simulation(end=end, count=count)
+        data_provider.initialize_simulation(end=end, count=count, frame=frame)
         trader = SimulationTrader(currency=self.currency)
-        trader.initialize_simulation(end=end, count=count, budget=self.budget)
+        trader.initialize_simulation(end=end, count=count, budget=self.budget, frame=frame)
         analyzer = Analyzer()
         analyzer.is_simulation = True
         self.operator.initialize(
@@ -209,11 +214,18 @@ class Simulator:
         self._print("Good Bye~")
 
     def run_single(self):
-        """인터렉션 없이 초기 설정 값으로 단독 1회 실행"""
+        """인터렉션 없이 초기 설정 값으로 단독 1회 실행
+
+        sync가 True인 경우 Worker 스레드와 타이머 없이 현재 스레드에서 끝까지 실행
+        """
         self.initialize()
-        self.start()
-        while self.operator.state == "running":
-            time.sleep(0.5)
+        if self.sync:
+            self.logger.info("Synchronous simulation start! ================")
+            self.operator.run_sync()
+        else:
+            self.start()
+            while self.operator.state == "running":
+                time.sleep(0.5)
 
         self.terminate()
 
@@ -1,12 +1,20 @@
 """데이터를 기반으로 매매 결정을 생성하는 Strategy 추상클래스"""
+import os
 from abc import ABCMeta, abstractmethod
+from .retention_buffer import RetentionBuffer
 
 
 class Strategy(metaclass=ABCMeta):
     """
     데이터를 받아서 매매 판단을 하고 결과를 받아서 다음 판단에 반영하는 전략 클래스
+
+    거래 정보 data와 거래 결과 result는 set_retention으로 설정한 개수만큼만 보관한다.
+    RETENTION_COUNT: 기본 보관 개수, None이면 제한 없이 보관
     """
 
+    RETENTION_COUNT = 1440
+    RETENTION_KEYS = ("data", "result")
+
     @abstractmethod
     def initialize(self, budget, min_price=100, add_spot_callback=None):
         """예산을 설정하고 초기화한다
@@ -62,3 +70,31 @@ class Strategy(metaclass=ABCMeta):
             "date_time": 거래 체결 시간, 시뮬레이션 모드에서는 데이터 시간 +2초
         }
         """
+
+    def set_retention(self, count=RETENTION_COUNT, spill_dir=None):
+        """거래 정보 data와 거래 결과 result의 보관 정책을 설정한다
+
+        이미 보관 중인 항목은 최근 count 개만 새로운 버퍼로 옮긴다.
+        count: 보관할 최근 항목 수, None이면 제한 없이 보관
+        spill_dir: 보관 개수를 넘어 버려지는 항목을 {NAME}-{data|result}.jsonl 파일로 기록할
+            디렉토리, None이면 기록하지 않고 버린다
+        """
+        for key in self.RETENTION_KEYS:
+            spill_file = None
+            if spill_dir is not None:
+                os.makedirs(spill_dir, exist_ok=True)
+                name = getattr(self, "NAME", "strategy")
+                spill_file = os.path.join(spill_dir, f"{name}-{key}.jsonl")
+            setattr(self, key, RetentionBuffer(getattr(self, key, ()), count, spill_file))
+
+    def get_retention_info(self):
+        """set_retention으로 보관 중인 항목의 상태 정보를 반환한다
+
+        Returns: {"data": RetentionBuffer.get_info(), "result": RetentionBuffer.get_info()}
+        """
+        info = {}
+        for key in self.RETENTION_KEYS:
+            buffer = getattr(self, key, None)
+            if isinstance(buffer, RetentionBuffer):
+                info[key] = buffer.get_info()
+        return info
@@ -13,8 +13,8 @@ class StrategyBuyAndHold(Strategy):
     분할 매수 후 홀딩 하는 간단한 전략
 
     isInitialized: 최초 잔고는 초기화 할 때만 갱신 된다
-    data: 거래 데이터 리스트, OHLCV 데이터
-    result: 거래 요청 결과 리스트
+    data: 최근 거래 데이터 RetentionBuffer, OHLCV 데이터
+    result: 최근 거래 요청 결과 RetentionBuffer
     request: 마지막 거래 요청
     budget: 시작 잔고
     balance: 현재 잔고
@@ -28,13 +28,12 @@ class StrategyBuyAndHold(Strategy):
     def __init__(self):
         self.is_intialized = False
         self.is_simulation = False
-        self.data = []
         self.budget = 0
         self.balance = 0.0
         self.min_price = 0
-        self.result = []
         self.request = None
         self.logger = LogManager.get_logger(__class__.__name__)
+        self.set_retention(self.RETENTION_COUNT)
         self.waiting_requests = {}
 
     def update_trading_info(self, info):
@@ -54,7 +53,7 @@ class StrategyBuyAndHold(Strategy):
         """
         if self.is_intialized is not True:
             return
-        self.data.append(copy.deepcopy(info))
+        self.data.append(copy.copy(info))
 
     def update_result(self, result):
         """요청한 거래의 결과를 업데이트
@@ -95,7 +94,7 @@ class StrategyBuyAndHold(Strategy):
             self.logger.info(f"price: {result['price']}, amount: {result['amount']}")
             self.logger.info(f"total: {total}, balance: {self.balance}")
             self.logger.info("================================================")
-            self.result.append(copy.deepcopy(result))
+            self.result.append(copy.copy(result))
         except (AttributeError, TypeError) as msg:
             self.logger.error(msg)
 
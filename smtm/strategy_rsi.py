@@ -2,16 +2,18 @@
 import copy
 import math
 from datetime import datetime
-import numpy as np
 from .strategy import Strategy
 from .log_manager import LogManager
 from .date_converter import DateConverter
+from .indicators import Rsi
 
 
 class StrategyRsi(Strategy):
     """
     RSI Relativce Strength Index 상대 강도 지수를 활용한 매매 전략
     http://www.investopedia.com/terms/r/rsi.asp
+
+    rsi: 종가로 RSI_COUNT 기간의 RSI를 계산하는 Rsi 지표, 초기화 할 때 생성된다
     """
 
     ISO_DATEFORMAT = "%Y-%m-%dT%H:%M:%S"
@@ -24,16 +26,14 @@ class StrategyRsi(Strategy):
     def __init__(self):
         self.is_intialized = False
         self.is_simulation = False
-        self.rsi_info = None
-        self.rsi = []
-        self.data = []
-        self.result = []
+        self.rsi = None
         self.add_spot_callback = None
         self.budget = 0
         self.balance = 0
         self.asset_amount = 0
         self.min_price = 0
         self.logger = LogManager.get_logger(__class__.__name__)
+        self.set_retention(self.RETENTION_COUNT)
         self.waiting_requests = {}
         self.position = None
 
@@ -48,6 +48,7 @@ class StrategyRsi(Strategy):
             return
 
         self.is_intialized = True
+        self.rsi = Rsi(self.RSI_COUNT)
         self.budget = budget
         self.balance = budget
         self.min_price = min_price
@@ -152,7 +153,7 @@ class StrategyRsi(Strategy):
         """
         if self.is_intialized is not True or info is None:
             return
-        self.data.append(copy.deepcopy(info))
+        self.data.append(copy.copy(info))
         self._update_rsi(info["closing_price"])
         self._update_position()
 
@@ -161,56 +162,24 @@ class StrategyRsi(Strategy):
 
         기본적으로 low보다 낮으면 최선을 다해 매수, high보다 높으면 최선을 다해 매도하도록 함
         """
-        if self.rsi_info is None:
+        if self.rsi.value is None:
             self.position = None
-        elif self.rsi[-1] < self.RSI_LOW:
+        elif self.rsi.value < self.RSI_LOW:
             self.position = "buy"
-            self.logger.debug(f"[RSI] Update position to BUY {self.rsi[-1]}")
-        elif self.rsi[-1] > self.RSI_HIGH:
+            self.logger.debug(f"[RSI] Update position to BUY {self.rsi.value}")
+        elif self.rsi.value > self.RSI_HIGH:
             self.position = "sell"
-            self.logger.debug(f"[RSI] Update position to SELL {self.rsi[-1]}")
+            self.logger.debug(f"[RSI] Update position to SELL {self.rsi.value}")
 
     def _update_rsi(self, price):
         """전달 받은 종가 정보로 rsi 정보를 업데이트"""
-
-        # 필요 갯수만큼 데이터 채우기
-        if len(self.rsi) < self.RSI_COUNT:
+        if self.rsi.update(price) is None:
             self.logger.debug(f"[RSI] Fill to ready {price}")
-            self.rsi.append(price)
             return
 
-        # 초기값을 생성
-        if len(self.rsi) == self.RSI_COUNT:
-            self.logger.debug(f"[RSI] Make seed {price}")
-            self.rsi.append(price)
-            deltas = np.diff(self.rsi)
-            up_avg = deltas[deltas >= 0].sum() / self.RSI_COUNT
-            down_avg = -deltas[deltas < 0].sum() / self.RSI_COUNT
-            r_strength = up_avg / down_avg
-            self.rsi_info = (down_avg, up_avg, price)
-            for i in range(len(self.rsi)):
-                self.rsi[i] = 100.0 - 100.0 / (1.0 + r_strength)
-            return
-
-        # 최신 RSI 업데이트
-        if self.rsi_info is not None:
-            up_val = 0.0
-            down_val = 0.0
-            delta = price - self.rsi_info[2]
-
-            if delta > 0:
-                up_val = delta
-            else:
-                down_val = -delta
-
-            down_avg = (self.rsi_info[0] * (self.RSI_COUNT - 1) + down_val) / self.RSI_COUNT
-            up_avg = (self.rsi_info[1] * (self.RSI_COUNT - 1) + up_val) / self.RSI_COUNT
-
-            r_strength = up_avg / down_avg
-            self.rsi.append(100.0 - 100.0 / (1.0 + r_strength))
-            self.rsi_info = (down_avg, up_avg, price)
-            self.logger.debug(f"[RSI] Update RSI {self.rsi_info}, {self.rsi[-1]}")
-            return
+        self.logger.debug(
+            f"[RSI] Update RSI {self.rsi.down_avg.value}, {self.rsi.up_avg.value}, {self.rsi.value}"
+        )
 
     def update_result(self, result):
         """요청한 거래의 결과를 업데이트
@@ -259,7 +228,7 @@ class StrategyRsi(Strategy):
             self.logger.info(f"price: {price}, amount: {amount}")
             self.logger.info(f"balance: {self.balance}, asset_amount: {self.asset_amount}")
             self.logger.info("================================================")
-            self.result.append(copy.deepcopy(result))
+            self.result.append(copy.copy(result))
         except (AttributeError, TypeError) as msg:
             self.logger.error(msg)
 
@@ -3,11 +3,11 @@
 import copy
 from datetime import datetime
 import math
-import pandas as pd
 import numpy as np
 from .strategy import Strategy
 from .log_manager import LogManager
 from .date_converter import DateConverter
+from .indicators import RollingWindow, Sma
 
 
 class StrategySma0(Strategy):
@@ -15,14 +15,17 @@ class StrategySma0(Strategy):
     이동 평균선을 이용한 기본 전략
 
     is_intialized: 최초 잔고는 초기화 할 때만 갱신 된다
-    data: 거래 데이터 리스트, OHLCV 데이터
-    result: 거래 요청 결과 리스트
+    data: 최근 거래 데이터 RetentionBuffer, OHLCV 데이터
+    result: 최근 거래 요청 결과 RetentionBuffer
     request: 마지막 거래 요청
     budget: 시작 잔고
     balance: 현재 잔고
     min_price: 최소 주문 금액
     current_process: 현재 진행해야 할 매매 타입, buy, sell
     process_unit: 분할 매매를 진행할 단위
+    price_count: 지금까지 업데이트된 거래 가격의 개수
+    sma_list: 단기, 중기, 장기 이동 평균 Sma
+    sma_long_history: 표준편차 계산을 위한 최근 장기 이동 평균 RollingWindow
     """
 
     ISO_DATEFORMAT = "%Y-%m-%dT%H:%M:%S"
@@ -39,17 +42,18 @@ class StrategySma0(Strategy):
     def __init__(self):
         self.is_intialized = False
         self.is_simulation = False
-        self.data = []
         self.budget = 0
         self.balance = 0
         self.asset_amount = 0
         self.min_price = 0
-        self.result = []
         self.request = None
         self.current_process = "ready"
-        self.closing_price_list = []
+        self.price_count = 0
+        self.sma_list = None
+        self.sma_long_history = None
         self.process_unit = (0, 0)  # budget and amount
         self.logger = LogManager.get_logger(__class__.__name__)
+        self.set_retention(self.RETENTION_COUNT)
         self.waiting_requests = {}
         self.cross_info = [{"price": 0, "index": 0}, {"price": 0, "index": 0}]
         self.add_spot_callback = None
@@ -71,7 +75,7 @@ class StrategySma0(Strategy):
         """
         if self.is_intialized is not True:
             return
-        self.data.append(copy.deepcopy(info))
+        self.data.append(copy.copy(info))
         self.__update_process(info)
 
     @staticmethod
@@ -88,20 +92,26 @@ class StrategySma0(Strategy):
     def __update_process(self, info):
         try:
             current_price = info["closing_price"]
-            current_idx = len(self.closing_price_list)
+            current_idx = self.price_count
             self.logger.info(f"# update process :: {current_idx}")
-            self.closing_price_list.append(current_price)
-            feeded_list = copy.deepcopy(self.closing_price_list)
-            for i in range(self.PREDICT_N):
-                feeded_list.append(current_price)
-
-            sma_short = pd.Series(feeded_list).rolling(self.SHORT).mean().values[-1]
-            sma_mid = pd.Series(feeded_list).rolling(self.MID).mean().values[-1]
-            sma_long_list = pd.Series(feeded_list).rolling(self.LONG).mean().values
+            self.price_count += 1
+            for sma in self.sma_list:
+                sma.update(current_price)
+
+            short, mid, long = self.sma_list
+            if long.value is not None:
+                self.sma_long_history.append(long.value)
+
+            if any(sma.value is None for sma in self.sma_list):
+                return
+
+            sma_short = short.predict(current_price, self.PREDICT_N)[-1]
+            sma_mid = mid.predict(current_price, self.PREDICT_N)[-1]
+            sma_long_list = long.predict(current_price, self.PREDICT_N)
             sma_long = sma_long_list[-1]
 
             self.logger.debug(f"[SMA] Start current index {current_idx}")
-            if np.isnan(sma_long) or current_idx + 1 < self.LONG:
+            if current_idx + 1 < self.LONG:
                 return
 
             if sma_short > sma_mid > sma_long and self.current_process != "buy":
@@ -117,8 +127,9 @@ class StrategySma0(Strategy):
                     if deviation_count > self.STD_K:
                         deviation_count = self.STD_K
 
+                    sma_long_list = self.sma_long_history.values() + sma_long_list
                     std_ratio = self._get_deviation_ratio(
-                        np.std(sma_long_list[-deviation_count:]), sma_long_list[-1]
+                        np.std(sma_long_list[-deviation_count:]), sma_long
                     )
 
                     if std_ratio > self.STD_RATIO:
@@ -189,7 +200,7 @@ class StrategySma0(Strategy):
             self.logger.info(f"price: {price}, amount: {amount}")
             self.logger.info(f"balance: {self.balance}, asset_amount: {self.asset_amount}")
             self.logger.info("================================================")
-            self.result.append(copy.deepcopy(result))
+            self.result.append(copy.copy(result))
         except (AttributeError, TypeError) as msg:
             self.logger.error(msg)
 
@@ -343,6 +354,8 @@ class StrategySma0(Strategy):
             return
 
         self.is_intialized = True
+        self.sma_list = (Sma(self.SHORT), Sma(self.MID), Sma(self.LONG))
+        self.sma_long_history = RollingWindow(max(self.STD_K - self.PREDICT_N, 1))
         self.budget = budget
         self.balance = budget
         self.min_price = min_price
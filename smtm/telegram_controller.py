@@ -20,6 +20,7 @@ from . import (
     StrategySma0,
     StrategyRsi,
     Operator,
+    TradeJournal,
 )
 
 load_dotenv()
@@ -39,7 +40,7 @@ class TelegramController:
     UPBIT_CURRENCY = ["BTC", "ETH", "DOGE", "XRP"]
     BITHUMB_CURRENCY = ["BTC", "ETH"]
 
-    def __init__(self):
+    def __init__(self, journal=False):
         LogManager.set_stream_level(30)
         self.logger = LogManager.get_logger("TelegramController")
         self.post_worker = Worker("Chatbot-Post-Worker")
@@ -61,6 +62,8 @@ class TelegramController:
         self.command_list = []
         self._create_command()
         self.currency = None
+        self.use_journal = journal
+        self.journal = None
 
     def _create_command(self):
         """명령어 정보를 생성한다"""
@@ -319,11 +322,12 @@ class TelegramController:
             def _on_exception(msg):
                 self.on_exception(msg)
             self.operator = Operator(on_exception=_on_exception)
+            self.journal = TradeJournal() if self.use_journal else None
             self.operator.initialize(
                 self.data_provider,
                 self.strategy,
                 self.trader,
-                Analyzer(),
+                Analyzer(journal=self.journal),
                 budget=self.budget,
             )
             self.operator.set_interval(self.INTERVAL)
@@ -370,6 +374,9 @@ class TelegramController:
         last_report = None
         if self.operator is not None:
             last_report = self.operator.stop()
+        if self.journal is not None:
+            self.journal.stop()
+            self.journal = None
         self.in_progress = None
         self.in_progress_step = 0
         self.operator = None
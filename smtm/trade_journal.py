@@ -0,0 +1,173 @@
+"""Analyzer의 기록을 Database 파일에 백그라운드로 저장하는 TradeJournal 클래스"""
+import json
+import queue
+import threading
+import traceback
+from datetime import datetime
+from .database import Database
+from .log_manager import LogManager
+from .record_table import RecordTable
+
+
+class TradeJournal:
+    """
+    Analyzer의 기록을 Database 파일의 journal 테이블에 write-behind 방식으로 저장하는 클래스
+
+    put은 기록을 대기열에 넣고 바로 반환하며, 기록 스레드가 대기 중인 기록을 최대 batch_size개씩
+    모아서 한 번의 트랜잭션으로 저장한다. 기록은 세션, 목록 이름, 목록별 순번 seq, date_time을
+    초 단위로 변환한 ts와 함께 JSON으로 저장하므로 프로세스가 비정상 종료되어도 저장된 기록은 남고,
+    다른 프로그램에서도 세션의 전체 기록을 조회할 수 있다. 튜플은 {"__tuple__": [...]}로 저장해서
+    읽을 때 튜플로 복원한다.
+    조회는 대기 중인 기록을 모두 저장한 후 기록 스레드와 다른 연결로 읽는다.
+
+    db_file: 기록할 Database 파일, None이면 Database 기본 파일
+    session: 기록을 구분할 세션 이름, None이면 생성 시간
+    batch_size: 한 번에 저장할 최대 기록 수
+    """
+
+    BATCH_SIZE = 256
+
+    def __init__(self, db_file=None, session=None, batch_size=BATCH_SIZE):
+        self.logger = LogManager.get_logger(__class__.__name__)
+        self.db_file = db_file
+        self.session = session or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.database = None
+
+    def put(self, name, seq, record):
+        """기록 저장을 요청하고 바로 반환한다
+
+        name: 기록 목록 이름
+        seq: 목록별 기록 순번
+        record: 저장 요청 후 변경되지 않는 기록 딕셔너리
+        """
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._looper, name="Trade-Journal", daemon=True
+                )
+                self.thread.start()
+        self.queue.put((name, seq, record))
+
+    def flush(self):
+        """대기 중인 기록이 모두 저장될 때까지 기다린다"""
+        self.queue.join()
+
+    def stop(self):
+        """대기 중인 기록을 모두 저장한 후 기록 스레드를 종료한다"""
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join()
+
+    def get_records(
+        self, name, start_seq=0, end_seq=None, start_ts=None, end_ts=None, by_time=False
+    ):
+        """저장된 기록을 seq 순서로 하나씩 반환한다
+
+        end_seq: 포함하지 않는 마지막 순번
+        start_ts, end_ts: 포함하는 초 단위 시간 구간, None이면 제한 없음
+        by_time: True이면 ts, seq 순서로 반환
+        """
+        self.flush()
+        for data in self._get_database().query_journal(
+            self.session,
+            name,
+            start_seq=start_seq,
+            end_seq=end_seq,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            by_time=by_time,
+        ):
+            yield json.loads(data, object_hook=self._restore_tuple)
+
+    def count(self, name, start_seq=0):
+        """start_seq 이후 저장된 기록 수를 반환한다"""
+        self.flush()
+        return self._get_database().count_journal(self.session, name, start_seq)
+
+    def get_view(self, name, start_seq=0):
+        """start_seq 이후의 기록을 시간 순서로 읽을 수 있는 JournalView를 반환한다"""
+        return JournalView(self, name, start_seq)
+
+    def _get_database(self):
+        with self.lock:
+            if self.database is None:
+                self.database = Database(self.db_file)
+                self.database.create_journal_table()
+            return self.database
+
+    def _looper(self):
+        database = Database(self.db_file)
+        database.create_journal_table()
+        is_stopped = False
+        while not is_stopped:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            is_stopped = batch[-1] is None
+            rows = []
+            for item in batch:
+                if item is None:
+                    continue
+                try:
+                    rows.append(self._make_row(*item))
+                except Exception:
+                    self.logger.error(f"journal encode fail: {item[0]} {item[1]}")
+
+            try:
+                database.insert_journal(rows)
+            except Exception:
+                self.logger.error(f"journal write fail: {traceback.format_exc()}")
+
+            for _ in batch:
+                self.queue.task_done()
+        self.logger.debug("trade journal is terminated")
+
+    def _make_row(self, name, seq, record):
+        timestamp = RecordTable.to_timestamp(record.get("date_time"))
+        data = json.dumps(self._encode(record), ensure_ascii=False, default=str)
+        return (self.session, name, seq, timestamp, data)
+
+    @classmethod
+    def _encode(cls, value):
+        if isinstance(value, dict):
+            return {key: cls._encode(item) for key, item in value.items()}
+        if isinstance(value, tuple):
+            return {"__tuple__": [cls._encode(item) for item in value]}
+        if isinstance(value, list):
+            return [cls._encode(item) for item in value]
+        return value
+
+    @staticmethod
+    def _restore_tuple(item):
+        if len(item) == 1 and "__tuple__" in item:
+            return tuple(item["__tuple__"])
+        return item
+
+
+class JournalView:
+    """TradeJournal에 저장된 목록을 시간 순서로 읽는 가벼운 뷰
+
+    리스트처럼 len과 순회를 지원하며, 순회할 때마다 journal 테이블에서 하나씩 읽어온다.
+    """
+
+    def __init__(self, journal, name, start_seq=0):
+        self.journal = journal
+        self.name = name
+        self.start_seq = start_seq
+
+    def __len__(self):
+        return self.journal.count(self.name, self.start_seq)
+
+    def __iter__(self):
+        return self.journal.get_records(self.name, start_seq=self.start_seq, by_time=True)
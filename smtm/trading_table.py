@@ -0,0 +1,235 @@
+"""보고서의 거래 기록 테이블을 병합하고 파일로 출력하는 TradingTable 클래스"""
+import csv
+import heapq
+import io
+import json
+from itertools import islice
+from operator import itemgetter
+from .record_table import RecordTable
+
+
+class TradingTable:
+    """
+    시간 순서로 저장된 레코드 목록들을 하나의 거래 기록 테이블로 병합하는 클래스
+
+    목록들을 합치거나 정렬된 리스트를 새로 만들지 않고, 순회할 때마다 각 목록을 date_time, kind
+    순서로 k-way merge 하면서 레코드를 하나씩 만든다. 시간 순서로 저장된 RecordTable은 정렬하지
+    않으므로 병합에 필요한 추가 메모리는 목록 수에 비례한다.
+    write는 병합된 레코드를 BUFFER_LINES 줄씩 모아서 파일에 기록한다.
+    리스트처럼 len, 인덱스, 순회를 지원하며 인덱스로 읽으면 처음부터 다시 병합한다.
+
+    record_lists: date_time, kind 항목을 갖는 레코드 목록들. 같은 시간이면 kind, 목록 순서로 정렬
+        RecordTable과 리스트가 아닌 목록은 len을 지원하고 시간 순서로 순회된다고 간주한다
+    """
+
+    FORMATS = ("txt", "csv", "jsonl", "parquet")
+    BUFFER_LINES = 1024
+    TEXT_TITLE = "### TRADING TABLE =================================\n"
+    COLUMNS = (
+        "date_time",
+        "kind",
+        "id",
+        "type",
+        "price",
+        "amount",
+        "msg",
+        "opening_price",
+        "high_price",
+        "low_price",
+        "closing_price",
+        "acc_price",
+        "acc_volume",
+        "balance",
+        "cumulative_return",
+        "price_change_ratio",
+        "asset",
+    )
+    NUMBER_COLUMNS = (
+        "price",
+        "amount",
+        "opening_price",
+        "high_price",
+        "low_price",
+        "closing_price",
+        "acc_price",
+        "acc_volume",
+        "balance",
+        "cumulative_return",
+    )
+
+    def __init__(self, *record_lists):
+        self.record_lists = record_lists
+
+    def write(self, file, report_format="txt"):
+        """병합된 레코드를 report_format 형식으로 기록한다
+
+        file: 파일 경로 또는 텍스트 모드로 열린 파일 객체, parquet은 파일 경로만 가능
+        report_format:
+            txt: 보고서의 TRADING TABLE 형식, 레코드가 없으면 아무것도 기록하지 않는다
+            csv: COLUMNS 헤더와 레코드별 한 줄, 거래 결과의 id는 요청 id
+            jsonl: 레코드별 JSON 한 줄
+            parquet: COLUMNS 컬럼을 갖는 parquet 파일, pyarrow가 설치된 경우에만 사용 가능
+        """
+        if report_format not in self.FORMATS:
+            raise UserWarning(f"unsupported report format: {report_format}")
+
+        if report_format == "parquet":
+            self._write_parquet(file)
+            return
+
+        if report_format == "txt":
+            lines = self._iter_text_lines()
+        elif report_format == "csv":
+            lines = self._iter_csv_lines()
+        else:
+            lines = self._iter_json_lines()
+
+        if isinstance(file, str):
+            with open(file, "w") as output:
+                self._write_lines(output, lines)
+        else:
+            self._write_lines(file, lines)
+
+    def _write_lines(self, output, lines):
+        for chunk in self._iter_chunks(lines):
+            output.write("".join(chunk))
+
+    def _iter_chunks(self, items):
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, self.BUFFER_LINES))
+            if len(chunk) == 0:
+                return
+            yield chunk
+
+    def _iter_text_lines(self):
+        for pos, item in enumerate(self):
+            if pos == 0:
+                yield self.TEXT_TITLE
+
+            if item["kind"] == 0:
+                yield f"{item['date_time']}, {item['opening_price']}, {item['high_price']}, {item['low_price']}, {item['closing_price']}, {item['acc_price']}, {item['acc_volume']}\n"
+            elif item["kind"] == 1:
+                yield f"{item['date_time']}, [->] {item['id']}, {item['type']}, {item['price']}, {item['amount']}\n"
+            elif item["kind"] == 2:
+                yield f"{item['date_time']}, [<-] {item['request']['id']}, {item['type']}, {item['price']}, {item['amount']}, {item['msg']}\n"
+            elif item["kind"] == 3:
+                yield f"{item['date_time']}, [#] {item['balance']}, {item['cumulative_return']}, {item['price_change_ratio']}, {item['asset']}\n"
+
+    def _iter_csv_lines(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+
+        def make_line(row):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(row)
+            return buffer.getvalue()
+
+        yield make_line(self.COLUMNS)
+        for record in self:
+            yield make_line(self._make_row(record))
+
+    def _iter_json_lines(self):
+        for record in self:
+            yield json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+    def _write_parquet(self, file_path):
+        # parquet 보고서를 사용하지 않는 경우 필요 없도록 사용할 때 import
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise UserWarning("pyarrow is required for parquet report") from err
+
+        types = {name: pa.float64() for name in self.NUMBER_COLUMNS}
+        types["kind"] = pa.int64()
+        schema = pa.schema([(name, types.get(name, pa.string())) for name in self.COLUMNS])
+        with pq.ParquetWriter(file_path, schema) as writer:
+            for chunk in self._iter_chunks(map(self._make_parquet_row, self)):
+                writer.write_batch(pa.RecordBatch.from_pylist(chunk, schema=schema))
+
+    def _make_row(self, record):
+        row = [record.get(name) for name in self.COLUMNS]
+        if record["kind"] == 2:
+            row[2] = record["request"]["id"]
+        return row
+
+    def _make_parquet_row(self, record):
+        row = {}
+        for name, value in zip(self.COLUMNS, self._make_row(record)):
+            if value is not None and name in self.NUMBER_COLUMNS:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    value = None
+            elif value is not None and name != "kind":
+                value = str(value)
+            row[name] = value
+        return row
+
+    @staticmethod
+    def _iter_keyed_records(record_list):
+        """레코드 목록을 ((timestamp, kind), record) 순서로 하나씩 반환한다
+
+        시간 순서로 저장된 RecordTable과 정렬된 목록은 그대로 순회하고, 그 외의 목록은 정렬된 위치
+        목록을 만든다
+        """
+        if not isinstance(record_list, (RecordTable, list)):
+            for record in record_list:
+                yield (RecordTable.to_timestamp(record["date_time"]), record["kind"]), record
+            return
+
+        if isinstance(record_list, RecordTable):
+            timestamps = record_list.timestamps
+            if record_list.is_sorted:
+                for timestamp, record in zip(timestamps, record_list):
+                    yield (timestamp, record["kind"]), record
+                return
+        else:
+            timestamps = [RecordTable.to_timestamp(record["date_time"]) for record in record_list]
+
+        if isinstance(record_list, RecordTable) and record_list.kind is not None:
+            order = sorted(range(len(record_list)), key=timestamps.__getitem__)
+        else:
+            order = sorted(
+                range(len(record_list)), key=lambda pos: (timestamps[pos], record_list[pos]["kind"])
+            )
+
+        for pos in order:
+            record = record_list[pos]
+            yield (timestamps[pos], record["kind"]), record
+
+    def __iter__(self):
+        merged = heapq.merge(*map(self._iter_keyed_records, self.record_lists), key=itemgetter(0))
+        for _, record in merged:
+            yield record
+
+    def __len__(self):
+        return sum(len(record_list) for record_list in self.record_lists)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step < 0:
+                return list(self)[index]
+            return list(islice(self, start, stop, step))
+
+        if index < 0:
+            index += len(self)
+        for record in islice(self, max(index, 0), None):
+            if index >= 0:
+                return record
+        raise IndexError("trading table index out of range")
+
+    def __eq__(self, other):
+        if isinstance(other, (TradingTable, RecordTable)):
+            other = list(other)
+        if not isinstance(other, list):
+            return NotImplemented
+        return list(self) == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
@@ -10,7 +10,7 @@ class VirtualMarket:
 
     end: 거래기간의 끝
     count: 거래기간까지 가져올 데이터의 갯수
-    data: 사용될 거래 정보 목록
+    data: 사용될 거래 정보 목록, CandleFrame
     turn_count: 현재까지 진행된 턴수
     balance: 잔고
     commission_ratio: 수수료율
@@ -21,7 +21,7 @@ class VirtualMarket:
 
     def __init__(self, market="KRW-BTC"):
         self.logger = LogManager.get_logger(__class__.__name__)
-        self.repo = DataRepository("smtm.db")
+        self.repo = None
         self.data = None
         self.turn_count = 0
         self.balance = 0
@@ -30,17 +30,23 @@ class VirtualMarket:
         self.is_initialized = False
         self.market = market
 
-    def initialize(self, end=None, count=100, budget=0):
+    def initialize(self, end=None, count=100, budget=0, frame=None):
         """
         실제 거래소에서 거래 데이터를 가져와서 초기화한다
 
         end: 언제까지의 거래기간 정보를 사용할 것인지에 대한 날짜 시간 정보
         count: 거래기간까지 가져올 데이터의 갯수
+        frame: SimulationContext에서 미리 로드한 CandleFrame, 전달된 경우 DataRepository를 사용하지 않는다
         """
-        end_dt = datetime.strptime(end, "%Y-%m-%dT%H:%M:%S")
-        start_dt = end_dt - timedelta(minutes=count)
-        start = start_dt.strftime("%Y-%m-%dT%H:%M:%S")
-        self.data = self.repo.get_data(start, end, market=self.market)
+        if frame is not None:
+            self.data = frame
+        else:
+            end_dt = datetime.strptime(end, "%Y-%m-%dT%H:%M:%S")
+            start_dt = end_dt - timedelta(minutes=count)
+            start = start_dt.strftime("%Y-%m-%dT%H:%M:%S")
+            if self.repo is None:
+                self.repo = DataRepository("smtm.db")
+            self.data = self.repo.get_frame(start, end, market=self.market)
         self.balance = budget
         self.is_initialized = True
         self.logger.debug(f"Virtual Market is initialized end: {end}, count: {count}")
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from array import array
+from contextlib import closing
+from smtm import AnalyzerCheckpoint, RecordTable
+
+
+class AnalyzerCheckpointTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmpdir.name, "mango.db")
+        self.table = RecordTable(("id", "price", "date_time"), kind=1, float_fields=("price",))
+        self.records = [{"balance": 500, "asset": {"mango": (1, 2.5)}}]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def append_records(self, start, count):
+        for idx in range(start, start + count):
+            self.table.append({"id": idx, "price": 1.5, "date_time": f"2020-04-30T17:0{idx}:00"})
+
+    def get_chunks(self):
+        with closing(sqlite3.connect(self.file_path)) as conn:
+            return conn.execute(
+                "SELECT name, start, count FROM chunk ORDER BY name, start"
+            ).fetchall()
+
+    def test_save_should_append_only_new_records_and_load_should_restore_lists(self):
+        checkpoint = AnalyzerCheckpoint(self.file_path)
+        self.append_records(0, 2)
+        checkpoint.save({"request_list": self.table, "asset_info_list": self.records}, state="kiwi")
+        self.append_records(2, 3)
+        self.table.append({"id": "no price"})
+        checkpoint.save(
+            {"request_list": self.table, "asset_info_list": self.records}, state="apple"
+        )
+
+        self.assertEqual(
+            self.get_chunks(),
+            [("asset_info_list", 0, 1), ("request_list", 0, 2), ("request_list", 2, 4)],
+        )
+        record_lists, state = AnalyzerCheckpoint(self.file_path).load()
+        self.assertEqual(state, "apple")
+        self.assertEqual(record_lists["asset_info_list"], self.records)
+        loaded = record_lists["request_list"]
+        self.assertIsInstance(loaded, RecordTable)
+        self.assertEqual(loaded, self.table)
+        self.assertEqual(loaded[-1], {"id": "no price", "kind": 1})
+        self.assertEqual(list(loaded.timestamps), list(self.table.timestamps))
+        self.assertFalse(loaded.is_sorted)
+
+    def test_save_should_write_again_when_list_is_replaced(self):
+        checkpoint = AnalyzerCheckpoint(self.file_path)
+        self.append_records(0, 3)
+        checkpoint.save({"request_list": self.table})
+        self.table = RecordTable(("id", "price", "date_time"), kind=1)
+        self.append_records(5, 1)
+        checkpoint.save({"request_list": self.table})
+
+        self.assertEqual(self.get_chunks(), [("request_list", 0, 1)])
+        self.assertEqual(AnalyzerCheckpoint(self.file_path).load()[0]["request_list"], self.table)
+
+    def test_save_should_write_again_when_front_records_are_dropped(self):
+        checkpoint = AnalyzerCheckpoint(self.file_path)
+        self.append_records(0, 3)
+        checkpoint.save({"request_list": self.table})
+        self.table.drop(2)
+        self.append_records(3, 2)
+        checkpoint.save({"request_list": self.table})
+
+        self.assertEqual(self.get_chunks(), [("request_list", 0, 3)])
+        self.assertEqual(AnalyzerCheckpoint(self.file_path).load()[0]["request_list"], self.table)
+
+    def test_save_should_continue_after_load(self):
+        self.append_records(0, 2)
+        AnalyzerCheckpoint(self.file_path).save({"request_list": self.table})
+        checkpoint = AnalyzerCheckpoint(self.file_path)
+        loaded = checkpoint.load()[0]["request_list"]
+        loaded.append({"id": 2, "price": 1.5, "date_time": "2020-04-30T17:02:00"})
+        checkpoint.save({"request_list": loaded})
+
+        self.assertEqual(self.get_chunks(), [("request_list", 0, 2), ("request_list", 2, 1)])
+
+    def test_save_should_write_columns_with_typecode_and_json(self):
+        self.append_records(0, 2)
+        AnalyzerCheckpoint(self.file_path).save(
+            {"request_list": self.table, "asset_info_list": self.records},
+            state={"start_asset_info": self.records[0]},
+        )
+
+        with closing(sqlite3.connect(self.file_path)) as conn:
+            columns = conn.execute(
+                "SELECT pos, typecode, data FROM chunk_column ORDER BY pos"
+            ).fetchall()
+            chunks = conn.execute(
+                "SELECT name, fields, kind, is_sorted, records FROM chunk ORDER BY name"
+            ).fetchall()
+        self.assertEqual(columns[0], (-1, "q", array("q", [1588266000, 1588266060]).tobytes()))
+        self.assertEqual(columns[1], (0, None, b"[0, 1]"))
+        self.assertEqual(columns[2], (1, "d", array("d", [1.5, 1.5]).tobytes()))
+        self.assertEqual(columns[3][:2], (2, None))
+        self.assertEqual(
+            chunks,
+            [
+                (
+                    "asset_info_list",
+                    None,
+                    None,
+                    None,
+                    '[{"balance": 500, "asset": {"mango": {"__tuple__": [1, 2.5]}}}]',
+                ),
+                ("request_list", '["id", "price", "date_time"]', 1, 1, "[null, null]"),
+            ],
+        )
+        self.assertEqual(
+            AnalyzerCheckpoint(self.file_path).load()[1], {"start_asset_info": self.records[0]}
+        )
+
+    def test_save_should_replace_file_of_different_version(self):
+        with closing(sqlite3.connect(self.file_path)) as conn:
+            with conn:
+                conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value BLOB)")
+                conn.execute("INSERT INTO meta(key, value) VALUES ('version', 1)")
+                conn.execute("CREATE TABLE chunk (name TEXT, start INTEGER, data BLOB)")
+                conn.execute("INSERT INTO chunk(name, start, data) VALUES ('request_list', 0, '')")
+
+        self.append_records(0, 1)
+        AnalyzerCheckpoint(self.file_path).save({"request_list": self.table})
+
+        self.assertEqual(self.get_chunks(), [("request_list", 0, 1)])
+        self.assertEqual(AnalyzerCheckpoint(self.file_path).load()[0]["request_list"], self.table)
+
+    def test_load_should_raise_UserWarning_when_version_is_different_or_file_not_exist(self):
+        with self.assertRaises(UserWarning):
+            AnalyzerCheckpoint(self.file_path).load()
+
+        AnalyzerCheckpoint(self.file_path).save({"asset_info_list": self.records})
+        with closing(sqlite3.connect(self.file_path)) as conn:
+            with conn:
+                conn.execute("UPDATE meta SET value = 0 WHERE key = 'version'")
+
+        with self.assertRaises(UserWarning):
+            AnalyzerCheckpoint(self.file_path).load()
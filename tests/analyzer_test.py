@@ -1,7 +1,8 @@
 import os
 import copy
+import tempfile
 import unittest
-from smtm import Analyzer, analyzer
+from smtm import Analyzer, TradeJournal, analyzer
 from unittest.mock import *
 from datetime import datetime, timedelta
 
@@ -120,6 +121,20 @@ class AnalyzerTests(unittest.TestCase):
         analyzer.update_asset_info.assert_not_called()
         analyzer.get_asset_info_func.assert_not_called()
 
+    def test_make_periodic_record_should_use_date_time_of_last_info_in_simulation(self):
+        analyzer = Analyzer()
+        analyzer.is_simulation = True
+        analyzer.update_asset_info = MagicMock()
+        analyzer.asset_info_list.append({"balance": 5000.0, "date_time": "2020-04-30T17:00:00"})
+        analyzer.info_list.append({"date_time": "2020-04-30T17:01:00"})
+
+        analyzer.make_periodic_record()
+        analyzer.update_asset_info.assert_not_called()
+
+        analyzer.info_list.append({"date_time": "2020-04-30T17:01:01"})
+        analyzer.make_periodic_record()
+        analyzer.update_asset_info.assert_called_once()
+
     def test_put_result_append_only_success_result(self):
         analyzer = Analyzer()
         analyzer.initialize("mango")
@@ -210,9 +225,9 @@ class AnalyzerTests(unittest.TestCase):
     def test_make_start_point_clear_asset_info_and_request_result(self):
         analyzer = Analyzer()
         analyzer.update_asset_info = MagicMock()
-        analyzer.request_list.append("mango")
-        analyzer.result_list.append("banana")
-        analyzer.asset_info_list.append("apple")
+        analyzer.request_list.append({"id": "mango"})
+        analyzer.result_list.append({"msg": "banana"})
+        analyzer.asset_info_list.append({"balance": "apple"})
         analyzer.make_start_point()
         self.assertEqual(len(analyzer.request_list), 0)
         self.assertEqual(len(analyzer.result_list), 0)
@@ -614,6 +629,54 @@ class AnalyzerTests(unittest.TestCase):
 
         analyzer.update_asset_info.assert_called_once()
 
+    def test_get_return_report_should_request_graph_to_graph_renderer(self):
+        analyzer = Analyzer()
+        analyzer.initialize("mango")
+        analyzer.is_simulation = True
+        self.fill_test_data_for_report(analyzer)
+        analyzer.update_asset_info = MagicMock()
+        renderer = MagicMock()
+        callback = MagicMock()
+
+        report = analyzer.get_return_report(
+            graph_filename="mango.jpg",
+            graph_renderer=renderer,
+            callback=callback,
+            graph_key="mango",
+        )
+
+        self.assertEqual(report[4], "mango.jpg")
+        callback.assert_not_called()
+        snapshot, destination, on_rendered = renderer.render.call_args[0]
+        self.assertEqual(destination, "mango.jpg")
+        self.assertEqual(renderer.render.call_args[1]["key"], "mango")
+        self.assertIn("Close", snapshot["plot_data"].columns)
+        self.assertEqual(snapshot["sma_info"], analyzer.sma_info)
+        on_rendered(None)
+        callback.assert_called_once_with(report[:4] + (None,) + report[5:])
+
+    def test_get_return_report_should_make_same_plot_data_for_last_graph_window(self):
+        analyzer = Analyzer()
+        analyzer.initialize("mango")
+        analyzer.is_simulation = True
+        self.fill_test_data_for_report(analyzer)
+        analyzer.update_asset_info = MagicMock()
+        analyzer.GRAPH_MAX_COUNT = 2
+        renderer = MagicMock()
+
+        analyzer.get_return_report(graph_filename="mango.jpg", graph_renderer=renderer)
+        window = renderer.render.call_args[0][0]["plot_data"]
+        analyzer.info_list = list(analyzer.info_list)
+        analyzer.result_list = list(analyzer.result_list)
+        analyzer.score_list = list(analyzer.score_list)
+        analyzer.spot_list = list(analyzer.spot_list)
+        analyzer.get_return_report(graph_filename="mango.jpg", graph_renderer=renderer)
+        expected = renderer.render.call_args[0][0]["plot_data"]
+
+        self.assertEqual(len(window), 2)
+        self.assertEqual(sorted(window.columns), sorted(expected.columns))
+        self.assertTrue(window[expected.columns].equals(expected))
+
     @patch("mplfinance.plot")
     def test_get_return_report_return_correct_report_with_index(self, mock_plot):
         """
@@ -935,11 +998,8 @@ class AnalyzerTests(unittest.TestCase):
             "Price_change_ratio {'mango': -66.667, 'apple': -99.85}\n",
         ]
 
-        for idx, val in enumerate(expected):
-            self.assertEqual(
-                handle.write.call_args_list[idx][0][0],
-                val,
-            )
+        written = "".join(call[0][0] for call in handle.write.call_args_list)
+        self.assertEqual(written.splitlines(keepends=True)[: len(expected)], expected)
 
         report = analyzer.create_report(tag=tag)
         mock_file.assert_called_with(analyzer.OUTPUT_FOLDER + tag + ".txt", "w")
@@ -947,6 +1007,46 @@ class AnalyzerTests(unittest.TestCase):
         analyzer.update_asset_info.assert_called()
         analyzer._get_rss_memory.assert_called()
 
+    @patch("mplfinance.plot")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_create_report_write_trading_table_to_separate_file_when_format_is_not_txt(
+        self, mock_file, mock_plot
+    ):
+        analyzer = Analyzer()
+        analyzer._get_rss_memory = MagicMock(return_value=123.45678)
+        analyzer.REPORT_FORMAT = "jsonl"
+        analyzer.initialize("mango")
+        analyzer.update_asset_info = MagicMock()
+        self.fill_test_data_for_report(analyzer)
+
+        analyzer.create_report(tag="orange")
+
+        mock_file.assert_any_call(analyzer.OUTPUT_FOLDER + "orange.txt", "w")
+        mock_file.assert_called_with(analyzer.OUTPUT_FOLDER + "orange.jsonl", "w")
+        written = "".join(call[0][0] for call in mock_file().write.call_args_list)
+        self.assertNotIn("### TRADING TABLE", written)
+        self.assertIn("### SUMMARY", written)
+        self.assertIn('"kind": 3', written)
+
+    @patch("mplfinance.plot")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_create_report_write_strategy_retention_info_in_debug_info(self, mock_file, mock_plot):
+        analyzer = Analyzer()
+        analyzer._get_rss_memory = MagicMock(return_value=123.45678)
+        strategy_info = {
+            "data": {"count": 1440, "maxlen": 1440, "dropped": 60, "size": 2048},
+            "result": {"count": 2, "maxlen": 1440, "dropped": 0, "size": 512},
+        }
+        analyzer.initialize("mango", get_strategy_info_func=MagicMock(return_value=strategy_info))
+        analyzer.update_asset_info = MagicMock()
+        self.fill_test_data_for_report(analyzer)
+
+        analyzer.create_report()
+        written = [call[0][0] for call in mock_file().write.call_args_list]
+        self.assertIn("strategy data: 1440 / 1440, dropped: 60, size: 2.0 KB\n", written)
+        self.assertIn("strategy result: 2 / 1440, dropped: 0, size: 0.5 KB\n", written)
+        analyzer.get_strategy_info_func.assert_called_once()
+
     @patch("mplfinance.make_addplot")
     @patch("mplfinance.plot")
     @patch("builtins.open", new_callable=mock_open)
@@ -1449,23 +1549,42 @@ class AnalyzerTests(unittest.TestCase):
         mock_file.assert_called_with("mango_dump_file")
         self.assertEqual(dummy_list, [{"mango": 500}, {"orange": 7.7}])
 
-    def test_dump_call_should_call__write_to_file_correctly(self):
+    @patch("smtm.AnalyzerCheckpoint.save")
+    def test_dump_call_should_save_lists_to_checkpoint(self, mock_save):
         analyzer = Analyzer()
-        analyzer._write_to_file = MagicMock()
+        analyzer.start_asset_info = "kiwi"
         analyzer.dump("mango")
-        called = analyzer._write_to_file.call_args_list
-        self.assertEqual(called[0][0][0], "mango.1")
-        self.assertEqual(called[1][0][0], "mango.2")
-        self.assertEqual(called[2][0][0], "mango.3")
-        self.assertEqual(called[3][0][0], "mango.4")
-        self.assertEqual(called[4][0][0], "mango.5")
-        self.assertEqual(called[0][0][1], analyzer.request_list)
-        self.assertEqual(called[1][0][1], analyzer.result_list)
-        self.assertEqual(called[2][0][1], analyzer.info_list)
-        self.assertEqual(called[3][0][1], analyzer.asset_info_list)
-        self.assertEqual(called[4][0][1], analyzer.score_list)
+        analyzer.dump("mango")
+
+        self.assertEqual(list(analyzer.checkpoints), ["mango"])
+        self.assertEqual(analyzer.checkpoints["mango"].file_path, "mango.db")
+        self.assertEqual(mock_save.call_count, 2)
+        record_lists = mock_save.call_args[0][0]
+        self.assertIs(record_lists["request_list"], analyzer.request_list)
+        self.assertIs(record_lists["result_list"], analyzer.result_list)
+        self.assertIs(record_lists["info_list"], analyzer.info_list)
+        self.assertIs(record_lists["asset_info_list"], analyzer.asset_info_list)
+        self.assertIs(record_lists["score_list"], analyzer.score_list)
+        self.assertIs(record_lists["spot_list"], analyzer.spot_list)
+        self.assertEqual(mock_save.call_args[1]["state"], {"start_asset_info": "kiwi"})
+
+    @patch("smtm.AnalyzerCheckpoint.load")
+    @patch("os.path.exists", return_value=True)
+    def test_load_dump_should_load_lists_from_checkpoint(self, mock_exists, mock_load):
+        analyzer = Analyzer()
+        mock_load.return_value = (
+            {"request_list": "a", "score_list": "e", "unknown": "f"},
+            {"start_asset_info": "kiwi"},
+        )
+        analyzer.load_dump("mango")
 
-    def test_load_dump_call_should_call__load_list_from_file_correctly(self):
+        mock_exists.assert_called_with("mango.db")
+        self.assertEqual(analyzer.request_list, "a")
+        self.assertEqual(analyzer.score_list, "e")
+        self.assertEqual(analyzer.start_asset_info, "kiwi")
+        self.assertFalse(hasattr(analyzer, "unknown"))
+
+    def test_load_dump_call_should_call__load_list_from_file_when_checkpoint_not_exist(self):
         analyzer = Analyzer()
         analyzer._load_list_from_file = MagicMock(side_effect=["a", "b", "c", "d", "e"])
         analyzer.load_dump("mango")
@@ -1481,6 +1600,112 @@ class AnalyzerTests(unittest.TestCase):
         self.assertEqual(analyzer.asset_info_list, "d")
         self.assertEqual(analyzer.score_list, "e")
 
+    def feed_trading_records(self, analyzer, count, start=0):
+        asset_info = {
+            "balance": 10000,
+            "asset": {},
+            "quote": {"mango": 500},
+            "date_time": "2020-04-30T16:59:00",
+        }
+        analyzer.initialize(lambda: dict(asset_info))
+        if start == 0:
+            analyzer.make_start_point()
+        for minute in range(start, start + count):
+            date_time = (datetime(2020, 4, 30, 17) + timedelta(minutes=minute)).isoformat()
+            price = 500 + (minute * 7) % 13
+            asset_info.update(
+                {
+                    "balance": 10000 - minute * 10,
+                    "asset": {"mango": (500, minute * 0.1)},
+                    "quote": {"mango": price},
+                    "date_time": date_time,
+                }
+            )
+            analyzer.put_trading_info(
+                {
+                    "market": "mango",
+                    "date_time": date_time,
+                    "opening_price": price,
+                    "high_price": price,
+                    "low_price": price,
+                    "closing_price": price,
+                    "acc_price": price,
+                    "acc_volume": 1,
+                }
+            )
+            request = {
+                "id": f"mango-{minute}",
+                "type": "buy",
+                "price": price,
+                "amount": 0.1,
+                "date_time": date_time,
+            }
+            analyzer.put_requests([request])
+            analyzer.put_result(
+                {
+                    "request": request,
+                    "type": "buy",
+                    "price": price,
+                    "amount": 0.1,
+                    "msg": "success",
+                    "date_time": date_time,
+                }
+            )
+            analyzer.add_drawing_spot(date_time, price)
+
+    @patch("pandas.to_datetime")
+    @patch("pandas.DataFrame")
+    @patch("mplfinance.plot")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_journal_should_keep_reports_same_after_records_are_trimmed(
+        self, mock_file, mock_plot, mock_DataFrame, mock_to_datetime
+    ):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            journal = TradeJournal(os.path.join(tmpdir, "mango.db"), session="mango")
+            expected = Analyzer()
+            trimmed = Analyzer(journal=journal)
+            trimmed.JOURNAL_KEEP_COUNT = 5
+            for item in (expected, trimmed):
+                item._get_rss_memory = MagicMock(return_value=123.45678)
+            self.feed_trading_records(expected, 30)
+            self.feed_trading_records(trimmed, 30)
+
+            self.assertLess(len(trimmed.info_list), 10)
+            self.assertLess(len(trimmed.score_list), 10)
+            self.assertEqual(trimmed.get_return_report(), expected.get_return_report())
+            for index_info in ((10, 0), (10, 1), (7, -1), (50, 0)):
+                self.assertEqual(
+                    trimmed.get_return_report(index_info=index_info),
+                    expected.get_return_report(index_info=index_info),
+                )
+            report = trimmed.create_report(tag="mango")
+            expected_report = expected.create_report(tag="mango")
+            self.assertEqual(report["summary"], expected_report["summary"])
+            self.assertEqual(list(report["trading_table"]), list(expected_report["trading_table"]))
+            journal.stop()
+            journal.database.conn.close()
+
+    def test_dump_should_save_trimmed_records_correctly_with_journal(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            journal = TradeJournal(os.path.join(tmpdir, "mango.db"), session="mango")
+            analyzer = Analyzer(journal=journal)
+            analyzer.JOURNAL_KEEP_COUNT = 5
+            dump_file = os.path.join(tmpdir, "dump")
+            self.feed_trading_records(analyzer, 8)
+            analyzer.dump(dump_file)
+            self.feed_trading_records(analyzer, 6, start=8)
+            analyzer.dump(dump_file)
+
+            loaded = Analyzer()
+            loaded.load_dump(dump_file)
+            for name in Analyzer.DUMP_LISTS:
+                self.assertEqual(getattr(loaded, name), getattr(analyzer, name))
+            self.assertEqual(
+                [info["date_time"][-5:-3] for info in loaded.info_list],
+                ["05", "06", "07", "08", "09", "10", "11", "12", "13"],
+            )
+            journal.stop()
+
     def test__get_min_max_return_should_return_min_max_tuple(self):
         dummy = [
             {"cumulative_return": 1},
@@ -1492,3 +1717,20 @@ class AnalyzerTests(unittest.TestCase):
         result = Analyzer._get_min_max_return(dummy)
         self.assertEqual(result[0], -21312)
         self.assertEqual(result[1], 4.55555555)
+
+    def test_get_metrics_should_return_compact_metrics(self):
+        analyzer = Analyzer()
+        analyzer.score_list = [
+            {"cumulative_return": 0},
+            {"cumulative_return": 10},
+            {"cumulative_return": -1},
+            {"cumulative_return": 5.5},
+            {"cumulative_return": 3},
+        ]
+        analyzer.result_list = ["a", "b", "c"]
+
+        self.assertEqual(analyzer.get_metrics(), (3.0, -1.0, 10.0, 3, -10.0))
+
+    def test_get_metrics_should_return_None_tuple_when_score_is_empty(self):
+        analyzer = Analyzer()
+        self.assertEqual(analyzer.get_metrics(), (None, None, None, None, None))
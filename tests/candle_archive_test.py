@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from smtm import CandleArchive
+from unittest.mock import *
+
+
+class CandleArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive_dir = os.path.join(self.tmpdir.name, "archive")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @staticmethod
+    def make_dummy_data(market, date_time_list):
+        return [
+            {
+                "market": market,
+                "date_time": date_time,
+                "opening_price": float(idx),
+                "high_price": float(idx) + 1,
+                "low_price": float(idx) - 1,
+                "closing_price": float(idx) + 0.5,
+                "acc_price": 1000.0,
+                "acc_volume": 1.0,
+            }
+            for idx, date_time in enumerate(date_time_list)
+        ]
+
+    def test_update_should_make_column_files_of_month(self):
+        archive = CandleArchive(self.archive_dir)
+        archive.update(self.make_dummy_data("mango", ["2020-03-10 22:52:00"]))
+
+        month_dir = os.path.join(self.archive_dir, "mango", "60", "2020-03")
+        self.assertEqual(
+            sorted(os.listdir(month_dir)),
+            sorted(f"{name}.npy" for name in CandleArchive.DTYPES),
+        )
+        self.assertEqual(len(np.load(os.path.join(month_dir, "ts.npy"))), 31 * 24 * 60)
+
+    def test_query_should_return_data_like_database(self):
+        archive = CandleArchive(self.archive_dir)
+        data = self.make_dummy_data("mango", ["2020-03-10T22:53:00", "2020-03-10T22:52:00"])
+        data[0]["recovered"] = 1
+        archive.update(data)
+
+        result = archive.query("2020-03-10 22:00:00", "2020-03-10 23:00:00", "mango")
+
+        self.assertEqual(
+            result,
+            [
+                {
+                    "period": 60,
+                    "recovered": 0,
+                    "market": "mango",
+                    "date_time": "2020-03-10 22:52:00",
+                    "opening_price": 1.0,
+                    "high_price": 2.0,
+                    "low_price": 0.0,
+                    "closing_price": 1.5,
+                    "acc_price": 1000.0,
+                    "acc_volume": 1.0,
+                },
+                {
+                    "period": 60,
+                    "recovered": 1,
+                    "market": "mango",
+                    "date_time": "2020-03-10 22:53:00",
+                    "opening_price": 0.0,
+                    "high_price": 1.0,
+                    "low_price": -1.0,
+                    "closing_price": 0.5,
+                    "acc_price": 1000.0,
+                    "acc_volume": 1.0,
+                },
+            ],
+        )
+        self.assertEqual(archive.query("2020-03-10 22:00:00", "2020-03-10 23:00:00", "kiwi"), [])
+
+    def test_query_columns_should_return_read_only_view_of_file_in_a_month(self):
+        CandleArchive(self.archive_dir).update(
+            self.make_dummy_data(
+                "mango", ["2020-03-10 22:52:00", "2020-03-10 22:53:00", "2020-03-10 22:54:00"]
+            )
+        )
+        archive = CandleArchive(self.archive_dir, read_only=True)
+
+        columns = archive.query_columns("2020-03-10 22:52:00", "2020-03-10 22:54:00", "mango")
+
+        self.assertEqual(columns["ts"].tolist(), [1583880720, 1583880780])
+        self.assertEqual(columns["ts"].dtype, np.int64)
+        self.assertEqual(columns["closing_price"].tolist(), [0.5, 1.5])
+        self.assertFalse(columns["closing_price"].flags.writeable)
+        file_column = archive.files[("mango", 60, "2020-03", "closing_price")]
+        self.assertTrue(np.shares_memory(columns["closing_price"], file_column))
+
+    def test_query_columns_should_concatenate_months_and_skip_empty_slots(self):
+        archive = CandleArchive(self.archive_dir)
+        archive.update(
+            self.make_dummy_data(
+                "mango", ["2020-03-31 23:58:00", "2020-04-01 00:00:00", "2020-04-01 00:01:00"]
+            )
+        )
+
+        columns = archive.query_columns("2020-03-31 23:58:00", "2020-04-01 00:02:00", "mango")
+
+        self.assertEqual(columns["ts"].tolist(), [1585699080, 1585699200, 1585699260])
+        self.assertEqual(columns["opening_price"].tolist(), [0.0, 1.0, 2.0])
+
+    def test_get_missing_ranges_should_return_empty_slots(self):
+        archive = CandleArchive(self.archive_dir)
+        archive.update(
+            self.make_dummy_data(
+                "mango", ["2020-03-31 23:10:00", "2020-03-31 23:11:00", "2020-04-01 00:30:00"]
+            )
+        )
+
+        self.assertEqual(
+            archive.get_missing_ranges("2020-03-31 23:00:00", "2020-04-01 01:00:00", "mango"),
+            [
+                ("2020-03-31 23:00:00", "2020-03-31 23:10:00"),
+                ("2020-03-31 23:12:00", "2020-04-01 00:30:00"),
+                ("2020-04-01 00:31:00", "2020-04-01 01:00:00"),
+            ],
+        )
+        self.assertEqual(
+            archive.get_missing_ranges("2020-03-31 23:10:00", "2020-03-31 23:12:00", "mango"), []
+        )
+        self.assertEqual(
+            archive.get_missing_ranges("2020-05-01 00:00:00", "2020-05-01 00:10:00", "mango"),
+            [("2020-05-01 00:00:00", "2020-05-01 00:10:00")],
+        )
+
+    def test_update_should_raise_UserWarning_when_read_only(self):
+        archive = CandleArchive(self.archive_dir, read_only=True)
+        with self.assertRaises(UserWarning):
+            archive.update(self.make_dummy_data("mango", ["2020-03-10 22:52:00"]))
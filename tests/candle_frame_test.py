@@ -0,0 +1,119 @@
+import unittest
+import numpy as np
+from smtm import CandleFrame
+
+
+class CandleFrameTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    @staticmethod
+    def get_dummy_records():
+        return [
+            {
+                "market": "KRW-BTC",
+                "date_time": "2020-03-10T22:52:00",
+                "opening_price": 9777000.0,
+                "high_price": 9778000.0,
+                "low_price": 9763000.0,
+                "closing_price": 9778000.0,
+                "acc_price": 11277224.71063,
+                "acc_volume": 1.15377852,
+            },
+            {
+                "market": "KRW-BTC",
+                "date_time": "2020-03-10 22:53:00",
+                "opening_price": 8777000.0,
+                "high_price": 8778000.0,
+                "low_price": 8763000.0,
+                "closing_price": 8778000.0,
+                "acc_price": 21277224.71063,
+                "acc_volume": 2.15377852,
+            },
+            {
+                "market": "KRW-BTC",
+                "date_time": "2020-03-10T22:54:00",
+                "opening_price": 7777000.0,
+                "high_price": 7778000.0,
+                "low_price": 7763000.0,
+                "closing_price": 7778000.0,
+                "acc_price": 31277224.71063,
+                "acc_volume": 3.15377852,
+            },
+        ]
+
+    def test_from_records_should_make_columns_correctly(self):
+        frame = CandleFrame.from_records(self.get_dummy_records())
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame.market, "KRW-BTC")
+        self.assertEqual(frame.timestamp.dtype, np.int64)
+        self.assertEqual(frame.timestamp.tolist(), [1583880720, 1583880780, 1583880840])
+        self.assertEqual(frame.columns["closing_price"].dtype, np.float64)
+        self.assertEqual(
+            frame.columns["closing_price"].tolist(), [9778000.0, 8778000.0, 7778000.0]
+        )
+
+    def test_from_records_should_make_empty_frame_with_empty_list(self):
+        frame = CandleFrame.from_records([], market="KRW-ETH")
+        self.assertEqual(len(frame), 0)
+        self.assertEqual(frame.market, "KRW-ETH")
+        self.assertEqual(frame.to_records(), [])
+
+    def test_columns_should_be_read_only(self):
+        frame = CandleFrame.from_records(self.get_dummy_records())
+        with self.assertRaises(ValueError):
+            frame.columns["closing_price"][0] = 1
+        with self.assertRaises(ValueError):
+            frame.timestamp[0] = 1
+
+    def test_getitem_should_return_row_with_get_info_contract(self):
+        records = self.get_dummy_records()
+        frame = CandleFrame.from_records(records)
+        row = frame[1]
+        self.assertEqual(row["market"], "KRW-BTC")
+        self.assertEqual(row["date_time"], "2020-03-10T22:53:00")
+        self.assertEqual(row["low_price"], 8763000.0)
+        self.assertEqual(type(row["low_price"]), float)
+        self.assertEqual(frame[-1]["date_time"], "2020-03-10T22:54:00")
+        records[1]["date_time"] = "2020-03-10T22:53:00"
+        self.assertEqual(dict(row), records[1])
+        self.assertEqual(row, records[1])
+
+    def test_getitem_should_raise_error_with_invalid_index_or_key(self):
+        frame = CandleFrame.from_records(self.get_dummy_records())
+        with self.assertRaises(IndexError):
+            frame[3]
+        with self.assertRaises(IndexError):
+            frame[-4]
+        with self.assertRaises(KeyError):
+            frame[0]["trade_price"]
+
+    def test_getitem_should_return_frame_view_with_slice(self):
+        frame = CandleFrame.from_records(self.get_dummy_records())
+        sliced = frame[1:]
+        self.assertEqual(len(sliced), 2)
+        self.assertEqual(sliced[0]["date_time"], "2020-03-10T22:53:00")
+        self.assertTrue(np.shares_memory(sliced.columns["high_price"], frame.columns["high_price"]))
+
+    def test_slice_time_should_return_frame_view_in_time_range(self):
+        frame = CandleFrame.from_records(self.get_dummy_records())
+        sliced = frame.slice_time(1583880780, 1583880840)
+        self.assertEqual(len(sliced), 1)
+        self.assertEqual(sliced[0]["date_time"], "2020-03-10T22:53:00")
+        self.assertTrue(np.shares_memory(sliced.timestamp, frame.timestamp))
+        self.assertEqual(len(frame.slice_time(1583880000, 1583890000)), 3)
+        self.assertEqual(len(frame.slice_time(1583890000, 1583899000)), 0)
+
+    def test_to_records_should_return_dictionary_list(self):
+        records = self.get_dummy_records()
+        records[1]["date_time"] = "2020-03-10T22:53:00"
+        frame = CandleFrame.from_records(records)
+        self.assertEqual(frame.to_records(), records)
+
+    def test_timestamp_conversion_should_be_reversible(self):
+        timestamp = CandleFrame.to_timestamp("2020-03-10T22:52:00")
+        self.assertEqual(timestamp, 1583880720)
+        self.assertEqual(CandleFrame.to_date_time_string(timestamp), "2020-03-10T22:52:00")
@@ -1,9 +1,77 @@
+import json
+import os
 import requests
+import tempfile
+import threading
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import numpy as np
 from smtm import DataRepository
 from unittest.mock import *
 
+WORK_DIR = None
+CWD = None
+
+
+def setUpModule():
+    global WORK_DIR, CWD
+    WORK_DIR = tempfile.TemporaryDirectory()
+    CWD = os.getcwd()
+    os.chdir(WORK_DIR.name)
+
+
+def tearDownModule():
+    os.chdir(CWD)
+    WORK_DIR.cleanup()
+
+
+class StubUpbitHandler(BaseHTTPRequestHandler):
+    """업비트 분봉 조회 API를 흉내내는 테스트용 핸들러, 처음 throttle_count개의 요청은 429로 응답한다"""
+
+    request_list = []
+    throttle_count = 1
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        with self.lock:
+            self.request_list.append(query)
+            is_throttled = len(self.request_list) <= self.throttle_count
+
+        if is_throttled:
+            self.send_response(429)
+            self.end_headers()
+            return
+
+        to_dt = datetime.strptime(query["to"][0], "%Y-%m-%dT%H:%M:%SZ") + timedelta(hours=9)
+        body = []
+        for i in range(1, int(query["count"][0]) + 1):
+            candle_dt = to_dt - timedelta(minutes=i)
+            price = float(candle_dt.hour * 100 + candle_dt.minute)
+            body.append(
+                {
+                    "market": query["market"][0],
+                    "candle_date_time_kst": candle_dt.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "opening_price": price,
+                    "high_price": price + 1,
+                    "low_price": price - 1,
+                    "trade_price": price,
+                    "candle_acc_trade_price": 1000.0,
+                    "candle_acc_trade_volume": 1.0,
+                }
+            )
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
 
 class DataRepositoryTests(unittest.TestCase):
     def setUp(self):
@@ -213,13 +281,16 @@ class DataRepositoryTests(unittest.TestCase):
             ("2020-03-20T00:00:00", "2020-03-21T00:00:00", 10),
         ]
         repo.database = MagicMock()
-        repo.database.query.return_value = []
-        repo._fetch_from_upbit = MagicMock(
-            return_value=[
-                {"content": "mango", "date_time": "2020-03-20T00:00:00"},
-                {"content": "banana", "date_time": "2020-03-20 00:01:00"},
-            ]
-        )
+        repo.database.get_missing_ranges.return_value = [
+            ("2020-02-20 17:00:15", "2020-02-20 17:10:15"),
+            ("2020-02-20 21:00:15", "2020-02-20 22:00:15"),
+        ]
+        repo.database.query.return_value = [
+            {"content": "mango", "date_time": "2020-03-20T00:00:00"},
+            {"content": "banana", "date_time": "2020-03-20 00:01:00"},
+        ]
+        repo._fetch_missing_ranges = MagicMock()
+        repo._fetch_from_upbit = MagicMock()
         result = repo.get_data("2020-02-20T17:00:15", "2020-02-20T22:00:15", "mango")
 
         self.assertEqual(
@@ -232,9 +303,156 @@ class DataRepositoryTests(unittest.TestCase):
         mock_to_end_min.assert_called_once_with(
             start_iso="2020-02-20T17:00:15", end_iso="2020-02-20T22:00:15"
         )
-        repo._fetch_from_upbit.assert_called_once_with(
-            "2020-02-20T17:00:15", "2020-02-20T22:00:15", "mango"
+        repo.database.get_missing_ranges.assert_called_once_with(
+            "2020-02-20 17:00:15", "2020-02-20 22:00:15", "mango"
+        )
+        repo._fetch_missing_ranges.assert_called_once_with(
+            [
+                ("2020-02-20T17:00:15", "2020-02-20T17:10:15"),
+                ("2020-02-20T21:00:15", "2020-02-20T22:00:15"),
+            ],
+            "mango",
+        )
+        repo._fetch_from_upbit.assert_not_called()
+
+    def test__fetch_missing_ranges_should_fetch_and_update_only_missing_chunks(self):
+        repo = DataRepository()
+        repo._update = MagicMock()
+        repo._fetch_from_upbit_up_to_200 = MagicMock(side_effect=[["kiwi"], ["pear"], ["melon"]])
+        repo._recovery_upbit_data = MagicMock(side_effect=[["orange"], ["apple"], ["banana"]])
+
+        repo._fetch_missing_ranges(
+            [
+                ("2020-03-20T00:00:00", "2020-03-20T00:10:00"),
+                ("2020-03-20T10:00:00", "2020-03-20T13:30:00"),
+            ],
+            "mango_market",
+        )
+
+        self.assertEqual(
+            repo._fetch_from_upbit_up_to_200.call_args_list,
+            [
+                call("2020-03-20T00:10:00", 10, "mango_market"),
+                call("2020-03-20T13:20:00", 200, "mango_market"),
+                call("2020-03-20T13:30:00", 10, "mango_market"),
+            ],
+        )
+        self.assertEqual(
+            repo._recovery_upbit_data.call_args_list[1][0],
+            (["pear"], "2020-03-20T10:00:00", 200, "mango_market"),
+        )
+        self.assertEqual(
+            repo._update.call_args_list, [call(["orange"]), call(["apple"]), call(["banana"])]
+        )
+
+    def test_get_frame_should_return_candle_frame_from_database_columns(self):
+        repo = DataRepository()
+        repo.database = MagicMock()
+        repo.database.get_missing_ranges.return_value = []
+        repo.database.query_columns.return_value = {
+            "ts": np.array([1584662400, 1584662460], dtype=np.int64),
+            "opening_price": np.array([1000.0, 2000.0]),
+            "high_price": np.array([1100.0, 2100.0]),
+            "low_price": np.array([900.0, 1900.0]),
+            "closing_price": np.array([1050.0, 2050.0]),
+            "acc_price": np.array([5000.0, 6000.0]),
+            "acc_volume": np.array([5.0, 3.0]),
+        }
+        repo._fetch_missing_ranges = MagicMock()
+
+        frame = repo.get_frame("2020-03-20T00:00:00", "2020-03-20T00:02:00", "mango")
+
+        repo.database.query_columns.assert_called_once_with(
+            "2020-03-20 00:00:00", "2020-03-20 00:02:00", "mango"
+        )
+        repo.database.query.assert_not_called()
+        repo._fetch_missing_ranges.assert_not_called()
+        self.assertEqual(len(frame), 2)
+        self.assertEqual(frame.market, "mango")
+        self.assertEqual(frame[0]["date_time"], "2020-03-20T00:00:00")
+        self.assertEqual(frame[1]["date_time"], "2020-03-20T00:01:00")
+        self.assertEqual(frame[1]["closing_price"], 2050.0)
+
+    def test_get_frame_should_raise_UserWarning_when_database_has_too_many_data(self):
+        repo = DataRepository()
+        repo.database = MagicMock()
+        repo.database.get_missing_ranges.return_value = []
+        repo.database.query_columns.return_value = {"ts": np.arange(3)}
+
+        with self.assertRaises(UserWarning):
+            repo.get_frame("2020-03-20T00:00:00", "2020-03-20T00:02:00", "mango")
+
+    def test_get_frame_should_return_candle_frame_from_records_in_verify_mode(self):
+        repo = DataRepository()
+        repo.verify_mode = True
+        repo._get_records = MagicMock(
+            return_value=[
+                {
+                    "market": "mango",
+                    "date_time": "2020-03-20 00:00:00",
+                    "period": 60,
+                    "recovered": 0,
+                    "opening_price": 1000.0,
+                    "high_price": 1100.0,
+                    "low_price": 900.0,
+                    "closing_price": 1050.0,
+                    "acc_price": 5000.0,
+                    "acc_volume": 5.0,
+                },
+                {
+                    "market": "mango",
+                    "date_time": "2020-03-20T00:01:00",
+                    "opening_price": 2000.0,
+                    "high_price": 2100.0,
+                    "low_price": 1900.0,
+                    "closing_price": 2050.0,
+                    "acc_price": 6000.0,
+                    "acc_volume": 3.0,
+                },
+            ]
+        )
+        frame = repo.get_frame("2020-03-20T00:00:00", "2020-03-20T00:02:00", "mango")
+
+        repo._get_records.assert_called_once_with(
+            "2020-03-20T00:00:00", "2020-03-20T00:02:00", "mango"
+        )
+        self.assertEqual(len(frame), 2)
+        self.assertEqual(frame.market, "mango")
+        self.assertEqual(frame[0]["date_time"], "2020-03-20T00:00:00")
+        self.assertEqual(frame[1]["date_time"], "2020-03-20T00:01:00")
+        self.assertEqual(frame[1]["closing_price"], 2050.0)
+
+    def test_get_frame_should_raise_UserWarning_when_read_only_database_has_missing_data(self):
+        repo = DataRepository()
+        repo.read_only = True
+        repo.database = MagicMock()
+        repo.database.get_missing_ranges.return_value = [
+            ("2020-03-20 00:00:00", "2020-03-20 00:01:00")
+        ]
+        repo._fetch_missing_ranges = MagicMock()
+
+        with self.assertRaises(UserWarning):
+            repo.get_frame("2020-03-20T00:00:00", "2020-03-20T00:02:00", "mango")
+        repo._fetch_missing_ranges.assert_not_called()
+
+    @patch("smtm.data_repository.Database")
+    def test_init_should_pass_database_options(self, mock_database):
+        repo = DataRepository("mango.db", read_only=True, pragmas={"mmap_size": 0}, shared=True)
+        mock_database.assert_called_once_with(
+            "mango.db", read_only=True, pragmas={"mmap_size": 0}, shared=True
         )
+        with self.assertRaises(UserWarning):
+            repo.prefetch("2020-03-20T00:00:00", "2020-03-20T00:02:00", "mango")
+
+    @patch("smtm.data_repository.CandleArchive")
+    def test_init_should_use_candle_archive_when_backend_is_archive(self, mock_archive):
+        repo = DataRepository(backend="archive", archive_dir="mango_dir", read_only=True)
+        mock_archive.assert_called_once_with("mango_dir", read_only=True)
+        self.assertEqual(repo.database, mock_archive.return_value)
+
+    def test_init_should_raise_UserWarning_when_backend_is_invalid(self):
+        with self.assertRaises(UserWarning):
+            DataRepository(backend="mango")
 
     def test__is_equal_should_return_correct_judgement(self):
         dummy_data_a = [
@@ -507,3 +725,80 @@ class DataRepositoryTests(unittest.TestCase):
         self.assertEqual(recovered[0]["closing_price"], 11546000)
         self.assertEqual(recovered[1]["closing_price"], 11546000)
         self.assertEqual(recovered[2]["closing_price"], 11546000)
+
+
+class DataRepositoryPrefetchTests(unittest.TestCase):
+    def setUp(self):
+        StubUpbitHandler.request_list = []
+        StubUpbitHandler.throttle_count = 1
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubUpbitHandler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/candles/minutes/1"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_prefetch_should_fetch_all_chunks_from_server_and_update_database(self):
+        repo = DataRepository(":memory:")
+        repo.URL = self.url
+        repo.PREFETCH_BATCH_SIZE = 300
+
+        result = repo.prefetch(
+            "2020-03-20T00:00:00", "2020-03-20T10:00:00", ["KRW-BTC", "KRW-ETH"], max_workers=3
+        )
+
+        self.assertEqual(result, {"KRW-BTC": 600, "KRW-ETH": 600})
+        # 첫 요청은 429 응답으로 재시도 된다
+        self.assertEqual(len(StubUpbitHandler.request_list), 7)
+        data = repo.get_data("2020-03-20T00:00:00", "2020-03-20T10:00:00", "KRW-ETH")
+        self.assertEqual(len(data), 600)
+        self.assertEqual(data[0]["date_time"], "2020-03-20T00:00:00")
+        self.assertEqual(data[-1]["date_time"], "2020-03-20T09:59:00")
+        self.assertEqual(data[61]["opening_price"], 101.0)
+        self.assertEqual(len(StubUpbitHandler.request_list), 7)
+
+    def test_prefetch_should_skip_chunks_already_in_database(self):
+        repo = DataRepository(":memory:")
+        repo.URL = self.url
+        repo.prefetch("2020-03-20T00:00:00", "2020-03-20T03:20:00", "KRW-BTC")
+        StubUpbitHandler.request_list = [{"dummy": "first request is done"}]
+
+        result = repo.prefetch("2020-03-20T00:00:00", "2020-03-20T06:40:00", "KRW-BTC")
+
+        self.assertEqual(result, {"KRW-BTC": 200})
+        self.assertEqual(len(StubUpbitHandler.request_list), 2)
+        self.assertEqual(StubUpbitHandler.request_list[1]["to"], ["2020-03-19T21:40:00Z"])
+
+    @patch("time.sleep")
+    def test__fetch_from_upbit_up_to_200_should_retry_with_backoff_when_throttled(self, mock_sleep):
+        StubUpbitHandler.throttle_count = 3
+        repo = DataRepository(":memory:")
+        repo.URL = self.url
+
+        data = repo._fetch_from_upbit_up_to_200("2020-03-20T01:00:00", 10, "KRW-BTC")
+
+        self.assertEqual(len(data), 10)
+        self.assertEqual(len(StubUpbitHandler.request_list), 4)
+        self.assertEqual(mock_sleep.call_args_list, [call(0.5), call(1.0), call(2.0)])
+
+    @patch("time.sleep")
+    def test__fetch_from_upbit_up_to_200_should_raise_UserWarning_when_retry_is_exhausted(
+        self, mock_sleep
+    ):
+        StubUpbitHandler.throttle_count = 100
+        repo = DataRepository(":memory:")
+        repo.URL = self.url
+        repo.THROTTLE_RETRY_COUNT = 2
+
+        with self.assertRaises(UserWarning):
+            repo._fetch_from_upbit_up_to_200("2020-03-20T01:00:00", 10, "KRW-BTC")
+
+        self.assertEqual(len(StubUpbitHandler.request_list), 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_prefetch_should_raise_UserWarning_when_period_is_invalid(self):
+        repo = DataRepository(":memory:")
+        with self.assertRaises(UserWarning):
+            repo.prefetch("2020-03-20T06:00:00", "2020-03-20T00:00:00", ["KRW-BTC"])
@@ -1,9 +1,28 @@
+import os
 import requests
+import sqlite3
+import tempfile
 import unittest
+import numpy as np
 from datetime import datetime
 from smtm import Database
 from unittest.mock import *
 
+WORK_DIR = None
+CWD = None
+
+
+def setUpModule():
+    global WORK_DIR, CWD
+    WORK_DIR = tempfile.TemporaryDirectory()
+    CWD = os.getcwd()
+    os.chdir(WORK_DIR.name)
+
+
+def tearDownModule():
+    os.chdir(CWD)
+    WORK_DIR.cleanup()
+
 
 class DatabaseTests(unittest.TestCase):
     def setUp(self):
@@ -20,22 +39,277 @@ class DatabaseTests(unittest.TestCase):
         mock_connect.assert_called_once_with("smtm.db", check_same_thread=False, timeout=30.0)
         dummy_connection.cursor.assert_called_once()
 
+    @patch("sqlite3.connect")
+    def test_constructor_apply_default_pragmas(self, mock_connect):
+        db = Database()
+        execute = mock_connect.return_value.cursor.return_value.execute
+        execute.assert_any_call("PRAGMA journal_mode = WAL")
+        execute.assert_any_call("PRAGMA synchronous = NORMAL")
+        execute.assert_any_call("PRAGMA cache_size = -16384")
+        execute.assert_any_call("PRAGMA mmap_size = 268435456")
+
+    @patch("sqlite3.connect")
+    def test_constructor_make_read_only_connection_without_create_table(self, mock_connect):
+        db = Database("mango.db", read_only=True, pragmas={"mmap_size": 0, "cache_size": None})
+        mock_connect.assert_called_once_with(
+            "file:mango.db?mode=ro", uri=True, check_same_thread=False, timeout=30.0
+        )
+        executed = [
+            args[0][0]
+            for args in mock_connect.return_value.cursor.return_value.execute.call_args_list
+        ]
+        self.assertEqual(executed, ["PRAGMA synchronous = NORMAL", "PRAGMA mmap_size = 0"])
+
+    def test_constructor_raise_UserWarning_when_pragma_is_invalid(self):
+        with self.assertRaises(UserWarning):
+            Database(":memory:", pragmas={"journal_mode": "WAL; DROP TABLE upbit"})
+
+    @patch("sqlite3.connect")
+    def test_constructor_share_connection_in_same_process(self, mock_connect):
+        mock_connect.side_effect = [MagicMock(), MagicMock(), MagicMock()]
+        backup_connections = Database.SHARED_CONNECTIONS
+        Database.SHARED_CONNECTIONS = {}
+
+        db_a = Database("mango.db", shared=True)
+        db_b = Database("mango.db", shared=True)
+        db_c = Database("mango.db", read_only=True, shared=True)
+        db_d = Database("mango.db")
+
+        Database.SHARED_CONNECTIONS = backup_connections
+        self.assertEqual(mock_connect.call_count, 3)
+        self.assertIs(db_a.conn, db_b.conn)
+        self.assertIsNot(db_a.conn, db_c.conn)
+        self.assertIsNot(db_a.conn, db_d.conn)
+
+    def test_read_only_database_should_not_be_updated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_file = os.path.join(tmpdir, "mango.db")
+            db = Database(db_file)
+            db.update(self.make_dummy_data("mango", ["2020-03-10 22:52:00"]))
+            db.conn.close()
+            read_only_db = Database(db_file, read_only=True)
+
+            self.assertEqual(
+                len(read_only_db.query("2020-03-10 22:52:00", "2020-03-10 22:53:00", "mango")), 1
+            )
+            with self.assertRaises(sqlite3.OperationalError):
+                read_only_db.update(self.make_dummy_data("mango", ["2020-03-10 22:53:00"]))
+            read_only_db.conn.close()
+
+    def test_query_journal_should_return_data_of_session_by_condition(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(os.path.join(tmpdir, "mango.db"))
+            db.create_journal_table()
+            db.insert_journal(
+                [
+                    ("mango", "info_list", 0, 300, "a"),
+                    ("mango", "info_list", 1, 100, "b"),
+                    ("mango", "info_list", 2, 200, "c"),
+                    ("mango", "score_list", 0, 100, "d"),
+                    ("orange", "info_list", 0, 100, "e"),
+                ]
+            )
+            db.insert_journal([("mango", "info_list", 2, 200, "f")])
+
+            self.assertEqual(list(db.query_journal("mango", "info_list")), ["a", "b", "f"])
+            self.assertEqual(list(db.query_journal("mango", "info_list", 1, 2)), ["b"])
+            self.assertEqual(
+                list(db.query_journal("mango", "info_list", by_time=True)), ["b", "f", "a"]
+            )
+            self.assertEqual(
+                list(db.query_journal("mango", "info_list", start_ts=150, end_ts=300)), ["a", "f"]
+            )
+            self.assertEqual(db.count_journal("mango", "info_list"), 3)
+            self.assertEqual(db.count_journal("mango", "info_list", 1), 2)
+            db.conn.close()
+
     def test_create_table_should_execute_and_commit_correct_statement(self):
         db = Database()
         db.cursor = MagicMock()
         db.conn = MagicMock()
         db.create_table()
-        db.cursor.execute.assert_called_once_with(
-            "CREATE TABLE IF NOT EXISTS upbit (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)"
+        self.assertEqual(db.cursor.execute.call_count, 3)
+        self.assertEqual(
+            db.cursor.execute.call_args_list[0][0][0],
+            "CREATE TABLE IF NOT EXISTS upbit (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT, ts INT)",
+        )
+        self.assertEqual(
+            db.cursor.execute.call_args_list[1][0][0],
+            "CREATE TABLE IF NOT EXISTS coverage (market TEXT, period INT, start_time DATETIME, end_time DATETIME, PRIMARY KEY(market, period, start_time))",
+        )
+        self.assertEqual(
+            db.cursor.execute.call_args_list[2][0][0],
+            "CREATE INDEX IF NOT EXISTS coverage_end ON coverage(market, period, end_time)",
         )
         db.conn.commit.assert_called_once()
 
+    def test_migrate_should_add_market_to_id_and_make_coverage_of_version_0_database(self):
+        db = Database(":memory:")
+        db.cursor.execute("PRAGMA user_version = 0")
+        for date_time in ["2020-03-10 22:52:00", "2020-03-10 22:53:00", "2020-03-10 22:55:00"]:
+            db.cursor.execute(
+                "INSERT INTO upbit(id, period, recovered, market, date_time) VALUES(?, 60, 0, 'mango', ?)",
+                (f"60S-{date_time}", date_time),
+            )
+
+        db.migrate()
+
+        db.cursor.execute("SELECT id FROM upbit ORDER BY id")
+        self.assertEqual(db.cursor.fetchall()[0]["id"], "60S-mango-2020-03-10 22:52:00")
+        self.assertEqual(db.cursor.execute("PRAGMA user_version").fetchone()["user_version"], 3)
+        self.assertEqual(
+            db.get_missing_ranges("2020-03-10 22:50:00", "2020-03-10 23:00:00", "mango"),
+            [
+                ("2020-03-10 22:50:00", "2020-03-10 22:52:00"),
+                ("2020-03-10 22:54:00", "2020-03-10 22:55:00"),
+                ("2020-03-10 22:56:00", "2020-03-10 23:00:00"),
+            ],
+        )
+
+    def test_update_should_keep_data_of_different_market_at_same_time(self):
+        db = Database(":memory:")
+        item = {
+            "date_time": "2020-03-10 22:52:00",
+            "opening_price": 1.0,
+            "high_price": 1.0,
+            "low_price": 1.0,
+            "closing_price": 1.0,
+            "acc_price": 1.0,
+            "acc_volume": 1.0,
+        }
+        db.update([dict(item, market="mango"), dict(item, market="banana")])
+        self.assertEqual(len(db.query("2020-03-10 22:52:00", "2020-03-10 22:53:00", "mango")), 1)
+        self.assertEqual(len(db.query("2020-03-10 22:52:00", "2020-03-10 22:53:00", "banana")), 1)
+
+    @staticmethod
+    def make_dummy_data(market, date_time_list):
+        return [
+            {
+                "market": market,
+                "date_time": date_time,
+                "opening_price": 1.0,
+                "high_price": 1.0,
+                "low_price": 1.0,
+                "closing_price": 1.0,
+                "acc_price": 1.0,
+                "acc_volume": 1.0,
+            }
+            for date_time in date_time_list
+        ]
+
+    def test_query_columns_should_return_numpy_array_of_each_column(self):
+        db = Database(":memory:")
+        data = self.make_dummy_data(
+            "mango", ["2020-03-10 22:54:00", "2020-03-10 22:52:00", "2020-03-10 22:53:00"]
+        )
+        for idx, item in enumerate(data):
+            item["closing_price"] = float(idx)
+        db.update(data)
+        db.update(self.make_dummy_data("banana", ["2020-03-10 22:53:00"]))
+
+        columns = db.query_columns("2020-03-10 22:52:00", "2020-03-10 22:54:00", "mango")
+
+        self.assertEqual(tuple(columns.keys()), Database.COLUMN_NAMES)
+        self.assertEqual(columns["ts"].dtype, np.int64)
+        self.assertEqual(columns["ts"].tolist(), [1583880720, 1583880780])
+        self.assertEqual(columns["closing_price"].dtype, np.float64)
+        self.assertEqual(columns["closing_price"].tolist(), [1.0, 2.0])
+        self.assertEqual(columns["acc_volume"].tolist(), [1.0, 1.0])
+
+    def test_query_columns_should_return_empty_array_when_no_data(self):
+        db = Database(":memory:")
+        columns = db.query_columns("2020-03-10 22:52:00", "2020-03-10 22:54:00", "mango")
+        self.assertEqual(len(columns["ts"]), 0)
+        self.assertEqual(len(columns["opening_price"]), 0)
+
+    def test_get_missing_ranges_should_return_whole_range_when_no_data(self):
+        db = Database(":memory:")
+        self.assertEqual(
+            db.get_missing_ranges("2020-03-10 22:00:00", "2020-03-10 23:00:00", "mango"),
+            [("2020-03-10 22:00:00", "2020-03-10 23:00:00")],
+        )
+
+    def test_get_missing_ranges_should_return_ranges_not_updated(self):
+        db = Database(":memory:")
+        db.update(
+            self.make_dummy_data(
+                "mango", ["2020-03-10 22:10:00", "2020-03-10 22:11:00", "2020-03-10 22:30:00"]
+            )
+        )
+        db.update(self.make_dummy_data("banana", ["2020-03-10 22:20:00"]))
+
+        self.assertEqual(
+            db.get_missing_ranges("2020-03-10 22:00:00", "2020-03-10 23:00:00", "mango"),
+            [
+                ("2020-03-10 22:00:00", "2020-03-10 22:10:00"),
+                ("2020-03-10 22:12:00", "2020-03-10 22:30:00"),
+                ("2020-03-10 22:31:00", "2020-03-10 23:00:00"),
+            ],
+        )
+        self.assertEqual(
+            db.get_missing_ranges("2020-03-10 22:10:00", "2020-03-10 22:12:00", "mango"), []
+        )
+        self.assertEqual(
+            db.get_missing_ranges("2020-03-10 22:11:00", "2020-03-10 22:31:00", "mango"),
+            [("2020-03-10 22:12:00", "2020-03-10 22:30:00")],
+        )
+
+    def test_update_should_merge_adjacent_and_overlapped_coverage(self):
+        db = Database(":memory:")
+        db.update(self.make_dummy_data("mango", ["2020-03-10 22:10:00", "2020-03-10 22:11:00"]))
+        db.update(self.make_dummy_data("mango", ["2020-03-10 22:14:00", "2020-03-10 22:15:00"]))
+        db.update(
+            self.make_dummy_data(
+                "mango", ["2020-03-10T22:11:00", "2020-03-10T22:12:00", "2020-03-10T22:13:00"]
+            )
+        )
+
+        db.cursor.execute("SELECT market, period, start_time, end_time FROM coverage")
+        self.assertEqual(
+            db.cursor.fetchall(),
+            [
+                {
+                    "market": "mango",
+                    "period": 60,
+                    "start_time": "2020-03-10 22:10:00",
+                    "end_time": "2020-03-10 22:16:00",
+                }
+            ],
+        )
+
+    def test_migrate_should_add_ts_column_and_index_to_version_2_database(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_file = os.path.join(tmpdir, "old.db")
+            conn = sqlite3.connect(db_file)
+            conn.execute(
+                "CREATE TABLE upbit (id TEXT PRIMARY KEY, period INT, recovered INT, market TEXT, date_time DATETIME, opening_price FLOAT, high_price FLOAT, low_price FLOAT, closing_price FLOAT, acc_price FLOAT, acc_volume FLOAT)"
+            )
+            conn.execute(
+                "INSERT INTO upbit(id, period, recovered, market, date_time) VALUES('60S-mango-2020-03-10 22:52:00', 60, 0, 'mango', '2020-03-10 22:52:00')"
+            )
+            conn.execute("PRAGMA user_version = 2")
+            conn.commit()
+            conn.close()
+
+            db = Database(db_file)
+
+            db.cursor.execute("SELECT ts FROM upbit")
+            self.assertEqual(db.cursor.fetchall(), [{"ts": 1583880720}])
+            self.assertEqual(db.cursor.execute("PRAGMA user_version").fetchone()["user_version"], 3)
+            db.cursor.execute("PRAGMA index_list(upbit)")
+            index_list = [index["name"] for index in db.cursor.fetchall()]
+            self.assertIn("upbit_market_period_ts", index_list)
+            self.assertEqual(
+                len(db.query("2020-03-10 22:52:00", "2020-03-10 22:53:00", "mango")), 1
+            )
+            db.conn.close()
+
     def test_query_should_execute_and_commit_correct_statement(self):
         db = Database()
         db.cursor = MagicMock()
         db.query("start_date", "end_date", "mango_market")
         db.cursor.execute.assert_called_once_with(
-            "SELECT period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM upbit WHERE market = ? AND period = ? AND date_time >= ? AND date_time < ? ORDER BY datetime(date_time) ASC",
+            "SELECT period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume FROM upbit WHERE market = ? AND period = ? AND ts >= CAST(strftime('%s', ?) AS INT) AND ts < CAST(strftime('%s', ?) AS INT) ORDER BY ts ASC",
             ("mango_market", 60, "start_date", "end_date"),
         )
         db.cursor.fetchall.assert_called_once()
@@ -81,7 +355,7 @@ class DatabaseTests(unittest.TestCase):
         db.update(dummy_data)
         expected_tuple_list = [
             (
-                "60S-2020-03-10T22:52:00",
+                "60S-mango-2020-03-10T22:52:00",
                 60,
                 1,
                 "mango",
@@ -92,9 +366,10 @@ class DatabaseTests(unittest.TestCase):
                 9778000.0,
                 11277224.71063,
                 1.15377852,
+                1583880720,
             ),
             (
-                "60S-2020-03-10T22:53:00",
+                "60S-mango-2020-03-10T22:53:00",
                 60,
                 0,
                 "mango",
@@ -105,9 +380,10 @@ class DatabaseTests(unittest.TestCase):
                 8778000.0,
                 11277224.71063,
                 1.15377852,
+                1583880780,
             ),
             (
-                "60S-2020-03-10T22:53:00",
+                "60S-mango-2020-03-10T22:53:00",
                 60,
                 0,
                 "mango",
@@ -118,11 +394,12 @@ class DatabaseTests(unittest.TestCase):
                 7778000.0,
                 11277224.71063,
                 1.15377852,
+                1583880780,
             ),
         ]
 
         db.cursor.executemany.assert_called_once_with(
-            "REPLACE INTO upbit(id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "REPLACE INTO upbit(id, period, recovered, market, date_time, opening_price, high_price, low_price, closing_price, acc_price, acc_volume, ts) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             expected_tuple_list,
         )
         db.conn.commit.assert_called_once()
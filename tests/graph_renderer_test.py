@@ -0,0 +1,113 @@
+import threading
+import unittest
+from smtm import GraphRenderer
+from unittest.mock import *
+
+
+class GraphRendererTests(unittest.TestCase):
+    def setUp(self):
+        self.renderer = GraphRenderer(max_pending=2, use_process=False)
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.drawn = []
+
+    def tearDown(self):
+        self.release.set()
+        self.renderer.stop()
+
+    def blocking_draw(self, snapshot, destination):
+        self.drawn.append((snapshot, destination))
+        self.started.set()
+        self.release.wait(5)
+        return destination
+
+    def wait_callback(self, count):
+        done = threading.Semaphore(0)
+        result = []
+
+        def callback(destination):
+            result.append(destination)
+            done.release()
+
+        def wait():
+            for _ in range(count):
+                self.assertTrue(done.acquire(timeout=5))
+            return result
+
+        return callback, wait
+
+    @patch("smtm.GraphRenderer.draw")
+    def test_render_should_draw_in_render_thread_and_call_callback(self, mock_draw):
+        mock_draw.side_effect = lambda snapshot, destination: destination
+        callback, wait = self.wait_callback(1)
+
+        self.renderer.render("snapshot", "mango.jpg", callback)
+
+        self.assertEqual(wait(), ["mango.jpg"])
+        mock_draw.assert_called_once_with("snapshot", "mango.jpg")
+
+    @patch("smtm.GraphRenderer.draw")
+    def test_render_should_coalesce_pending_request_for_same_file(self, mock_draw):
+        mock_draw.side_effect = self.blocking_draw
+        callback, wait = self.wait_callback(3)
+
+        self.renderer.render("first", "mango.jpg", callback)
+        self.assertTrue(self.started.wait(5))
+        self.renderer.render("old", "orange.jpg", callback)
+        self.renderer.render("new", "orange.jpg", callback)
+        self.release.set()
+
+        self.assertEqual(wait(), ["mango.jpg", "orange.jpg", "orange.jpg"])
+        self.assertEqual(self.drawn, [("first", "mango.jpg"), ("new", "orange.jpg")])
+
+    @patch("smtm.GraphRenderer.draw")
+    def test_render_should_coalesce_pending_request_for_same_key_to_latest_file(self, mock_draw):
+        mock_draw.side_effect = self.blocking_draw
+        callback, wait = self.wait_callback(3)
+
+        self.renderer.render("first", "g1-mango.jpg", callback, key="mango")
+        self.assertTrue(self.started.wait(5))
+        self.renderer.render("old", "g2-orange.jpg", callback, key="orange")
+        self.renderer.render("new", "g3-orange.jpg", callback, key="orange")
+        self.release.set()
+
+        self.assertEqual(wait(), ["g1-mango.jpg", "g3-orange.jpg", "g3-orange.jpg"])
+        self.assertEqual(self.drawn, [("first", "g1-mango.jpg"), ("new", "g3-orange.jpg")])
+
+    @patch("smtm.GraphRenderer.draw")
+    def test_render_should_drop_oldest_request_when_queue_is_full(self, mock_draw):
+        mock_draw.side_effect = self.blocking_draw
+        callback, wait = self.wait_callback(4)
+
+        self.renderer.render("first", "mango.jpg", callback)
+        self.assertTrue(self.started.wait(5))
+        self.renderer.render("a", "apple.jpg", callback)
+        self.renderer.render("b", "banana.jpg", callback)
+        self.renderer.render("k", "kiwi.jpg", callback)
+        self.release.set()
+
+        self.assertEqual(sorted(wait(), key=str), [None, "banana.jpg", "kiwi.jpg", "mango.jpg"])
+        self.assertEqual(len(self.drawn), 3)
+
+    @patch("smtm.GraphRenderer.draw")
+    def test_render_should_call_callback_with_None_when_draw_fail(self, mock_draw):
+        mock_draw.side_effect = ValueError("invalid data")
+        callback, wait = self.wait_callback(1)
+
+        self.renderer.render("snapshot", "mango.jpg", callback)
+
+        self.assertEqual(wait(), [None])
+
+    @patch("smtm.GraphRenderer.draw")
+    def test_stop_should_terminate_thread_after_pending_requests(self, mock_draw):
+        mock_draw.side_effect = lambda snapshot, destination: destination
+        callback, wait = self.wait_callback(1)
+
+        self.renderer.render("snapshot", "mango.jpg", callback)
+        thread = self.renderer.thread
+        self.renderer.stop()
+        thread.join(5)
+
+        self.assertEqual(wait(), ["mango.jpg"])
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(self.renderer.thread)
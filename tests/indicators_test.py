@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+import pandas as pd
+from smtm.indicators import Sma, Ema, Rsi, RollingStd, Bollinger
+
+
+def make_prices(count=500):
+    idx = np.arange(count)
+    return 26000000 + np.cumsum(np.sin(idx * 0.7) * 30000 + np.cos(idx * 0.13) * 12000)
+
+
+def run_streaming(indicator, prices):
+    return [indicator.update(price) for price in prices]
+
+
+class IndicatorsTests(unittest.TestCase):
+    def setUp(self):
+        self.prices = make_prices()
+
+    def tearDown(self):
+        pass
+
+    def assert_same_values(self, streaming, batch):
+        self.assertEqual(len(streaming), len(batch))
+        for value, expected in zip(streaming, batch):
+            if np.isnan(expected):
+                self.assertIsNone(value)
+            else:
+                self.assertTrue(np.isclose(value, expected, rtol=1e-9, atol=1e-6))
+
+    def test_sma_update_should_return_same_value_with_batch(self):
+        batch = Sma.batch(self.prices, 20)
+        self.assert_same_values(run_streaming(Sma(20), self.prices), batch)
+
+        expected = pd.Series(self.prices).rolling(20).mean().to_numpy()
+        self.assertTrue(np.allclose(batch, expected, equal_nan=True))
+
+    def test_sma_predict_should_return_sma_with_repeated_price(self):
+        sma = Sma(5)
+        for price in [10, 20, 30, 40, 50, 60]:
+            sma.update(price)
+
+        self.assertEqual(sma.predict(100, 3), [56.0, 70.0, 82.0])
+
+    def test_sma_predict_should_keep_sma_of_repeated_price_when_count_is_larger_than_period(self):
+        sma = Sma(2)
+        for price in [10, 20, 30]:
+            sma.update(price)
+
+        self.assertEqual(sma.predict(100, 4), [65.0, 100.0, 100.0, 100.0])
+
+    def test_ema_update_should_return_same_value_with_batch(self):
+        batch = Ema.batch(self.prices, 12)
+        self.assert_same_values(run_streaming(Ema(12), self.prices), batch)
+        self.assertAlmostEqual(batch[11], self.prices[:12].mean())
+
+        batch = Ema.batch(self.prices, 14, wilder=True)
+        self.assert_same_values(run_streaming(Ema(14, wilder=True), self.prices), batch)
+
+    def test_ema_update_should_smooth_with_weight(self):
+        ema = Ema(3)
+        self.assertIsNone(ema.update(1))
+        self.assertIsNone(ema.update(2))
+        self.assertEqual(ema.update(3), 2)
+        self.assertEqual(ema.update(6), 4)
+
+        wilder = Ema(2, wilder=True)
+        wilder.update(2)
+        self.assertEqual(wilder.update(4), 3)
+        self.assertEqual(wilder.update(9), 6)
+
+    def test_rsi_update_should_return_same_value_with_batch(self):
+        batch = Rsi.batch(self.prices, 14)
+        self.assert_same_values(run_streaming(Rsi(14), self.prices), batch)
+        self.assertTrue(np.isnan(batch[13]))
+        self.assertFalse(np.isnan(batch[14]))
+
+    def test_rsi_should_return_100_when_price_only_goes_up(self):
+        rsi = Rsi(3)
+        values = run_streaming(rsi, [1, 2, 3, 4, 5])
+        self.assertEqual(values, [None, None, None, 100.0, 100.0])
+        self.assertTrue(np.array_equal(Rsi.batch([1, 2, 3, 4, 5], 3)[3:], [100.0, 100.0]))
+
+    def test_rsi_batch_should_return_nan_when_prices_are_not_enough(self):
+        self.assertTrue(np.isnan(Rsi.batch([1, 2, 3], 3)).all())
+
+    def test_rolling_std_update_should_return_same_value_with_batch(self):
+        batch = RollingStd.batch(self.prices, 25)
+        self.assert_same_values(run_streaming(RollingStd(25), self.prices), batch)
+        self.assertAlmostEqual(batch[-1], np.std(self.prices[-25:]))
+
+    def test_bollinger_update_should_return_same_value_with_batch(self):
+        middle, upper, lower = Bollinger.batch(self.prices, 20, 2)
+        streaming = run_streaming(Bollinger(20, 2), self.prices)
+        self.assert_same_values([None if v is None else v[0] for v in streaming], middle)
+        self.assert_same_values([None if v is None else v[1] for v in streaming], upper)
+        self.assert_same_values([None if v is None else v[2] for v in streaming], lower)
+        self.assertAlmostEqual(upper[-1] - middle[-1], 2 * np.std(self.prices[-20:]))
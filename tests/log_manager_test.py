@@ -1,4 +1,6 @@
 import logging.handlers
+import os
+import tempfile
 import unittest
 from smtm import LogManager
 from unittest.mock import *
@@ -26,6 +28,9 @@ class LogManagerTests(unittest.TestCase):
         LogManager.stream_handler = original
 
     def test_change_log_file_should_change_file_handler(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        original_filename = LogManager.log_filename
+        kiwi_log = os.path.join(tmpdir.name, "kiwi.log")
         logger = LogManager.get_logger("orange")
         has_RotatingFileHandler = False
         old_handler = None
@@ -37,7 +42,7 @@ class LogManagerTests(unittest.TestCase):
         self.assertTrue(has_RotatingFileHandler)
 
         has_RotatingFileHandler = False
-        LogManager.change_log_file("kiwi.log")
+        LogManager.change_log_file(kiwi_log)
         for handler in logger.handlers:
             if issubclass(type(handler), logging.handlers.RotatingFileHandler):
                 self.assertEqual(handler.baseFilename[-8:], "kiwi.log")
@@ -47,10 +52,14 @@ class LogManagerTests(unittest.TestCase):
         self.assertTrue(has_RotatingFileHandler)
 
         has_RotatingFileHandler = False
-        LogManager.change_log_file("kiwi.log")
+        LogManager.change_log_file(kiwi_log)
         for handler in logger.handlers:
             if issubclass(type(handler), logging.handlers.RotatingFileHandler):
                 self.assertEqual(handler.baseFilename[-8:], "kiwi.log")
                 self.assertEqual(old_handler, handler)
                 has_RotatingFileHandler = True
         self.assertTrue(has_RotatingFileHandler)
+
+        LogManager.change_log_file(original_filename)
+        old_handler.close()
+        tmpdir.cleanup()
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+from multiprocessing import AuthenticationError
+from smtm import LogManager, MassCoordinator
+from unittest.mock import *
+
+LOG_DIR = None
+LOG_FILENAME = None
+
+
+def setUpModule():
+    """테스트 중 기록되는 로그 파일을 임시 디렉토리에 만든다"""
+    global LOG_DIR, LOG_FILENAME
+    LOG_DIR = tempfile.TemporaryDirectory()
+    LOG_FILENAME = LogManager.log_filename
+    LogManager.change_log_file(os.path.join(LOG_DIR.name, "smtm.log"))
+
+
+def tearDownModule():
+    handler = LogManager.file_handler
+    LogManager.change_log_file(LOG_FILENAME)
+    handler.close()
+    LOG_DIR.cleanup()
+
+
+class MassCoordinatorTests(unittest.TestCase):
+    def setUp(self):
+        self.task_list = [
+            {"idx": 0, "period": "a", "group": 0},
+            {"idx": 1, "period": "b", "group": 0},
+            {"idx": 2, "period": "c", "group": 1},
+        ]
+
+    def tearDown(self):
+        pass
+
+    def test_parse_address_should_return_host_and_port(self):
+        self.assertEqual(MassCoordinator.parse_address("127.0.0.1:5000"), ("127.0.0.1", 5000))
+        self.assertEqual(MassCoordinator.parse_address(":5000"), ("", 5000))
+        with self.assertRaises(UserWarning):
+            MassCoordinator.parse_address("127.0.0.1")
+
+    def test_lease_should_return_tasks_by_group(self):
+        coordinator = MassCoordinator("config", self.task_list)
+
+        self.assertEqual(coordinator.lease("mango"), self.task_list[0:2])
+        self.assertEqual(coordinator.lease("orange"), self.task_list[2:3])
+        self.assertEqual(coordinator.lease("mango"), [])
+        self.assertEqual(coordinator.lease_map[0]["worker"], "mango")
+        self.assertEqual(coordinator.lease_map[1]["worker"], "orange")
+
+    def test_lease_should_return_None_when_all_tasks_are_completed(self):
+        coordinator = MassCoordinator("config", self.task_list)
+        coordinator.lease("mango")
+        coordinator.lease("mango")
+        for task in self.task_list:
+            coordinator.complete("mango", {"idx": task["idx"], "result": 0, "group": task["group"]})
+
+        self.assertIsNone(coordinator.lease("mango"))
+        self.assertEqual(coordinator.lease_map, {})
+
+    def test_complete_should_put_result_and_ignore_duplicated_result(self):
+        coordinator = MassCoordinator("config", self.task_list)
+        coordinator.lease("mango")
+
+        self.assertTrue(coordinator.complete("mango", {"idx": 1, "result": "apple", "group": 0}))
+        self.assertFalse(coordinator.complete("orange", {"idx": 1, "result": "kiwi", "group": 0}))
+        self.assertEqual(coordinator.get_result(timeout=0), {"idx": 1, "result": "apple"})
+        self.assertIsNone(coordinator.get_result(timeout=0))
+        self.assertIn(0, coordinator.lease_map)
+
+    def test_lease_should_lease_again_uncompleted_tasks_when_lease_is_expired(self):
+        coordinator = MassCoordinator("config", self.task_list, lease_timeout=10)
+        coordinator._get_deadline = MagicMock(return_value=0)
+        coordinator.lease("mango")
+        coordinator.complete("mango", {"idx": 0, "result": "apple", "group": 0})
+
+        self.assertEqual(coordinator.lease("orange"), self.task_list[1:2])
+        self.assertEqual(coordinator.lease_map[0]["worker"], "orange")
+
+    def test_serve_should_accept_connection(self):
+        coordinator = MassCoordinator("config", self.task_list, period_list=["a", "b", "c"])
+        address = coordinator.serve("127.0.0.1:0", authkey="kiwi")
+        proxy = MassCoordinator.connect(f"{address[0]}:{address[1]}", authkey="kiwi")
+
+        self.assertEqual(proxy.get_config(), "config")
+        self.assertEqual(proxy.get_period_list(), ["a", "b", "c"])
+        self.assertEqual(proxy.lease("mango"), self.task_list[0:2])
+        self.assertTrue(proxy.complete("mango", {"idx": 0, "result": (1, 2), "group": 0}))
+        self.assertEqual(coordinator.get_result(), {"idx": 0, "result": (1, 2)})
+        coordinator.shutdown()
+        self.assertIsNone(coordinator.server)
+
+    def test_serve_should_refuse_connection_with_different_authkey(self):
+        coordinator = MassCoordinator("config", self.task_list)
+        address = coordinator.serve("127.0.0.1:0", authkey="kiwi")
+
+        with self.assertRaises(AuthenticationError):
+            MassCoordinator.connect(f"{address[0]}:{address[1]}", authkey="mango")
+        coordinator.shutdown()
+
+    @patch.dict(os.environ, {"SMTM_MASS_AUTHKEY": "banana"})
+    def test_get_authkey_should_return_passed_key_or_environment_variable(self):
+        self.assertEqual(MassCoordinator.get_authkey("kiwi"), b"kiwi")
+        self.assertEqual(MassCoordinator.get_authkey(b"mango"), b"mango")
+        self.assertEqual(MassCoordinator.get_authkey(), b"banana")
+
+    @patch.dict(os.environ, {"SMTM_MASS_AUTHKEY": ""})
+    def test_serve_and_connect_should_raise_UserWarning_when_authkey_is_not_set(self):
+        coordinator = MassCoordinator("config", self.task_list)
+
+        with self.assertRaises(UserWarning):
+            coordinator.serve("127.0.0.1:0")
+        with self.assertRaises(UserWarning):
+            MassCoordinator.connect("127.0.0.1:50000")
+        self.assertIsNone(coordinator.server)
+        self.assertTrue(MassCoordinator.DEFAULT_ADDRESS.startswith("127.0.0.1:"))
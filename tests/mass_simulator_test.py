@@ -1,9 +1,33 @@
+import os
+import tempfile
 import unittest
 from datetime import datetime
 from datetime import timedelta
-from smtm import MassSimulator
+from smtm import Analyzer, MassSimulator, LogManager
 from unittest.mock import *
 
+WORK_DIR = None
+CWD = None
+LOG_FILENAME = None
+
+
+def setUpModule():
+    """MassSimulator가 만드는 로그 파일이 임시 디렉토리에 기록되도록 작업 디렉토리를 변경한다"""
+    global WORK_DIR, CWD, LOG_FILENAME
+    WORK_DIR = tempfile.TemporaryDirectory()
+    CWD = os.getcwd()
+    LOG_FILENAME = LogManager.log_filename
+    os.chdir(WORK_DIR.name)
+    LogManager.change_log_file(os.path.join(WORK_DIR.name, "smtm.log"))
+
+
+def tearDownModule():
+    handler = LogManager.file_handler
+    LogManager.change_log_file(LOG_FILENAME)
+    handler.close()
+    os.chdir(CWD)
+    WORK_DIR.cleanup()
+
 
 class MassSimulatorUtilTests(unittest.TestCase):
     def setUp(self):
@@ -47,9 +71,9 @@ class MassSimulatorAnalyzeTests(unittest.TestCase):
             ],
         }
         dummy_result = [
-            (0, 0, 1.12, 0, 0, 0, 2.99, 1.88),
-            (0, 0, 2.25, 0, 0, 0, 1.99, -1.88),
-            (0, 0, 2.01, 0, 0, 0, 4.99, 2.88),
+            (1.12, 2.99, 1.88, 3, -1.5),
+            (2.25, 1.99, -1.88, 0, 0),
+            (2.01, 4.99, 2.88, 12, -0.25),
         ]
         mass.draw_graph = MagicMock()
         mass.analyze_result(dummy_result, dummy_config)
@@ -67,10 +91,10 @@ class MassSimulatorAnalyzeTests(unittest.TestCase):
             "수익률 편차:    0.595\n",
             "수익률 최대:     2.25,   1\n",
             "수익률 최소:     1.12,   0\n",
-            "순번, 인덱스, 구간 수익률, 최대 수익률, 최저 수익률 ===\n",
-            "   1,      1,        2.25,       -1.88,        1.99\n",
-            "   2,      2,        2.01,        2.88,        4.99\n",
-            "   3,      0,        1.12,        1.88,        2.99\n",
+            "순번, 인덱스, 구간 수익률, 최대 수익률, 최저 수익률, 거래 횟수, 최대 낙폭 ===\n",
+            "   1,      1,        2.25,       -1.88,        1.99,         0,         0.0\n",
+            "   2,      2,        2.01,        2.88,        4.99,        12,       -0.25\n",
+            "   3,      0,        1.12,        1.88,        2.99,         3,        -1.5\n",
         ]
 
         for idx, val in enumerate(expected):
@@ -86,6 +110,46 @@ class MassSimulatorAnalyzeTests(unittest.TestCase):
             [1.12, 2.25, 2.01], mean=1.793, filename="output/BnH-2Hour.jpg"
         )
 
+    def test_analyze_result_should_skip_period_without_score_records(self):
+        mass = MassSimulator()
+        dummy_config = {
+            "title": "BnH-2Hour",
+            "budget": 50000,
+            "strategy": 0,
+            "interval": 1,
+            "currency": "BTC",
+            "description": "mass-simluation-unit-test",
+            "period_list": [
+                {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+                {"start": "2020-04-30T18:00:00", "end": "2020-04-30T20:00:00"},
+            ],
+        }
+        analyzer = Analyzer()
+        analyzer.logger = MagicMock()
+        dummy_result = [
+            (1.12, 2.99, 1.88, 3, -1.5),
+            analyzer.get_metrics(),
+            (2.01, 4.99, 2.88, 12, -0.25),
+        ]
+        mass.draw_graph = MagicMock()
+        with patch("builtins.open", new_callable=mock_open) as mock_file:
+            mass.analyze_result(dummy_result, dummy_config)
+
+        self.assertEqual(mass.analyzed_result, (1.565, 0.629, 2.01, 1.12))
+        written = [call_args[0][0] for call_args in mock_file().write.call_args_list]
+        self.assertEqual(
+            written[-3:],
+            [
+                "   1,      2,        2.01,        2.88,        4.99,        12,       -0.25\n",
+                "   2,      0,        1.12,        1.88,        2.99,         3,        -1.5\n",
+                "   3,      1,         nan,         nan,         nan,         -,         nan\n",
+            ],
+        )
+        self.assertEqual(mass.draw_graph.call_args[0][0][::2], [1.12, 2.01])
+
+        with self.assertRaises(UserWarning):
+            mass.analyze_result([dummy_result[1]], dummy_config)
+
     @patch("matplotlib.pyplot.bar")
     @patch("matplotlib.pyplot.plot")
     @patch("matplotlib.pyplot.savefig")
@@ -103,13 +167,15 @@ class MassSimulatorInitializeTests(unittest.TestCase):
     def tearDown(self):
         pass
 
+    @patch("smtm.SimulationContext.load")
     @patch("smtm.SimulationDataProvider.initialize_simulation")
     @patch("smtm.SimulationTrader.initialize_simulation")
     @patch("smtm.SimulationOperator.initialize")
     @patch("smtm.SimulationOperator.set_interval")
     def test_get_initialized_operator_should_initialize_correctly(
-        self, mock_interval, mock_op_init, mock_tr_init, mock_dp_init
+        self, mock_interval, mock_op_init, mock_tr_init, mock_dp_init, mock_load
     ):
+        mock_load.return_value = "mango_frame"
         budget = 50000
         strategy_num = 1
         interval = 60
@@ -120,11 +186,44 @@ class MassSimulatorInitializeTests(unittest.TestCase):
         operator = MassSimulator.get_initialized_operator(
             budget, strategy_num, interval, currency, start, end, tag
         )
-        mock_dp_init.assert_called_once_with(end=end, count=60)
-        mock_tr_init.assert_called_once_with(end=end, count=60, budget=budget)
+        mock_load.assert_called_once_with(end=end, count=60)
+        mock_dp_init.assert_called_once_with(end=end, count=60, frame="mango_frame")
+        mock_tr_init.assert_called_once_with(end=end, count=60, budget=budget, frame="mango_frame")
         mock_op_init.assert_called_once_with(ANY, ANY, ANY, ANY, budget=budget)
         mock_interval.assert_called_once_with(60)
         self.assertEqual(operator.tag, tag)
+        self.assertTrue(operator.report_enable)
+
+        operator = MassSimulator.get_initialized_operator(
+            budget, strategy_num, interval, currency, start, end, tag, metrics_only=True
+        )
+        self.assertFalse(operator.report_enable)
+
+    @patch("smtm.SimulationContext.load")
+    @patch("smtm.SimulationDataProvider.initialize_simulation")
+    @patch("smtm.SimulationTrader.initialize_simulation")
+    @patch("smtm.SimulationOperator.initialize")
+    def test_get_initialized_operator_should_apply_parameter_to_strategy(
+        self, mock_op_init, mock_tr_init, mock_dp_init, mock_load
+    ):
+        start = "2020-04-30T17:00:00"
+        end = "2020-04-30T18:00:00"
+        MassSimulator.get_initialized_operator(
+            50000, 1, 60, "BTC", start, end, "tag", parameter={"SHORT": 5, "STD_RATIO": 0.1}
+        )
+        strategy = mock_op_init.call_args[0][1]
+        self.assertEqual(strategy.SHORT, 5)
+        self.assertEqual(strategy.STD_RATIO, 0.1)
+        self.assertEqual(type(strategy).SHORT, 10)
+
+        with self.assertRaises(UserWarning):
+            MassSimulator.get_initialized_operator(
+                50000, 2, 60, "BTC", start, end, "tag", parameter={"SHORT": 5}
+            )
+        with self.assertRaises(UserWarning):
+            MassSimulator.get_initialized_operator(
+                50000, 1, 60, "BTC", start, end, "tag", parameter={"logger": None}
+            )
 
 
 class MassSimulatorRunTests(unittest.TestCase):
@@ -134,8 +233,11 @@ class MassSimulatorRunTests(unittest.TestCase):
     def tearDown(self):
         pass
 
+    @patch("smtm.mass_simulator.ResultJournal")
     @patch("smtm.LogManager.set_stream_level")
-    def test_run_should_call_run_simulation_correctly(self, mock_set_stream_level):
+    def test_run_should_call_run_simulation_correctly(
+        self, mock_set_stream_level, mock_journal_class
+    ):
         mass = MassSimulator()
         dummy_config = {
             "title": "BnH-2Hour",
@@ -158,46 +260,226 @@ class MassSimulatorRunTests(unittest.TestCase):
         mass._load_config.assert_called_once_with("mass_config_file_name")
         self.assertEqual(
             mass._execute_simulation.call_args[0][0],
+            {
+                "title": "BnH-2Hour",
+                "budget": 50000,
+                "strategy": 0,
+                "interval": 1,
+                "currency": "BTC",
+                "sync": False,
+                "database": {},
+                "metrics_only": False,
+            },
+        )
+        period_list = dummy_config["period_list"]
+        self.assertEqual(
+            mass._execute_simulation.call_args[0][1],
             [
-                {
-                    "title": "BnH-2Hour",
-                    "budget": 50000,
-                    "strategy": 0,
-                    "interval": 1,
-                    "currency": "BTC",
-                    "partial_idx": 0,
-                    "partial_period_list": [
-                        {
-                            "idx": 0,
-                            "period": {
-                                "start": "2020-04-30T17:00:00",
-                                "end": "2020-04-30T19:00:00",
-                            },
-                        },
-                    ],
-                },
-                {
-                    "title": "BnH-2Hour",
-                    "budget": 50000,
-                    "strategy": 0,
-                    "interval": 1,
-                    "currency": "BTC",
-                    "partial_idx": 1,
-                    "partial_period_list": [
-                        {
-                            "idx": 1,
-                            "period": {
-                                "start": "2020-04-30T18:00:00",
-                                "end": "2020-04-30T20:00:00",
-                            },
-                        },
-                    ],
-                },
+                {"idx": 0, "period": period_list[0], "group": 0, "group_periods": [period_list[0]]},
+                {"idx": 1, "period": period_list[1], "group": 1, "group_periods": [period_list[1]]},
             ],
         )
-        self.assertEqual(mass._execute_simulation.call_args[0][1], 2)
+        self.assertEqual(mass._execute_simulation.call_args[0][2], 2)
+        self.assertEqual(mass._execute_simulation.call_args[0][3], 1)
         mass.analyze_result.assert_called_once_with(mass.result, dummy_config)
         mass.print_state.assert_called()
+        self.assertEqual(mock_journal_class.call_args[0][0], "output/BnH-2Hour.journal.jsonl")
+        mock_journal_class.return_value.load.assert_not_called()
+        mock_journal_class.return_value.open.assert_called_once_with(resume=False)
+        mock_journal_class.return_value.close.assert_called_once()
+
+    @patch("smtm.mass_simulator.ResultJournal")
+    @patch("smtm.LogManager.set_stream_level")
+    def test_run_should_serve_simulation_when_serve_is_passed(
+        self, mock_set_stream_level, mock_journal_class
+    ):
+        mass = MassSimulator()
+        dummy_config = {
+            "title": "BnH-2Hour",
+            "budget": 50000,
+            "strategy": 0,
+            "interval": 1,
+            "currency": "BTC",
+            "description": "mass-simluation-unit-test",
+            "period_list": [
+                {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+            ],
+            "database": {"read_only": True},
+        }
+        mass._load_config = MagicMock(return_value=dummy_config)
+        mass.analyze_result = MagicMock()
+        mass.print_state = MagicMock()
+        mass._execute_simulation = MagicMock()
+        mass._serve_simulation = MagicMock()
+        mass._prepare_database = MagicMock()
+
+        mass.run("mass_config_file_name", 2, serve="0.0.0.0:5000", authkey="kiwi")
+
+        mass._prepare_database.assert_not_called()
+        mass._execute_simulation.assert_not_called()
+        self.assertEqual(mass._serve_simulation.call_args[0][0]["title"], "BnH-2Hour")
+        self.assertEqual(mass._serve_simulation.call_args[0][1][0]["idx"], 0)
+        self.assertEqual(mass._serve_simulation.call_args[0][2], "0.0.0.0:5000")
+        self.assertEqual(mass._serve_simulation.call_args[0][3], b"kiwi")
+
+    @patch.dict(os.environ, {"SMTM_MASS_AUTHKEY": ""})
+    def test_run_should_raise_UserWarning_when_serve_without_authkey(self):
+        mass = MassSimulator()
+        mass._load_config = MagicMock()
+        mass._serve_simulation = MagicMock()
+
+        with self.assertRaises(UserWarning):
+            mass.run("mass_config_file_name", 2, serve="127.0.0.1:5000")
+
+        mass._load_config.assert_not_called()
+        mass._serve_simulation.assert_not_called()
+
+    @patch("smtm.mass_simulator.ResultJournal")
+    @patch("smtm.LogManager.set_stream_level")
+    def test_run_should_skip_finished_jobs_when_resume_is_true(
+        self, mock_set_stream_level, mock_journal_class
+    ):
+        mass = MassSimulator()
+        dummy_config = {
+            "title": "BnH-2Hour",
+            "budget": 50000,
+            "strategy": 0,
+            "interval": 1,
+            "currency": "BTC",
+            "description": "mass-simluation-unit-test",
+            "period_list": [
+                {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+                {"start": "2020-04-30T18:00:00", "end": "2020-04-30T20:00:00"},
+                {"start": "2020-04-30T19:00:00", "end": "2020-04-30T21:00:00"},
+            ],
+        }
+        mass._load_config = MagicMock(return_value=dummy_config)
+        mass.analyze_result = MagicMock()
+        mass.print_state = MagicMock()
+        mass._execute_simulation = MagicMock()
+        journal = mock_journal_class.return_value
+        journal.load.return_value = {0: (1, 2, 3), 2: (4, 5, 6)}
+
+        mass.run("mass_config_file_name", 4, resume=True)
+
+        journal.load.assert_called_once_with(mass.job_list)
+        journal.open.assert_called_once_with(resume=True)
+        task_list = mass._execute_simulation.call_args[0][1]
+        self.assertEqual([task["idx"] for task in task_list], [1])
+        self.assertEqual(mass._execute_simulation.call_args[0][2], 1)
+        self.assertEqual(mass.result, [(1, 2, 3), None, (4, 5, 6)])
+        self.assertEqual(mass.done_count, 2)
+        self.assertEqual(mass.resumed_count, 2)
+
+    @patch("smtm.mass_simulator.ResultJournal")
+    @patch("smtm.LogManager.set_stream_level")
+    def test_run_should_not_execute_simulation_when_all_jobs_are_finished(
+        self, mock_set_stream_level, mock_journal_class
+    ):
+        mass = MassSimulator()
+        dummy_config = {
+            "title": "BnH-2Hour",
+            "budget": 50000,
+            "strategy": 0,
+            "interval": 1,
+            "currency": "BTC",
+            "description": "mass-simluation-unit-test",
+            "period_list": [
+                {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+            ],
+        }
+        mass._load_config = MagicMock(return_value=dummy_config)
+        mass.analyze_result = MagicMock()
+        mass.print_state = MagicMock()
+        mass._execute_simulation = MagicMock()
+        mock_journal_class.return_value.load.return_value = {0: (1, 2, 3)}
+
+        mass.run("mass_config_file_name", 2, resume=True)
+
+        mass._execute_simulation.assert_not_called()
+        mass.analyze_result.assert_called_once_with([(1, 2, 3)], dummy_config)
+
+    @patch("smtm.mass_simulator.ResultJournal")
+    @patch("smtm.LogManager.set_stream_level")
+    def test_run_should_make_job_for_each_period_and_parameter(
+        self, mock_set_stream_level, mock_journal_class
+    ):
+        mass = MassSimulator()
+        dummy_config = {
+            "title": "SMA-Sweep",
+            "budget": 50000,
+            "strategy": 1,
+            "interval": 1,
+            "currency": "BTC",
+            "description": "mass-simluation-unit-test",
+            "period_list": [
+                {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+                {"start": "2020-04-30T19:00:00", "end": "2020-04-30T21:00:00"},
+            ],
+            "parameter": {"method": "grid", "space": {"SHORT": [5, 10]}},
+            "chunksize": 2,
+        }
+        mass._load_config = MagicMock(return_value=dummy_config)
+        mass.analyze_result = MagicMock()
+        mass.analyze_parameter_result = MagicMock()
+        mass.print_state = MagicMock()
+        mass._execute_simulation = MagicMock()
+        mass.run("mass_config_file_name", 2)
+
+        task_list = mass._execute_simulation.call_args[0][1]
+        period_list = dummy_config["period_list"]
+        self.assertEqual(
+            [(task["idx"], task["period"], task["parameter"]) for task in task_list],
+            [
+                (0, period_list[0], {"SHORT": 5}),
+                (1, period_list[0], {"SHORT": 10}),
+                (2, period_list[1], {"SHORT": 5}),
+                (3, period_list[1], {"SHORT": 10}),
+            ],
+        )
+        self.assertEqual(task_list[1]["group"], 0)
+        self.assertEqual(task_list[2]["group"], 1)
+        self.assertEqual(mass._execute_simulation.call_args[0][3], 2)
+        self.assertEqual(len(mass.result), 4)
+        mass.analyze_result.assert_called_once_with(mass.result, dummy_config)
+        mass.analyze_parameter_result.assert_called_once_with(
+            mass.result, dummy_config, [{"SHORT": 5}, {"SHORT": 10}]
+        )
+
+    @patch("builtins.open", new_callable=mock_open)
+    def test_analyze_parameter_result_should_write_ranked_parameters(self, mock_file):
+        mass = MassSimulator()
+        config = {
+            "title": "SMA-Sweep",
+            "period_list": [{"start": "a", "end": "b"}, {"start": "b", "end": "c"}],
+            "parameter": {"method": "grid", "space": {"SHORT": [5, 10]}},
+        }
+        parameter_list = [{"SHORT": 5}, {"SHORT": 10}]
+        result_list = [
+            (1.0, 0, 0, 0, 0),
+            (3.0, 0, 0, 0, 0),
+            (-1.0, 0, 0, 0, 0),
+            (5.0, 0, 0, 0, 0),
+        ]
+
+        mass.analyze_parameter_result(result_list, config, parameter_list)
+
+        mock_file.assert_called_once_with(
+            "output/SMA-Sweep.parameter.result", "w", encoding="utf-8"
+        )
+        written = [call[0][0] for call in mock_file().write.call_args_list]
+        self.assertEqual(written[1], "Parameter: grid (2), Period: 2\n")
+        self.assertTrue(written[3].startswith("   1,        1,         4.0,"))
+        self.assertTrue(written[3].endswith('{"SHORT": 10}\n'))
+        self.assertTrue(written[4].startswith("   2,        0,         0.0,"))
+        self.assertEqual(mass.best_parameter, ({"SHORT": 10}, 4.0))
+
+    def test_make_job_list_should_return_period_jobs_when_parameter_list_is_None(self):
+        period_list = [{"start": "a", "end": "b"}, {"start": "b", "end": "c"}]
+        self.assertEqual(
+            MassSimulator.make_job_list(period_list),
+            [{"idx": 0, "period": period_list[0]}, {"idx": 1, "period": period_list[1]}],
+        )
 
     def test_run_single_should_start_and_stop_operator(self):
         mock_op = MagicMock()
@@ -206,6 +488,13 @@ class MassSimulatorRunTests(unittest.TestCase):
         mock_op.stop.assert_called_once()
         mock_op.get_score.assert_called_once()
 
+    def test_run_single_should_call_run_sync_when_sync_is_true(self):
+        mock_op = MagicMock()
+        MassSimulator.run_single(mock_op, sync=True)
+        mock_op.run_sync.assert_called_once()
+        mock_op.start.assert_not_called()
+        mock_op.get_score.assert_called_once()
+
 
 class MassSimulatorTests(unittest.TestCase):
     def setUp(self):
@@ -290,13 +579,278 @@ class MassSimulatorTests(unittest.TestCase):
         mass.print_state()
         self.assertEqual(mock_print.call_args[0][0].find("simulation is running"), 36)
 
+    @patch("builtins.print")
+    def test_print_state_print_progress_when_result_is_passed(self, mock_print):
+        mass = MassSimulator()
+        mass.result = [None, None, None, None]
+        mass.start = datetime.now() - timedelta(seconds=4)
+        mass._update_result({"idx": 2, "result": (1.5, 0, 0)})
+        mass.print_state(result={"idx": 2, "result": (1.5, 0, 0)})
+        message = mock_print.call_args[0][0]
+        self.assertEqual(message.find("[1/4] #2 return: 1.5, remain: "), 36)
+
     def test__update_result_should_update_result_correctly(self):
         mass = MassSimulator()
         mass.result.append(0)
-        mass._update_result([{"idx": 0, "result": "mango"}])
+        mass._update_result({"idx": 0, "result": "mango"})
         self.assertEqual(mass.result[0], "mango")
+        self.assertEqual(mass.done_count, 1)
+
+    def test__update_result_should_append_result_to_journal(self):
+        mass = MassSimulator()
+        mass.result = [None, None]
+        mass.job_list = [{"idx": 0, "period": "apple"}, {"idx": 1, "period": "banana"}]
+        mass.journal = MagicMock()
+        mass._update_result({"idx": 1, "result": "mango"})
+        mass.journal.append.assert_called_once_with({"idx": 1, "period": "banana"}, "mango")
+
+    def test_get_chunksize_should_return_chunksize_for_process(self):
+        self.assertEqual(MassSimulator.get_chunksize(3, 4), 1)
+        self.assertEqual(MassSimulator.get_chunksize(100, 4), 6)
+
+    def test_make_task_list_should_group_jobs_by_chunksize(self):
+        period_list = [{"start": str(i), "end": str(i + 1)} for i in range(5)]
+        job_list = MassSimulator.make_job_list(period_list)
+
+        task_list = MassSimulator.make_task_list(job_list, 2)
+        self.assertEqual([task["idx"] for task in task_list], [0, 1, 2, 3, 4])
+        self.assertEqual([task["group"] for task in task_list], [0, 0, 1, 1, 2])
+        self.assertEqual(task_list[0]["group_periods"], period_list[0:2])
+        self.assertEqual(task_list[3]["group_periods"], period_list[2:4])
+        self.assertEqual(task_list[4]["group_periods"], period_list[4:5])
+
+    @patch("smtm.mass_simulator.Pool")
+    def test__execute_simulation_should_update_result_as_task_completed(self, mock_pool_class):
+        mass = MassSimulator()
+        mass.result = [None, None]
+        mass.print_state = MagicMock()
+        mass.memory_usage = MagicMock()
+        pool = mock_pool_class.return_value.__enter__.return_value
+        pool.imap_unordered.return_value = iter(
+            [{"idx": 1, "result": "banana"}, {"idx": 0, "result": "mango"}]
+        )
+
+        mass._execute_simulation("dummy_config", ["task0", "task1"], 2, chunksize=1)
+
+        mock_pool_class.assert_called_once_with(
+            processes=2, initializer=MassSimulator._initialize_worker, initargs=("dummy_config",)
+        )
+        pool.imap_unordered.assert_called_once_with(
+            MassSimulator._execute_simulation_task, ["task0", "task1"], chunksize=1
+        )
+        self.assertEqual(mass.result, ["mango", "banana"])
+        mass.print_state.assert_called_with(result={"idx": 0, "result": "mango"})
 
-    def test__execute_single_process_simulation_should_run_simulation(self):
+    @patch("builtins.print")
+    @patch("smtm.mass_simulator.MassCoordinator")
+    def test__serve_simulation_should_update_result_from_coordinator(
+        self, mock_coordinator_class, mock_print
+    ):
+        mass = MassSimulator()
+        mass.config = {"period_list": "dummy_period_list"}
+        mass.result = [None, None]
+        mass.print_state = MagicMock()
+        mock_coordinator_class.LEASE_TIMEOUT = 600
+        coordinator = mock_coordinator_class.return_value
+        coordinator.serve.return_value = ("0.0.0.0", 5000)
+        coordinator.get_result.side_effect = [
+            {"idx": 1, "result": "banana"},
+            None,
+            {"idx": 0, "result": "mango"},
+        ]
+
+        mass._serve_simulation("dummy_config", ["task0", "task1"], "0.0.0.0:5000", b"kiwi")
+
+        mock_coordinator_class.assert_called_once_with(
+            "dummy_config", ["task0", "task1"], period_list="dummy_period_list", lease_timeout=600
+        )
+        coordinator.serve.assert_called_once_with("0.0.0.0:5000", b"kiwi")
+        coordinator.shutdown.assert_called_once()
+        self.assertEqual(mass.result, ["mango", "banana"])
+        self.assertEqual(mass.done_count, 2)
+
+    @patch("builtins.print")
+    @patch("smtm.mass_simulator.Process")
+    @patch("smtm.mass_simulator.MassCoordinator")
+    def test_join_should_start_worker_processes(
+        self, mock_coordinator_class, mock_process_class, mock_print
+    ):
+        mass = MassSimulator()
+        mass._prepare_database = MagicMock()
+        mock_coordinator_class.get_authkey.return_value = b"kiwi"
+        coordinator = mock_coordinator_class.connect.return_value
+        coordinator.get_config.return_value = {"title": "mango", "currency": "BTC"}
+
+        mass.join("127.0.0.1:5000", 3, authkey="kiwi")
+
+        mock_coordinator_class.get_authkey.assert_called_once_with("kiwi")
+        mock_coordinator_class.connect.assert_called_once_with("127.0.0.1:5000", b"kiwi")
+        mass._prepare_database.assert_not_called()
+        self.assertEqual(mock_process_class.call_count, 3)
+        mock_process_class.assert_called_with(
+            target=MassSimulator._join_worker, args=("127.0.0.1:5000", b"kiwi")
+        )
+        self.assertEqual(mock_process_class.return_value.start.call_count, 3)
+        self.assertEqual(mock_process_class.return_value.join.call_count, 3)
+
+    @patch("builtins.print")
+    @patch("smtm.mass_simulator.Process")
+    @patch("smtm.mass_simulator.MassCoordinator")
+    def test_join_should_prepare_database_when_read_only_is_configured(
+        self, mock_coordinator_class, mock_process_class, mock_print
+    ):
+        mass = MassSimulator()
+        mass._prepare_database = MagicMock()
+        coordinator = mock_coordinator_class.connect.return_value
+        coordinator.get_config.return_value = {
+            "title": "mango",
+            "currency": "BTC",
+            "database": {"read_only": True},
+        }
+        coordinator.get_period_list.return_value = "dummy_period_list"
+
+        mass.join("127.0.0.1:5000", 1)
+
+        mass._prepare_database.assert_called_once_with({"read_only": True})
+        self.assertEqual(mass.config["period_list"], "dummy_period_list")
+
+    @patch("builtins.print")
+    @patch("time.sleep")
+    @patch("smtm.mass_simulator.MassCoordinator")
+    def test__join_worker_should_execute_leased_tasks_until_completed(
+        self, mock_coordinator_class, mock_sleep, mock_print
+    ):
+        backup_initialize_worker = MassSimulator._initialize_worker
+        backup_execute_simulation_task = MassSimulator._execute_simulation_task
+        MassSimulator._initialize_worker = MagicMock()
+        MassSimulator._execute_simulation_task = MagicMock(
+            side_effect=lambda task: {"idx": task["idx"], "result": "mango"}
+        )
+        coordinator = mock_coordinator_class.connect.return_value
+        coordinator.get_config.return_value = "dummy_config"
+        coordinator.lease.side_effect = [
+            [{"idx": 0, "group": 0}, {"idx": 1, "group": 0}],
+            [],
+            [{"idx": 2, "group": 1}],
+            None,
+        ]
+
+        MassSimulator._join_worker("127.0.0.1:5000", b"kiwi")
+
+        mock_coordinator_class.connect.assert_called_once_with("127.0.0.1:5000", b"kiwi")
+        MassSimulator._initialize_worker.assert_called_once_with("dummy_config")
+        self.assertEqual(coordinator.lease.call_count, 4)
+        mock_sleep.assert_called_once_with(1)
+        self.assertEqual(
+            [call[0][1] for call in coordinator.complete.call_args_list],
+            [
+                {"idx": 0, "result": "mango", "group": 0},
+                {"idx": 1, "result": "mango", "group": 0},
+                {"idx": 2, "result": "mango", "group": 1},
+            ],
+        )
+        MassSimulator._initialize_worker = backup_initialize_worker
+        MassSimulator._execute_simulation_task = backup_execute_simulation_task
+
+    @patch("builtins.print")
+    @patch("smtm.mass_simulator.MassCoordinator")
+    def test__join_worker_should_stop_when_coordinator_is_disconnected(
+        self, mock_coordinator_class, mock_print
+    ):
+        backup_initialize_worker = MassSimulator._initialize_worker
+        MassSimulator._initialize_worker = MagicMock()
+        mock_coordinator_class.connect.return_value.lease.side_effect = EOFError()
+
+        MassSimulator._join_worker("127.0.0.1:5000")
+
+        self.assertTrue(mock_print.call_args[0][0].endswith("coordinator is disconnected: "))
+        MassSimulator._initialize_worker = backup_initialize_worker
+
+    @patch("smtm.LogManager.set_stream_level")
+    @patch("smtm.mass_simulator.SimulationContext")
+    def test__initialize_worker_should_make_context(
+        self, mock_context_class, mock_set_stream_level
+    ):
+        backup_memory_usage = MassSimulator.memory_usage
+        MassSimulator.memory_usage = MagicMock()
+        config = {"currency": "ETH", "database": {"read_only": True, "backend": "archive"}}
+
+        MassSimulator._initialize_worker(config)
+
+        mock_context_class.assert_called_once_with(
+            currency="ETH",
+            db_file="smtm.db",
+            read_only=True,
+            pragmas=None,
+            backend="archive",
+            archive_dir="smtm_archive",
+        )
+        self.assertEqual(MassSimulator.worker_config, config)
+        self.assertEqual(MassSimulator.worker_context, mock_context_class.return_value)
+        self.assertIsNone(MassSimulator.worker_group)
+        self.assertEqual(LogManager.log_filename, "mass-simulation-MainProcess.log")
+        MassSimulator.memory_usage = backup_memory_usage
+
+    def test__execute_simulation_task_should_prefetch_once_for_each_group(self):
+        backup_run_single = MassSimulator.run_single
+        backup_get_initialized_operator = MassSimulator.get_initialized_operator
+        MassSimulator.run_single = MagicMock(return_value="mango_report")
+        operator = MagicMock()
+        operator.analyzer.get_metrics.return_value = "mango_result"
+        MassSimulator.get_initialized_operator = MagicMock(return_value=operator)
+        MassSimulator.worker_config = {
+            "title": "BnH-2Hour",
+            "budget": 50000,
+            "strategy": 0,
+            "interval": 1,
+            "currency": "BTC",
+        }
+        context = MagicMock()
+        MassSimulator.worker_context = context
+        MassSimulator.worker_group = None
+        period_list = [
+            {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+            {"start": "2020-04-30T19:00:00", "end": "2020-04-30T21:00:00"},
+        ]
+        task_list = [
+            {"idx": 7, "period": period_list[0], "group": 3, "group_periods": period_list},
+            {
+                "idx": 8,
+                "period": period_list[1],
+                "parameter": {"SHORT": 5},
+                "group": 3,
+                "group_periods": period_list,
+            },
+        ]
+
+        result = [MassSimulator._execute_simulation_task(task) for task in task_list]
+
+        context.prefetch_periods.assert_called_once_with(period_list)
+        self.assertEqual(result[0], {"idx": 7, "result": "mango_result"})
+        self.assertEqual(result[1], {"idx": 8, "result": "mango_result"})
+        MassSimulator.run_single.assert_called_with(operator, sync=False)
+        call_args_list = MassSimulator.get_initialized_operator.call_args_list
+        self.assertEqual(
+            call_args_list[0][0],
+            (50000, 0, 1, "BTC", "2020-04-30T17:00:00", "2020-04-30T19:00:00", "MASS-BnH-2Hour-7"),
+        )
+        self.assertEqual(
+            call_args_list[0][1], {"context": context, "parameter": None, "metrics_only": False}
+        )
+        self.assertEqual(call_args_list[1][0][4], "2020-04-30T19:00:00")
+        self.assertEqual(call_args_list[1][1]["parameter"], {"SHORT": 5})
+        MassSimulator.run_single = backup_run_single
+        MassSimulator.get_initialized_operator = backup_get_initialized_operator
+        MassSimulator.worker_config = None
+        MassSimulator.worker_context = None
+        MassSimulator.worker_group = None
+
+    @patch("smtm.mass_simulator.ResultJournal")
+    @patch("smtm.LogManager.set_stream_level")
+    def test_run_should_prepare_database_when_read_only_is_configured(
+        self, mock_set_stream_level, mock_journal_class
+    ):
+        mass = MassSimulator()
         dummy_config = {
             "title": "BnH-2Hour",
             "budget": 50000,
@@ -304,78 +858,48 @@ class MassSimulatorTests(unittest.TestCase):
             "interval": 1,
             "currency": "BTC",
             "description": "mass-simluation-unit-test",
-            "partial_idx": 1,
-            "partial_period_list": [
-                {
-                    "idx": 7,
-                    "period": {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
-                },
-                {
-                    "idx": 8,
-                    "period": {"start": "2020-04-30T18:00:00", "end": "2020-04-30T20:00:00"},
-                },
+            "period_list": [
+                {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
             ],
+            "database": {"read_only": True, "pragmas": {"mmap_size": 0}},
         }
-        backup_run_single = MassSimulator.run_single
-        backup_memory_usage = MassSimulator.memory_usage
-        MassSimulator.run_single = MagicMock(return_value="mango_result")
-        MassSimulator.memory_usage = MagicMock()
-        MassSimulator.get_initialized_operator = MagicMock(return_value="dummy_operator")
-        result = MassSimulator._execute_single_process_simulation(dummy_config)
-
-        MassSimulator.memory_usage.assert_called_once()
-        MassSimulator.run_single.assert_called_with("dummy_operator")
-        self.assertEqual(result[0]["idx"], 7)
-        self.assertEqual(result[0]["result"], "mango_result")
-        self.assertEqual(result[1]["idx"], 8)
-        self.assertEqual(result[1]["result"], "mango_result")
-        self.assertEqual(MassSimulator.get_initialized_operator.call_args_list[0][0][0], 50000)
-        self.assertEqual(MassSimulator.get_initialized_operator.call_args_list[0][0][1], 0)
-        self.assertEqual(MassSimulator.get_initialized_operator.call_args_list[0][0][2], 1)
-        self.assertEqual(MassSimulator.get_initialized_operator.call_args_list[0][0][3], "BTC")
-        self.assertEqual(
-            MassSimulator.get_initialized_operator.call_args_list[0][0][4], "2020-04-30T17:00:00"
+        mass._load_config = MagicMock(return_value=dummy_config)
+        mass.analyze_result = MagicMock()
+        mass.print_state = MagicMock()
+        mass._execute_simulation = MagicMock()
+        mass._prepare_database = MagicMock()
+
+        mass.run("mass_config_file_name", 2)
+
+        mass._prepare_database.assert_called_once_with(
+            {"read_only": True, "pragmas": {"mmap_size": 0}}
         )
         self.assertEqual(
-            MassSimulator.get_initialized_operator.call_args_list[0][0][5], "2020-04-30T19:00:00"
+            mass._execute_simulation.call_args[0][0]["database"],
+            {"read_only": True, "pragmas": {"mmap_size": 0}},
         )
-        self.assertEqual(MassSimulator.get_initialized_operator.call_args_list[1][0][0], 50000)
-        self.assertEqual(MassSimulator.get_initialized_operator.call_args_list[1][0][1], 0)
-        self.assertEqual(MassSimulator.get_initialized_operator.call_args_list[1][0][2], 1)
-        self.assertEqual(MassSimulator.get_initialized_operator.call_args_list[1][0][3], "BTC")
-        self.assertEqual(
-            MassSimulator.get_initialized_operator.call_args_list[1][0][4], "2020-04-30T18:00:00"
+
+    @patch("smtm.mass_simulator.DataRepository")
+    def test__prepare_database_should_prefetch_merged_periods(self, mock_repo_class):
+        mass = MassSimulator()
+        mass.config = {
+            "currency": "ETH",
+            "period_list": [
+                {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"},
+                {"start": "2020-04-30T19:00:00", "end": "2020-04-30T21:00:00"},
+                {"start": "2020-05-01T17:00:00", "end": "2020-05-01T19:00:00"},
+            ],
+        }
+
+        mass._prepare_database({"db_file": "mango.db", "read_only": True})
+
+        mock_repo_class.assert_called_once_with(
+            "mango.db", pragmas=None, backend="sqlite", archive_dir="smtm_archive"
         )
         self.assertEqual(
-            MassSimulator.get_initialized_operator.call_args_list[1][0][5], "2020-04-30T20:00:00"
+            mock_repo_class.return_value.prefetch.call_args_list,
+            [
+                call("2020-04-30T17:00:00", "2020-04-30T21:00:00", ["KRW-ETH"]),
+                call("2020-05-01T17:00:00", "2020-05-01T19:00:00", ["KRW-ETH"]),
+            ],
         )
-        MassSimulator.run_single = backup_run_single
-        MassSimulator.memory_usage = backup_memory_usage
-
-    def test_make_chunk_should_make_chunk_list_from_original_list(self):
-        a = [1, 2, 3, 4, 5, 6, 7]
-        a_result = MassSimulator.make_chunk(a, 3)
-        self.assertEqual(a_result[0], [1, 2, 3])
-        self.assertEqual(a_result[1], [4, 5])
-        self.assertEqual(a_result[2], [6, 7])
-
-        a_result = MassSimulator.make_chunk(a, 4)
-        self.assertEqual(a_result[0], [1, 2])
-        self.assertEqual(a_result[1], [3, 4])
-        self.assertEqual(a_result[2], [5, 6])
-        self.assertEqual(a_result[3], [7])
-
-        a_result = MassSimulator.make_chunk(a, 2)
-        self.assertEqual(a_result[0], [1, 2, 3, 4])
-        self.assertEqual(a_result[1], [5, 6, 7])
-
-        b = ["a", "b", "c", "d", "e"]
-        b_result = MassSimulator.make_chunk(b, 2)
-        self.assertEqual(b_result[0], ["a", "b", "c"])
-        self.assertEqual(b_result[1], ["d", "e"])
-
-        b_result = MassSimulator.make_chunk(b, 4)
-        self.assertEqual(b_result[0], ["a", "b"])
-        self.assertEqual(b_result[1], ["c"])
-        self.assertEqual(b_result[2], ["d"])
-        self.assertEqual(b_result[3], ["e"])
@@ -1,6 +1,6 @@
 import unittest
 from datetime import datetime, timedelta
-from smtm import Operator
+from smtm import GraphRenderer, Operator
 from unittest.mock import *
 import requests
 import threading
@@ -31,9 +31,20 @@ class OperatorInitializeTests(unittest.TestCase):
         self.operator.initialize(
             "mango", self.strategy_mock, self.trader_mock, self.analyzer_mock, "banana"
         )
-        self.analyzer_mock.initialize.assert_called_once_with("orange")
+        self.analyzer_mock.initialize.assert_called_once_with("orange", ANY)
         self.strategy_mock.initialize.assert_called_once_with("banana", add_spot_callback=ANY)
 
+    def test_initialize_should_pass_strategy_retention_info_callback_to_analyzer(self):
+        self.strategy_mock.get_retention_info.return_value = "retention_info"
+        self.operator.initialize(
+            "mango", self.strategy_mock, self.trader_mock, self.analyzer_mock, "banana"
+        )
+        callback = self.analyzer_mock.initialize.call_args[0][1]
+        self.assertEqual(callback(), "retention_info")
+
+        self.strategy_mock.get_retention_info.side_effect = AttributeError("no retention")
+        self.assertEqual(callback(), {})
+
     def test_initialize_should_call_strategy_initialize_with_add_spot_callback(self):
         self.trader_mock.get_account_info = "orange"
         self.operator.initialize(
@@ -318,14 +329,28 @@ class OperatorTests(unittest.TestCase):
             {"runnable": ANY, "callback": "dummy", "index_info": 7}
         )
 
-        self.analyzer_mock.get_return_report.return_value = "grape"
+        def get_return_report(graph_filename, index_info, graph_renderer, callback, graph_key):
+            graph_renderer.render("snapshot", graph_filename, callback, key=graph_key)
+
+        self.analyzer_mock.get_return_report.side_effect = get_return_report
+        self.operator.graph_renderer = GraphRenderer(use_process=False)
         task = {"runnable": MagicMock(), "callback": MagicMock(), "index_info": 5}
         runnable = self.operator.worker.post_task.call_args[0][0]["runnable"]
-        runnable(task)
+        with patch("smtm.GraphRenderer.draw", side_effect=lambda snapshot, dest: dest):
+            runnable(task)
+            thread = self.operator.graph_renderer.thread
+            self.operator.graph_renderer.stop()
+            thread.join(5)
+
         self.analyzer_mock.get_return_report.assert_called_once_with(
-            graph_filename=ANY, index_info=5
+            graph_filename=ANY,
+            index_info=5,
+            graph_renderer=self.operator.graph_renderer,
+            callback=task["callback"],
+            graph_key=(None, 5),
         )
-        task["callback"].assert_called_once_with("grape")
+        graph_filename = self.analyzer_mock.get_return_report.call_args[1]["graph_filename"]
+        task["callback"].assert_called_once_with(graph_filename)
 
     def test_get_score_do_nothing_when_state_is_NOT_running(self):
         timer_mock = MagicMock()
@@ -0,0 +1,67 @@
+import unittest
+from smtm import ParameterSampler
+
+
+class ParameterSamplerTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_sample_should_return_None_when_config_is_None(self):
+        self.assertIsNone(ParameterSampler.sample(None))
+
+    def test_sample_should_raise_UserWarning_when_config_is_invalid(self):
+        with self.assertRaises(UserWarning):
+            ParameterSampler.sample({"method": "mango", "space": {"SHORT": [1, 2]}})
+        with self.assertRaises(UserWarning):
+            ParameterSampler.sample({"method": "grid", "space": {}})
+        with self.assertRaises(UserWarning):
+            ParameterSampler.sample({"method": "random", "space": {"SHORT": [10, 1]}})
+        with self.assertRaises(UserWarning):
+            ParameterSampler.sample({"method": "lhs", "space": {"SHORT": [1, 2, 3]}})
+
+    def test_sample_should_return_all_combinations_with_grid(self):
+        parameter_list = ParameterSampler.sample(
+            {"space": {"SHORT": [5, 10], "LONG": [40, 60, 80]}}
+        )
+
+        self.assertEqual(
+            parameter_list,
+            [
+                {"SHORT": 5, "LONG": 40},
+                {"SHORT": 5, "LONG": 60},
+                {"SHORT": 5, "LONG": 80},
+                {"SHORT": 10, "LONG": 40},
+                {"SHORT": 10, "LONG": 60},
+                {"SHORT": 10, "LONG": 80},
+            ],
+        )
+
+    def test_sample_should_return_values_in_range_with_random(self):
+        config = {
+            "method": "random",
+            "space": {"RSI_COUNT": [10, 20], "STD_RATIO": [0.0001, 0.0002]},
+            "count": 30,
+            "seed": 7,
+        }
+        parameter_list = ParameterSampler.sample(config)
+
+        self.assertEqual(len(parameter_list), 30)
+        for parameter in parameter_list:
+            self.assertIsInstance(parameter["RSI_COUNT"], int)
+            self.assertTrue(10 <= parameter["RSI_COUNT"] <= 20)
+            self.assertIsInstance(parameter["STD_RATIO"], float)
+            self.assertTrue(0.0001 <= parameter["STD_RATIO"] <= 0.0002)
+        self.assertEqual(ParameterSampler.sample(config), parameter_list)
+
+    def test_sample_should_use_each_stratum_once_with_lhs(self):
+        parameter_list = ParameterSampler.sample(
+            {"method": "lhs", "space": {"SHORT": [0, 9], "RATIO": [0.0, 1.0]}, "count": 10}
+        )
+
+        self.assertEqual(sorted(item["SHORT"] for item in parameter_list), list(range(10)))
+        self.assertEqual(
+            sorted(int(item["RATIO"] * 10) for item in parameter_list), list(range(10))
+        )
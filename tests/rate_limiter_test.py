@@ -0,0 +1,54 @@
+import unittest
+from smtm import RateLimiter
+from unittest.mock import *
+
+
+class RateLimiterTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_init_should_raise_UserWarning_when_rate_is_invalid(self):
+        with self.assertRaises(UserWarning):
+            RateLimiter(0)
+
+    @patch("time.sleep")
+    @patch("time.monotonic")
+    def test_acquire_should_not_wait_when_token_is_enough(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100
+        limiter = RateLimiter(10, capacity=3)
+
+        limiter.acquire()
+        limiter.acquire()
+        limiter.acquire()
+
+        mock_sleep.assert_not_called()
+        self.assertEqual(limiter.tokens, 0)
+
+    @patch("time.sleep")
+    @patch("time.monotonic")
+    def test_acquire_should_wait_until_token_is_refilled(self, mock_monotonic, mock_sleep):
+        mock_monotonic.side_effect = [100, 100, 100, 100.125, 100.25]
+        limiter = RateLimiter(4, capacity=1)
+
+        limiter.acquire()
+        limiter.acquire()
+
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(mock_sleep.call_args_list[0][0][0], 0.25)
+        self.assertEqual(mock_sleep.call_args_list[1][0][0], 0.125)
+        self.assertEqual(limiter.tokens, 0)
+
+    @patch("time.sleep")
+    @patch("time.monotonic")
+    def test_acquire_should_not_save_token_over_capacity(self, mock_monotonic, mock_sleep):
+        mock_monotonic.side_effect = [100, 200]
+        limiter = RateLimiter(10, capacity=2)
+        limiter.tokens = 0
+
+        limiter.acquire()
+
+        mock_sleep.assert_not_called()
+        self.assertEqual(limiter.tokens, 1)
@@ -0,0 +1,138 @@
+import unittest
+from array import array
+from smtm import RecordTable
+
+
+class RecordTableTests(unittest.TestCase):
+    def setUp(self):
+        self.table = RecordTable(("id", "price", "date_time"), kind=1, float_fields=("price",))
+
+    def test_append_should_store_values_in_columns_and_return_record_with_kind(self):
+        record = {"date_time": "2020-04-30T17:00:00", "id": "mango", "price": 500.0}
+        self.table.append(record)
+        record["price"] = 0
+
+        self.assertEqual(len(self.table), 1)
+        self.assertEqual(
+            self.table[0],
+            {"id": "mango", "price": 500.0, "date_time": "2020-04-30T17:00:00", "kind": 1},
+        )
+        self.assertIsInstance(self.table.columns[1], array)
+        self.assertEqual(self.table.get_timestamp(-1), 1588266000)
+
+    def test_append_should_keep_original_value_when_value_is_not_float(self):
+        self.table.append({"id": "mango", "price": 500.0})
+        self.table.append({"id": "orange", "price": 0})
+        self.table.append({"id": "apple", "price": "5000"})
+
+        self.assertEqual([record["price"] for record in self.table], [500.0, 0, "5000"])
+        self.assertEqual(repr(self.table[1]["price"]), "0")
+        self.assertIsNone(self.table.get_timestamp(-1))
+
+    def test_append_should_keep_extra_items_and_omit_missing_items(self):
+        self.table.append({"name": "orange", "kind": 5}, price=1.5)
+
+        self.assertEqual(self.table[-1], {"price": 1.5, "name": "orange", "kind": 1})
+        self.assertEqual(list(self.table[-1].keys()), ["price", "name", "kind"])
+
+    def test_table_should_work_like_list_of_records(self):
+        self.table.append({"id": "mango", "date_time": "2020-04-30T17:00:00"})
+        self.table.append({"id": "orange", "date_time": "2020-04-30T17:01:00"})
+        expected = [
+            {"id": "mango", "date_time": "2020-04-30T17:00:00", "kind": 1},
+            {"id": "orange", "date_time": "2020-04-30T17:01:00", "kind": 1},
+        ]
+
+        self.assertEqual(self.table, expected)
+        self.assertEqual(self.table[1:], expected[1:])
+        self.assertEqual(self.table[-1], expected[-1])
+        self.assertEqual(["a"] + self.table, ["a"] + expected)
+        self.assertEqual(self.table + self.table, expected + expected)
+        self.assertEqual(repr(self.table), repr(expected))
+        with self.assertRaises(IndexError):
+            self.table[2]
+
+    def test_table_without_kind_should_not_add_kind(self):
+        table = RecordTable(("balance",), float_fields=("balance",))
+        table.append({"balance": 5000.0, "kind": "mango"})
+        self.assertEqual(table[0], {"balance": 5000.0, "kind": "mango"})
+
+    def test_is_sorted_should_be_false_when_date_time_is_not_in_order_or_invalid(self):
+        self.table.append({"date_time": "2020-04-30T17:00:00"})
+        self.table.append({"date_time": "2020-04-30T17:00:00"})
+        self.assertTrue(self.table.is_sorted)
+
+        self.table.append({"date_time": "2020-04-30T16:59:00"})
+        self.assertFalse(self.table.is_sorted)
+
+        table = RecordTable(("date_time",))
+        table.append({"date_time": "2020-02-27T24:00:00"})
+        self.assertFalse(table.is_sorted)
+
+    def test_get_range_should_return_table_of_sliced_records(self):
+        for minute in range(5):
+            self.table.append({"id": minute, "date_time": f"2020-04-30T17:0{minute}:00"})
+
+        sliced = self.table.get_range(-3, None)
+
+        self.assertIsInstance(sliced, RecordTable)
+        self.assertEqual(sliced, self.table[-3:])
+        self.assertEqual(list(sliced.timestamps), list(self.table.timestamps[-3:]))
+        self.assertEqual(self.table.get_range(None, 10), self.table[:10])
+
+    def test_filter_by_time_should_return_records_in_time_range(self):
+        for minute in (0, 1, 1, 3, 4):
+            self.table.append({"date_time": f"2020-04-30T17:0{minute}:00"})
+        start = RecordTable.to_timestamp("2020-04-30T17:01:00")
+        end = RecordTable.to_timestamp("2020-04-30T17:03:00")
+
+        self.assertEqual(len(self.table.filter_by_time(start, end)), 3)
+
+        self.table.append({"date_time": "2020-04-30T17:02:00"})
+        filtered = self.table.filter_by_time(start, end)
+        self.assertFalse(self.table.is_sorted)
+        self.assertEqual(
+            [record["date_time"] for record in filtered],
+            [
+                "2020-04-30T17:01:00",
+                "2020-04-30T17:01:00",
+                "2020-04-30T17:03:00",
+                "2020-04-30T17:02:00",
+            ],
+        )
+
+    def test_get_column_should_return_values_and_raise_KeyError_for_missing_value(self):
+        self.table.append({"id": "mango", "price": 1.5})
+        self.table.append({"id": "orange", "price": 2.5})
+        self.assertEqual(list(self.table.get_column("price")), [1.5, 2.5])
+
+        self.table.append({"price": 3.5})
+        with self.assertRaises(KeyError):
+            self.table.get_column("id")
+
+    def test_drop_should_remove_first_records(self):
+        self.table.append({"id": "mango", "price": 1.5, "date_time": "2020-04-30T17:00:00"})
+        self.table.append({"name": "apple", "date_time": "2020-04-30T17:01:00"})
+        self.table.append({"id": "orange", "price": 2.5, "date_time": "2020-04-30T17:02:00"})
+        expected = list(self.table)[2:]
+
+        self.table.drop(2)
+
+        self.assertEqual(len(self.table), 1)
+        self.assertEqual(self.table, expected)
+        self.assertEqual(self.table.get_timestamp(0), 1588266120)
+        self.assertEqual(self.table.generation, 1)
+
+    def test_extend_should_append_records_of_other_table(self):
+        self.table.append({"id": "mango", "price": 1.5, "date_time": "2020-04-30T17:00:00"})
+        other = RecordTable(("id", "price", "date_time"), kind=1, float_fields=("price",))
+        other.append({"id": "orange", "price": "free", "date_time": "2020-04-30T17:01:00"})
+        other.append({"name": "apple", "date_time": "2020-04-30T16:00:00"})
+
+        self.table.extend(other)
+
+        self.assertEqual(self.table, [self.table[0]] + list(other))
+        self.assertEqual(self.table.get_timestamp(-1), 1588262400)
+        self.assertFalse(self.table.is_sorted)
+        with self.assertRaises(UserWarning):
+            self.table.extend(RecordTable(("id",)))
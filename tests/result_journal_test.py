@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+from smtm import ResultJournal
+
+
+class ResultJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.config = {"budget": 50000, "strategy": 1, "interval": 1, "currency": "BTC"}
+        self.job_list = [
+            {"idx": 0, "period": {"start": "2020-04-30T17:00:00", "end": "2020-04-30T19:00:00"}},
+            {"idx": 1, "period": {"start": "2020-04-30T19:00:00", "end": "2020-04-30T21:00:00"}},
+        ]
+
+    def test_make_key_should_return_same_key_for_same_simulation_config(self):
+        key = ResultJournal.make_key(self.config)
+        other = dict(self.config)
+        other["title"] = "other title"
+        other["period_list"] = []
+        self.assertEqual(ResultJournal.make_key(other), key)
+
+        other["budget"] = 10000
+        self.assertNotEqual(ResultJournal.make_key(other), key)
+
+    def test_load_should_return_empty_dict_when_file_not_exist(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            journal = ResultJournal(os.path.join(tmpdir, "journal.jsonl"), "mango")
+            self.assertEqual(journal.load(self.job_list), {})
+
+    def test_append_should_write_record_and_load_should_read_it(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "output", "journal.jsonl")
+            journal = ResultJournal(file_path, "mango")
+            journal.open()
+            journal.append(self.job_list[1], (0, 0, 1.5, 2.5))
+            journal.close()
+
+            with open(file_path, "r", encoding="utf-8") as journal_file:
+                record = json.loads(journal_file.readline())
+            self.assertEqual(record["key"], "mango")
+            self.assertEqual(record["idx"], 1)
+            self.assertEqual(record["period"], self.job_list[1]["period"])
+            self.assertIsNone(record["parameter"])
+            self.assertEqual(journal.load(self.job_list), {1: (0, 0, 1.5, 2.5)})
+
+    def test_load_should_ignore_record_of_other_key_or_job(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "journal.jsonl")
+            journal = ResultJournal(file_path, "mango")
+            journal.open()
+            journal.append(self.job_list[0], (0, 0, 1.5))
+            journal.append({"idx": 1, "period": "other period"}, (0, 0, 2.5))
+            journal.append({"idx": 5, "period": "out of range"}, (0, 0, 3.5))
+            journal.close()
+            ResultJournal(file_path, "orange").open(resume=True)
+
+            self.assertEqual(journal.load(self.job_list), {0: (0, 0, 1.5)})
+            self.assertEqual(ResultJournal(file_path, "orange").load(self.job_list), {})
+
+    def test_load_should_ignore_parameter_mismatched_record(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "journal.jsonl")
+            job = dict(self.job_list[0], parameter={"SHORT": 5})
+            journal = ResultJournal(file_path, "mango")
+            journal.open()
+            journal.append(job, (0, 0, 1.5))
+            journal.close()
+
+            self.assertEqual(journal.load([job]), {0: (0, 0, 1.5)})
+            self.assertEqual(journal.load([dict(job, parameter={"SHORT": 10})]), {})
+            self.assertEqual(journal.load(self.job_list), {})
+
+    def test_open_should_clear_records_when_resume_is_false(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "journal.jsonl")
+            journal = ResultJournal(file_path, "mango")
+            journal.open()
+            journal.append(self.job_list[0], (0, 0, 1.5))
+            journal.open(resume=True)
+            journal.append(self.job_list[1], (0, 0, 2.5))
+            journal.close()
+            self.assertEqual(journal.load(self.job_list), {0: (0, 0, 1.5), 1: (0, 0, 2.5)})
+
+            journal.open()
+            journal.close()
+            self.assertEqual(journal.load(self.job_list), {})
+
+    def test_open_should_skip_truncated_line_when_resume_is_true(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "journal.jsonl")
+            journal = ResultJournal(file_path, "mango")
+            journal.open()
+            journal.append(self.job_list[0], (0, 0, 1.5))
+            journal.journal_file.write('{"key": "mango", "idx": 1, "per')
+            journal.close()
+
+            journal.open(resume=True)
+            journal.append(self.job_list[1], (0, 0, 2.5))
+            journal.close()
+            self.assertEqual(journal.load(self.job_list), {0: (0, 0, 1.5), 1: (0, 0, 2.5)})
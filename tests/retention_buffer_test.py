@@ -0,0 +1,89 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from smtm.retention_buffer import RetentionBuffer
+from unittest.mock import *
+
+
+class RetentionBufferTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_append_should_keep_recent_items_only(self):
+        buffer = RetentionBuffer(maxlen=2)
+        buffer.append({"id": 1})
+        buffer.append({"id": 2})
+        buffer.append({"id": 3})
+
+        self.assertEqual(list(buffer), [{"id": 2}, {"id": 3}])
+        self.assertEqual(buffer[-1], {"id": 3})
+        self.assertEqual(buffer.dropped_count, 1)
+
+    def test_append_should_keep_all_items_when_maxlen_is_None(self):
+        buffer = RetentionBuffer(range(5))
+        buffer.append(5)
+        self.assertEqual(list(buffer), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(buffer.dropped_count, 0)
+
+    def test_append_should_write_dropped_items_to_spill_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spill_file = os.path.join(tmpdir, "spill.jsonl")
+            buffer = RetentionBuffer([{"id": 1}, {"id": 2}], maxlen=2, spill_file=spill_file)
+            buffer.append({"id": 3})
+            buffer.append({"id": 4})
+
+            with open(spill_file, "r", encoding="utf-8") as spilled:
+                items = [json.loads(line) for line in spilled]
+
+        self.assertEqual(items, [{"id": 1}, {"id": 2}])
+        self.assertEqual(list(buffer), [{"id": 3}, {"id": 4}])
+
+    def test_init_should_spill_items_over_maxlen(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spill_file = os.path.join(tmpdir, "spill.jsonl")
+            buffer = RetentionBuffer([1, 2, 3], maxlen=1, spill_file=spill_file)
+
+            with open(spill_file, "r", encoding="utf-8") as spilled:
+                self.assertEqual(spilled.read(), "1\n2\n")
+        self.assertEqual(list(buffer), [3])
+        self.assertEqual(buffer.dropped_count, 2)
+
+    def test_get_info_should_return_retention_state(self):
+        buffer = RetentionBuffer([1, 2, 3], maxlen=2)
+
+        info = buffer.get_info()
+        self.assertEqual(info["count"], 2)
+        self.assertEqual(info["maxlen"], 2)
+        self.assertEqual(info["dropped"], 1)
+        self.assertGreater(info["size"], 0)
+
+    def test_append_should_open_spill_file_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spill_file = os.path.join(tmpdir, "spill.jsonl")
+            with patch("builtins.open", mock_open()) as mock_file:
+                buffer = RetentionBuffer(range(10), maxlen=2, spill_file=spill_file)
+                buffer.append(10)
+
+            mock_file.assert_called_once_with(spill_file, "a", buffering=1, encoding="utf-8")
+            self.assertEqual(mock_file().write.call_count, 9)
+
+    def test_pickle_should_keep_items_and_policy(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spill_file = os.path.join(tmpdir, "mango.jsonl")
+            buffer = RetentionBuffer([1, 2, 3], maxlen=2, spill_file=spill_file)
+
+            loaded = pickle.loads(pickle.dumps(buffer))
+            loaded.append(4)
+            loaded.close()
+
+            with open(spill_file, "r", encoding="utf-8") as spilled:
+                self.assertEqual(spilled.read(), "1\n2\n")
+        self.assertEqual(list(loaded), [3, 4])
+        self.assertEqual(loaded.maxlen, 2)
+        self.assertEqual(loaded.spill_file, spill_file)
+        self.assertEqual(loaded.dropped_count, 2)
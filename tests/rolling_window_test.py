@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from smtm import RollingWindow
+
+
+class RollingWindowTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_init_should_raise_UserWarning_when_size_is_invalid(self):
+        with self.assertRaises(UserWarning):
+            RollingWindow(0)
+
+    def test_append_should_keep_only_recent_values(self):
+        window = RollingWindow(3)
+        self.assertEqual(window.values(), [])
+        self.assertIsNone(window.mean())
+        self.assertIsNone(window.std())
+
+        window.append(1)
+        window.append(2)
+        self.assertFalse(window.is_full())
+        self.assertEqual(window.values(), [1, 2])
+
+        window.append(3)
+        window.append(4)
+        self.assertTrue(window.is_full())
+        self.assertEqual(len(window), 3)
+        self.assertEqual(window.values(), [2, 3, 4])
+        self.assertEqual(window.total, 9)
+        self.assertEqual(window.mean(), 3)
+
+    def test_getitem_should_return_value_from_oldest(self):
+        window = RollingWindow(3)
+        for value in range(5):
+            window.append(value)
+
+        self.assertEqual(window[0], 2)
+        self.assertEqual(window[2], 4)
+        self.assertEqual(window[-1], 4)
+        self.assertEqual(window[-3], 2)
+        with self.assertRaises(IndexError):
+            window[3]
+        with self.assertRaises(IndexError):
+            window[-4]
+
+    def test_mean_and_std_should_return_same_value_with_numpy(self):
+        window = RollingWindow(20)
+        values = 50000000 + np.cumsum(np.sin(np.arange(1000)) * 1000)
+        for idx, value in enumerate(values):
+            window.append(value)
+            recent = values[max(idx - 19, 0) : idx + 1]
+            self.assertAlmostEqual(window.mean(), np.mean(recent), places=5)
+            self.assertAlmostEqual(window.std(), np.std(recent), delta=1e-3)
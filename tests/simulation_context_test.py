@@ -0,0 +1,115 @@
+import unittest
+from smtm import SimulationContext, CandleFrame
+from unittest.mock import *
+
+
+class SimulationContextTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_constructor_should_raise_UserWarning_with_not_supported_currency(self):
+        with self.assertRaises(UserWarning):
+            SimulationContext(currency="USD")
+
+    def test_load_should_call_repo_get_frame_correctly(self):
+        context = SimulationContext(currency="ETH")
+        context.repo = MagicMock()
+        context.repo.get_frame.return_value = "mango_frame"
+
+        frame = context.load("2020-03-20T00:00:00", 10)
+
+        self.assertEqual(frame, "mango_frame")
+        self.assertEqual(context.frame, "mango_frame")
+        context.repo.get_frame.assert_called_once_with(
+            "2020-03-19T23:50:00", "2020-03-20T00:00:00", market="KRW-ETH"
+        )
+
+    @patch("smtm.simulation_context.DataRepository")
+    def test_load_should_create_repo_once(self, mock_repo_class):
+        context = SimulationContext(db_file="mango.db")
+        context.load("2020-03-20T00:00:00", 10)
+        context.load("2020-03-20T01:00:00", 10)
+        mock_repo_class.assert_called_once_with(
+            "mango.db",
+            read_only=False,
+            pragmas=None,
+            shared=True,
+            backend="sqlite",
+            archive_dir="smtm_archive",
+        )
+        self.assertEqual(mock_repo_class.return_value.get_frame.call_count, 2)
+
+    @staticmethod
+    def make_dummy_frame(start, count):
+        start_ts = CandleFrame.to_timestamp(start)
+        timestamp = [start_ts + i * 60 for i in range(count)]
+        columns = {name: [float(i) for i in range(count)] for name in CandleFrame.PRICE_COLUMNS}
+        return CandleFrame("KRW-BTC", timestamp, columns)
+
+    def test_prefetch_periods_should_merge_contiguous_periods(self):
+        context = SimulationContext()
+        context.prefetch_periods(
+            [
+                {"start": "2020-03-20T02:00:00", "end": "2020-03-20T04:00:00"},
+                {"start": "2020-03-20T00:00:00", "end": "2020-03-20T02:00:00"},
+                {"start": "2020-03-20T03:00:00", "end": "2020-03-20T05:00:00"},
+                {"start": "2020-03-21T00:00:00", "end": "2020-03-21T02:00:00"},
+            ]
+        )
+        self.assertEqual(
+            context.prefetch_ranges,
+            [
+                ["2020-03-20T00:00:00", "2020-03-20T05:00:00"],
+                ["2020-03-21T00:00:00", "2020-03-21T02:00:00"],
+            ],
+        )
+
+    def test_load_should_slice_prefetched_range_with_single_query(self):
+        context = SimulationContext()
+        context.repo = MagicMock()
+        context.repo.get_frame.return_value = self.make_dummy_frame("2020-03-20T00:00:00", 300)
+        context.prefetch_periods(
+            [
+                {"start": "2020-03-20T00:00:00", "end": "2020-03-20T02:00:00"},
+                {"start": "2020-03-20T02:00:00", "end": "2020-03-20T04:00:00"},
+                {"start": "2020-03-20T03:00:00", "end": "2020-03-20T05:00:00"},
+            ]
+        )
+
+        first = context.load("2020-03-20T02:00:00", 120)
+        second = context.load("2020-03-20T05:00:00", 120)
+
+        context.repo.get_frame.assert_called_once_with(
+            "2020-03-20T00:00:00", "2020-03-20T05:00:00", market="KRW-BTC"
+        )
+        self.assertEqual(len(first), 120)
+        self.assertEqual(first[0]["date_time"], "2020-03-20T00:00:00")
+        self.assertEqual(len(second), 120)
+        self.assertEqual(second[0]["date_time"], "2020-03-20T03:00:00")
+        self.assertEqual(second[-1]["date_time"], "2020-03-20T04:59:00")
+
+    def test_load_should_query_repo_when_period_is_not_prefetched(self):
+        context = SimulationContext()
+        context.repo = MagicMock()
+        context.repo.get_frame.return_value = "mango_frame"
+        context.prefetch_periods([{"start": "2020-03-20T00:00:00", "end": "2020-03-20T02:00:00"}])
+
+        self.assertEqual(context.load("2020-03-21T02:00:00", 120), "mango_frame")
+        context.repo.get_frame.assert_called_once_with(
+            "2020-03-21T00:00:00", "2020-03-21T02:00:00", market="KRW-BTC"
+        )
+
+    def test_load_should_query_repo_when_prefetched_data_is_broken(self):
+        context = SimulationContext()
+        context.repo = MagicMock()
+        context.repo.get_frame.side_effect = [
+            self.make_dummy_frame("2020-03-20T00:30:00", 90),
+            "mango_frame",
+        ]
+        context.prefetch_periods([{"start": "2020-03-20T00:00:00", "end": "2020-03-20T02:00:00"}])
+
+        self.assertEqual(context.load("2020-03-20T01:00:00", 60), "mango_frame")
+        self.assertEqual(context.repo.get_frame.call_count, 2)
@@ -1,5 +1,5 @@
 import unittest
-from smtm import SimulationDataProvider
+from smtm import SimulationDataProvider, CandleFrame
 from unittest.mock import *
 import requests
 
@@ -11,19 +11,29 @@ class SimulationDataProviderTests(unittest.TestCase):
     def tearDown(self):
         pass
 
-    def test_initialize_simulation_should_call_repo_get_data_correctly(self):
+    def test_initialize_simulation_should_call_repo_get_frame_correctly(self):
         dp = SimulationDataProvider()
         dp.index = 10
         dp.repo = MagicMock()
-        dp.repo.get_data = MagicMock(return_value="orange")
+        dp.repo.get_frame = MagicMock(return_value="orange")
         dp.initialize_simulation("2020-03-20T00:00:00", 10)
 
         self.assertEqual(dp.index, 0)
         self.assertEqual(dp.data, "orange")
-        dp.repo.get_data.assert_called_once_with(
+        dp.repo.get_frame.assert_called_once_with(
             "2020-03-19T23:50:00", "2020-03-20T00:00:00", market="KRW-BTC"
         )
 
+    def test_initialize_simulation_should_use_frame_without_repo(self):
+        dp = SimulationDataProvider()
+        dp.index = 10
+        dp.repo = MagicMock()
+        dp.initialize_simulation("2020-03-20T00:00:00", 10, frame="banana")
+
+        self.assertEqual(dp.index, 0)
+        self.assertEqual(dp.data, "banana")
+        dp.repo.get_frame.assert_not_called()
+
     def test_get_info_return_None_without_initialize(self):
         dp = SimulationDataProvider()
         self.assertEqual(dp.get_info(), None)
@@ -41,3 +51,24 @@ class SimulationDataProviderTests(unittest.TestCase):
         self.assertEqual(dp.get_info(), dummy_data[1])
         self.assertEqual(dp.get_info(), dummy_data[2])
         self.assertEqual(dp.get_info(), None)
+
+    def test_get_info_return_dictionary_copy_of_candle_frame_row(self):
+        dummy_data = [
+            {
+                "market": "KRW-BTC",
+                "date_time": "2020-03-20T00:00:00",
+                "opening_price": 1000.0,
+                "high_price": 1100.0,
+                "low_price": 900.0,
+                "closing_price": 1050.0,
+                "acc_price": 5000.0,
+                "acc_volume": 5.0,
+            }
+        ]
+        dp = SimulationDataProvider()
+        dp.data = CandleFrame.from_records(dummy_data)
+        info = dp.get_info()
+        self.assertEqual(type(info), dict)
+        self.assertEqual(info, dummy_data[0])
+        info["kind"] = 0
+        self.assertEqual(dp.get_info(), None)
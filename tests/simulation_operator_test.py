@@ -39,6 +39,8 @@ class SimulationOperatorTests(unittest.TestCase):
         dp_mock.get_info.assert_called_once()
         self.assertEqual(operator.turn, 1)
         analyzer_mock.put_trading_info.assert_called_once_with("mango")
+        self.threading_mock.assert_called_once_with(27, ANY)
+        self.timer_mock.start.assert_called_once()
 
     def test_execute_trading_should_call_trader_send_request_and_strategy_update_result(self):
         operator = SimulationOperator()
@@ -103,6 +105,27 @@ class SimulationOperatorTests(unittest.TestCase):
         analyzer_mock.create_report.assert_called_once()
         self.assertEqual(operator.state, "simulation_terminated")
 
+    def test_execute_trading_should_not_create_report_when_report_enable_is_false(self):
+        operator = SimulationOperator(report_enable=False)
+        analyzer_mock = Mock()
+        analyzer_mock.get_return_report = MagicMock(return_value="summary")
+        dp_mock = Mock()
+        dp_mock.get_info = MagicMock(return_value="mango")
+        strategy_mock = Mock()
+        strategy_mock.NAME = "mango_st"
+        strategy_mock.get_request = MagicMock(return_value={"id": "mango"})
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+        operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
+        operator.set_interval(27)
+        operator._execute_trading(None)
+
+        trader_mock.send_request.call_args[0][1]({"msg": "game-over"})
+        analyzer_mock.create_report.assert_not_called()
+        analyzer_mock.get_return_report.assert_called_once_with()
+        self.assertEqual(operator.last_report, {"summary": "summary"})
+        self.assertEqual(operator.state, "simulation_terminated")
+
     def test_execute_trading_should_NOT_call_trader_send_request_when_request_is_None(self):
         operator = SimulationOperator()
         analyzer_mock = Mock()
@@ -118,8 +141,11 @@ class SimulationOperatorTests(unittest.TestCase):
         trader_mock.send_request = MagicMock()
         operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
         operator.set_interval(27)
+        operator.state = "running"
         operator._execute_trading(None)
         trader_mock.send_request.assert_not_called()
+        self.assertEqual(operator.turn, 0)
+        self.threading_mock.assert_not_called()
 
     def test_get_score_should_call_work_post_task_with_correct_task(self):
         operator = SimulationOperator()
@@ -170,3 +196,96 @@ class SimulationOperatorTests(unittest.TestCase):
         operator.get_score.assert_called_with(
             ANY, index_info=operator.PERIODIC_RECORD_INFO, graph_tag=ANY
         )
+
+    def test_run_sync_should_execute_turns_until_simulation_terminated(self):
+        operator = SimulationOperator()
+        analyzer_mock = Mock()
+        analyzer_mock.create_report = MagicMock(return_value="report")
+        dp_mock = Mock()
+        dp_mock.get_info = MagicMock(return_value="mango")
+        dummy_request = {"id": "mango", "type": "orange", "price": 500, "amount": 10}
+        strategy_mock = Mock()
+        strategy_mock.NAME = "mango_st"
+        strategy_mock.get_request = MagicMock(return_value=dummy_request)
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+        call_count = 0
+
+        def dummy_send_request(request, callback):
+            nonlocal call_count
+            call_count += 1
+            if call_count < 3:
+                callback({"msg": "success"})
+            else:
+                callback({"msg": "game-over"})
+
+        trader_mock.send_request = dummy_send_request
+        operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
+        operator.worker = MagicMock()
+
+        self.assertEqual(operator.run_sync(), "report")
+        self.assertEqual(operator.turn, 3)
+        self.assertEqual(operator.state, "simulation_terminated")
+        self.assertEqual(strategy_mock.update_result.call_count, 2)
+        analyzer_mock.make_start_point.assert_called_once()
+        analyzer_mock.create_report.assert_called_once()
+        operator.worker.start.assert_not_called()
+        operator.worker.post_task.assert_not_called()
+        self.threading_mock.assert_not_called()
+
+    def test_run_sync_should_stop_and_return_report_when_request_is_None(self):
+        operator = SimulationOperator()
+        analyzer_mock = Mock()
+        analyzer_mock.create_report = MagicMock(return_value={"summary": "kiwi"})
+        dp_mock = Mock()
+        strategy_mock = Mock()
+        strategy_mock.NAME = "mango_st"
+        strategy_mock.get_request = MagicMock(return_value=None)
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+        operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
+
+        self.assertEqual(operator.run_sync(), {"summary": "kiwi"})
+        self.assertEqual(operator.current_turn, 1)
+        self.assertEqual(operator.state, "simulation_terminated")
+        trader_mock.send_request.assert_not_called()
+        analyzer_mock.create_report.assert_called_once()
+
+    def test_get_score_should_return_last_report_after_run_sync_is_stopped_by_failed_turn(self):
+        operator = SimulationOperator(report_enable=False)
+        analyzer_mock = Mock()
+        analyzer_mock.get_return_report = MagicMock(return_value="kiwi")
+        dp_mock = Mock()
+        dp_mock.get_info = MagicMock(side_effect=AttributeError("no data"))
+        strategy_mock = Mock()
+        strategy_mock.NAME = "mango_st"
+        trader_mock = Mock()
+        trader_mock.NAME = "orange_tr"
+        operator.initialize(dp_mock, strategy_mock, trader_mock, analyzer_mock)
+        callback = MagicMock()
+
+        self.assertEqual(operator.run_sync(), {"summary": "kiwi"})
+        operator.get_score(callback)
+
+        self.assertEqual(operator.state, "simulation_terminated")
+        callback.assert_called_once_with("kiwi")
+        analyzer_mock.create_report.assert_not_called()
+
+    def test_run_sync_should_return_None_when_state_is_NOT_ready(self):
+        operator = SimulationOperator()
+        operator.state = "running"
+        self.assertEqual(operator.run_sync(), None)
+
+    def test_get_score_should_call_callback_directly_when_running_sync(self):
+        operator = SimulationOperator()
+        analyzer = MagicMock()
+        analyzer.get_return_report.return_value = "grape"
+        operator.initialize("banana", MagicMock(), MagicMock(), analyzer)
+        operator.worker = MagicMock()
+        operator.state = "running"
+        operator.is_sync = True
+        callback = MagicMock()
+        operator.get_score(callback, index_info=7)
+        operator.worker.post_task.assert_not_called()
+        analyzer.get_return_report.assert_called_once_with(graph_filename=ANY, index_info=7)
+        callback.assert_called_once_with("grape")
@@ -1,7 +1,24 @@
+import os
+import tempfile
 import unittest
 from smtm import Simulator
 from unittest.mock import *
 
+WORK_DIR = None
+CWD = None
+
+
+def setUpModule():
+    global WORK_DIR, CWD
+    WORK_DIR = tempfile.TemporaryDirectory()
+    CWD = os.getcwd()
+    os.chdir(WORK_DIR.name)
+
+
+def tearDownModule():
+    os.chdir(CWD)
+    WORK_DIR.cleanup()
+
 
 class SimulatorTests(unittest.TestCase):
     def setUp(self):
@@ -29,6 +46,18 @@ class SimulatorTests(unittest.TestCase):
         simulator.initialize.assert_called()
         simulator.terminate.assert_called()
 
+    def test_run_single_call_operator_run_sync_when_sync_is_true(self):
+        simulator = Simulator(sync=True)
+        simulator.start = MagicMock()
+        simulator.initialize = MagicMock()
+        simulator.terminate = MagicMock()
+        simulator.operator = MagicMock()
+        simulator.run_single()
+        simulator.initialize.assert_called()
+        simulator.operator.run_sync.assert_called_once()
+        simulator.start.assert_not_called()
+        simulator.terminate.assert_called()
+
     @patch("builtins.print")
     def test_print_help_print_guide_correctly(self, mock_print):
         simulator = Simulator()
@@ -103,11 +132,15 @@ class SimulatorTests(unittest.TestCase):
         simulator.config_list[1]["action"].assert_called_with("end_value")
         simulator.config_list[2]["action"].assert_called_with("5")
 
+    @patch("smtm.SimulationContext.load")
     @patch("smtm.SimulationTrader.initialize_simulation")
     @patch("smtm.SimulationDataProvider.initialize_simulation")
     @patch("smtm.SimulationOperator.set_interval")
     @patch("smtm.SimulationOperator.initialize")
-    def test_initialize_call_initialize(self, mock_initialize, mock_set_interval, mock_dp, mock_tr):
+    def test_initialize_call_initialize(
+        self, mock_initialize, mock_set_interval, mock_dp, mock_tr, mock_load
+    ):
+        mock_load.return_value = "mango_frame"
         simulator = Simulator(budget=7000, from_dash_to="201220.170000-201220.180000")
         simulator._make_tag = MagicMock(return_value="orange")
         simulator.interval = 0.1
@@ -115,8 +148,11 @@ class SimulatorTests(unittest.TestCase):
         self.assertEqual(simulator.need_init, False)
         mock_initialize.assert_called_once()
         mock_set_interval.assert_called_once_with(0.1)
-        mock_dp.assert_called_once_with(end="2020-12-20T18:00:00", count=60)
-        mock_tr.assert_called_once_with(end="2020-12-20T18:00:00", count=60, budget=7000)
+        mock_load.assert_called_once_with(end="2020-12-20T18:00:00", count=60)
+        mock_dp.assert_called_once_with(end="2020-12-20T18:00:00", count=60, frame="mango_frame")
+        mock_tr.assert_called_once_with(
+            end="2020-12-20T18:00:00", count=60, budget=7000, frame="mango_frame"
+        )
         simulator._make_tag.assert_called_once()
         self.assertEqual(simulator.operator.tag, "orange")
 
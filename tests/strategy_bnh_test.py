@@ -1,3 +1,6 @@
+import json
+import os
+import tempfile
 import unittest
 from smtm import StrategyBuyAndHold
 from unittest.mock import *
@@ -29,6 +32,36 @@ class StrategyBuyAndHoldTests(unittest.TestCase):
         bnh.update_trading_info("mango")
         self.assertEqual(bnh.data.pop(), "mango")
 
+    def test_update_trading_info_keep_recent_data_only(self):
+        bnh = StrategyBuyAndHold()
+        bnh.initialize(100, 10)
+        for i in range(bnh.RETENTION_COUNT + 10):
+            bnh.update_trading_info({"closing_price": i})
+
+        self.assertEqual(len(bnh.data), bnh.RETENTION_COUNT)
+        self.assertEqual(bnh.data[0], {"closing_price": 10})
+        self.assertEqual(bnh.get_retention_info()["data"]["dropped"], 10)
+
+    def test_set_retention_should_move_recent_items_and_spill_dropped_items(self):
+        bnh = StrategyBuyAndHold()
+        bnh.initialize(100, 10)
+        for i in range(3):
+            bnh.update_trading_info({"closing_price": i})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bnh.set_retention(2, spill_dir=tmpdir)
+            bnh.update_trading_info({"closing_price": 3})
+            self.assertEqual(list(bnh.data), [{"closing_price": 2}, {"closing_price": 3}])
+
+            with open(os.path.join(tmpdir, "BnH-data.jsonl"), "r", encoding="utf-8") as spilled:
+                items = [json.loads(line) for line in spilled]
+            self.assertEqual(items, [{"closing_price": 0}, {"closing_price": 1}])
+
+        info = bnh.get_retention_info()
+        self.assertEqual(info["data"]["count"], 2)
+        self.assertEqual(info["data"]["maxlen"], 2)
+        self.assertEqual(info["result"]["count"], 0)
+
     def test_update_trading_info_ignore_info_when_not_yet_initialzed(self):
         bnh = StrategyBuyAndHold()
         bnh.update_trading_info("mango")
@@ -1,4 +1,5 @@
 import unittest
+import pandas as pd
 from smtm import StrategySma0
 from unittest.mock import *
 
@@ -39,46 +40,50 @@ class StrategySma0Tests(unittest.TestCase):
             "closing_price": 500,
         }
         sma.update_trading_info(dummy_info)
-        self.assertEqual(sma.closing_price_list.pop(), 500)
+        self.assertEqual(sma.price_count, 1)
+        for item in sma.sma_list:
+            self.assertEqual(item.window.values(), [500])
 
-    @patch("numpy.isnan")
-    @patch("pandas.Series")
-    def test_update_trading_info_update_process_when_long_gt_short(self, mock_series, mock_np):
+    def test_update_trading_info_keep_only_long_window_prices(self):
         sma = StrategySma0()
+        sma.initialize(100, 10)
+        for i in range(sma.LONG * 3):
+            sma.update_trading_info({"date_time": "mango", "closing_price": 500 + i})
 
-        for i in range(sma.LONG):
-            sma.closing_price_list.append(500)
-
-        class DummyMean:
-            pass
-
-        dummy_mean_short = DummyMean()
-        dummy_mean_mid = DummyMean()
-        dummy_mean_long = DummyMean()
-
-        dummy_mean_short.values = [5]
-        dummy_mean_mid.values = [7]
-        dummy_mean_long.values = [10]
-
-        rolling_return_mock = MagicMock()
-        rolling_return_mock.mean.side_effect = [
-            dummy_mean_short,
-            dummy_mean_mid,
-            dummy_mean_long,
-            dummy_mean_short,
-            dummy_mean_mid,
-            dummy_mean_long,
-        ]
-        series_return = MagicMock()
-        series_return.rolling.return_value = rolling_return_mock
-        mock_series.return_value = series_return
+        self.assertEqual(sma.price_count, sma.LONG * 3)
+        self.assertEqual(len(sma.sma_list[0].window), sma.SHORT)
+        self.assertEqual(len(sma.sma_list[1].window), sma.MID)
+        self.assertEqual(len(sma.sma_list[2].window), sma.LONG)
+        self.assertEqual(sma.sma_list[2].window[-1], 500 + sma.LONG * 3 - 1)
+        self.assertEqual(len(sma.sma_long_history), sma.STD_K - sma.PREDICT_N)
+
+    def test_update_trading_info_predict_sma_same_with_rolling_mean(self):
+        sma = StrategySma0()
+        sma.initialize(100, 10)
+        price_list = [1000 + (i * 37) % 101 for i in range(sma.LONG + 5)]
+        for price in price_list:
+            sma.update_trading_info({"date_time": "mango", "closing_price": price})
+
+        current_price = price_list[-1]
+        feeded_list = price_list + [current_price] * sma.PREDICT_N
+        for item in sma.sma_list:
+            expected = pd.Series(feeded_list).rolling(item.period).mean().values
+            predicted = item.predict(current_price, sma.PREDICT_N)
+            self.assertEqual(len(predicted), sma.PREDICT_N)
+            for i in range(sma.PREDICT_N):
+                self.assertAlmostEqual(predicted[i], expected[-sma.PREDICT_N + i])
+
+    def test_update_trading_info_update_process_when_long_gt_short(self):
+        sma = StrategySma0()
+        sma.initialize(100, 10)
+        for i in range(sma.LONG - 1):
+            sma.update_trading_info({"date_time": "mango", "closing_price": 1000 - i})
+        self.assertEqual(sma.current_process, "ready")
 
         dummy_info = {
             "date_time": "mango",
             "closing_price": 500,
         }
-        mock_np.return_value = False
-        sma.initialize(100, 10)
         sma.current_process = "buy"
         sma.asset_amount = 12
         sma.update_trading_info(dummy_info)
@@ -87,7 +92,7 @@ class StrategySma0Tests(unittest.TestCase):
         self.assertEqual(sma.process_unit[1], 12 / sma.STEP)
 
         self.assertEqual(sma.cross_info[0], {"price": 0, "index": 0})
-        self.assertEqual(sma.cross_info[1], {"price": 500, "index": 60})
+        self.assertEqual(sma.cross_info[1], {"price": 500, "index": 59})
 
         # current_process가 "sell" 일때는 업데이트 되지 않아야함
         sma.current_process = "sell"
@@ -97,44 +102,17 @@ class StrategySma0Tests(unittest.TestCase):
         self.assertEqual(sma.process_unit[0], 0)
         self.assertEqual(sma.process_unit[1], 12)  # 12 / STEP
 
-    @patch("numpy.isnan")
-    @patch("pandas.Series")
-    def test_update_trading_info_update_process_when_long_lt_short(self, mock_series, mock_np):
+    def test_update_trading_info_update_process_when_long_lt_short(self):
         sma = StrategySma0()
-
-        for i in range(sma.LONG):
-            sma.closing_price_list.append(500)
-
-        class DummyMean:
-            pass
-
-        dummy_mean_short = DummyMean()
-        dummy_mean_mid = DummyMean()
-        dummy_mean_long = DummyMean()
-
-        dummy_mean_short.values = [10]
-        dummy_mean_mid.values = [7]
-        dummy_mean_long.values = [5]
-
-        rolling_return_mock = MagicMock()
-        rolling_return_mock.mean.side_effect = [
-            dummy_mean_short,
-            dummy_mean_mid,
-            dummy_mean_long,
-            dummy_mean_short,
-            dummy_mean_mid,
-            dummy_mean_long,
-        ]
-        series_return = MagicMock()
-        series_return.rolling.return_value = rolling_return_mock
-        mock_series.return_value = series_return
+        sma.initialize(100, 10)
+        for i in range(sma.LONG - 1):
+            sma.update_trading_info({"date_time": "mango", "closing_price": 100 + i})
+        self.assertEqual(sma.current_process, "ready")
 
         dummy_info = {
             "date_time": "mango",
             "closing_price": 500,
         }
-        mock_np.return_value = False
-        sma.initialize(100, 10)
         sma.current_process = "sell"
         sma.balance = 90000
         expected_price = 90000 / sma.STEP
@@ -144,7 +122,7 @@ class StrategySma0Tests(unittest.TestCase):
         self.assertEqual(sma.process_unit[1], 0)
 
         self.assertEqual(sma.cross_info[0], {"price": 0, "index": 0})
-        self.assertEqual(sma.cross_info[1], {"price": 500, "index": 60})
+        self.assertEqual(sma.cross_info[1], {"price": 500, "index": 59})
 
         # current_process가 "buy" 일때는 업데이트 되지 않아야함
         sma.current_process = "buy"
@@ -154,51 +132,16 @@ class StrategySma0Tests(unittest.TestCase):
         self.assertEqual(sma.process_unit[0], 90000)  # 90000 / STEP
         self.assertEqual(sma.process_unit[1], 0)
 
-    @patch("numpy.isnan")
-    @patch("pandas.Series")
-    def test_update_trading_info_update_process_and_cross_info_when_long_lt_short(
-        self, mock_series, mock_np
-    ):
+    def test_update_trading_info_update_process_and_cross_info_when_long_lt_short(self):
         sma = StrategySma0()
-
+        sma.initialize(100, 10)
         for i in range(sma.LONG + sma.STD_K):
-            sma.closing_price_list.append(500)
-
-        class DummyMean:
-            pass
-
-        dummy_mean_short = DummyMean()
-        dummy_mean_mid = DummyMean()
-        dummy_mean_long = DummyMean()
-
-        dummy_mean_short.values = [10]
-        dummy_mean_mid.values = [7]
-        dummy_mean_long.values = []
-
-        for i in range(sma.STD_K):
-            dummy_mean_long.values.append(i)
-
-        dummy_mean_long.values.append(5)
-
-        rolling_return_mock = MagicMock()
-        rolling_return_mock.mean.side_effect = [
-            dummy_mean_short,
-            dummy_mean_mid,
-            dummy_mean_long,
-            dummy_mean_short,
-            dummy_mean_mid,
-            dummy_mean_long,
-        ]
-        series_return = MagicMock()
-        series_return.rolling.return_value = rolling_return_mock
-        mock_series.return_value = series_return
+            sma.update_trading_info({"date_time": "mango", "closing_price": 100 + i * 10})
 
         dummy_info = {
             "date_time": "dummy_datetime",
-            "closing_price": 500,
+            "closing_price": 1000,
         }
-        mock_np.return_value = False
-        sma.initialize(100, 10)
         sma.current_process = "sell"
         sma.balance = 90000
         sma.update_trading_info(dummy_info)
@@ -207,7 +150,18 @@ class StrategySma0Tests(unittest.TestCase):
         self.assertEqual(sma.process_unit[1], 0)
 
         self.assertEqual(sma.cross_info[0], {"price": 0, "index": 85})
-        self.assertEqual(sma.cross_info[1], {"price": 500, "index": 85})
+        self.assertEqual(sma.cross_info[1], {"price": 1000, "index": 85})
+
+    def test_update_trading_info_keep_cross_info_when_deviation_is_small(self):
+        sma = StrategySma0()
+        sma.initialize(100, 10)
+        for i in range(sma.LONG + sma.STD_K):
+            sma.update_trading_info({"date_time": "mango", "closing_price": 1000000})
+
+        sma.update_trading_info({"date_time": "mango", "closing_price": 1000100})
+        self.assertEqual(sma.current_process, "buy")
+        self.assertEqual(sma.cross_info[0], {"price": 0, "index": 0})
+        self.assertEqual(sma.cross_info[1], {"price": 1000100, "index": 85})
 
     def test_update_trading_info_ignore_info_when_not_yet_initialzed(self):
         sma = StrategySma0()
@@ -348,7 +302,7 @@ class StrategySma0Tests(unittest.TestCase):
         sma = StrategySma0()
         sma.initialize(100, 10)
         dummy_info = {"closing_price": 2000}
-        sma.closing_price_list.append(dummy_info)
+        sma.data.append(dummy_info)
         sma.cross_info[0] = {"price": 0, "index": 1}
         requests = sma.get_request()
         self.assertEqual(requests, None)
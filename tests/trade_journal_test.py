@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from smtm import TradeJournal
+from unittest.mock import *
+
+
+class TradeJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmpdir.name, "mango.db")
+        self.journal = TradeJournal(self.db_file, session="mango", batch_size=2)
+
+    def tearDown(self):
+        self.journal.stop()
+        if self.journal.database is not None:
+            self.journal.database.conn.close()
+        self.tmpdir.cleanup()
+
+    def test_get_records_should_return_saved_records_with_tuple(self):
+        records = [
+            {"date_time": "2020-04-30T17:00:00", "asset": {"mango": (500, 1.5)}, "kind": 3},
+            {"date_time": "2020-04-30T17:01:00", "asset": {}, "kind": 3},
+            {"date_time": "2020-04-30T17:02:00", "asset": {"mango": (501, 0.5)}, "kind": 3},
+        ]
+        for seq, record in enumerate(records):
+            self.journal.put("score_list", seq, record)
+
+        self.assertEqual(list(self.journal.get_records("score_list")), records)
+        self.assertEqual(list(self.journal.get_records("score_list", 1, 2)), records[1:2])
+        self.assertEqual(
+            list(self.journal.get_records("score_list", start_ts=1588266060)), records[1:]
+        )
+        self.assertEqual(self.journal.count("score_list", 1), 2)
+        self.assertEqual(self.journal.count("info_list"), 0)
+
+    def test_get_view_should_return_records_in_time_order(self):
+        self.journal.put("info_list", 0, {"date_time": "2020-04-30T17:01:00", "kind": 0})
+        self.journal.put("info_list", 1, {"date_time": "2020-04-30T17:00:00", "kind": 0})
+        self.journal.put("info_list", 2, {"date_time": "2020-04-30T17:02:00", "kind": 0})
+
+        view = self.journal.get_view("info_list", start_seq=1)
+
+        self.assertEqual(len(view), 2)
+        self.assertEqual(
+            [record["date_time"] for record in view],
+            ["2020-04-30T17:00:00", "2020-04-30T17:02:00"],
+        )
+
+    def test_stop_should_write_records_and_terminate_thread(self):
+        self.journal.put("info_list", 0, {"date_time": "2020-04-30T17:00:00", "kind": 0})
+        thread = self.journal.thread
+
+        self.journal.stop()
+
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(self.journal.thread)
+        other = TradeJournal(self.db_file, session="mango")
+        self.assertEqual(other.count("info_list"), 1)
+        other.database.conn.close()
+
+    def test_put_should_not_stop_thread_when_write_fail(self):
+        self.journal.logger = MagicMock()
+        self.journal.put("info_list", 0, {"date_time": "2020-04-30T17:00:00", "kind": 0})
+        self.journal.put("info_list", 1, None)
+        self.journal.flush()
+        self.journal.put("info_list", 2, {"date_time": "2020-04-30T17:02:00", "kind": 0})
+
+        self.assertEqual(self.journal.count("info_list"), 2)
+        self.journal.logger.error.assert_called_once()
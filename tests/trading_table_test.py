@@ -0,0 +1,150 @@
+import io
+import json
+import sys
+import unittest
+from smtm import RecordTable, TradingTable
+from unittest.mock import *
+
+
+class TradingTableTests(unittest.TestCase):
+    def setUp(self):
+        self.info_list = RecordTable(
+            (
+                "date_time",
+                "opening_price",
+                "high_price",
+                "low_price",
+                "closing_price",
+                "acc_price",
+                "acc_volume",
+            ),
+            kind=0,
+        )
+        self.request_list = RecordTable(("id", "type", "price", "amount", "date_time"), kind=1)
+        for minute in range(3):
+            price = 500 + minute
+            self.info_list.append(
+                {
+                    "date_time": f"2020-04-30T17:0{minute}:00",
+                    "opening_price": price,
+                    "high_price": price,
+                    "low_price": price,
+                    "closing_price": price,
+                    "acc_price": price,
+                    "acc_volume": 1,
+                }
+            )
+        self.request_list.append(
+            {
+                "id": "mango",
+                "type": "buy",
+                "price": 500,
+                "amount": 1,
+                "date_time": "2020-04-30T17:01:00",
+            }
+        )
+        self.result_list = [
+            {
+                "request": {"id": "mango"},
+                "type": "buy",
+                "price": 500,
+                "amount": 0.5,
+                "msg": "success",
+                "date_time": "2020-04-30T17:01:30",
+                "kind": 2,
+            },
+            {
+                "request": {"id": "mango"},
+                "type": "buy",
+                "price": 500,
+                "amount": 0.5,
+                "msg": "success",
+                "date_time": "2020-04-30T17:00:30",
+                "kind": 2,
+            },
+        ]
+        self.table = TradingTable(self.request_list, self.info_list, self.result_list)
+
+    def test_iter_should_merge_records_by_date_time_and_kind(self):
+        self.assertEqual(
+            [(record["date_time"], record["kind"]) for record in self.table],
+            [
+                ("2020-04-30T17:00:00", 0),
+                ("2020-04-30T17:00:30", 2),
+                ("2020-04-30T17:01:00", 0),
+                ("2020-04-30T17:01:00", 1),
+                ("2020-04-30T17:01:30", 2),
+                ("2020-04-30T17:02:00", 0),
+            ],
+        )
+
+    def test_iter_should_sort_unsorted_record_table(self):
+        self.info_list.append({"date_time": "2020-04-30T16:59:00"})
+
+        self.assertFalse(self.info_list.is_sorted)
+        self.assertEqual(self.table[0]["date_time"], "2020-04-30T16:59:00")
+
+    def test_table_should_work_like_list_of_records(self):
+        expected = sorted(
+            list(self.info_list) + list(self.request_list) + self.result_list,
+            key=lambda record: (record["date_time"], record["kind"]),
+        )
+
+        self.assertEqual(len(self.table), 6)
+        self.assertEqual(self.table, expected)
+        self.assertEqual(self.table[3], expected[3])
+        self.assertEqual(self.table[-1], expected[-1])
+        self.assertEqual(self.table[1:4], expected[1:4])
+        with self.assertRaises(IndexError):
+            self.table[6]
+
+    def test_write_should_write_text_lines_by_chunk(self):
+        self.table.BUFFER_LINES = 4
+        output = MagicMock()
+
+        self.table.write(output)
+
+        self.assertEqual(output.write.call_count, 2)
+        written = "".join(call[0][0] for call in output.write.call_args_list)
+        self.assertEqual(
+            written,
+            "### TRADING TABLE =================================\n"
+            "2020-04-30T17:00:00, 500, 500, 500, 500, 500, 1\n"
+            "2020-04-30T17:00:30, [<-] mango, buy, 500, 0.5, success\n"
+            "2020-04-30T17:01:00, 501, 501, 501, 501, 501, 1\n"
+            "2020-04-30T17:01:00, [->] mango, buy, 500, 1\n"
+            "2020-04-30T17:01:30, [<-] mango, buy, 500, 0.5, success\n"
+            "2020-04-30T17:02:00, 502, 502, 502, 502, 502, 1\n",
+        )
+
+    def test_write_should_write_nothing_when_table_is_empty(self):
+        output = io.StringIO()
+        TradingTable([], RecordTable(("date_time",), kind=0)).write(output)
+        self.assertEqual(output.getvalue(), "")
+
+    def test_write_should_write_csv_with_header_and_request_id(self):
+        output = io.StringIO()
+
+        self.table.write(output, "csv")
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertEqual(lines[0], ",".join(TradingTable.COLUMNS))
+        self.assertEqual(lines[2], "2020-04-30T17:00:30,2,mango,buy,500,0.5,success,,,,,,,,,,")
+
+    def test_write_should_write_json_line_for_each_record(self):
+        output = io.StringIO()
+
+        self.table.write(output, "jsonl")
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(records, list(self.table))
+
+    def test_write_should_raise_UserWarning_when_format_is_not_supported(self):
+        with self.assertRaises(UserWarning):
+            self.table.write(io.StringIO(), "xml")
+
+    @patch.dict(sys.modules, {"pyarrow": None, "pyarrow.parquet": None})
+    def test_write_should_raise_UserWarning_when_pyarrow_is_not_installed(self):
+        with self.assertRaises(UserWarning):
+            self.table.write("mango.parquet", "parquet")
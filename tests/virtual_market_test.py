@@ -16,17 +16,26 @@ class VirtualMarketInitializeTests(unittest.TestCase):
     def test_intialize_should_update_data_from_data_repository(self):
         market = VirtualMarket()
         market.repo = MagicMock()
-        market.repo.get_data.return_value = ["mango", "orange"]
+        market.repo.get_frame.return_value = ["mango", "orange"]
         market.market = "mango_market"
         market.initialize(end="2020-04-30T00:00:00", count=500, budget=7777777)
         self.assertEqual(market.data[0], "mango")
         self.assertEqual(market.data[1], "orange")
         self.assertEqual(market.is_initialized, True)
         self.assertEqual(market.balance, 7777777)
-        market.repo.get_data.assert_called_once_with(
+        market.repo.get_frame.assert_called_once_with(
             "2020-04-29T15:40:00", "2020-04-30T00:00:00", market="mango_market"
         )
 
+    def test_intialize_should_use_frame_without_data_repository(self):
+        market = VirtualMarket()
+        market.repo = MagicMock()
+        market.initialize(end="2020-04-30T00:00:00", count=500, budget=7777777, frame="mango")
+        self.assertEqual(market.data, "mango")
+        self.assertEqual(market.is_initialized, True)
+        self.assertEqual(market.balance, 7777777)
+        market.repo.get_frame.assert_not_called()
+
 
 class VirtualMarketTests(unittest.TestCase):
     def setUp(self):